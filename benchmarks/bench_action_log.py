@@ -0,0 +1,63 @@
+"""
+Benchmark: cost of action logging on the game loop and writer throughput.
+
+Logs ``--count`` decisions as fast as possible and reports the time spent in the
+log calls (what the game loop pays) and how long the background writer takes to
+persist them, for each backend.
+
+Usage:
+    python benchmarks/bench_action_log.py [--count 100000] [--batch-size 512]
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from decisions import ActionType, Decision  # noqa: E402
+from world.action_log import ActionLog, JSONLActionWriter, SQLiteActionWriter  # noqa: E402
+
+
+class Speaker:
+    name = "Bench"
+    entity_id = 1
+
+
+def run(count, batch_size):
+    decision = Decision(type=ActionType.COMMUNICATE, target="Ann", message="Nice weather today.")
+    speaker = Speaker()
+    print(f"{'backend':>8} | {'records':>8} | {'call us':>7} | {'written/s':>10} | {'batches':>7} | {'dropped':>7}")
+    print("-" * 62)
+    with tempfile.TemporaryDirectory() as directory:
+        writers = {
+            "sqlite": lambda: SQLiteActionWriter(Path(directory) / "actions.sqlite"),
+            "jsonl": lambda: JSONLActionWriter(Path(directory) / "jsonl"),
+        }
+        for backend, make_writer in writers.items():
+            log = ActionLog(make_writer(), batch_size=batch_size, max_queue=count + 1)
+            start = time.perf_counter()
+            for i in range(count):
+                log.log_decision(i * 0.01, speaker, decision)
+            logged = time.perf_counter() - start
+            log.flush(timeout=300)
+            total = time.perf_counter() - start
+            stats = log.stats()
+            log.close()
+            print(
+                f"{backend:>8} | {count:>8} | {logged / count * 1e6:>7.2f} | "
+                f"{stats.written / total:>10.0f} | {stats.batches:>7} | {stats.dropped:>7}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--batch-size", type=int, default=512)
+    args = parser.parse_args()
+    run(args.count, args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
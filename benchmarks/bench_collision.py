@@ -0,0 +1,86 @@
+"""
+Benchmark: sweep-and-prune collision vs. all-pairs checks at high agent density.
+
+Circles are scattered over a square map sized so they cover ``--density`` of its
+area (0.5 = half the ground is occupied), then one collision tick is timed:
+broad phase, narrow phase and push-apart. The all-pairs baseline is vectorized
+NumPy over every pair, so it is the fastest possible O(N²) check; it is skipped
+above ``--max-naive`` circles because it needs N² memory.
+
+Usage:
+    python benchmarks/bench_collision.py [--counts 1000 10000 100000] [--density 0.5]
+"""
+import argparse
+import sys
+import time
+from math import pi, sqrt
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from world.collision import find_overlapping_pairs, resolve_collisions  # noqa: E402
+from world.entity_store import EntityStore  # noqa: E402
+
+
+def all_pairs(positions, radii):
+    """Baseline: test every pair with one broadcast distance matrix."""
+    delta = positions[:, None, :] - positions[None, :, :]
+    reach = radii[:, None] + radii[None, :]
+    overlapping = np.einsum("ijk,ijk->ij", delta, delta) < reach * reach
+    i, j = np.nonzero(np.triu(overlapping, k=1))
+    return i, j
+
+
+def best_of(repeats, fn):
+    """Return the fastest of ``repeats`` timed calls, in seconds."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(counts, radius, density, max_naive, repeats, seed):
+    print(f"radius={radius:.0f}px, density={density:.0%} of the ground covered")
+    print(f"{'agents':>8} | {'pairs':>8} | {'all-pairs ms':>12} | {'sweep ms':>8} | {'resolve ms':>10} | {'speedup':>7}")
+    print("-" * 70)
+    rng = np.random.default_rng(seed)
+    for count in counts:
+        side = int(sqrt(count * pi * radius ** 2 / density))
+        positions = rng.uniform(radius, side - radius, (count, 2))
+        radii = np.full(count, float(radius))
+
+        pairs = len(find_overlapping_pairs(positions, radii)[0])
+        sweep = best_of(repeats, lambda: find_overlapping_pairs(positions, radii))
+        naive = best_of(repeats, lambda: all_pairs(positions, radii)) if count <= max_naive else None
+
+        # Full tick on an entity store: detect, push apart, clamp
+        store = EntityStore(side, side, capacity=count)
+        ids = store.spawn_many(positions, radius, (0, 0, 0))
+        resolve = best_of(1, lambda: resolve_collisions(store, ids))
+
+        naive_text = f"{naive * 1000:>12.2f}" if naive is not None else f"{'-':>12}"
+        speedup_text = f"{naive / sweep:>6.1f}x" if naive is not None else f"{'-':>7}"
+        print(
+            f"{count:>8} | {pairs:>8} | {naive_text} | {sweep * 1000:>8.2f} | "
+            f"{resolve * 1000:>10.2f} | {speedup_text}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--counts", type=int, nargs="+", default=[1000, 5000, 10000, 100000])
+    parser.add_argument("--radius", type=float, default=20.0)
+    parser.add_argument("--density", type=float, default=0.5, help="Fraction of the ground covered")
+    parser.add_argument("--max-naive", type=int, default=5000, help="Largest count for the all-pairs baseline")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    run(args.counts, args.radius, args.density, args.max_naive, args.repeats, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Benchmark: decision throughput of the scheduler and dispatcher with the mock provider.
+
+Runs a headless world in real time with ``--characters`` AI characters whose
+models use the offline "mock" provider (simulated latency, no network), once per
+``--concurrency`` limit. Reports completed decisions per second against the
+demand (characters / interval), the decision latency from dispatch to result
+(mock latency plus dispatcher queueing), the peak number of decisions in flight,
+the game loop cost per tick and how fast simulated time advanced (below 1.0 the
+loop could not keep up and demand drops with it).
+
+Usage:
+    python benchmarks/bench_decision_pipeline.py [--characters 500] [--latency-ms 300] [--concurrency 16 64 256]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from config import LittleWorldConfig, LLMConfig, LLMProviderConfig, MockLLMConfig, SimulationConfig  # noqa: E402
+from character import AICharacter  # noqa: E402
+from language_model.llm_base_engine import BaseAIModelEngine  # noqa: E402
+from world import World  # noqa: E402
+
+
+class LatencyRecorder:
+    """Stands in for the scheduler's action log and keeps decision latencies."""
+
+    def __init__(self):
+        self.latencies = []
+        self.failed = 0
+
+    def log_llm_call(self, sim_time, character, kind, latency, ok=True):
+        if ok:
+            self.latencies.append(latency)
+        else:
+            self.failed += 1
+
+    def log_decision(self, sim_time, character, decision):
+        pass
+
+
+def run_once(characters, seconds, interval, mock, concurrency, seed):
+    config = LittleWorldConfig(
+        simulation=SimulationConfig(seed=seed, entity_capacity=characters + 16, skip_unchanged_observations=False),
+        llm_providers={"mock": LLMProviderConfig(max_concurrency=concurrency)},
+    )
+    world = World(config, headless=True)
+    llm_config = LLMConfig(type="mock", version="mock", api_key="", mock=mock, coalesce_requests=False)
+    rng = world.rng
+    for i in range(characters):
+        model = BaseAIModelEngine(llm_config, personality_prompt=f"You are character {i}.")
+        character = AICharacter(
+            rng.uniform(20, config.window.width - 20), rng.uniform(20, config.window.height - 20),
+            config, world=world, model=model, decision_interval=interval,
+        )
+        character.name = f"Character {i}"
+        world.add_character(character)
+
+    recorder = LatencyRecorder()
+    world.scheduler.action_log = recorder
+    timestep = world.sim_clock.timestep
+    ticks = 0
+    tick_time = 0.0
+    peak_in_flight = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        tick_start = time.perf_counter()
+        world.update()
+        tick_end = time.perf_counter()
+        ticks += 1
+        tick_time += tick_end - tick_start
+        peak_in_flight = max(peak_in_flight, world.scheduler.in_flight)
+        # Pace the loop like the game does
+        time.sleep(max(0.0, start + ticks * timestep - tick_end))
+    elapsed = time.perf_counter() - start
+    world.scheduler.stop()
+
+    latencies = sorted(recorder.latencies) or [0.0]
+    return {
+        "rate": len(recorder.latencies) / elapsed,
+        "failed": recorder.failed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000.0,
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000.0,
+        "peak": peak_in_flight,
+        "tick_ms": tick_time / ticks * 1000.0,
+        "speed": world.sim_clock.sim_time / elapsed,
+    }
+
+
+def run(characters, seconds, interval, mock, concurrencies, seed):
+    print(f"{characters} characters deciding every {interval:.1f}s "
+          f"(demand {characters / interval:.0f} decisions/s), "
+          f"{mock.latency} latency {mock.latency_ms:.0f}±{mock.latency_spread_ms:.0f} ms, "
+          f"error rate {mock.error_rate:.0%}")
+    print(f"{'limit':>6} | {'decisions/s':>11} | {'failed':>6} | {'p50 ms':>7} | {'p99 ms':>7} | "
+          f"{'peak in flight':>14} | {'ms/tick':>7} | {'sim/real':>8}")
+    print("-" * 89)
+    for concurrency in concurrencies:
+        result = run_once(characters, seconds, interval, mock, concurrency, seed)
+        print(
+            f"{concurrency or 'none':>6} | {result['rate']:>11.1f} | {result['failed']:>6} | "
+            f"{result['p50_ms']:>7.0f} | {result['p99_ms']:>7.0f} | {result['peak']:>14} | {result['tick_ms']:>7.2f} | "
+            f"{result['speed']:>8.2f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--characters", type=int, default=500)
+    parser.add_argument("--seconds", type=float, default=10.0, help="Wall-clock seconds per run")
+    parser.add_argument("--interval", type=float, default=3.0, help="Seconds between decisions")
+    parser.add_argument("--latency", default="lognormal", help="fixed, uniform, normal, lognormal or exponential")
+    parser.add_argument("--latency-ms", type=float, default=300.0)
+    parser.add_argument("--latency-spread-ms", type=float, default=100.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[16, 64, 256],
+                        help="Dispatcher max_concurrency values to compare")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    mock = MockLLMConfig(
+        latency=args.latency, latency_ms=args.latency_ms,
+        latency_spread_ms=args.latency_spread_ms, error_rate=args.error_rate, seed=args.seed,
+    )
+    run(args.characters, args.seconds, args.interval, mock, args.concurrency, args.seed)
+
+
+if __name__ == "__main__":
+    main()
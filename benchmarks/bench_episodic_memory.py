@@ -0,0 +1,81 @@
+"""
+Benchmark: episodic memory retrieval latency and recall vs. episode count.
+
+Fills one character's episodic memory with synthetic observation texts. It then
+reports the mean and 99th-percentile time of a full ``search`` (query embedding
+included), and recall@k of the index against an exact brute-force scan. Below
+``ivf_threshold`` episodes the index is a brute-force scan itself, so recall is 1.
+
+Usage:
+    python benchmarks/bench_episodic_memory.py [--counts 1000 10000 100000] [--probe 8]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from config import EpisodicMemoryConfig  # noqa: E402
+from language_model.episodic_memory import create_episodic_memory  # noqa: E402
+
+NAMES = ["Ann", "Bob", "Cid", "Dee", "Eve", "Fay", "Gus", "Hal"]
+DIRECTIONS = ["north", "north-east", "east", "south-east", "south", "south-west", "west", "north-west"]
+WORDS = [f"w{i}" for i in range(4000)]
+
+
+def make_texts(count, rng):
+    return [
+        f"{NAMES[i % len(NAMES)]} (ai) at {rng.integers(0, 300)} pixels {DIRECTIONS[rng.integers(0, 8)]} "
+        f"from me said: {' '.join(rng.choice(WORDS, 6))} -> move ({rng.integers(-1, 2)}, {rng.integers(-1, 2)})"
+        for i in range(count)
+    ]
+
+
+def run(counts, probe, queries, k):
+    rng = np.random.default_rng(0)
+    print(f"{'episodes':>9} | {'index':>5} | {'add us':>6} | {'search ms':>9} | {'p99 ms':>6} | {'recall':>6}")
+    print("-" * 58)
+    for count in counts:
+        memory = create_episodic_memory(EpisodicMemoryConfig(top_k=k, ivf_probe=probe))
+        texts = make_texts(count, rng)
+        start = time.perf_counter()
+        memory.add_many(texts)
+        added = time.perf_counter() - start
+
+        query_texts = [texts[i] for i in rng.integers(0, count, queries)]
+        times = []
+        for query in query_texts:
+            start = time.perf_counter()
+            memory.search(query)
+            times.append(time.perf_counter() - start)
+
+        index = memory.index
+        vectors = index.vectors
+        hits = 0
+        for query in memory.embedder.embed_many(query_texts):
+            ids, _ = index.search(query, k)
+            exact = np.argpartition(-(vectors @ query), k - 1)[:k]
+            hits += len(set(ids.tolist()) & set(exact.tolist()))
+
+        times = np.array(times) * 1000
+        print(
+            f"{count:>9} | {'ivf' if index.centroids is not None else 'flat':>5} | {added / count * 1e6:>6.1f} | "
+            f"{times.mean():>9.3f} | {np.percentile(times, 99):>6.3f} | {hits / (queries * k):>6.2f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--counts", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--probe", type=int, default=8, help="IVF clusters scanned per search")
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--k", type=int, default=5)
+    args = parser.parse_args()
+    run(args.counts, args.probe, args.queries, args.k)
+
+
+if __name__ == "__main__":
+    main()
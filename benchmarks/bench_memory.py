@@ -0,0 +1,83 @@
+"""
+Benchmark: prompt size over a long simulation with conversation memory.
+
+Simulates one character deciding every ``--interval`` seconds for ``--hours``
+hours of simulated time. Each hour it reports the prompt size with bounded
+memory and the size a naive prompt carrying the full history would have
+reached. It also reports the time spent building each prompt. Summaries come from
+a stand-in LLM that keeps the last words of its input, so no API is called.
+
+Usage:
+    python benchmarks/bench_memory.py [--hours 4] [--interval 3] [--budget 2048]
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from langchain_core.messages import AIMessage  # noqa: E402
+from config import LLMConfig, MemoryConfig  # noqa: E402
+from language_model.llm_base_engine import BaseAIModelEngine  # noqa: E402
+
+
+class EchoLLM:
+    """Stand-in LLM answering with the last 150 words of the prompt."""
+
+    async def ainvoke(self, messages):
+        words = messages[-1].content.split()
+        return AIMessage(content=" ".join(words[-150:]))
+
+
+async def run(hours, interval, budget):
+    config = LLMConfig(
+        type="vllm",
+        version="bench",
+        api_key="k",
+        memory=MemoryConfig(prompt_token_budget=budget),
+    )
+    engine = BaseAIModelEngine(config=config, personality_prompt="You are a curious villager. " * 20)
+    engine.llm = EchoLLM()
+    counter = engine.token_counter
+    print(f"Token counter: {'tiktoken' if counter.exact else 'estimate'}")
+    print(f"{'hour':>4} | {'turns':>6} | {'prompt tokens':>13} | {'full history':>12} | {'build us':>8}")
+    print("-" * 58)
+
+    history_tokens = 0
+    turns_per_hour = int(3600 / interval)
+    turn = 0
+    for hour in range(1, hours + 1):
+        build = 0.0
+        for _ in range(turns_per_hour):
+            observation = (
+                f"World State: - My position: ({turn % 800}, {turn % 600}) - Visible characters: 2 "
+                f"- Ann (ai) at {turn % 90}.0 pixels east from me - Bob (player) at 40.0 pixels north from me"
+            )
+            messages = {"world_state": observation, "input_messages": ""}
+            start = time.perf_counter()
+            engine.build_prompt(messages)
+            build += time.perf_counter() - start
+            engine.memory.add_turn(observation, f"move ({turn % 3 - 1}, 0)", turn * interval)
+            history_tokens += counter.count(observation) + 8
+            turn += 1
+            await asyncio.sleep(0)  # Let background summaries run
+        await engine.memory.wait_summarized()
+        print(
+            f"{hour:>4} | {turn:>6} | {engine.last_prompt_tokens:>13} | "
+            f"{history_tokens + engine.last_prompt_tokens:>12} | {build / turns_per_hour * 1e6:>8.0f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hours", type=int, default=4)
+    parser.add_argument("--interval", type=float, default=3.0, help="Seconds between decisions")
+    parser.add_argument("--budget", type=int, default=2048, help="Prompt token budget")
+    args = parser.parse_args()
+    asyncio.run(run(args.hours, args.interval, args.budget))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark: prompt tokens per observation for each observation format.
+
+Runs a headless world with ``--entities`` wandering characters. Each step it
+encodes what a few observers see with every format and reports the mean tokens
+per observation, plus the saving against the full JSON dump
+(WorldState.to_structured_dict) and the current verbose text. The delta format
+is measured over consecutive decisions ``--interval`` seconds apart, one encoder
+per observer.
+
+Usage:
+    python benchmarks/bench_observation_tokens.py [--entities 200] [--radius 200] [--steps 40]
+"""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from config import LittleWorldConfig, SimulationConfig  # noqa: E402
+from language_model.memory import TokenCounter  # noqa: E402
+from world import World  # noqa: E402
+from world.observation_encoders import create_observation_encoder  # noqa: E402
+
+FORMATS = ("json", "verbose", "table", "delta")
+
+
+def run(entities, radius, steps, observers, interval, round_to):
+    config = LittleWorldConfig(simulation=SimulationConfig(seed=0, entity_capacity=entities + 16))
+    world = World(config, headless=True)
+    world.spawn_entities(entities)
+    watched = world.characters[-observers:]
+    counter = TokenCounter()
+    encoders = {
+        name: [create_observation_encoder(name, round_to) for _ in watched]
+        for name in FORMATS
+    }
+    totals = dict.fromkeys(FORMATS, 0)
+    visible = 0
+    samples = 0
+    ticks_per_decision = max(int(round(interval / world.sim_clock.timestep)), 1)
+    for _ in range(steps):
+        for _ in range(ticks_per_decision):
+            world.update()
+        for i, character in enumerate(watched):
+            state = world.get_world_state_for(character, radius)
+            visible += len(state.visible_characters)
+            samples += 1
+            for name in FORMATS:
+                totals[name] += counter.count(encoders[name][i].encode(state))
+    world.scheduler.stop()
+
+    print(f"Token counter: {'tiktoken' if counter.exact else 'estimate'}; "
+          f"{visible / samples:.1f} characters visible per observation")
+    print(f"{'format':>8} | {'tokens':>7} | {'vs json':>7} | {'vs verbose':>10}")
+    print("-" * 42)
+    for name in FORMATS:
+        mean = totals[name] / samples
+        print(
+            f"{name:>8} | {mean:>7.1f} | {mean / (totals['json'] / samples):>7.0%} | "
+            f"{mean / (totals['verbose'] / samples):>10.0%}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entities", type=int, default=200)
+    parser.add_argument("--radius", type=float, default=200.0, help="Vision radius in pixels")
+    parser.add_argument("--steps", type=int, default=40, help="Decisions per observer")
+    parser.add_argument("--observers", type=int, default=10)
+    parser.add_argument("--interval", type=float, default=3.0, help="Seconds between decisions")
+    parser.add_argument("--round-to", type=float, default=10.0, help="Rounding step in pixels")
+    args = parser.parse_args()
+    run(args.entities, args.radius, args.steps, args.observers, args.interval, args.round_to)
+
+
+if __name__ == "__main__":
+    main()
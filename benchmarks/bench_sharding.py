@@ -0,0 +1,84 @@
+"""
+Benchmark: sharded multi-process ticks vs. the single-process batch tick.
+
+Wandering circles are scattered over a square map sized so they cover
+``--density`` of its area. The baseline runs batch movement and collision
+resolution on one EntityStore in this process; the sharded runs split the map
+into vertical strips handled by ``--shards`` worker processes. Speedup is bounded
+by the number of CPU cores.
+
+Usage:
+    python benchmarks/bench_sharding.py [--counts 10000 100000] [--shards 1 2 4]
+"""
+import argparse
+import os
+import sys
+import time
+from math import pi, sqrt
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from config import LittleWorldConfig, SimulationConfig, WindowConfig  # noqa: E402
+from world.collision import resolve_collisions  # noqa: E402
+from world.entity_store import EntityStore  # noqa: E402
+from world.movement import batch_move  # noqa: E402
+from world.sharding import ShardedWorld  # noqa: E402
+
+
+def time_ticks(ticks, step):
+    """Return the mean duration of ``ticks`` calls to ``step``, in seconds."""
+    step()  # Warm-up
+    start = time.perf_counter()
+    for _ in range(ticks):
+        step()
+    return (time.perf_counter() - start) / ticks
+
+
+def run(counts, shard_counts, radius, density, ticks, seed):
+    print(f"radius={radius:.0f}px, density={density:.0%}, {os.cpu_count()} CPU cores")
+    print(f"{'agents':>8} | {'shards':>6} | {'ms/tick':>8} | {'speedup':>7}")
+    print("-" * 40)
+    for count in counts:
+        side = int(sqrt(count * pi * radius ** 2 / density))
+        config = LittleWorldConfig(
+            window=WindowConfig(width=side, height=side),
+            simulation=SimulationConfig(seed=seed),
+        )
+        positions = np.random.default_rng(seed).uniform(radius, side - radius, (count, 2))
+        dt = config.game.timestep
+
+        store = EntityStore(side, side, capacity=count)
+        ids = store.spawn_many(positions, radius, (0, 0, 0), speed=config.character.speed, wander=True)
+        rng = np.random.default_rng(seed)
+
+        def single_tick():
+            batch_move(store, ids, dt, rng, config.simulation.random_walk_interval)
+            resolve_collisions(store, ids)
+
+        baseline = time_ticks(ticks, single_tick)
+        print(f"{count:>8} | {'-':>6} | {baseline * 1000:>8.2f} | {'1.0x':>7}")
+
+        for shards in shard_counts:
+            with ShardedWorld(config, capacity=count, num_shards=shards) as world:
+                world.spawn_entities(positions, radius, (0, 0, 0))
+                sharded = time_ticks(ticks, world.step)
+            print(f"{count:>8} | {shards:>6} | {sharded * 1000:>8.2f} | {baseline / sharded:>6.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--counts", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--shards", type=int, nargs="+", default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    parser.add_argument("--radius", type=float, default=10.0)
+    parser.add_argument("--density", type=float, default=0.3, help="Fraction of the ground covered")
+    parser.add_argument("--ticks", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    run(args.counts, args.shards, args.radius, args.density, args.ticks, args.seed)
+
+
+if __name__ == "__main__":
+    main()
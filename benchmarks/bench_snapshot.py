@@ -0,0 +1,76 @@
+"""
+Benchmark: World.snapshot / World.restore time and file size vs. entity count.
+
+Each world is headless with ``count`` wandering entities on a map sized so they
+cover ``--density`` of the ground. The restore is timed
+into a fresh World built from the same config; it includes re-creating entity
+handles and rebuilding the spatial index.
+
+Usage:
+    python benchmarks/bench_snapshot.py [--counts 1000 10000 100000]
+"""
+import argparse
+import sys
+import tempfile
+import time
+from math import pi, sqrt
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from config import LittleWorldConfig, SimulationConfig, WindowConfig  # noqa: E402
+from world import World  # noqa: E402
+from world.snapshot import load_snapshot  # noqa: E402
+
+
+def run(counts, density, repeats):
+    print(f"{'entities':>9} | {'size MB':>7} | {'snapshot ms':>11} | {'map ms':>6} | {'restore ms':>10}")
+    print("-" * 57)
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "world.lws"
+        for count in counts:
+            radius = LittleWorldConfig().character.radius
+            side = max(int(sqrt(count * pi * radius ** 2 / density)), 800)
+            config = LittleWorldConfig(
+                window=WindowConfig(width=side, height=side),
+                simulation=SimulationConfig(seed=0, entity_capacity=count + 16),
+            )
+            world = World(config, headless=True)
+            world.spawn_entities(count)
+            world.update()
+
+            snapshot, size = float("inf"), 0
+            for _ in range(repeats):
+                start = time.perf_counter()
+                size = world.snapshot(path)
+                snapshot = min(snapshot, time.perf_counter() - start)
+
+            # Mapping the file alone, without rebuilding world objects
+            start = time.perf_counter()
+            load_snapshot(path)
+            mapped = time.perf_counter() - start
+
+            restored = World(config, headless=True)
+            start = time.perf_counter()
+            restored.restore(path)
+            restore = time.perf_counter() - start
+
+            print(
+                f"{count:>9} | {size / 1e6:>7.2f} | {snapshot * 1000:>11.2f} | "
+                f"{mapped * 1000:>6.2f} | {restore * 1000:>10.2f}"
+            )
+            world.scheduler.stop()
+            restored.scheduler.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--counts", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--density", type=float, default=0.3, help="Fraction of the ground covered")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+    run(args.counts, args.density, args.repeats)
+
+
+if __name__ == "__main__":
+    main()
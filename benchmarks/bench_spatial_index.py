@@ -0,0 +1,111 @@
+"""
+Benchmark: spatial hash grid vs. linear scan for per-tick vision queries.
+
+Every character queries its vision radius once per tick, which is what
+``World.get_world_state_for`` does for every AI character. The map grows with the
+character count so the average number of visible neighbours stays constant.
+
+Usage:
+    python benchmarks/bench_spatial_index.py [--counts 10 100 1000 10000]
+"""
+import argparse
+import random
+import sys
+import time
+from math import pi, sqrt
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from config import LittleWorldConfig, WindowConfig  # noqa: E402
+from character import Character  # noqa: E402
+from world.spatial_index import SpatialHashGrid  # noqa: E402
+from world.world_state import calculate_distance  # noqa: E402
+
+
+def build_characters(count: int, vision_radius: float, neighbours: float, seed: int):
+    """Create ``count`` characters spread over a map sized for ``neighbours`` average visible."""
+    side = int(sqrt(count * pi * vision_radius ** 2 / neighbours))
+    config = LittleWorldConfig(window=WindowConfig(width=side, height=side))
+    rng = random.Random(seed)
+    characters = [
+        Character(rng.uniform(0, side), rng.uniform(0, side), (0, 0, 0), config=config)
+        for _ in range(count)
+    ]
+    return characters
+
+
+def linear_scan(characters, observer, vision_radius):
+    """Current behaviour: distance check against every character."""
+    visible = []
+    for other in characters:
+        if other is observer:
+            continue
+        if calculate_distance(observer.x, observer.y, other.x, other.y) <= vision_radius:
+            visible.append(other)
+    return visible
+
+
+def grid_scan(grid, observer, vision_radius):
+    """Spatial index: distance check against characters in nearby cells only."""
+    visible = []
+    for other in grid.candidates(observer.x, observer.y, vision_radius):
+        if other is observer:
+            continue
+        if calculate_distance(observer.x, observer.y, other.x, other.y) <= vision_radius:
+            visible.append(other)
+    return visible
+
+
+def time_per_tick(query, observers, total):
+    """Time ``query`` over ``observers`` and extrapolate to ``total`` observers."""
+    start = time.perf_counter()
+    for observer in observers:
+        query(observer)
+    elapsed = time.perf_counter() - start
+    return elapsed / len(observers) * total
+
+
+def run(counts, vision_radius, neighbours, max_observers, seed):
+    print(f"vision_radius={vision_radius:.0f}px, ~{neighbours:.0f} visible neighbours per character")
+    print(f"{'characters':>10} | {'linear ms/tick':>14} | {'grid ms/tick':>12} | {'grid move ms':>12} | {'speedup':>7}")
+    print("-" * 68)
+    for count in counts:
+        characters = build_characters(count, vision_radius, neighbours, seed)
+        grid = SpatialHashGrid(cell_size=vision_radius)
+        for character in characters:
+            grid.insert(character)
+            character.spatial_index = grid
+
+        # Sample observers for the O(N^2) linear scan so large counts finish quickly
+        rng = random.Random(seed)
+        observers = characters if count <= max_observers else rng.sample(characters, max_observers)
+
+        linear = time_per_tick(lambda o: linear_scan(characters, o, vision_radius), observers, count)
+        indexed = time_per_tick(lambda o: grid_scan(grid, o, vision_radius), observers, count)
+
+        # Incremental index maintenance: every character takes one step
+        start = time.perf_counter()
+        for character in characters:
+            character.move(rng.choice((-5, 0, 5)), rng.choice((-5, 0, 5)))
+        move_cost = time.perf_counter() - start
+
+        print(
+            f"{count:>10} | {linear * 1000:>14.2f} | {indexed * 1000:>12.2f} | "
+            f"{move_cost * 1000:>12.2f} | {linear / indexed:>6.1f}x"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--counts", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--vision-radius", type=float, default=200.0)
+    parser.add_argument("--neighbours", type=float, default=10.0, help="Average visible characters")
+    parser.add_argument("--max-observers", type=int, default=200, help="Observers sampled per count")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    run(args.counts, args.vision_radius, args.neighbours, args.max_observers, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,7 @@ from optparse import Option
 from token import OP
 import pygame
 import random
-from typing import Optional, TYPE_CHECKING
+from typing import Iterable, Optional, TYPE_CHECKING
 from config import LittleWorldConfig, CharacterConfig, ColorsConfig, WindowConfig
 from decisions import Decision, ActionType
 
@@ -13,6 +13,8 @@ if TYPE_CHECKING:
 # Forward reference to avoid circular import
 if TYPE_CHECKING:
     from world import World
+    from world.spatial_index import SpatialHashGrid
+    from world.entity_store import EntityStore
 
 
 class Character:
@@ -37,8 +39,13 @@ class Character:
             character_config: Character-specific config. If None, uses config.character
             window_config: Window config. If None, uses config.window
         """
+        # Position lives in an EntityStore once the character joins a World
+        self._store: Optional["EntityStore"] = None
+        self._entity_id = -1
         self.x = x
         self.y = y
+        self._dx = 0.0  # Velocity (pixels per second) while not attached
+        self._dy = 0.0
         self.color = color
         self.config = config
         
@@ -48,9 +55,109 @@ class Character:
         
         self.radius = self.character_config.radius
         self.speed = self.character_config.speed
+        
+        # Spatial index the character is registered in (set by World)
+        self.spatial_index: Optional["SpatialHashGrid"] = None
+
+    @property
+    def x(self) -> float:
+        if self._store is not None:
+            return float(self._store.pos[self._entity_id, 0])
+        return self._x
+
+    @x.setter
+    def x(self, value: float):
+        if self._store is not None:
+            self._store.pos[self._entity_id, 0] = value
+        else:
+            self._x = value
+
+    @property
+    def y(self) -> float:
+        if self._store is not None:
+            return float(self._store.pos[self._entity_id, 1])
+        return self._y
+
+    @y.setter
+    def y(self, value: float):
+        if self._store is not None:
+            self._store.pos[self._entity_id, 1] = value
+        else:
+            self._y = value
+
+    @property
+    def entity_id(self) -> Optional[int]:
+        """Id in the attached EntityStore, or None if not attached."""
+        return self._entity_id if self._store is not None else None
+
+    def attach_to_store(self, store: "EntityStore") -> int:
+        """
+        Move this character's state into an entity store.
+        
+        Args:
+            store: Store to spawn the character's entity in
+            
+        Returns:
+            Entity id
+        """
+        if self._store is not None:
+            self.detach_from_store()
+        self._entity_id = store.spawn(
+            self.x, self.y, self.radius, self.color,
+            vision_radius=getattr(self, 'vision_radius', 0.0),
+            speed=self.speed,
+        )
+        self._store = store
+        store.vel[self._entity_id] = (self._dx, self._dy)
+        return self._entity_id
+
+    def bind_entity(self, store: "EntityStore", entity_id: int) -> None:
+        """
+        Use an existing entity (e.g. restored from a snapshot) as this character's state.
+        
+        Args:
+            store: Store holding the entity
+            entity_id: Entity id in the store
+        """
+        self._store = store
+        self._entity_id = entity_id
+
+    def export_state(self) -> dict:
+        """
+        State kept outside the entity store, as JSON-serializable data (for snapshots).
+        
+        Returns:
+            Dict accepted by import_state()
+        """
+        return {}
+
+    def import_state(self, state: dict) -> None:
+        """
+        Restore state produced by export_state().
+        
+        Args:
+            state: Saved state
+        """
+        pass
+
+    def detach_from_store(self):
+        """Copy state back onto the character and free its entity."""
+        if self._store is None:
+            return
+        self._x, self._y = self._store.pos[self._entity_id].tolist()
+        self._dx, self._dy = self._store.vel[self._entity_id].tolist()
+        self._store.despawn(self._entity_id)
+        self._store = None
+        self._entity_id = -1
 
     def move(self, dx, dy):
         """Move the character by dx, dy, keeping within screen bounds"""
+        if self._store is not None:
+            self._store.move(self._entity_id, dx, dy)
+            if self.spatial_index is not None:
+                self.spatial_index.update(self)
+            return
+        
         new_x = self.x + dx
         new_y = self.y + dy
         
@@ -60,15 +167,33 @@ class Character:
         
         self.x = new_x
         self.y = new_y
+        
+        if self.spatial_index is not None:
+            self.spatial_index.update(self)
 
-    def update(self):
-        """Update character state - override in subclasses"""
+    def update(self, dt: float):
+        """
+        Update character state - override in subclasses.
+        
+        Args:
+            dt: Simulated seconds since the last update (fixed timestep)
+        """
         pass
 
     def render(self, screen):
         """Render the character as a circle"""
         pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.radius)
 
+    def get_rect(self) -> pygame.Rect:
+        """
+        Get the screen area covered by render().
+        
+        Returns:
+            Bounding rectangle of the character (with a 1px margin)
+        """
+        size = 2 * self.radius + 2
+        return pygame.Rect(int(self.x) - self.radius - 1, int(self.y) - self.radius - 1, size, size)
+
 
 class PlayerCharacter(Character):
     """Player-controlled character"""
@@ -92,19 +217,33 @@ class PlayerCharacter(Character):
         super().__init__(x, y, color, config=config)
         self.name = "Player"  # Default name, can be set from config later
 
-    def handle_input(self, keys):
+    def handle_input(self, keys, dt: float):
         """Handle keyboard input for movement"""
-        dx = 0
-        dy = 0
+        direction_x = 0
+        direction_y = 0
         
         if keys[pygame.K_UP] or keys[pygame.K_w]:
-            dy -= self.speed
+            direction_y -= 1
         if keys[pygame.K_DOWN] or keys[pygame.K_s]:
-            dy += self.speed
+            direction_y += 1
         if keys[pygame.K_LEFT] or keys[pygame.K_a]:
-            dx -= self.speed
+            direction_x -= 1
         if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
-            dx += self.speed
+            direction_x += 1
+        
+        self.apply_input(direction_x, direction_y, dt)
+    
+    def apply_input(self, direction_x: int, direction_y: int, dt: float):
+        """
+        Move for one timestep in a direction (from keyboard or a scripted input source).
+        
+        Args:
+            direction_x: -1 (west), 0 or 1 (east)
+            direction_y: -1 (north), 0 or 1 (south)
+            dt: Simulated seconds to move for
+        """
+        dx = direction_x * self.speed * dt
+        dy = direction_y * self.speed * dt
         
         if dx != 0 or dy != 0:
             self.move(dx, dy)
@@ -123,6 +262,8 @@ class AICharacter(Character):
         world: Optional["World"] = None,
         model: Optional["BaseAIModelEngine"] = None,
         personality: Optional[str] = None,
+        decision_interval: Optional[float] = None,
+        decision_triggers: Optional[Iterable[str]] = None,
     ):
         """
         Initialize AI character.
@@ -137,6 +278,10 @@ class AICharacter(Character):
             world: Optional reference to World (for initiative observation mode)
             model: Optional LLM model engine (BaseAIModelEngine) for AI decision making
             personality: Optional personality text for the character
+            decision_interval: Seconds between LLM decisions (minimum spacing in
+                               event-driven mode). If None, uses default 3.0
+            decision_triggers: World event types (world.events.EventType values) that
+                               make the character decide. If None, all event types.
         """
         color = color or config.colors.ai_character
         super().__init__(x, y, color, config=config, character_config=character_config)
@@ -145,29 +290,95 @@ class AICharacter(Character):
         self.model = model  # LLM model for decision making
         self.personality = personality  # Character personality text
         self.name = "AI Character"  # Default name, can be set from config later
-        self.direction_change_timer = 0
-        self.current_dx = 0
-        self.current_dy = 0
+        self.decision_interval = decision_interval or 3.0
+        self.decision_triggers = frozenset(decision_triggers) if decision_triggers is not None else None
+        # Random-walk fallback (characters without a model)
+        self.rng = random.Random()  # Seeded by World for reproducible runs
+        self.direction_change_interval = 1.0  # Seconds between random direction changes
+        self.direction_change_timer = 0.0
+        # Current velocity in pixels per second
+        self.current_dx = 0.0
+        self.current_dy = 0.0
+
+    @property
+    def current_dx(self) -> float:
+        """Current x velocity in pixels per second (stored in the EntityStore when attached)."""
+        if self._store is not None:
+            return float(self._store.vel[self._entity_id, 0])
+        return self._dx
+
+    @current_dx.setter
+    def current_dx(self, value: float):
+        if self._store is not None:
+            self._store.vel[self._entity_id, 0] = value
+        else:
+            self._dx = value
+
+    @property
+    def current_dy(self) -> float:
+        """Current y velocity in pixels per second (stored in the EntityStore when attached)."""
+        if self._store is not None:
+            return float(self._store.vel[self._entity_id, 1])
+        return self._dy
+
+    @current_dy.setter
+    def current_dy(self, value: float):
+        if self._store is not None:
+            self._store.vel[self._entity_id, 1] = value
+        else:
+            self._dy = value
+
+    def export_state(self) -> dict:
+        """Random-walk RNG, timer and memories (position and velocity live in the entity store)."""
+        version, internal, gauss_next = self.rng.getstate()
+        state = {
+            "rng": [version, list(internal), gauss_next],
+            "direction_change_timer": self.direction_change_timer,
+        }
+        memory = getattr(self.model, "memory", None)
+        if memory is not None:
+            state["memory"] = memory.export_state()
+        episodic_memory = getattr(self.model, "episodic_memory", None)
+        if episodic_memory is not None:
+            state["episodic_memory"] = episodic_memory.export_state()
+        return state
+
+    def import_state(self, state: dict) -> None:
+        """Restore state produced by export_state()."""
+        version, internal, gauss_next = state["rng"]
+        self.rng.setstate((version, tuple(internal), gauss_next))
+        self.direction_change_timer = state["direction_change_timer"]
+        memory = getattr(self.model, "memory", None)
+        if memory is not None and "memory" in state:
+            memory.import_state(state["memory"])
+        episodic_memory = getattr(self.model, "episodic_memory", None)
+        if episodic_memory is not None and "episodic_memory" in state:
+            episodic_memory.import_state(state["episodic_memory"])
 
-    def update(self, world_state: Optional["WorldState"] = None):
+    def update(self, dt: float, world_state: Optional["WorldState"] = None):
         """
         Update AI character.
         
+        Characters with a model move according to their latest Decision (decisions are
+        made asynchronously by the world's DecisionScheduler). Characters without a
+        model fall back to random movement.
+        
         Args:
-            world_state: Optional world state observation (passive mode).
-                        If None and world reference exists, will query world (initiative mode).
-        """
-        # For now, keep random movement as fallback
-        # Later, this will use make_decision() with world_state
-        if world_state is None:
-            # Initiative mode: query world if available
-            if self.world is not None:
-                world_state = self.get_observation()
+            dt: Simulated seconds since the last update (fixed timestep)
+            world_state: Optional world state observation (unused; observations for
+                        decisions are taken by the DecisionScheduler)
+        """
+        if self.model is None:
+            self._update_random_direction(dt)
         
-        # TODO: Use world_state with make_decision() when LLM is integrated
-        # For now, continue with random movement
-        self.direction_change_timer += 1
-        if self.direction_change_timer >= 60:
+        # Move in current direction
+        if self.current_dx != 0 or self.current_dy != 0:
+            self.move(self.current_dx * dt, self.current_dy * dt)
+    
+    def _update_random_direction(self, dt: float):
+        """Pick a new random direction every direction_change_interval seconds."""
+        self.direction_change_timer += dt
+        if self.direction_change_timer >= self.direction_change_interval:
             # Randomly choose a direction
             directions = [
                 (0, -self.speed),   # Up
@@ -176,12 +387,8 @@ class AICharacter(Character):
                 (self.speed, 0),    # Right
                 (0, 0)              # Stay
             ]
-            self.current_dx, self.current_dy = random.choice(directions)
-            self.direction_change_timer = 0
-        
-        # Move in current direction
-        if self.current_dx != 0 or self.current_dy != 0:
-            self.move(self.current_dx, self.current_dy)
+            self.current_dx, self.current_dy = self.rng.choice(directions)
+            self.direction_change_timer -= self.direction_change_interval
     
     def get_observation(self) -> Optional["WorldState"]:
         """
@@ -206,36 +413,80 @@ class AICharacter(Character):
         """
         return world_state.to_structured_dict()
 
-    def make_decision(self, world_state, personality):
+    async def make_decision(self, world_state, personality=None, received=None) -> Optional[Decision]:
         """
-        Make a decision based on world state and personality, then execute the appropriate action.
+        Make a decision based on world state and personality.
         
-        This method will be called periodically (e.g., every 3 seconds) to determine what
-        the AI character should do next. The decision can be to observe, communicate, or interact.
+        Called by the world's DecisionScheduler on a background event loop when one of
+        the character's decision_triggers events happens (or every
+        ``decision_interval`` seconds in polling mode); the returned Decision is
+        applied on the game loop thread with apply_decision().
         
         Args:
             world_state: Current state of the world (visible characters, objects, etc.)
-            personality: Character's personality traits and preferences
+            personality: Character's personality traits and preferences. The model's
+                        system prompt already carries the personality, so this is
+                        only used when it differs from the character's own.
+            received: Messages heard since the last decision (e.g. 'Ann said: "Hi"'),
+                      added to the prompt's input messages
             
         Returns:
-            Decision: Pydantic model containing the action type and parameters
+            Decision: Pydantic model containing the action type and parameters,
+            or None if the character has no model
             
         Example:
-            decision = self.make_decision(world_state, personality)
-            if decision.type == ActionType.OBSERVE:
-                observation = self.observe(decision.radius)
-            elif decision.type == ActionType.COMMUNICATE:
-                self.communication(decision.target, decision.message)
-            elif decision.type == ActionType.INTERACT:
-                self.interact(decision.target)
-            elif decision.type == ActionType.MOVE:
-                self.move(decision.dx, decision.dy)
-        """
-        # TODO: Implement AI decision-making
-        # 1. Use ai_agent to call LLM with world_state and personality
-        # 2. Use LLM.with_structured_output(Decision) to get structured Decision object
-        # 3. Return the Decision object
-        pass
+            decision = await self.make_decision(world_state, personality)
+            self.apply_decision(decision)
+        """
+        if self.model is None:
+            return None
+        
+        lines = []
+        if personality and personality != self.personality:
+            lines.append(f"Personality: {personality}")
+        lines.extend(received or ())
+        messages = {
+            "world_state": self.model.render_world_state(world_state),
+            "input_messages": "\n".join(lines),
+        }
+        decision = await self.model.structured_answering(messages, Decision)
+        memory = getattr(self.model, "memory", None)
+        episodic_memory = getattr(self.model, "episodic_memory", None)
+        if decision is not None and (memory is not None or episodic_memory is not None):
+            now = self.world.sim_clock.sim_time if self.world is not None else None
+            if memory is not None:
+                memory.add_turn(messages["world_state"], decision.describe(), now)
+            if episodic_memory is not None:
+                episodic_memory.add(f"{messages['world_state']} -> {decision.describe()}", now)
+        return decision
+
+    def apply_decision(self, decision: Decision):
+        """
+        Execute a Decision on the game loop thread.
+        
+        Args:
+            decision: Decision returned by make_decision()
+        """
+        if decision.type == ActionType.MOVE:
+            # Decisions give a direction; walk that way at the character's speed
+            dx, dy = decision.dx or 0, decision.dy or 0
+            length = (dx * dx + dy * dy) ** 0.5
+            if length > 0:
+                self.current_dx = dx / length * self.speed
+                self.current_dy = dy / length * self.speed
+            else:
+                self.current_dx, self.current_dy = 0.0, 0.0
+        elif decision.type == ActionType.STAY:
+            self.current_dx, self.current_dy = 0.0, 0.0
+        elif decision.type == ActionType.COMMUNICATE:
+            self.current_dx, self.current_dy = 0.0, 0.0
+            if decision.message and self.world is not None:
+                self.world.show_dialogue(self, decision.message)
+                self.world.deliver_message(self, decision.message, decision.target)
+        elif decision.type == ActionType.OBSERVE:
+            self.observe(decision.radius or self.vision_radius)
+        elif decision.type == ActionType.INTERACT:
+            self.interact()
 
     def observe(self, radius):
         """
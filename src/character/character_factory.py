@@ -55,6 +55,7 @@ class CharacterFactory:
         world: Optional["World"] = None,
         model = None,
         personality: str = None,
+        decision_interval: Optional[float] = None,
     ) -> AICharacter:
         """
         Create an AI character.
@@ -66,6 +67,7 @@ class CharacterFactory:
             character_config: Character-specific config. If None, uses config default.
             vision_radius: Vision radius in pixels. If None, uses default 200.0
             world: Optional reference to World (for initiative observation mode)
+            decision_interval: Seconds between LLM decisions. If None, uses default 3.0
             
         Returns:
             AICharacter instance
@@ -80,5 +82,6 @@ class CharacterFactory:
             world=world,
             model=model,
             personality=personality,
+            decision_interval=decision_interval,
         )
 
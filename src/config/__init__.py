@@ -9,10 +9,17 @@ from .models.little_world_config import (
     ColorsConfig,
     CharacterConfig,
     GameConfig,
+    SimulationConfig,
+    ActionLogConfig,
+    LLMProviderConfig,
 )
 from .models.character_config import (
     LLMConfig,
     CharacterInstanceConfig,
+    ResponseCacheConfig,
+    MemoryConfig,
+    EpisodicMemoryConfig,
+    MockLLMConfig,
 )
 from .utils import load_config
 
@@ -22,7 +29,14 @@ __all__ = [
     "ColorsConfig",
     "CharacterConfig",
     "GameConfig",
+    "SimulationConfig",
+    "ActionLogConfig",
+    "LLMProviderConfig",
     "LLMConfig",
     "CharacterInstanceConfig",
+    "ResponseCacheConfig",
+    "MemoryConfig",
+    "EpisodicMemoryConfig",
+    "MockLLMConfig",
     "load_config",
 ]
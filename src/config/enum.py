@@ -5,4 +5,5 @@ class Provider(StrEnum):
     OPENAI = auto()
     GOOGLE = auto()
     VLLM = auto()
+    MOCK = auto()
             
\ No newline at end of file
@@ -7,10 +7,17 @@ from .little_world_config import (
     ColorsConfig,
     CharacterConfig,
     GameConfig,
+    SimulationConfig,
+    ActionLogConfig,
+    LLMProviderConfig,
 )
 from .character_config import (
     LLMConfig,
     CharacterInstanceConfig,
+    ResponseCacheConfig,
+    MemoryConfig,
+    EpisodicMemoryConfig,
+    MockLLMConfig,
 )
 
 __all__ = [
@@ -19,7 +26,14 @@ __all__ = [
     "ColorsConfig",
     "CharacterConfig",
     "GameConfig",
+    "SimulationConfig",
+    "ActionLogConfig",
+    "LLMProviderConfig",
     "LLMConfig",
     "CharacterInstanceConfig",
+    "ResponseCacheConfig",
+    "MemoryConfig",
+    "EpisodicMemoryConfig",
+    "MockLLMConfig",
 ]
 
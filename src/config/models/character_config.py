@@ -2,14 +2,94 @@
 Character-specific configuration models.
 """
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Literal, Optional
+
+
+class ResponseCacheConfig(BaseModel):
+    """Prompt-response cache settings for an AI character's model."""
+    enabled: bool = Field(default=True, description="Enable the response cache")
+    backend: Literal["memory", "sqlite"] = Field(default="memory", description="Cache backend")
+    max_entries: int = Field(default=1024, gt=0, description="Entries kept before eviction")
+    ttl_seconds: Optional[float] = Field(default=300.0, gt=0, description="Entry lifetime in seconds (None = no expiry)")
+    sqlite_path: str = Field(default=".cache/llm_responses.sqlite", description="Database file for the sqlite backend")
+    quantization_step: float = Field(
+        default=0.0,
+        ge=0,
+        description="Round observed positions/distances to this many pixels so near-identical scenes share a cache entry (0 = off)"
+    )
+
+
+class MemoryConfig(BaseModel):
+    """Conversation memory settings for an AI character's model."""
+    enabled: bool = Field(default=True, description="Enable conversation memory")
+    max_turns: int = Field(default=8, gt=0, description="Recent turns kept verbatim in the ring buffer")
+    turn_tokens: int = Field(default=128, gt=0, description="Max tokens stored per turn (longer turns are truncated)")
+    summarize_every: int = Field(default=4, gt=0, description="Turns pushed out of the ring buffer before they are summarized")
+    summary_tokens: int = Field(default=256, gt=0, description="Max tokens in the running summary of older turns")
+    prompt_token_budget: int = Field(default=2048, gt=0, description="Max tokens in a whole prompt; memory fills what the rest leaves")
+    encoding: Optional[str] = Field(
+        default="cl100k_base",
+        description="tiktoken encoding for counting tokens (None, or tiktoken unavailable = estimate 4 characters per token)"
+    )
+
+
+class EpisodicMemoryConfig(BaseModel):
+    """Long-term episodic memory settings for an AI character's model."""
+    enabled: bool = Field(default=True, description="Enable episodic memory")
+    dim: int = Field(default=128, gt=0, description="Embedding dimensions")
+    top_k: int = Field(default=5, gt=0, description="Episodes recalled per prompt")
+    max_tokens: int = Field(default=256, gt=0, description="Max tokens of recalled episodes per prompt")
+    ivf_threshold: int = Field(default=8192, gt=0, description="Episodes before switching from brute-force search to an IVF index")
+    ivf_lists: int = Field(default=256, gt=0, description="IVF clusters")
+    ivf_probe: int = Field(default=8, gt=0, description="IVF clusters scanned per search")
+
+
+class MockLLMConfig(BaseModel):
+    """Behaviour of the offline mock provider (LLMConfig.type == "mock")."""
+    latency: Literal["fixed", "uniform", "normal", "lognormal", "exponential"] = Field(
+        default="lognormal",
+        description="Distribution of the time to the first token"
+    )
+    latency_ms: float = Field(default=300.0, ge=0, description="Mean time to the first token in milliseconds")
+    latency_spread_ms: float = Field(
+        default=100.0,
+        ge=0,
+        description="Standard deviation (normal, lognormal) or half-width (uniform) of the latency in milliseconds"
+    )
+    per_token_ms: float = Field(default=0.0, ge=0, description="Extra milliseconds per generated token")
+    output_tokens: int = Field(default=32, gt=0, description="Mean tokens generated per reply")
+    output_tokens_spread: int = Field(default=0, ge=0, description="Generated tokens vary uniformly by up to this much")
+    error_rate: float = Field(default=0.0, ge=0, le=1, description="Fraction of requests that fail with MockLLMError")
+    seed: int = Field(default=0, description="Seed for latencies, errors and replies")
 
 
 class LLMConfig(BaseModel):
     """LLM configuration for AI characters."""
-    type: str = Field(description="LLM provider type (e.g., 'openai', 'gemini', 'vllm')")
+    type: str = Field(description="LLM provider type (e.g., 'openai', 'gemini', 'vllm', 'mock')")
     version: str = Field(description="Model version (e.g., 'gpt-4o', 'gpt-3.5-turbo')")
     api_key: str = Field(description="API key (environment variables expanded via os.path.expandvars)")
+    base_url: Optional[str] = Field(default=None, description="API base URL (None = provider default)")
+    # Connection pool shared by every character using the same provider/base_url
+    max_connections: int = Field(default=100, gt=0, description="Max open HTTP connections in the shared pool")
+    max_keepalive_connections: int = Field(default=20, ge=0, description="Max idle keep-alive connections in the shared pool")
+    keepalive_expiry: float = Field(default=30.0, ge=0, description="Seconds an idle connection is kept alive")
+    # Sampling settings (used by vLLM)
+    max_tokens: Optional[int] = Field(default=None, gt=0, description="Max tokens to generate")
+    temperature: float = Field(default=0.7, ge=0, description="Sampling temperature")
+    top_p: float = Field(default=0.8, gt=0, le=1, description="Nucleus sampling probability")
+    top_k: int = Field(default=20, description="Top-k sampling (-1 disables)")
+    enable_thinking: bool = Field(default=False, description="Enable reasoning mode in the chat template")
+    # Concurrency and rate limits are per provider, in LittleWorldConfig.llm_providers
+    coalesce_requests: bool = Field(default=True, description="Share one call between identical concurrent requests")
+    observation_format: str = Field(
+        default="verbose",
+        description="Observation encoder for prompts ('verbose', 'json', 'table', 'delta' or a registered one; 'delta' needs memory)"
+    )
+    observation_round_to: float = Field(default=10.0, ge=0, description="Rounding step in pixels for compact observation formats")
+    cache: Optional[ResponseCacheConfig] = Field(default=None, description="Prompt-response cache (None = disabled)")
+    memory: Optional[MemoryConfig] = Field(default=None, description="Conversation memory (None = disabled)")
+    episodic_memory: Optional[EpisodicMemoryConfig] = Field(default=None, description="Long-term episodic memory (None = disabled)")
+    mock: Optional[MockLLMConfig] = Field(default=None, description="Mock provider behaviour when type is 'mock' (None = defaults)")
 
 
 class CharacterInstanceConfig(BaseModel):
@@ -17,6 +97,7 @@ class CharacterInstanceConfig(BaseModel):
     name: str = Field(description="Character name/identifier")
     llm: Optional[LLMConfig] = Field(default=None, description="LLM configuration (for AI characters)")
     vision_radius: Optional[float] = Field(default=200.0, description="Vision radius in pixels (for AI characters)")
+    decision_interval: float = Field(default=3.0, gt=0, description="Seconds between LLM decisions (for AI characters)")
     # Add other character-specific settings here as needed
-    # e.g., personality_file, decision_interval, etc.
+    # e.g., personality_file, etc.
 
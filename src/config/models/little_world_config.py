@@ -2,7 +2,7 @@
 Configuration models using Pydantic for type safety and validation.
 """
 from pydantic import BaseModel, Field
-from typing import Tuple, Optional
+from typing import Literal, Tuple, Optional
 
 
 class WindowConfig(BaseModel):
@@ -38,12 +38,91 @@ class ColorsConfig(BaseModel):
 class CharacterConfig(BaseModel):
     """Character settings."""
     radius: int = Field(default=20, description="Character radius in pixels")
-    speed: int = Field(default=5, description="Character movement speed (pixels per frame)")
+    speed: float = Field(default=300.0, description="Character movement speed (pixels per second)")
 
 
 class GameConfig(BaseModel):
     """Game loop settings."""
     fps: int = Field(default=60, description="Frames per second")
+    timestep: float = Field(default=1.0 / 60.0, gt=0, description="Fixed simulation timestep in seconds")
+    time_scale: float = Field(default=1.0, ge=0.5, le=100.0, description="Simulated seconds per real second")
+    max_frame_time: float = Field(
+        default=0.25,
+        gt=0,
+        description="Longest real frame time simulated in one frame (limits catch-up after stalls)"
+    )
+
+
+class SimulationConfig(BaseModel):
+    """Simulation engine settings."""
+    spatial_cell_size: int = Field(
+        default=200,
+        gt=0,
+        description="Spatial index cell size in pixels (close to the typical vision radius)"
+    )
+    seed: Optional[int] = Field(default=None, description="Random seed for reproducible runs (None = random)")
+    entity_capacity: int = Field(
+        default=1024,
+        gt=0,
+        description="Initial slots in the entity store (grows by doubling as needed)",
+    )
+    batch_movement_threshold: int = Field(
+        default=32,
+        ge=0,
+        description="Move AI characters with one vectorized pass per tick once there are at least this many",
+    )
+    random_walk_interval: float = Field(
+        default=1.0,
+        gt=0,
+        description="Seconds between random-walk direction changes in batch movement",
+    )
+    collisions: bool = Field(default=True, description="Keep characters from overlapping")
+    collision_iterations: int = Field(
+        default=1,
+        ge=1,
+        description="Collision detect/resolve passes per tick (more settle dense crowds faster)",
+    )
+    observation_move_threshold: float = Field(
+        default=10.0,
+        ge=0,
+        description="Pixels a character must move before an observer's view counts as changed",
+    )
+    skip_unchanged_observations: bool = Field(
+        default=True,
+        description="Skip an AI character's LLM decision when nothing in its view changed",
+    )
+    event_driven_decisions: bool = Field(
+        default=True,
+        description="AI characters decide on world events (or after max_idle_time) instead of every decision_interval",
+    )
+    max_idle_time: float = Field(
+        default=30.0,
+        gt=0,
+        description="Event-driven mode: seconds without a decision after which a character decides anyway",
+    )
+    shards: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="ShardedWorld worker processes, one vertical map strip each (None = one per CPU core)",
+    )
+
+
+class ActionLogConfig(BaseModel):
+    """Append-only log of decisions, observations and LLM latencies."""
+    enabled: bool = Field(default=False, description="Record decisions, observations and LLM call latencies")
+    backend: Literal["sqlite", "jsonl"] = Field(default="sqlite", description="SQLite database (WAL) or segmented JSONL files")
+    path: str = Field(default=".logs/actions.sqlite", description="Database file (sqlite) or directory of segments (jsonl)")
+    batch_size: int = Field(default=512, gt=0, description="Records written per batch by the background writer")
+    flush_interval: float = Field(default=0.5, gt=0, description="Seconds before a partial batch is written")
+    max_queue: int = Field(default=100_000, gt=0, description="Records waiting to be written before new ones are dropped")
+    segment_records: int = Field(default=100_000, gt=0, description="Records per JSONL segment file")
+
+
+class LLMProviderConfig(BaseModel):
+    """Dispatcher limits for one LLM provider, shared by every character that uses it."""
+    max_concurrency: Optional[int] = Field(default=None, gt=0, description="Max concurrent requests (None = provider default)")
+    requests_per_second: Optional[float] = Field(default=None, gt=0, description="Request rate limit (None = provider default)")
+    burst: Optional[float] = Field(default=None, gt=0, description="Requests allowed at once above the rate (None = max(1, rate))")
 
 
 class LittleWorldConfig(BaseModel):
@@ -52,5 +131,11 @@ class LittleWorldConfig(BaseModel):
     colors: ColorsConfig = Field(default_factory=ColorsConfig, description="Color settings")
     character: CharacterConfig = Field(default_factory=CharacterConfig, description="Character settings")
     game: GameConfig = Field(default_factory=GameConfig, description="Game loop settings")
+    simulation: SimulationConfig = Field(default_factory=SimulationConfig, description="Simulation engine settings")
+    action_log: ActionLogConfig = Field(default_factory=ActionLogConfig, description="Action/decision log settings")
+    llm_providers: dict[str, LLMProviderConfig] = Field(
+        default_factory=dict,
+        description="Dispatcher limits per LLM provider name (e.g. 'openai', 'vllm'); unlisted providers keep their defaults"
+    )
     characters: Optional[dict[str, dict]] = Field(default=None, description="Character instance configurations")
 
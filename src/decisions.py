@@ -23,3 +23,22 @@ class Decision(BaseModel):
     message: Optional[str] = None  # For communicate action
     interaction_type: Optional[str] = None  # For interact action (what kind of interaction)
 
+    def describe(self) -> str:
+        """
+        Format the decision as a short line of text (e.g. for conversation memory).
+
+        Returns:
+            Text like "move (1, 0)" or 'communicate to Ann: "Hello"'
+        """
+        text = self.type.value
+        if self.type == ActionType.MOVE:
+            text += f" ({self.dx or 0}, {self.dy or 0})"
+        elif self.type == ActionType.OBSERVE and self.radius is not None:
+            text += f" within {self.radius:.0f} pixels"
+        if self.target:
+            text += f" to {self.target}" if self.type == ActionType.COMMUNICATE else f" with {self.target}"
+        if self.interaction_type:
+            text += f" ({self.interaction_type})"
+        if self.message:
+            text += f': "{self.message}"'
+        return text
@@ -1,4 +1,4 @@
-from typing import Any, Protocol, Dict, List, runtime_checkable, Self, Type
+from typing import Any, AsyncIterator, Protocol, Dict, List, runtime_checkable, Self, Type
 from pydantic import BaseModel
 from langchain_core.prompt_values import PromptValue
 
@@ -14,6 +14,10 @@ class LLMBase(Protocol):
     async def ainvoke(self, messages: PromptValue) -> Any:
         ...
 
+    def astream(self, messages: PromptValue) -> AsyncIterator[str]:
+        """Yield the reply's text incrementally as the model generates it."""
+        ...
+
     def with_structured_output(self, schema: Type[BaseModel]) -> Self:
         ...
 
@@ -0,0 +1,351 @@
+"""
+Shared LLM request dispatcher.
+
+Every LLM call from every character goes through one process-wide dispatcher, which
+applies per-provider limits before a request reaches the network:
+
+- a concurrency semaphore (max requests in flight),
+- a token-bucket rate limiter (requests per second with bursts),
+- coalescing of identical in-flight requests into a single call.
+
+There is no client-side batching: vLLM's continuous batching already groups the
+requests that are in flight at the same time on the server, so holding requests
+back to release them together would only add latency. Letting enough of them
+through at once (max_concurrency) is what keeps its batches full.
+
+Limits are set once per provider (LittleWorldConfig.llm_providers, applied with
+configure_providers()), not per character.
+"""
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Hashable, Mapping, Optional
+from pydantic import BaseModel, Field
+
+
+class ProviderLimits(BaseModel):
+    """Dispatch limits for one provider."""
+    max_concurrency: Optional[int] = Field(default=None, gt=0, description="Max requests in flight (None = unlimited)")
+    requests_per_second: Optional[float] = Field(default=None, gt=0, description="Token bucket refill rate (None = unlimited)")
+    burst: Optional[float] = Field(default=None, gt=0, description="Token bucket capacity. If None, uses max(1, requests_per_second)")
+
+
+DEFAULT_PROVIDER_LIMITS: dict[str, ProviderLimits] = {
+    "openai": ProviderLimits(max_concurrency=8, requests_per_second=8.0),
+    "vllm": ProviderLimits(max_concurrency=64),
+}
+
+
+class ProviderStats(BaseModel):
+    """Snapshot of dispatcher metrics for one provider."""
+    provider: str
+    queue_depth: int = Field(description="Requests waiting for a rate-limit token or concurrency slot")
+    in_flight: int = Field(description="Requests currently running")
+    submitted: int = Field(description="Requests submitted (including coalesced ones)")
+    completed: int = Field(description="Requests that finished successfully")
+    failed: int = Field(description="Requests that raised")
+    coalesced: int = Field(description="Requests served by an identical in-flight request")
+    mean_wait_seconds: float = Field(description="Average time from submit to start of the call")
+    max_wait_seconds: float = Field(description="Longest time from submit to start of the call")
+
+
+class TokenBucket:
+    """Asyncio token-bucket rate limiter."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Initialize token bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum stored tokens (burst size). If None, uses max(1, rate)
+        """
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        """Wait until ``tokens`` are available, then take them (FIFO among waiters)."""
+        async with self._lock:
+            self._refill()
+            while self._tokens < tokens:
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= tokens
+
+
+class _ProviderLane:
+    """Asyncio primitives and counters for one provider on one event loop."""
+
+    def __init__(self, provider: str, limits: ProviderLimits, loop: asyncio.AbstractEventLoop):
+        self.provider = provider
+        self.loop = loop
+        self.limits = limits
+        self.bucket: Optional[TokenBucket] = None
+        self.inflight_keys: dict[Hashable, asyncio.Future] = {}
+        # Concurrency slots: a counter and FIFO waiters instead of a Semaphore, so
+        # the limit can change while requests hold slots
+        self._slots_held = 0
+        self._slot_waiters: deque[asyncio.Future] = deque()
+        self.set_limits(limits)
+
+        self.queue_depth = 0
+        self.in_flight = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.coalesced = 0
+        self.started = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def set_limits(self, limits: ProviderLimits) -> None:
+        """
+        Apply new limits in place.
+
+        Running requests keep their slots; a lower max_concurrency takes effect as
+        they finish, a higher one admits waiting requests at once.
+        """
+        self.limits = limits
+        if limits.requests_per_second is None:
+            self.bucket = None
+        elif self.bucket is None:
+            self.bucket = TokenBucket(limits.requests_per_second, limits.burst)
+        else:
+            self.bucket.rate = limits.requests_per_second
+            self.bucket.capacity = limits.burst or max(1.0, limits.requests_per_second)
+        self._grant_slots()
+
+    def stats(self) -> ProviderStats:
+        return ProviderStats(
+            provider=self.provider,
+            queue_depth=self.queue_depth,
+            in_flight=self.in_flight,
+            submitted=self.submitted,
+            completed=self.completed,
+            failed=self.failed,
+            coalesced=self.coalesced,
+            mean_wait_seconds=self.total_wait / self.started if self.started else 0.0,
+            max_wait_seconds=self.max_wait,
+        )
+
+    def _slot_free(self) -> bool:
+        limit = self.limits.max_concurrency
+        return limit is None or self._slots_held < limit
+
+    def _grant_slots(self) -> None:
+        """Hand free slots to waiters in arrival order."""
+        while self._slot_waiters and self._slot_free():
+            waiter = self._slot_waiters.popleft()
+            if not waiter.done():
+                self._slots_held += 1
+                waiter.set_result(None)
+
+    async def _acquire_slot(self) -> None:
+        if not self._slot_waiters and self._slot_free():
+            self._slots_held += 1
+            return
+        waiter = self.loop.create_future()
+        self._slot_waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was granted just before the cancellation
+                self._release_slot()
+            else:
+                self._slot_waiters.remove(waiter)
+            raise
+
+    def _release_slot(self) -> None:
+        self._slots_held -= 1
+        self._grant_slots()
+
+    async def run(self, call: Callable[[], Awaitable[Any]]) -> Any:
+        enqueued = time.monotonic()
+        self.queue_depth += 1
+        try:
+            if self.bucket is not None:
+                await self.bucket.acquire()
+            await self._acquire_slot()
+        finally:
+            self.queue_depth -= 1
+        try:
+            wait = time.monotonic() - enqueued
+            self.started += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            self.in_flight += 1
+            try:
+                result = await call()
+            except BaseException:
+                self.failed += 1
+                raise
+            self.completed += 1
+            return result
+        finally:
+            self.in_flight -= 1
+            self._release_slot()
+
+
+class LLMDispatcher:
+    """Process-wide dispatcher applying per-provider limits to LLM calls."""
+
+    def __init__(self, limits: Optional[dict[str, ProviderLimits]] = None):
+        """
+        Initialize dispatcher.
+
+        Args:
+            limits: Per-provider limits. If None, uses DEFAULT_PROVIDER_LIMITS.
+                    Providers without an entry are not limited.
+        """
+        self._limits = dict(DEFAULT_PROVIDER_LIMITS if limits is None else limits)
+        self._lanes: dict[str, _ProviderLane] = {}
+
+    def configure(self, provider: str, limits: ProviderLimits) -> None:
+        """
+        Set the limits for a provider.
+
+        The provider's lane is updated in place, so requests already running or
+        waiting stay counted against the new limits.
+
+        Args:
+            provider: Provider name (e.g. "openai", "vllm")
+            limits: New limits
+        """
+        provider = provider.lower()
+        self._limits[provider] = limits
+        lane = self._lanes.get(provider)
+        if lane is not None:
+            lane.set_limits(limits)
+
+    def limits_for(self, provider: str) -> ProviderLimits:
+        """Return the limits applied to ``provider``."""
+        return self._limits.get(provider.lower(), ProviderLimits())
+
+    @staticmethod
+    def _copy_counters(src: _ProviderLane, dst: _ProviderLane) -> None:
+        for name in (
+            "submitted", "completed", "failed", "coalesced", "started",
+            "total_wait", "max_wait",
+        ):
+            setattr(dst, name, getattr(src, name))
+
+    def _lane(self, provider: str) -> _ProviderLane:
+        loop = asyncio.get_running_loop()
+        lane = self._lanes.get(provider)
+        if lane is None or lane.loop is not loop:
+            # asyncio primitives are bound to a loop; rebuild them for a new one
+            new_lane = _ProviderLane(provider, self.limits_for(provider), loop)
+            if lane is not None:
+                self._copy_counters(lane, new_lane)
+            self._lanes[provider] = lane = new_lane
+        return lane
+
+    async def submit(
+        self,
+        provider: str,
+        call: Callable[[], Awaitable[Any]],
+        key: Optional[Hashable] = None,
+    ) -> Any:
+        """
+        Run an LLM call under the provider's limits.
+
+        Args:
+            provider: Provider name used to pick limits (e.g. "openai", "vllm")
+            call: Zero-argument callable returning the awaitable to run
+            key: Coalescing key. Concurrent submissions with the same key share one
+                 call and its result. None disables coalescing for this request.
+
+        Returns:
+            The call's result
+        """
+        provider = provider.lower()
+        lane = self._lane(provider)
+        lane.submitted += 1
+
+        if key is None:
+            return await lane.run(call)
+
+        leader = lane.inflight_keys.get(key)
+        if leader is not None:
+            lane.coalesced += 1
+            return await asyncio.shield(leader)
+
+        shared = lane.loop.create_future()
+        # Avoid "exception never retrieved" warnings when nobody else joined
+        shared.add_done_callback(lambda f: f.cancelled() or f.exception())
+        lane.inflight_keys[key] = shared
+        try:
+            result = await lane.run(call)
+        except asyncio.CancelledError:
+            shared.cancel()
+            raise
+        except BaseException as e:
+            shared.set_exception(e)
+            raise
+        else:
+            shared.set_result(result)
+            return result
+        finally:
+            if lane.inflight_keys.get(key) is shared:
+                del lane.inflight_keys[key]
+
+    def stats(self) -> dict[str, ProviderStats]:
+        """Return a metrics snapshot for every provider that received requests."""
+        return {provider: lane.stats() for provider, lane in self._lanes.items()}
+
+
+_dispatcher: Optional[LLMDispatcher] = None
+
+
+def get_dispatcher() -> LLMDispatcher:
+    """Return the process-wide LLM dispatcher, creating it on first use."""
+    global _dispatcher
+    if _dispatcher is None:
+        _dispatcher = LLMDispatcher()
+    return _dispatcher
+
+
+def configure_providers(providers: Mapping[str, Any]) -> None:
+    """
+    Apply per-provider limits from the app config to the process-wide dispatcher.
+
+    Args:
+        providers: Provider name -> settings with optional ``max_concurrency``,
+                   ``requests_per_second`` and ``burst`` (e.g.
+                   LittleWorldConfig.llm_providers). Unset fields keep the
+                   provider's default (DEFAULT_PROVIDER_LIMITS).
+    """
+    dispatcher = get_dispatcher()
+    for provider, settings in providers.items():
+        base = DEFAULT_PROVIDER_LIMITS.get(provider.lower(), ProviderLimits())
+        dispatcher.configure(provider, base.model_copy(update=settings.model_dump(exclude_none=True)))
+
+
+def message_fingerprint(messages: Any) -> Hashable:
+    """
+    Build a hashable fingerprint of a prompt for request coalescing.
+
+    Args:
+        messages: PromptValue, list of messages, or any other prompt input
+
+    Returns:
+        Tuple of (message type, content) pairs, or repr() for unknown inputs
+    """
+    if hasattr(messages, "to_messages"):
+        messages = messages.to_messages()
+    if isinstance(messages, list):
+        return tuple(
+            (getattr(m, "type", type(m).__name__), str(getattr(m, "content", m)))
+            for m in messages
+        )
+    return repr(messages)
+
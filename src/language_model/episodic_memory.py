@@ -0,0 +1,403 @@
+"""
+Long-term episodic memory for AI characters.
+
+Every turn a character lives through is kept as an episode. When a prompt is
+built, only the episodes most similar to the current observation are recalled.
+That subset is small enough to fit in the prompt, however many thousands of
+episodes have accumulated.
+
+- HashingEmbedder turns text into a fixed-size vector by feature hashing words
+  and word pairs. It is deterministic across runs and processes, needs no
+  model download, and takes microseconds per text.
+- VectorIndex searches those vectors by cosine similarity. Below
+  ``ivf_threshold`` vectors it scans all of them. Above that it trains an
+  inverted-file (IVF) index (spherical k-means into ``ivf_lists`` clusters)
+  and scans only the ``ivf_probe`` clusters nearest the query. It retrains
+  whenever the count doubles, so clusters follow the data at amortized O(1) cost
+  per added vector.
+"""
+import re
+import threading
+import zlib
+from typing import Iterable, Optional
+import numpy as np
+from pydantic import BaseModel, Field
+from config.models.character_config import EpisodicMemoryConfig
+from language_model.memory import TokenCounter
+
+_WORD = re.compile(r"[a-z0-9]+")
+_TRAIN_SAMPLE = 16_384  # Vectors k-means is trained on
+_TRAIN_ITERATIONS = 8
+
+
+class HashingEmbedder:
+    """Embeds text as L2-normalized signed feature-hash counts of words and word pairs."""
+
+    def __init__(self, dim: int = 128):
+        """
+        Initialize embedder.
+
+        Args:
+            dim: Vector dimensions
+        """
+        self.dim = dim
+
+    def _features(self, text: str) -> tuple[np.ndarray, np.ndarray]:
+        words = _WORD.findall(text.lower())
+        features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+        hashes = np.fromiter((zlib.crc32(f.encode()) for f in features), dtype=np.uint32, count=len(features))
+        signs = np.where(hashes & 0x80000000, 1.0, -1.0).astype(np.float32)
+        return (hashes % self.dim).astype(np.intp), signs
+
+    def embed(self, text: str) -> np.ndarray:
+        """
+        Embed one text.
+
+        Args:
+            text: Text to embed
+
+        Returns:
+            float32 vector of shape (dim,); all zeros for text without words
+        """
+        vector = np.zeros(self.dim, dtype=np.float32)
+        index, signs = self._features(text)
+        np.add.at(vector, index, signs)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def embed_many(self, texts: Iterable[str]) -> np.ndarray:
+        """Embed several texts into a float32 array of shape (n, dim)."""
+        texts = list(texts)
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            index, signs = self._features(text)
+            np.add.at(vectors[row], index, signs)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        np.divide(vectors, norms, out=vectors, where=norms > 0)
+        return vectors
+
+
+class VectorIndex:
+    """Cosine-similarity index over normalized vectors: brute force, then IVF once large."""
+
+    def __init__(
+        self,
+        dim: int,
+        ivf_threshold: int = 8192,
+        ivf_lists: int = 256,
+        ivf_probe: int = 8,
+        seed: int = 0,
+    ):
+        """
+        Initialize an empty index.
+
+        Args:
+            dim: Vector dimensions
+            ivf_threshold: Vector count at which the IVF index is first trained
+            ivf_lists: IVF clusters
+            ivf_probe: Clusters scanned per search
+            seed: Seed for k-means initialization
+        """
+        self.dim = dim
+        self.ivf_threshold = ivf_threshold
+        self.ivf_lists = ivf_lists
+        self.ivf_probe = ivf_probe
+        self.rng = np.random.default_rng(seed)
+        self._count = 0
+        # Flat storage until the IVF index is trained
+        self._vectors: Optional[np.ndarray] = np.zeros((64, dim), dtype=np.float32)
+        # IVF storage: each cluster keeps its vectors contiguous, so a probe is
+        # one small matrix product instead of a scattered gather
+        self.centroids: Optional[np.ndarray] = None
+        self._trained_at = 0
+        self._list_vectors: list[np.ndarray] = []
+        self._list_ids: list[np.ndarray] = []
+        self._list_sizes: list[int] = []
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """Stored vectors in id order, shape (len, dim) (a copy once the IVF index is trained)."""
+        if self.centroids is None:
+            return self._vectors[:self._count]
+        out = np.empty((self._count, self.dim), dtype=np.float32)
+        for vectors, ids, size in zip(self._list_vectors, self._list_ids, self._list_sizes):
+            out[ids[:size]] = vectors[:size]
+        return out
+
+    def add_many(self, vectors: np.ndarray) -> np.ndarray:
+        """
+        Add vectors.
+
+        Args:
+            vectors: Normalized float32 vectors, shape (n, dim)
+
+        Returns:
+            Their ids (consecutive, starting at the previous len())
+        """
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim)
+        start, end = self._count, self._count + len(vectors)
+        ids = np.arange(start, end)
+        if self.centroids is None:
+            if end > len(self._vectors):
+                grown = np.zeros((max(end, 2 * len(self._vectors)), self.dim), dtype=np.float32)
+                grown[:start] = self._vectors[:start]
+                self._vectors = grown
+            self._vectors[start:end] = vectors
+            self._count = end
+            if end >= self.ivf_threshold:
+                self._train(self._vectors[:end])
+        elif end >= 2 * self._trained_at:
+            data = np.concatenate([self.vectors, vectors])
+            self._count = end
+            self._train(data)
+        else:
+            self._count = end
+            self._assign(ids, vectors)
+        return ids
+
+    def add(self, vector: np.ndarray) -> int:
+        """Add one vector and return its id."""
+        return int(self.add_many(vector[None, :])[0])
+
+    def _train(self, data: np.ndarray) -> None:
+        """Run spherical k-means on a sample of ``data`` (all vectors, in id order) and rebuild the lists."""
+        lists = min(self.ivf_lists, len(data))
+        sample = data if len(data) <= _TRAIN_SAMPLE else data[self.rng.choice(len(data), _TRAIN_SAMPLE, replace=False)]
+        centroids = sample[self.rng.choice(len(sample), lists, replace=False)].copy()
+        for _ in range(_TRAIN_ITERATIONS):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            empty = norms[:, 0] == 0
+            sums[~empty] /= norms[~empty]
+            # Re-seed empty clusters with random sample points
+            sums[empty] = sample[self.rng.choice(len(sample), int(empty.sum()))]
+            centroids = sums
+        self.centroids = centroids
+        self._trained_at = len(data)
+        self._list_vectors = [np.zeros((0, self.dim), dtype=np.float32) for _ in range(lists)]
+        self._list_ids = [np.zeros(0, dtype=np.intp) for _ in range(lists)]
+        self._list_sizes = [0] * lists
+        self._vectors = None
+        self._assign(np.arange(len(data)), data)
+
+    def _assign(self, ids: np.ndarray, vectors: np.ndarray) -> None:
+        """Append vectors to the lists of their nearest centroids."""
+        labels = np.argmax(vectors @ self.centroids.T, axis=1)
+        order = np.argsort(labels, kind="stable")
+        labels, ids, vectors = labels[order], ids[order], vectors[order]
+        bounds = np.flatnonzero(np.diff(labels)) + 1
+        for lo, hi in zip(np.r_[0, bounds].tolist(), np.r_[bounds, len(labels)].tolist()):
+            c = int(labels[lo])
+            size, new = self._list_sizes[c], hi - lo
+            if size + new > len(self._list_ids[c]):
+                capacity = max(size + new, 2 * len(self._list_ids[c]), 16)
+                grown = np.zeros((capacity, self.dim), dtype=np.float32)
+                grown[:size] = self._list_vectors[c][:size]
+                self._list_vectors[c] = grown
+                grown_ids = np.zeros(capacity, dtype=np.intp)
+                grown_ids[:size] = self._list_ids[c][:size]
+                self._list_ids[c] = grown_ids
+            self._list_vectors[c][size:size + new] = vectors[lo:hi]
+            self._list_ids[c][size:size + new] = ids[lo:hi]
+            self._list_sizes[c] = size + new
+
+    def search(self, query: np.ndarray, k: int, max_id: Optional[int] = None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Find the stored vectors most similar to a query.
+
+        Args:
+            query: Normalized float32 vector, shape (dim,)
+            k: Number of results
+            max_id: Only consider ids below this (None = all)
+
+        Returns:
+            Tuple of (ids, cosine similarities), best first
+        """
+        limit = self._count if max_id is None else min(max_id, self._count)
+        if k <= 0 or limit <= 0:
+            return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.float32)
+        if self.centroids is None:
+            ids = np.arange(limit)
+            scores = self._vectors[:limit] @ query
+        else:
+            probe = min(self.ivf_probe, len(self.centroids))
+            nearest = np.argpartition(-(self.centroids @ query), probe - 1)[:probe]
+            id_parts, score_parts = [], []
+            for c in nearest.tolist():
+                size = self._list_sizes[c]
+                id_parts.append(self._list_ids[c][:size])
+                score_parts.append(self._list_vectors[c][:size] @ query)
+            ids, scores = np.concatenate(id_parts), np.concatenate(score_parts)
+            if limit < self._count:
+                keep = ids < limit
+                ids, scores = ids[keep], scores[keep]
+        if len(scores) > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return ids[top], scores[top]
+
+
+class Episode(BaseModel):
+    """A recalled episode."""
+    text: str = Field(description="Episode text")
+    time: Optional[float] = Field(default=None, description="Simulation time it happened")
+    score: float = Field(description="Cosine similarity to the query")
+
+
+class EpisodicMemory:
+    """
+    Every episode a character lived through, searchable by similarity.
+
+    Safe to use from the game loop and the decision scheduler's loop at once.
+    """
+
+    def __init__(
+        self,
+        embedder: Optional[HashingEmbedder] = None,
+        index: Optional[VectorIndex] = None,
+        top_k: int = 5,
+        max_tokens: int = 256,
+        counter: Optional[TokenCounter] = None,
+    ):
+        """
+        Initialize episodic memory.
+
+        Args:
+            embedder: Text embedder. If None, a 128-dimension HashingEmbedder.
+            index: Vector index matching the embedder's dimensions. If None, a new VectorIndex.
+            top_k: Episodes recalled per prompt
+            max_tokens: Max tokens of recalled episodes per prompt
+            counter: Token counter. If None, estimates tokens from text length.
+        """
+        self.embedder = embedder or HashingEmbedder()
+        self.index = index or VectorIndex(self.embedder.dim)
+        self.top_k = top_k
+        self.max_tokens = max_tokens
+        self.counter = counter or TokenCounter(None)
+        self._texts: list[str] = []
+        self._times: list[Optional[float]] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def add(self, text: str, time: Optional[float] = None) -> None:
+        """
+        Remember an episode.
+
+        Args:
+            text: What happened
+            time: Simulation time it happened
+        """
+        vector = self.embedder.embed(text)
+        with self._lock:
+            self.index.add(vector)
+            self._texts.append(text)
+            self._times.append(time)
+
+    def add_many(self, texts: list[str], times: Optional[list[Optional[float]]] = None) -> None:
+        """Remember several episodes at once (embedded and indexed in one batch)."""
+        vectors = self.embedder.embed_many(texts)
+        with self._lock:
+            self.index.add_many(vectors)
+            self._texts.extend(texts)
+            self._times.extend(times if times is not None else [None] * len(texts))
+
+    def search(self, query: str, k: Optional[int] = None, skip_latest: int = 0) -> list[Episode]:
+        """
+        Recall the episodes most similar to a query.
+
+        Args:
+            query: Text to match (e.g. the current observation)
+            k: Number of episodes. If None, top_k.
+            skip_latest: Ignore the newest episodes (e.g. ones already in the
+                         prompt's recent-turn memory)
+
+        Returns:
+            Episodes, most similar first
+        """
+        vector = self.embedder.embed(query)
+        with self._lock:
+            limit = len(self._texts) - skip_latest
+            ids, scores = self.index.search(vector, self.top_k if k is None else k, max_id=limit)
+            return [
+                Episode(text=self._texts[i], time=self._times[i], score=float(s))
+                for i, s in zip(ids.tolist(), scores.tolist())
+                if s > 0
+            ]
+
+    def render(self, query: str, max_tokens: Optional[int] = None, skip_latest: int = 0) -> str:
+        """
+        Render the episodes recalled for a query as prompt text within a token budget.
+
+        Args:
+            query: Text to match
+            max_tokens: Token budget. If None, the memory's max_tokens.
+            skip_latest: Ignore the newest episodes
+
+        Returns:
+            Recalled episodes in chronological order, or "" if none are relevant
+        """
+        budget = self.max_tokens if max_tokens is None else min(max_tokens, self.max_tokens)
+        header = "Things I remember:\n"
+        budget -= self.counter.count(header)
+        chosen = []
+        for episode in self.search(query, skip_latest=skip_latest):
+            prefix = f"- [t={episode.time:.1f}s] " if episode.time is not None else "- "
+            line = prefix + " ".join(episode.text.split())
+            tokens = self.counter.count(line) + 1
+            if tokens > budget:
+                continue
+            chosen.append((episode.time or 0.0, line))
+            budget -= tokens
+        if not chosen:
+            return ""
+        chosen.sort(key=lambda item: item[0])
+        return header + "\n".join(line for _, line in chosen)
+
+    def export_state(self) -> dict:
+        """Episode texts and times, as JSON-serializable data (vectors are recomputed on import)."""
+        with self._lock:
+            return {"texts": list(self._texts), "times": list(self._times)}
+
+    def import_state(self, state: dict) -> None:
+        """Replace the episodes with state produced by export_state()."""
+        with self._lock:
+            self.index = VectorIndex(
+                self.embedder.dim,
+                ivf_threshold=self.index.ivf_threshold,
+                ivf_lists=self.index.ivf_lists,
+                ivf_probe=self.index.ivf_probe,
+            )
+            self._texts = []
+            self._times = []
+        if state["texts"]:
+            self.add_many(state["texts"], state["times"])
+
+
+def create_episodic_memory(
+    config: Optional[EpisodicMemoryConfig],
+    counter: Optional[TokenCounter] = None,
+) -> Optional[EpisodicMemory]:
+    """
+    Build an episodic memory from config.
+
+    Args:
+        config: Episodic memory configuration (None = disabled)
+        counter: Token counter for prompt budgeting
+
+    Returns:
+        EpisodicMemory, or None if disabled
+    """
+    if config is None or not config.enabled:
+        return None
+    embedder = HashingEmbedder(config.dim)
+    index = VectorIndex(config.dim, config.ivf_threshold, config.ivf_lists, config.ivf_probe)
+    return EpisodicMemory(embedder, index, config.top_k, config.max_tokens, counter)
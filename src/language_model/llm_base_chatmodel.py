@@ -1,12 +1,24 @@
-
+import asyncio
+from functools import lru_cache
+from typing import Any, AsyncIterator, Hashable, Optional
 from pydantic import BaseModel
 from language_model.base import LLMBase
 from language_model.providers.provider_factory import create_llm_instance
+from language_model.providers.mock_llm import MockLLM
+from language_model.dispatcher import get_dispatcher, message_fingerprint
 from config.models.character_config import LLMConfig
 from langchain_core.runnables import Runnable
 from openai import AsyncOpenAI
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
 
+async def _stream_text(llm, messages) -> AsyncIterator[str]:
+    """Yield the text of each chunk from a LangChain chat model's astream()."""
+    async for chunk in llm.astream(messages):
+        content = chunk.content if isinstance(chunk.content, str) else str(chunk.content)
+        if content:
+            yield content
+
+
 class OpenAIEngine(LLMBase):
     def __init__(self, llm):
         self.llm = llm
@@ -14,6 +26,9 @@ class OpenAIEngine(LLMBase):
     async def ainvoke(self, messages):
         return await self.llm.ainvoke(messages)
 
+    def astream(self, messages) -> AsyncIterator[str]:
+        return _stream_text(self.llm, messages)
+
     def bind_tools(self, tools):
         return self.llm.bind_tools(tools)
     
@@ -27,18 +42,29 @@ class GeminiEngine(LLMBase):
     async def ainvoke(self, messages):
         return await self.llm.ainvoke(messages)
 
+    def astream(self, messages) -> AsyncIterator[str]:
+        return _stream_text(self.llm, messages)
+
     def bind_tools(self, tools):
         return GeminiEngine(self.llm.bind_tools(tools))
     
     def with_structured_output(self, schema):
         return self.llm.with_structured_output(schema)
 
+@lru_cache(maxsize=None)
+def _model_json_schema(schema: type[BaseModel]) -> dict:
+    """JSON schema of a pydantic model class, computed once per class."""
+    return schema.model_json_schema()
+
+
 class VLLMEngine(LLMBase):
     def __init__(self, client: AsyncOpenAI, config: LLMConfig, tools=None, schema=None):
         self.client = client
         self.config = config
         self.tools = tools
         self.schema = schema
+        # Normalized once per binding instead of once per request
+        self.guided_json = self._normalize_schema(schema)
     
     @staticmethod
     def lc_prompt_to_openai_messages(input_message):
@@ -97,7 +123,7 @@ class VLLMEngine(LLMBase):
 
         # Pydantic model class
         if isinstance(schema, type) and issubclass(schema, BaseModel):
-            return schema.model_json_schema()
+            return _model_json_schema(schema)
 
         # Already JSON schema
         if isinstance(schema, dict):
@@ -105,13 +131,12 @@ class VLLMEngine(LLMBase):
 
         raise TypeError(f"Unsupported schema type: {type(schema)}")
     
-    async def ainvoke(self, messages):
-        
+    def _build_payload(self, messages) -> dict:
         openai_messages = self.lc_prompt_to_openai_messages(messages)
 
         # if self.tools:
         #     print(f"[The tool we have]: {self.tools}")
-        payload = {
+        return {
             "model": self.config.version,
             "messages":  openai_messages,
             "max_tokens": self.config.max_tokens,
@@ -125,14 +150,31 @@ class VLLMEngine(LLMBase):
                 "chat_template_kwargs": {
                     "enable_thinking": self.config.enable_thinking
                 },
-                "guided_json":self._normalize_schema(self.schema)
+                "guided_json": self.guided_json
             }
         }
 
-        return await self.client.chat.completions.create(**payload)
+    async def ainvoke(self, messages):
+        payload = self._build_payload(messages)
+        response = await self.client.chat.completions.create(**payload)
+        
+        # Guided decoding returns JSON text; parse it like with_structured_output does for OpenAI
+        if isinstance(self.schema, type) and issubclass(self.schema, BaseModel):
+            return self.schema.model_validate_json(response.choices[0].message.content)
+        return response
+
+    async def astream(self, messages) -> AsyncIterator[str]:
+        """Stream the reply text with ``stream=True``, one delta per chunk."""
+        payload = self._build_payload(messages)
+        stream = await self.client.chat.completions.create(**payload, stream=True)
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            content = chunk.choices[0].delta.content
+            if content:
+                yield content
 
     def bind_tools(self, tools)-> "VLLMEngine":
-        self.tools = tools
         return VLLMEngine(self.client, self.config, tools, self.schema)
 
     def with_structured_output(self, schema: type[BaseModel]) -> "VLLMEngine":
@@ -143,6 +185,26 @@ class VLLMEngine(LLMBase):
             schema=schema,
         )
 
+class MockEngine(LLMBase):
+    """Engine over the offline mock provider (config type "mock")."""
+
+    def __init__(self, client: MockLLM, tools=None, schema=None):
+        self.client = client
+        self.tools = tools
+        self.schema = schema
+
+    async def ainvoke(self, messages):
+        return await self.client.complete(messages, self.schema, self.tools)
+
+    def astream(self, messages) -> AsyncIterator[str]:
+        return self.client.stream(messages)
+
+    def bind_tools(self, tools) -> "MockEngine":
+        return MockEngine(self.client, tools, self.schema)
+
+    def with_structured_output(self, schema) -> "MockEngine":
+        return MockEngine(self.client, self.tools, schema)
+
 def create_chat_engine(config: LLMConfig) -> LLMBase:
     if config.type == "openai":
         return OpenAIEngine(create_llm_instance(config))
@@ -151,28 +213,134 @@ def create_chat_engine(config: LLMConfig) -> LLMBase:
         # add a tranformation layer to transffer msg 
     elif config.type == "vllm":
         return VLLMEngine(create_llm_instance(config), config)
+    elif config.type == "mock":
+        return MockEngine(create_llm_instance(config))
     else:
         raise ValueError("Unsupported provider")
 
+
+def _binding_cache_key(schema=None, tools=None) -> Hashable:
+    """Hashable key for a (schema, tools) binding."""
+    schema_key = schema if isinstance(schema, (type, type(None))) else repr(schema)
+    tools_key = None if tools is None else repr(tools)
+    return schema_key, tools_key
+
+
 class LLMChatModel(LLMBase, Runnable):
     def __init__(self, config: LLMConfig):
+        self.config = config
         self.llm: LLMBase = create_chat_engine(config)
+        # Identifies structured-output/tool bindings in request coalescing keys
+        self._binding_key: tuple = ()
+        self._bound_cache: dict[Hashable, LLMBase] = {}
+        self._bound_cache_base: Optional[LLMBase] = None
+
+    def bound_llm(self, schema=None, tools=None) -> LLMBase:
+        """
+        Get the engine bound to a structured-output schema and/or tools.
+        
+        Each (schema, tools) binding is built once per model and reused, so repeated
+        calls do no wrapper construction or schema normalization.
+        
+        Args:
+            schema: Structured output schema (pydantic model class), or None
+            tools: Tool definitions, or None
+            
+        Returns:
+            Bound engine (self.llm itself when nothing is bound)
+        """
+        if schema is None and tools is None:
+            return self.llm
+        if self._bound_cache_base is not self.llm:
+            # The underlying engine was replaced; bindings built on the old one are stale
+            self._bound_cache.clear()
+            self._bound_cache_base = self.llm
+        key = _binding_cache_key(schema, tools)
+        bound = self._bound_cache.get(key)
+        if bound is None:
+            bound = self.llm
+            if tools is not None:
+                bound = bound.bind_tools(tools)
+            if schema is not None:
+                bound = bound.with_structured_output(schema)
+            self._bound_cache[key] = bound
+        return bound
         
     def invoke(self, *args, **kwargs):
         raise NotImplementedError("OpenAIEngine is async-only. Use `await ainvoke()` instead.")
 
     async def ainvoke(self, messages):
-        return await self.llm.ainvoke(messages)
+        return await self._dispatch(self.llm, messages)
 
-    # self.__class__.__new__ is necessary to avoid LLMChatModel become RunnableBinding which cause no attr error
-    def with_structured_output(self, schema):
+    async def astream(self, messages, llm: Optional[LLMBase] = None) -> AsyncIterator[str]:
+        """
+        Stream the reply text chunk by chunk.
+        
+        The stream runs under the shared dispatcher like any other request: it
+        waits for a rate-limit token and holds a concurrency slot until the
+        stream is finished. Streams are never coalesced.
+        
+        Args:
+            messages: Rendered prompt
+            llm: Engine to stream from. If None, uses self.llm
+            
+        Yields:
+            Text chunks as the model generates them
+        """
+        llm = llm or self.llm
+        chunks: asyncio.Queue = asyncio.Queue()
+        finished = object()
+        
+        async def pump():
+            try:
+                async for chunk in llm.astream(messages):
+                    await chunks.put(chunk)
+            finally:
+                await chunks.put(finished)
+        
+        task = asyncio.ensure_future(get_dispatcher().submit(self.config.type, pump))
+        try:
+            while True:
+                chunk = await chunks.get()
+                if chunk is finished:
+                    break
+                yield chunk
+            await task  # Re-raise errors from the stream
+        finally:
+            if not task.done():
+                task.cancel()
+
+    async def _dispatch(self, llm: LLMBase, messages, schema=None):
+        """Send a request through the shared dispatcher (limits, coalescing)."""
+        key = None
+        if self.config.coalesce_requests:
+            key = (
+                self.config.version,
+                self._binding_key,
+                getattr(schema, "__qualname__", schema),
+                message_fingerprint(messages),
+            )
+        return await get_dispatcher().submit(
+            self.config.type, lambda: llm.ainvoke(messages), key=key
+        )
+
+    def _copy_with(self, llm: LLMBase, binding) -> "LLMChatModel":
+        # self.__class__.__new__ is necessary to avoid LLMChatModel become RunnableBinding which cause no attr error
         new_model = self.__class__.__new__(self.__class__)
-        new_model.llm = self.llm.with_structured_output(schema)
+        new_model.config = self.config
+        new_model.llm = llm
+        new_model._binding_key = self._binding_key + (binding,)
+        new_model._bound_cache = {}
+        new_model._bound_cache_base = None
         return new_model
 
+    def with_structured_output(self, schema):
+        return self._copy_with(
+            self.bound_llm(schema=schema),
+            ("schema", getattr(schema, "__qualname__", repr(schema))),
+        )
+
     def bind_tools(self, tools):
-        new_model = self.__class__.__new__(self.__class__)
-        new_model.llm = self.llm.bind_tools(tools)
-        return new_model
+        return self._copy_with(self.bound_llm(tools=tools), ("tools", repr(tools)))
     
 
@@ -1,8 +1,28 @@
-from typing import Optional, Type
+from typing import AsyncIterator, Optional, Type, TYPE_CHECKING
 from pydantic import BaseModel
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from decisions import Decision
+from language_model.episodic_memory import EpisodicMemory, create_episodic_memory
 from language_model.llm_base_chatmodel import LLMChatModel
+from language_model.memory import (
+    MESSAGE_OVERHEAD_TOKENS,
+    ConversationMemory,
+    MemoryStats,
+    TokenCounter,
+    create_conversation_memory,
+)
+from language_model.prompt_assembler import WORLD_RULES, PrefixStats, PromptAssembler
+from language_model.response_cache import CacheStats, ResponseCache, create_response_cache, make_cache_key
 from config.models.character_config import LLMConfig
-from langchain_core.prompts.chat import ChatPromptTemplate
+
+if TYPE_CHECKING:
+    from world.observation_encoders import ObservationEncoder
+
+SUMMARY_INSTRUCTIONS = (
+    "Update your running summary of what happened so far with the events below. "
+    "Keep who you met, what was said and where things are; drop routine movement. "
+    "Answer with the new summary only, in at most {words} words."
+)
 
 class BaseAIModelEngine(LLMChatModel):
     """Base AI model engine with personality prompt support."""
@@ -13,6 +33,11 @@ class BaseAIModelEngine(LLMChatModel):
         personality_prompt: str, 
         input_blocks: Optional[list[str]] = ["{world_state}, {input_messages}"],
         structured_output_schema: Type[BaseModel] = None,
+        response_cache: Optional[ResponseCache] = None,
+        memory: Optional[ConversationMemory] = None,
+        episodic_memory: Optional[EpisodicMemory] = None,
+        world_rules: Optional[str] = WORLD_RULES,
+        observation_encoder: Optional["ObservationEncoder"] = None,
     ):
         """
         Initialize base AI model engine.
@@ -20,28 +45,217 @@ class BaseAIModelEngine(LLMChatModel):
         Args:
             config: LLM configuration
             personality_prompt: Personality prompt text
+            response_cache: Prompt-response cache. If None, built from config.cache
+            memory: Conversation memory. If None, built from config.memory (summarized
+                    with this engine's LLM)
+            episodic_memory: Long-term episodic memory. If None, built from
+                             config.episodic_memory
+            world_rules: Rules shared by every character, placed before the
+                         personality in decision prompts (None or "" = no rules)
+            observation_encoder: Encoder turning WorldState into prompt text. If
+                                 None, built from config.observation_format
         """
         super().__init__(config=config)
         self.personality_prompt = personality_prompt
         self.input_blocks = input_blocks
-        self.template = self._compose_template(input_blocks)  
+        self.memory = memory if memory is not None else create_conversation_memory(config.memory, self.summarize)
+        self.prompt_token_budget = config.memory.prompt_token_budget if config.memory else None
+        self.token_counter = self.memory.counter if self.memory is not None else TokenCounter()
+        self.episodic_memory = (
+            episodic_memory if episodic_memory is not None
+            else create_episodic_memory(config.episodic_memory, self.token_counter)
+        )
+        self.world_rules = world_rules
+        self.template = self._compose_template(input_blocks)
         self.structured_output_schema = structured_output_schema
+        self.quantization_step = config.cache.quantization_step if config.cache else 0.0
+        if observation_encoder is None:
+            # Imported here to avoid a circular import (world imports character setups
+            # that import this module)
+            from world.observation_encoders import create_observation_encoder
+            observation_encoder = create_observation_encoder(config.observation_format, config.observation_round_to)
+        self.observation_encoder = observation_encoder
+        if observation_encoder.incremental:
+            if self.memory is None:
+                raise ValueError(
+                    f"Observation format '{observation_encoder.name}' needs conversation memory (llm.memory)"
+                )
+            observation_encoder.limit_history(self.memory.max_turns)
+            # The same text ("no change") means different scenes for different histories
+            response_cache = None
+        elif response_cache is None:
+            response_cache = create_response_cache(config.cache)
+        self.response_cache = response_cache
 
-    def _compose_template(self, input_blocks):
-        messages = [("system", self.personality_prompt)]
-        if input_blocks:
-            messages += [("human", block) for block in input_blocks]
-        return ChatPromptTemplate.from_messages(messages)
+    def _compose_template(self, input_blocks) -> PromptAssembler:
+        return PromptAssembler(self.personality_prompt, input_blocks, self.world_rules, self.token_counter)
 
+    @property
+    def last_prompt_tokens(self) -> int:
+        """Tokens in the most recent prompt built by build_prompt()."""
+        return self.template.last_tokens
 
-    async def _call_llm(self, messages):
-      
-        if self.structured_output_schema:
-            self.llm = self.llm.with_structured_output(self.structured_output_schema)
+    def build_prompt(self, messages: dict, rules: bool = False):
+        """
+        Assemble the prompt, with conversation and episodic memory if enabled.
+        
+        Sections go from most to least stable (see PromptAssembler) so provider
+        prefix caches hit. The world rules describe the decision actions, so only
+        decision prompts ask for them. Episodes similar to the current template variables are
+        recalled first (up to the episodic memory's max_tokens). The conversation
+        memory then fills the tokens that are left, so the whole prompt stays within
+        the configured prompt_token_budget (unless the personality and observation
+        alone exceed it).
+        
+        Args:
+            messages: Template variables (e.g. world_state, input_messages)
+            rules: Put the world rules ahead of the personality
+            
+        Returns:
+            Rendered prompt (PromptValue)
+        """
+        if self.memory is None and self.episodic_memory is None:
+            return self.template.assemble(messages, rules=rules)
+        budget = None
+        if self.prompt_token_budget is not None:
+            budget = self.prompt_token_budget - self.template.fixed_tokens(messages, rules)
+        
+        recalled = ""
+        if self.episodic_memory is not None:
+            query = " ".join(str(value) for value in messages.values())
+            # Turns still in the conversation memory are in the prompt already
+            recent = len(self.memory) if self.memory is not None else 0
+            recall_budget = budget - MESSAGE_OVERHEAD_TOKENS if budget is not None else None
+            recalled = self.episodic_memory.render(query, recall_budget, skip_latest=recent)
+            if recalled and budget is not None:
+                budget -= self.token_counter.count(recalled) + MESSAGE_OVERHEAD_TOKENS
+        summary = recent_turns = ""
+        if self.memory is not None:
+            # Without a configured budget the memory's own bounds (max_turns, summary_tokens) apply
+            memory_budget = budget - 2 * MESSAGE_OVERHEAD_TOKENS if budget is not None else 1 << 30
+            summary, recent_turns = self.memory.render_sections(memory_budget)
+        return self.template.assemble(messages, summary, recent_turns, recalled, rules)
+
+    async def summarize(self, summary: str, turns: list[str]) -> str:
+        """
+        Fold older turns into the memory summary with the LLM.
+        
+        Args:
+            summary: Current summary ("" if none yet)
+            turns: Texts of the turns to add, oldest first
             
-        response = await self.llm.ainvoke(messages)
+        Returns:
+            New summary text
+        """
+        words = max(int(self.config.memory.summary_tokens * 0.75), 1) if self.config.memory else 150
+        events = "\n".join(turns)
+        messages = [
+            # Same system text as decision prompts, so the provider's prefix cache covers it
+            SystemMessage(content=self.template.system_text),
+            HumanMessage(content=(
+                f"{SUMMARY_INSTRUCTIONS.format(words=words)}\n\n"
+                f"Current summary:\n{summary or '(none)'}\n\nEvents:\n{events}"
+            )),
+        ]
+        response = await self._dispatch(self.llm, messages)
+        return response.content if hasattr(response, "content") else str(response)
+
+    async def _call_llm(self, messages):
+        # The structured binding is built once and reused; self.llm is never rebound
+        llm = self.bound_llm(schema=self.structured_output_schema)
+        response = await self._cached_dispatch(llm, messages, self.structured_output_schema)
         return response
 
+    async def _cached_dispatch(self, llm, messages, schema=None):
+        """Answer from the response cache if possible, otherwise dispatch and store."""
+        if self.response_cache is None:
+            response = await self._dispatch(llm, messages, schema)
+            self.observation_encoder.commit()
+            return response
+        
+        key = make_cache_key(messages, self.config.version, schema)
+        response = self.response_cache.get(key)
+        if response is None:
+            response = await self._dispatch(llm, messages, schema)
+            self.observation_encoder.commit()
+            self.response_cache.set(key, response)
+        return response
+
+    def render_world_state(self, world_state) -> str:
+        """
+        Render a WorldState as prompt text with the observation encoder, quantized
+        per the cache config.
+        
+        Args:
+            world_state: WorldState observation (or None)
+            
+        Returns:
+            Prompt text for the world_state template variable
+        """
+        if world_state is not None and self.quantization_step > 0:
+            world_state = world_state.quantized(self.quantization_step)
+        return self.observation_encoder.encode(world_state)
+
+    def cache_stats(self) -> Optional[CacheStats]:
+        """Return response cache hit/miss counters, or None without a cache."""
+        return self.response_cache.stats() if self.response_cache is not None else None
+
+    def memory_stats(self) -> Optional[MemoryStats]:
+        """Return conversation memory counters, or None without memory."""
+        return self.memory.stats() if self.memory is not None else None
+
+    def prompt_stats(self) -> PrefixStats:
+        """Return prefix-reuse counters for the prompts built so far."""
+        return self.template.stats()
+
     async def basic_answering(self, messages):
-        return await self._call_llm(self.template.invoke(messages))
+        return await self._call_llm(self.build_prompt(messages))
+
+    async def stream_answering(self, messages) -> AsyncIterator[str]:
+        """
+        Answer with free text, yielding it chunk by chunk as it is generated.
+        
+        A cached answer is yielded as a single chunk. A streamed answer is cached
+        once complete, so a later basic_answering call with the same prompt hits it.
+        
+        Args:
+            messages: Template variables (e.g. world_state, input_messages)
+            
+        Yields:
+            Text chunks
+        """
+        prompt = self.build_prompt(messages)
+        key = None
+        if self.response_cache is not None:
+            key = make_cache_key(prompt, self.config.version, None)
+            cached = self.response_cache.get(key)
+            if cached is not None:
+                yield cached.content if hasattr(cached, "content") else str(cached)
+                return
+        
+        parts = []
+        async for chunk in self.astream(prompt):
+            parts.append(chunk)
+            yield chunk
+        self.observation_encoder.commit()
+        if key is not None:
+            self.response_cache.set(key, AIMessage(content="".join(parts)))
+
+    async def structured_answering(self, messages, schema: Type[BaseModel]) -> BaseModel:
+        """
+        Answer with a structured object instead of free text.
+        
+        Decision prompts start with the world rules; other schemas get the
+        personality alone, like free-text prompts.
+        
+        Args:
+            messages: Template variables (e.g. world_state, input_messages)
+            schema: Pydantic model the answer must conform to
+            
+        Returns:
+            Instance of ``schema``
+        """
+        structured_llm = self.bound_llm(schema=schema)
+        prompt = self.build_prompt(messages, rules=isinstance(schema, type) and issubclass(schema, Decision))
+        return await self._cached_dispatch(structured_llm, prompt, schema)
 
@@ -0,0 +1,372 @@
+"""
+Bounded conversation memory for AI characters.
+
+The newest turns are kept verbatim in a ring buffer. Turns pushed out of it are
+folded into a running summary on the event loop, in batches of
+``summarize_every`` and off the decision's critical path. The summary is capped
+at ``summary_tokens``. When a prompt is built, the memory is rendered into
+whatever token budget the rest of the prompt leaves. The summary goes first, then
+as many recent turns as fit, newest first. So prompt size stays flat however long
+the simulation runs.
+
+Tokens are counted with tiktoken when it and the configured encoding are
+available, and estimated at 4 characters per token otherwise.
+"""
+import asyncio
+import threading
+from collections import deque
+from typing import Any, Awaitable, Callable, Iterable, Optional
+from pydantic import BaseModel, Field
+from config.models.character_config import MemoryConfig
+
+CHARS_PER_TOKEN = 4  # Estimate used without tiktoken
+MESSAGE_OVERHEAD_TOKENS = 4  # Role and separators per chat message
+
+_encodings: dict[str, Any] = {}
+_encodings_lock = threading.Lock()
+
+Summarizer = Callable[[str, list[str]], Awaitable[str]]
+
+
+def _load_encoding(name: Optional[str]):
+    """Load (once per process) a tiktoken encoding, or None if unavailable."""
+    if name is None:
+        return None
+    with _encodings_lock:
+        if name not in _encodings:
+            try:
+                import tiktoken
+                _encodings[name] = tiktoken.get_encoding(name)
+            except Exception:
+                # Not installed, unknown encoding, or the encoding file can't be fetched
+                _encodings[name] = None
+        return _encodings[name]
+
+
+class TokenCounter:
+    """Counts tokens with tiktoken, or estimates them from the text length."""
+
+    def __init__(self, encoding: Optional[str] = "cl100k_base"):
+        """
+        Initialize token counter.
+
+        Args:
+            encoding: tiktoken encoding name. If None (or it can't be loaded),
+                      tokens are estimated at CHARS_PER_TOKEN characters each.
+        """
+        self._encoding = _load_encoding(encoding)
+
+    @property
+    def exact(self) -> bool:
+        """True if tokens are counted with tiktoken rather than estimated."""
+        return self._encoding is not None
+
+    def count(self, text: str) -> int:
+        """Number of tokens in ``text``."""
+        if not text:
+            return 0
+        if self._encoding is not None:
+            return len(self._encoding.encode(text, disallowed_special=()))
+        return -(-len(text) // CHARS_PER_TOKEN)
+
+    def count_messages(self, messages: Iterable[Any]) -> int:
+        """
+        Number of tokens in a list of chat messages, including per-message overhead.
+
+        Args:
+            messages: LangChain messages (anything with ``content``) or strings
+        """
+        total = 0
+        for message in messages:
+            content = getattr(message, "content", message)
+            total += self.count(content if isinstance(content, str) else str(content)) + MESSAGE_OVERHEAD_TOKENS
+        return total
+
+    def truncate(self, text: str, max_tokens: int, keep_end: bool = False) -> str:
+        """
+        Cut ``text`` down to at most ``max_tokens`` tokens.
+
+        Args:
+            text: Text to shorten
+            max_tokens: Token limit
+            keep_end: Keep the end of the text instead of the start
+
+        Returns:
+            ``text`` itself if it fits, otherwise its first (or last) ``max_tokens`` tokens
+        """
+        if max_tokens <= 0:
+            return ""
+        if self._encoding is not None:
+            tokens = self._encoding.encode(text, disallowed_special=())
+            if len(tokens) <= max_tokens:
+                return text
+            tokens = tokens[-max_tokens:] if keep_end else tokens[:max_tokens]
+            return self._encoding.decode(tokens)
+        limit = max_tokens * CHARS_PER_TOKEN
+        if len(text) <= limit:
+            return text
+        return text[-limit:] if keep_end else text[:limit]
+
+
+class MemoryTurn:
+    """One remembered exchange: what the character observed and how it responded."""
+
+    __slots__ = ("time", "observation", "response", "text", "tokens")
+
+    def __init__(self, time: Optional[float], observation: str, response: str, counter: TokenCounter, max_tokens: int):
+        self.time = time
+        self.observation = observation
+        self.response = response
+        prefix = f"[t={time:.1f}s] " if time is not None else ""
+        # One line per turn, however the observation was laid out
+        line = " ".join(f"{prefix}{observation} -> {response}".split())
+        self.text = counter.truncate(line, max_tokens)
+        self.tokens = counter.count(self.text)
+
+
+class MemoryStats(BaseModel):
+    """Counters for a conversation memory."""
+    recent: int = Field(description="Turns in the ring buffer")
+    pending: int = Field(description="Older turns waiting to be (or being) summarized")
+    summarized: int = Field(description="Turns folded into the summary so far")
+    summary_tokens: int = Field(description="Tokens in the current summary")
+    failed_summaries: int = Field(description="Summarizer calls that failed (turns were truncated into the summary instead)")
+
+
+class ConversationMemory:
+    """
+    Ring buffer of recent turns plus a running summary of older ones.
+
+    Safe to use from the game loop and the decision scheduler's loop at once.
+    """
+
+    def __init__(
+        self,
+        max_turns: int = 8,
+        turn_tokens: int = 128,
+        summarize_every: int = 4,
+        summary_tokens: int = 256,
+        counter: Optional[TokenCounter] = None,
+        summarizer: Optional[Summarizer] = None,
+    ):
+        """
+        Initialize conversation memory.
+
+        Args:
+            max_turns: Recent turns kept verbatim
+            turn_tokens: Max tokens stored per turn
+            summarize_every: Older turns summarized per summarizer call
+            summary_tokens: Max tokens in the summary
+            counter: Token counter. If None, estimates tokens from text length.
+            summarizer: Async ``(summary, turn_texts) -> new summary`` (usually an LLM
+                        call). If None, or if it fails, the oldest text is cut from the
+                        summary to make room for the new turns.
+        """
+        self.max_turns = max_turns
+        self.turn_tokens = turn_tokens
+        self.summarize_every = summarize_every
+        self.summary_tokens = summary_tokens
+        self.counter = counter or TokenCounter(None)
+        self.summarizer = summarizer
+        self.summary = ""
+        self._recent: deque[MemoryTurn] = deque()
+        self._pending: list[MemoryTurn] = []  # Out of the ring buffer, not yet summarized
+        self._summarizing: list[MemoryTurn] = []  # Batch the summarizer is working on
+        self._lagged: list[MemoryTurn] = []  # Compacted into the summary while the summarizer ran
+        self._task: Optional[asyncio.Task] = None
+        self._generation = 0  # Bumped by import_state; older summaries are discarded
+        self._lock = threading.Lock()
+        self.summarized = 0
+        self.failed_summaries = 0
+
+    def __len__(self) -> int:
+        return len(self._recent) + len(self._pending) + len(self._summarizing)
+
+    def add_turn(self, observation: str, response: str, time: Optional[float] = None) -> None:
+        """
+        Remember a turn.
+
+        Called from a running event loop, summarization of older turns is started
+        as a background task there; otherwise they are truncated into the summary
+        right away.
+
+        Args:
+            observation: What the character observed (prompt input)
+            response: What it answered or decided
+            time: Simulation time of the turn
+        """
+        turn = MemoryTurn(time, observation, response, self.counter, self.turn_tokens)
+        with self._lock:
+            self._recent.append(turn)
+            while len(self._recent) > self.max_turns:
+                self._pending.append(self._recent.popleft())
+            if len(self._pending) < self.summarize_every:
+                return
+            if self._summarizing:
+                # A summary is in progress; if it lags far behind, cut the backlog
+                # down instead of letting it grow
+                if len(self._pending) >= 2 * self.summarize_every:
+                    self._compact(self._pending[:self.summarize_every])
+                    self._lagged.extend(self._pending[:self.summarize_every])
+                    del self._pending[:self.summarize_every]
+                return
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                loop = None
+            if self.summarizer is None or loop is None:
+                self._compact(self._pending)
+                self._pending.clear()
+                return
+            self._summarizing, self._pending = self._pending, []
+            self._task = loop.create_task(
+                self._summarize(self.summary, list(self._summarizing), self._generation)
+            )
+
+    def _compact(self, turns: list[MemoryTurn]) -> None:
+        """Append turns to the summary and keep its newest summary_tokens tokens (lock held)."""
+        lines = [self.summary] if self.summary else []
+        text = "\n".join(lines + [t.text for t in turns])
+        self.summary = self.counter.truncate(text, self.summary_tokens, keep_end=True)
+        self.summarized += len(turns)
+
+    async def _summarize(self, summary: str, batch: list[MemoryTurn], generation: int) -> None:
+        """Fold ``batch`` into ``summary`` (the summary when the task started)."""
+        try:
+            new_summary = await self.summarizer(summary, [t.text for t in batch])
+        except Exception as e:
+            print(f"Error summarizing memory: {e}")
+            new_summary = None
+        with self._lock:
+            if generation != self._generation:
+                # The state was replaced by import_state while the summarizer ran
+                return
+            if new_summary is None:
+                self.failed_summaries += 1
+                lines = ([summary] if summary else []) + [t.text for t in batch]
+            else:
+                lines = [self.counter.truncate(str(new_summary).strip(), self.summary_tokens)]
+            # Turns compacted while the summarizer lagged are newer than the batch
+            lines += [t.text for t in self._lagged]
+            self.summary = self.counter.truncate("\n".join(line for line in lines if line), self.summary_tokens, keep_end=True)
+            self.summarized += len(batch)
+            self._summarizing = []
+            self._lagged = []
+            self._task = None
+
+    async def wait_summarized(self) -> None:
+        """Wait for a background summarization, if one is running."""
+        task = self._task
+        if task is not None:
+            await asyncio.shield(task)
+
+    def render_sections(self, max_tokens: int) -> tuple[str, str]:
+        """
+        Render the summary and the recent turns as prompt text within a token budget.
+
+        The summary is rendered first and is only cut down if the budget is tiny.
+        The newest turns that still fit come next, in chronological order. Turns
+        waiting to be summarized are included too, so nothing drops out of the
+        prompt while the summarizer runs. The two parts are separate because the
+        summary changes far less often than the recent turns. That lets prompts
+        put it earlier, in the part that stays the same between calls.
+
+        Args:
+            max_tokens: Token budget for both texts together
+
+        Returns:
+            Tuple of (summary text, recent turns text); either is "" if empty
+        """
+        with self._lock:
+            summary = self.summary
+            turns = self._summarizing + self._pending + list(self._recent)
+        header = "Summary of earlier events:\n"
+        recent_header = "Recent events (oldest first):\n"
+        budget = max_tokens
+        summary_text = ""
+        if summary:
+            budget -= self.counter.count(header)
+            summary = self.counter.truncate(summary, budget, keep_end=True)
+            if summary:
+                summary_text = header + summary
+                budget -= self.counter.count(summary) + 1
+        budget -= self.counter.count(recent_header)
+        chosen = []
+        for turn in reversed(turns):
+            if turn.tokens + 1 > budget:
+                break
+            chosen.append(turn.text)
+            budget -= turn.tokens + 1
+        recent_text = recent_header + "\n".join(reversed(chosen)) if chosen else ""
+        return summary_text, recent_text
+
+    def render(self, max_tokens: int) -> str:
+        """
+        Render the memory as one prompt text within a token budget (see render_sections).
+
+        Args:
+            max_tokens: Token budget for the returned text
+
+        Returns:
+            Memory text, or "" if there is nothing to remember or no budget
+        """
+        return "\n\n".join(part for part in self.render_sections(max_tokens) if part)
+
+    def export_state(self) -> dict:
+        """Summary and unsummarized turns, as JSON-serializable data."""
+        with self._lock:
+            turns = self._summarizing + self._pending + list(self._recent)
+            return {
+                "summary": self.summary,
+                "summarized": self.summarized,
+                "turns": [[t.time, t.observation, t.response] for t in turns],
+            }
+
+    def import_state(self, state: dict) -> None:
+        """Restore state produced by export_state()."""
+        turns = [MemoryTurn(time, obs, resp, self.counter, self.turn_tokens) for time, obs, resp in state["turns"]]
+        with self._lock:
+            self.summary = state["summary"]
+            self.summarized = state["summarized"]
+            self._summarizing = []
+            self._lagged = []
+            self._task = None
+            self._generation += 1
+            self._pending = turns[:-self.max_turns] if len(turns) > self.max_turns else []
+            self._recent = deque(turns[-self.max_turns:])
+
+    def stats(self) -> MemoryStats:
+        with self._lock:
+            return MemoryStats(
+                recent=len(self._recent),
+                pending=len(self._pending) + len(self._summarizing),
+                summarized=self.summarized,
+                summary_tokens=self.counter.count(self.summary),
+                failed_summaries=self.failed_summaries,
+            )
+
+
+def create_conversation_memory(
+    config: Optional[MemoryConfig],
+    summarizer: Optional[Summarizer] = None,
+) -> Optional[ConversationMemory]:
+    """
+    Build a conversation memory from config.
+
+    Args:
+        config: Memory configuration (None = disabled)
+        summarizer: Async summarizer for older turns
+
+    Returns:
+        ConversationMemory, or None if memory is disabled
+    """
+    if config is None or not config.enabled:
+        return None
+    return ConversationMemory(
+        max_turns=config.max_turns,
+        turn_tokens=config.turn_tokens,
+        summarize_every=config.summarize_every,
+        summary_tokens=config.summary_tokens,
+        counter=TokenCounter(config.encoding),
+        summarizer=summarizer,
+    )
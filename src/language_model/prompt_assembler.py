@@ -0,0 +1,205 @@
+"""
+Prompt assembly ordered for provider prefix caching.
+
+OpenAI prompt caching and vLLM automatic prefix caching reuse work only for the
+exact leading bytes a prompt shares with earlier ones. PromptAssembler therefore
+lays out every prompt from the most stable content to the least stable:
+
+1. system: shared world rules, then the character's personality (identical on
+   every call, and the rules are identical across characters). The rules
+   describe the decision actions, so prompts that ask for something else can
+   leave them out (``rules=False``) and get the personality alone.
+2. summary: the conversation memory summary (changes every few turns)
+3. recent: recent turns (change every turn)
+4. recalled: episodes recalled for this observation
+5. observation: the live input blocks (world state, messages)
+
+Empty sections are left out rather than rendered as empty messages, and stable
+texts are normalized (line endings, surrounding whitespace) so the same content
+always renders to the same bytes. Each assembled prompt is compared with the
+previous one to measure how much of it a prefix cache could have reused.
+"""
+import threading
+from os.path import commonprefix
+from typing import Optional
+from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.prompt_values import ChatPromptValue
+from pydantic import BaseModel, Field
+from language_model.memory import MESSAGE_OVERHEAD_TOKENS, TokenCounter
+
+WORLD_RULES = """You live in LittleWorld, a 2D top-down world shared with other characters.
+Positions are in pixels: x grows to the east, y grows to the south.
+Each turn you get what you can see and choose exactly one action:
+- move: walk in direction (dx, dy), each -1, 0 or 1
+- stay: stand still
+- observe: look around within a radius in pixels
+- communicate: say a message, optionally to a target character by name
+- interact: interact with a target, with an interaction type"""
+
+SECTIONS = ("system", "summary", "recent", "recalled", "observation")
+
+
+def _normalize(text: str) -> str:
+    """Normalize line endings and surrounding whitespace so equal content renders identically."""
+    return text.replace("\r\n", "\n").replace("\r", "\n").strip()
+
+
+class PrefixStats(BaseModel):
+    """How much of each prompt repeated the previous prompt's leading bytes."""
+    prompts: int = Field(description="Prompts assembled")
+    total_tokens: int = Field(description="Tokens in all prompts")
+    reused_tokens: int = Field(description="Tokens in the prefix each prompt shared with the one before")
+    system_tokens: int = Field(description="Tokens in the system section (world rules + personality)")
+    section_changes: dict[str, int] = Field(description="Prompts in which each section differed from the previous prompt")
+
+    @property
+    def reuse_rate(self) -> float:
+        """Fraction of prompt tokens a prefix cache could have served."""
+        return self.reused_tokens / self.total_tokens if self.total_tokens else 0.0
+
+
+class PromptAssembler:
+    """Builds chat prompts in stable-to-volatile section order and tracks prefix reuse."""
+
+    def __init__(
+        self,
+        personality: str,
+        input_blocks: Optional[list[str]] = None,
+        world_rules: Optional[str] = WORLD_RULES,
+        counter: Optional[TokenCounter] = None,
+    ):
+        """
+        Initialize prompt assembler.
+
+        Args:
+            personality: Personality prompt text
+            input_blocks: Observation message templates, formatted with str.format
+                          from the prompt variables (e.g. "{world_state}")
+            world_rules: Rules shared by every character (None or "" = no rules)
+            counter: Token counter for stats. If None, estimates tokens from text length.
+        """
+        self.input_blocks = input_blocks or []
+        self.system_text = "\n\n".join(_normalize(t) for t in (world_rules or "", personality or "") if t.strip())
+        self.personality_text = _normalize(personality or "")
+        self.counter = counter or TokenCounter(None)
+        self.system_tokens = self.counter.count(self.system_text) + MESSAGE_OVERHEAD_TOKENS
+        self._personality_tokens = self.counter.count(self.personality_text) + MESSAGE_OVERHEAD_TOKENS
+        self.last_tokens = 0
+        self._previous: list[tuple[str, str]] = []
+        self._prompts = 0
+        self._total_tokens = 0
+        self._reused_tokens = 0
+        self._section_changes = dict.fromkeys(SECTIONS, 0)
+        self._lock = threading.Lock()
+
+    def sections(
+        self,
+        variables: dict,
+        summary: str = "",
+        recent: str = "",
+        recalled: str = "",
+        rules: bool = True,
+    ) -> list[tuple[str, str]]:
+        """
+        Lay out the prompt sections.
+
+        Args:
+            variables: Values for the input block placeholders
+            summary: Memory summary text
+            recent: Recent turns text
+            recalled: Recalled episodes text
+            rules: Start the system section with the world rules
+
+        Returns:
+            (section name, text) pairs in prompt order, empty sections left out.
+            The observation section has one entry per input block.
+        """
+        sections = [("system", self.system_text if rules else self.personality_text)]
+        for name, text in (("summary", summary), ("recent", recent), ("recalled", recalled)):
+            text = _normalize(text)
+            if text:
+                sections.append((name, text))
+        sections += [("observation", block.format_map(variables)) for block in self.input_blocks]
+        return sections
+
+    def render(
+        self, variables: dict, summary: str = "", recent: str = "", recalled: str = "", rules: bool = True
+    ) -> ChatPromptValue:
+        """Build the prompt without recording stats (see sections for the arguments)."""
+        return self._to_prompt(self.sections(variables, summary, recent, recalled, rules))
+
+    def invoke(self, variables: dict) -> ChatPromptValue:
+        """Build the prompt from variables alone (same call as ChatPromptTemplate.invoke)."""
+        return self.render(variables)
+
+    def _system_tokens(self, rules: bool) -> int:
+        return self.system_tokens if rules else self._personality_tokens
+
+    def fixed_tokens(self, variables: dict, rules: bool = True) -> int:
+        """Tokens in the system and observation sections, i.e. everything memory can't shrink."""
+        return self._system_tokens(rules) + sum(
+            self.counter.count(text) + MESSAGE_OVERHEAD_TOKENS
+            for name, text in self.sections(variables) if name == "observation"
+        )
+
+    def assemble(
+        self, variables: dict, summary: str = "", recent: str = "", recalled: str = "", rules: bool = True
+    ) -> ChatPromptValue:
+        """
+        Build the prompt and record how much of it repeats the previous prompt.
+
+        Args:
+            variables: Values for the input block placeholders
+            summary: Memory summary text
+            recent: Recent turns text
+            recalled: Recalled episodes text
+            rules: Start the system section with the world rules
+
+        Returns:
+            Prompt (ChatPromptValue)
+        """
+        sections = self.sections(variables, summary, recent, recalled, rules)
+        tokens = [
+            self._system_tokens(rules) if name == "system" else self.counter.count(text) + MESSAGE_OVERHEAD_TOKENS
+            for name, text in sections
+        ]
+        with self._lock:
+            previous = self._previous
+            reused = 0
+            for i, section in enumerate(sections):
+                if i < len(previous) and previous[i] == section:
+                    reused += tokens[i]
+                    continue
+                if i < len(previous) and previous[i][0] == section[0]:
+                    # Same kind of message: the shared leading characters still count
+                    reused += self.counter.count(commonprefix([previous[i][1], section[1]]))
+                break
+            before = {name: [t for n, t in previous if n == name] for name in SECTIONS}
+            after = {name: [t for n, t in sections if n == name] for name in SECTIONS}
+            if previous:
+                for name in SECTIONS:
+                    if before[name] != after[name]:
+                        self._section_changes[name] += 1
+            self._previous = sections
+            self._prompts += 1
+            self._total_tokens += sum(tokens)
+            self._reused_tokens += reused
+            self.last_tokens = sum(tokens)
+        return self._to_prompt(sections)
+
+    @staticmethod
+    def _to_prompt(sections: list[tuple[str, str]]) -> ChatPromptValue:
+        return ChatPromptValue(messages=[
+            SystemMessage(content=text) if name == "system" else HumanMessage(content=text)
+            for name, text in sections
+        ])
+
+    def stats(self) -> PrefixStats:
+        with self._lock:
+            return PrefixStats(
+                prompts=self._prompts,
+                total_tokens=self._total_tokens,
+                reused_tokens=self._reused_tokens,
+                system_tokens=self.system_tokens,
+                section_changes=dict(self._section_changes),
+            )
@@ -0,0 +1,117 @@
+"""
+Process-wide registry of LLM provider clients.
+
+Characters that talk to the same endpoint share one client and one pooled httpx
+connection pool instead of opening a pool (and TLS handshake) per character.
+"""
+import threading
+from typing import Any, Callable, Hashable, Optional
+import httpx
+
+
+class ClientRegistry:
+    """
+    Caches provider clients by (provider, base_url, model) and httpx pools by (provider, base_url).
+
+    httpx.AsyncClient connections belong to the event loop that opened them, so shared
+    clients should be used from a single loop (the DecisionScheduler's).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clients: dict[Hashable, Any] = {}
+        self._http_clients: dict[Hashable, httpx.AsyncClient] = {}
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def http_client(
+        self,
+        provider: str,
+        base_url: Optional[str],
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 60.0,
+    ) -> httpx.AsyncClient:
+        """
+        Get the shared pooled httpx client for an endpoint, creating it on first use.
+
+        Pool settings only apply when the client is created; later callers share it as is.
+
+        Args:
+            provider: Provider name
+            base_url: Endpoint base URL (None for the provider default)
+            max_connections: Maximum open connections in the pool
+            max_keepalive_connections: Maximum idle keep-alive connections
+            keepalive_expiry: Seconds an idle connection is kept alive
+            timeout: Request timeout in seconds
+
+        Returns:
+            Shared httpx.AsyncClient
+        """
+        key = (provider, base_url)
+        with self._lock:
+            client = self._http_clients.get(key)
+            if client is None or client.is_closed:
+                client = httpx.AsyncClient(
+                    limits=httpx.Limits(
+                        max_connections=max_connections,
+                        max_keepalive_connections=max_keepalive_connections,
+                        keepalive_expiry=keepalive_expiry,
+                    ),
+                    timeout=timeout,
+                )
+                self._http_clients[key] = client
+            return client
+
+    def get_or_create(
+        self,
+        provider: str,
+        base_url: Optional[str],
+        model: str,
+        factory: Callable[[], Any],
+    ) -> Any:
+        """
+        Get the shared client for (provider, base_url, model), creating it with ``factory``.
+
+        Args:
+            provider: Provider name
+            base_url: Endpoint base URL (None for the provider default)
+            model: Model name
+            factory: Zero-argument callable that builds the client
+
+        Returns:
+            Shared client instance
+        """
+        key = (provider, base_url, model)
+        with self._lock:
+            client = self._clients.get(key)
+        if client is not None:
+            return client
+        client = factory()
+        with self._lock:
+            # Another thread may have won the race; keep the first client
+            return self._clients.setdefault(key, client)
+
+    async def aclose(self) -> None:
+        """Close every pooled connection and forget all cached clients."""
+        with self._lock:
+            http_clients = list(self._http_clients.values())
+            self._http_clients.clear()
+            self._clients.clear()
+        for client in http_clients:
+            await client.aclose()
+
+
+_registry: Optional[ClientRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_client_registry() -> ClientRegistry:
+    """Return the process-wide client registry, creating it on first use."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ClientRegistry()
+        return _registry
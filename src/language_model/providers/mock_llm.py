@@ -0,0 +1,243 @@
+"""
+Offline mock LLM provider for load testing.
+
+MockLLM stands in for a provider client (like AsyncOpenAI for vLLM): it sleeps
+for a latency drawn from a configurable distribution, fails a configurable
+fraction of requests, and answers with text, tool calls or a valid instance of
+the requested structured-output schema (random Decisions for Decision). Nothing
+leaves the process, so the scheduler, dispatcher, cache and memory can be load
+tested on a laptop.
+
+Replies are a function of the prompt and the seed, so identical prompts get
+identical replies (as coalescing and caching assume). Latencies, errors and
+reply lengths come from one seeded generator and repeat for the same sequence
+of requests.
+"""
+import asyncio
+import enum
+import math
+import random
+import types
+import typing
+import zlib
+from typing import Any, AsyncIterator, Optional
+from langchain_core.messages import AIMessage
+from pydantic import BaseModel, Field
+from config import MockLLMConfig
+from decisions import ActionType, Decision
+from language_model.dispatcher import message_fingerprint
+from language_model.memory import TokenCounter
+
+# One-token words used to pad replies to the drawn token count
+_WORDS = (
+    "hello", "there", "tree", "walk", "north", "south", "east", "west",
+    "nice", "day", "see", "you", "later", "friend", "look", "here",
+)
+# Relative frequency of each action in mock decisions
+_ACTION_WEIGHTS = {
+    ActionType.MOVE: 5,
+    ActionType.STAY: 2,
+    ActionType.COMMUNICATE: 2,
+    ActionType.OBSERVE: 1,
+}
+
+
+class MockLLMError(RuntimeError):
+    """Simulated provider failure."""
+
+
+class MockLLMStats(BaseModel):
+    """Snapshot of mock provider counters."""
+    requests: int = Field(description="Requests received (including failed ones)")
+    failed: int = Field(description="Requests that raised MockLLMError")
+    input_tokens: int = Field(description="Prompt tokens received")
+    output_tokens: int = Field(description="Tokens generated")
+    mean_latency_seconds: float = Field(description="Average simulated latency per request")
+
+
+def _placeholder(annotation: Any, rng: random.Random) -> Any:
+    """A valid value for a required field of a generic structured-output schema."""
+    origin = typing.get_origin(annotation)
+    if origin in (typing.Union, types.UnionType):
+        args = [a for a in typing.get_args(annotation) if a is not type(None)]
+        return _placeholder(args[0], rng) if args else None
+    if origin is typing.Literal:
+        return rng.choice(typing.get_args(annotation))
+    if origin in (list, set, tuple, dict):
+        return origin()
+    if isinstance(annotation, type):
+        if issubclass(annotation, enum.Enum):
+            return rng.choice(list(annotation))
+        if issubclass(annotation, BaseModel):
+            return _fill_schema(annotation, rng)
+        if issubclass(annotation, bool):
+            return rng.random() < 0.5
+        if issubclass(annotation, (int, float)):
+            return annotation(rng.randint(0, 10))
+        if issubclass(annotation, str):
+            return rng.choice(_WORDS)
+    raise TypeError(f"Mock provider cannot fill a field of type {annotation!r}")
+
+
+def _fill_schema(schema: type[BaseModel], rng: random.Random) -> BaseModel:
+    """Instance of ``schema`` with its required fields filled in (defaults elsewhere)."""
+    values = {
+        name: _placeholder(field.annotation, rng)
+        for name, field in schema.model_fields.items()
+        if field.is_required()
+    }
+    return schema.model_validate(values)
+
+
+class MockLLM:
+    """Simulated provider client with configurable latency, errors and reply length."""
+
+    def __init__(self, config: Optional[MockLLMConfig] = None, counter: Optional[TokenCounter] = None):
+        """
+        Initialize mock provider.
+
+        Args:
+            config: Mock behaviour. If None, uses MockLLMConfig defaults
+            counter: Counts prompt tokens. If None, estimates 4 characters per token
+        """
+        self.config = config or MockLLMConfig()
+        self.counter = counter or TokenCounter(None)
+        self._rng = random.Random(self.config.seed)
+        self.requests = 0
+        self.failed = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.total_latency = 0.0
+
+    def sample_latency(self) -> float:
+        """Draw a time to the first token in seconds."""
+        config = self.config
+        mean, spread = config.latency_ms, config.latency_spread_ms
+        if config.latency == "fixed" or mean == 0:
+            value = mean
+        elif config.latency == "uniform":
+            value = self._rng.uniform(mean - spread, mean + spread)
+        elif config.latency == "normal":
+            value = self._rng.gauss(mean, spread)
+        elif config.latency == "lognormal":
+            # Parameters chosen so the distribution has the configured mean and spread
+            sigma2 = math.log1p((spread / mean) ** 2)
+            value = self._rng.lognormvariate(math.log(mean) - sigma2 / 2, sigma2 ** 0.5)
+        else:
+            value = self._rng.expovariate(1.0 / mean)
+        return max(value, 0.0) / 1000.0
+
+    def sample_output_tokens(self) -> int:
+        """Draw the number of tokens to generate."""
+        spread = self.config.output_tokens_spread
+        return max(1, self.config.output_tokens + self._rng.randint(-spread, spread))
+
+    async def _begin(self, messages) -> tuple[random.Random, int, int, float]:
+        """
+        Count a request and draw its behaviour.
+
+        Returns:
+            Reply generator (seeded from the prompt), prompt tokens, tokens to
+            generate and latency in seconds (not slept yet)
+
+        Raises:
+            MockLLMError: For the configured fraction of requests, after waiting
+                          for the time to the first token
+        """
+        fingerprint = message_fingerprint(messages)
+        prompt = messages.to_messages() if hasattr(messages, "to_messages") else messages
+        input_tokens = self.counter.count_messages(prompt if isinstance(prompt, list) else [str(prompt)])
+        self.requests += 1
+        self.input_tokens += input_tokens
+        tokens = self.sample_output_tokens()
+        first_token = self.sample_latency()
+        if self._rng.random() < self.config.error_rate:
+            # A failed request costs the time to the first token but generates nothing
+            self.failed += 1
+            self.total_latency += first_token
+            await asyncio.sleep(first_token)
+            raise MockLLMError(f"Simulated provider error (request {self.requests})")
+        latency = first_token + tokens * self.config.per_token_ms / 1000.0
+        self.total_latency += latency
+        self.output_tokens += tokens
+        seed = zlib.crc32(repr(fingerprint).encode()) ^ self.config.seed
+        return random.Random(seed), input_tokens, tokens, latency
+
+    @staticmethod
+    def _text(rng: random.Random, tokens: int) -> str:
+        return " ".join(rng.choice(_WORDS) for _ in range(tokens))
+
+    def _decision(self, rng: random.Random, tokens: int) -> Decision:
+        action = rng.choices(list(_ACTION_WEIGHTS), weights=list(_ACTION_WEIGHTS.values()))[0]
+        if action == ActionType.MOVE:
+            dx, dy = rng.choice([(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy])
+            return Decision(type=action, dx=dx, dy=dy)
+        if action == ActionType.COMMUNICATE:
+            return Decision(type=action, message=self._text(rng, tokens).capitalize())
+        if action == ActionType.OBSERVE:
+            return Decision(type=action, radius=float(rng.randrange(100, 301, 50)))
+        return Decision(type=action)
+
+    async def complete(self, messages, schema=None, tools=None) -> Any:
+        """
+        Answer a prompt after a simulated delay.
+
+        Args:
+            messages: Rendered prompt (PromptValue or list of messages)
+            schema: Structured output schema (pydantic model class), or None
+            tools: Tool definitions (OpenAI format), or None
+
+        Returns:
+            Instance of ``schema`` if given; otherwise an AIMessage calling one of
+            ``tools`` if given, or an AIMessage with text
+
+        Raises:
+            MockLLMError: For the configured fraction of requests (after the
+                          time to the first token)
+        """
+        rng, input_tokens, tokens, latency = await self._begin(messages)
+        await asyncio.sleep(latency)
+        if isinstance(schema, type) and issubclass(schema, Decision):
+            return self._decision(rng, tokens)
+        if schema is not None:
+            return _fill_schema(schema, rng)
+        usage = {"input_tokens": input_tokens, "output_tokens": tokens, "total_tokens": input_tokens + tokens}
+        if tools:
+            tool = rng.choice(list(tools))
+            function = tool.get("function", tool) if isinstance(tool, dict) else tool
+            name = function.get("name") if isinstance(function, dict) else getattr(function, "name", str(function))
+            call = {"name": name, "args": {}, "id": f"call_{self.requests}"}
+            return AIMessage(content="", tool_calls=[call], usage_metadata=usage)
+        return AIMessage(content=self._text(rng, tokens), usage_metadata=usage)
+
+    async def stream(self, messages) -> AsyncIterator[str]:
+        """
+        Stream a text reply: nothing until the time to the first token, then one
+        word every ``per_token_ms``.
+
+        Args:
+            messages: Rendered prompt
+
+        Yields:
+            Text chunks
+
+        Raises:
+            MockLLMError: For the configured fraction of requests
+        """
+        rng, _, tokens, latency = await self._begin(messages)
+        per_token = self.config.per_token_ms / 1000.0
+        await asyncio.sleep(latency - tokens * per_token)
+        for i in range(tokens):
+            if per_token:
+                await asyncio.sleep(per_token)
+            yield ("" if i == 0 else " ") + rng.choice(_WORDS)
+
+    def stats(self) -> MockLLMStats:
+        """Return a snapshot of the request counters."""
+        return MockLLMStats(
+            requests=self.requests,
+            failed=self.failed,
+            input_tokens=self.input_tokens,
+            output_tokens=self.output_tokens,
+            mean_latency_seconds=self.total_latency / self.requests if self.requests else 0.0,
+        )
@@ -7,20 +7,47 @@ from langchain_core.runnables import Runnable
 from openai import OpenAI, AsyncOpenAI
 from dotenv import load_dotenv
 from config.enum import Provider
+from language_model.providers.client_registry import get_client_registry
+from language_model.providers.mock_llm import MockLLM
+
+DEFAULT_VLLM_BASE_URL = "http://localhost:8000/v1"
+
 
 def create_llm_instance(config) -> Runnable:
+    """
+    Get the provider client for an LLM config.
+
+    Clients are shared process-wide per (provider, base_url, model) and reuse one
+    pooled HTTP client per endpoint, so many characters do not open many pools.
+    """
     load_dotenv()
     provider = config.type.lower()
     model_name = config.version
+    registry = get_client_registry()
 
     if provider == Provider.OPENAI:
-        api_key = os.getenv("OPENAI_API_KEY")   
-        return ChatOpenAI(
-            model=model_name,
-            temperature=0,
-            max_tokens=None,
-            max_retries=2,
-            api_key=api_key
+        api_key = os.getenv("OPENAI_API_KEY")
+        base_url = config.base_url
+        http_client = registry.http_client(
+            provider,
+            base_url,
+            max_connections=config.max_connections,
+            max_keepalive_connections=config.max_keepalive_connections,
+            keepalive_expiry=config.keepalive_expiry,
+        )
+        return registry.get_or_create(
+            provider,
+            base_url,
+            model_name,
+            lambda: ChatOpenAI(
+                model=model_name,
+                temperature=0,
+                max_tokens=None,
+                max_retries=2,
+                api_key=api_key,
+                base_url=base_url,
+                http_async_client=http_client,
+            ),
         )
 
     # elif provider == Provider.GOOGLE:
@@ -29,12 +56,30 @@ def create_llm_instance(config) -> Runnable:
 
     elif provider == Provider.VLLM:
         api_key = "thekey" # put into env
-        openai_api_base = "http://localhost:8000/v1" # put into env
+        openai_api_base = config.base_url or DEFAULT_VLLM_BASE_URL
+        http_client = registry.http_client(
+            provider,
+            openai_api_base,
+            max_connections=config.max_connections,
+            max_keepalive_connections=config.max_keepalive_connections,
+            keepalive_expiry=config.keepalive_expiry,
+        )
 
-        return AsyncOpenAI(
-            api_key=api_key,
-            base_url=openai_api_base,
+        # AsyncOpenAI is model-agnostic, so one client serves every model on the server
+        return registry.get_or_create(
+            provider,
+            openai_api_base,
+            None,
+            lambda: AsyncOpenAI(
+                api_key=api_key,
+                base_url=openai_api_base,
+                http_client=http_client,
+            ),
         )
 
+    elif provider == Provider.MOCK:
+        # Offline stand-in for load tests; each config gets its own seeded generator
+        return MockLLM(config.mock)
+
     else:
         raise ValueError(f"Unsupported LLM provider: {provider}")
@@ -0,0 +1,226 @@
+"""
+Prompt-response caches for AI model engines.
+
+Responses are keyed on the fully rendered prompt, so characters that see the same
+(quantized) scene reuse an earlier answer instead of calling the LLM again.
+"""
+import hashlib
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional
+from pydantic import BaseModel, Field
+from config.models.character_config import ResponseCacheConfig
+
+
+class CacheStats(BaseModel):
+    """Hit/miss counters for a response cache."""
+    hits: int = Field(description="Lookups answered from the cache")
+    misses: int = Field(description="Lookups that had to call the LLM")
+    entries: int = Field(description="Entries currently stored")
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def make_cache_key(messages: Any, model: str, schema: Any = None) -> str:
+    """
+    Build a cache key from a rendered prompt.
+
+    Args:
+        messages: Rendered ChatPromptTemplate output (PromptValue) or list of messages
+        model: Model name/version
+        schema: Structured output schema, if any
+
+    Returns:
+        Hex SHA-256 digest identifying the request
+    """
+    if hasattr(messages, "to_messages"):
+        messages = messages.to_messages()
+    digest = hashlib.sha256()
+    digest.update(model.encode())
+    digest.update(b"\0")
+    digest.update(getattr(schema, "__qualname__", repr(schema)).encode())
+    for message in messages if isinstance(messages, list) else [messages]:
+        digest.update(b"\0")
+        digest.update(str(getattr(message, "type", "")).encode())
+        digest.update(b"\0")
+        digest.update(str(getattr(message, "content", message)).encode())
+    return digest.hexdigest()
+
+
+class ResponseCache:
+    """Base class for response caches; subclasses implement _get/_set/__len__."""
+
+    def __init__(self, ttl_seconds: Optional[float] = None):
+        """
+        Initialize cache.
+
+        Args:
+            ttl_seconds: Entry lifetime in seconds (None = never expires)
+        """
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+
+    def _expiry(self) -> Optional[float]:
+        return time.time() + self.ttl_seconds if self.ttl_seconds else None
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached response for ``key`` (counting a hit or miss)."""
+        value = self._get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a response under ``key``."""
+        if value is not None:
+            self._set(key, value)
+
+    def stats(self) -> CacheStats:
+        return CacheStats(hits=self.hits, misses=self.misses, entries=len(self))
+
+    def _get(self, key: str) -> Optional[Any]:
+        raise NotImplementedError
+
+    def _set(self, key: str, value: Any) -> None:
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+
+class InMemoryResponseCache(ResponseCache):
+    """Thread-safe LRU cache with optional TTL."""
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: Optional[float] = None):
+        """
+        Initialize in-memory cache.
+
+        Args:
+            max_entries: Entries kept before the least recently used is evicted
+            ttl_seconds: Entry lifetime in seconds (None = never expires)
+        """
+        super().__init__(ttl_seconds)
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[Optional[float], Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def _set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (self._expiry(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class SQLiteResponseCache(ResponseCache):
+    """On-disk cache in a SQLite file, shared across runs."""
+
+    def __init__(self, path: str | Path, max_entries: int = 100_000, ttl_seconds: Optional[float] = None):
+        """
+        Initialize SQLite cache.
+
+        Args:
+            path: Database file path (created if missing)
+            max_entries: Entries kept before the oldest are evicted
+            ttl_seconds: Entry lifetime in seconds (None = never expires)
+        """
+        super().__init__(ttl_seconds)
+        self.max_entries = max_entries
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, "
+            "expires_at REAL, created_at REAL NOT NULL)"
+        )
+        # Eviction takes the oldest rows without sorting the table
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_created_at ON responses (created_at)")
+        self._conn.commit()
+        self._count = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def _get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, expires_at = row
+            if expires_at is not None and expires_at < time.time():
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                self._count -= 1
+                return None
+        return pickle.loads(value)
+
+    def _set(self, key: str, value: Any) -> None:
+        blob = pickle.dumps(value)
+        with self._lock:
+            exists = self._conn.execute("SELECT 1 FROM responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, expires_at, created_at) VALUES (?, ?, ?, ?)",
+                (key, blob, self._expiry(), time.time()),
+            )
+            if exists is None:
+                self._count += 1
+            if self._count > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    "SELECT key FROM responses ORDER BY created_at LIMIT ?)",
+                    (self._count - self.max_entries,),
+                )
+                self._count = self.max_entries
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def create_response_cache(config: Optional[ResponseCacheConfig]) -> Optional[ResponseCache]:
+    """
+    Build a response cache from config.
+
+    Args:
+        config: Cache configuration. If None or disabled, no cache is used.
+
+    Returns:
+        ResponseCache instance, or None
+    """
+    if config is None or not config.enabled:
+        return None
+    if config.backend == "sqlite":
+        return SQLiteResponseCache(config.sqlite_path, config.max_entries, config.ttl_seconds)
+    return InMemoryResponseCache(config.max_entries, config.ttl_seconds)
@@ -1,9 +1,27 @@
+import argparse
 from world import World
 
 
-def main():
-    world = World()
-    world.run()
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the LittleWorld simulation.")
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="Run without a window or rendering, as fast as possible",
+    )
+    parser.add_argument(
+        "--ticks",
+        type=int,
+        default=None,
+        help="Stop after this many ticks (default: run until quit)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    world = World(headless=args.headless)
+    world.run(max_ticks=args.ticks)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,329 @@
+"""
+Append-only log of AI decisions, observations and LLM call latencies.
+
+Logging calls only put a tuple on a queue, so they never block the game loop on
+disk I/O. A background thread drains the queue and writes records in batches
+(one transaction per batch for SQLite, one write per batch for JSONL). When the
+writer falls behind by ``max_queue`` records, new records are dropped and counted
+instead of growing memory without bound.
+
+Records go to three tables (SQLite) or carry a "kind" field (JSONL):
+
+- decisions: sim_time, wall_time, character_id, character, type, dx, dy, radius,
+  target, message, interaction_type
+- observations: sim_time, wall_time, character_id, character, summary
+- llm_calls: sim_time, wall_time, character_id, character, kind, latency_ms, ok
+"""
+import json
+import queue
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+from pydantic import BaseModel, Field
+from config import ActionLogConfig
+from decisions import Decision
+
+COLUMNS = {
+    "decisions": (
+        "sim_time", "wall_time", "character_id", "character", "type", "dx", "dy",
+        "radius", "target", "message", "interaction_type",
+    ),
+    "observations": ("sim_time", "wall_time", "character_id", "character", "summary"),
+    "llm_calls": ("sim_time", "wall_time", "character_id", "character", "kind", "latency_ms", "ok"),
+}
+_SQL_TYPES = {
+    "sim_time": "REAL", "wall_time": "REAL", "character_id": "INTEGER", "dx": "INTEGER",
+    "dy": "INTEGER", "radius": "REAL", "latency_ms": "REAL", "ok": "INTEGER",
+}
+
+
+class _Flush:
+    """Queue marker: set ``done`` once everything queued before it is written."""
+
+    __slots__ = ("done", "stop")
+
+    def __init__(self, stop: bool = False):
+        self.done = threading.Event()
+        self.stop = stop  # Also stop the writer thread
+
+
+class ActionLogStats(BaseModel):
+    """Counters for an action log."""
+    logged: int = Field(description="Records accepted by log_* calls")
+    written: int = Field(description="Records written to storage")
+    dropped: int = Field(description="Records dropped because the queue was full")
+    batches: int = Field(description="Batches written")
+
+
+class ActionLogWriter:
+    """Storage backend; only ever called from the log's writer thread."""
+
+    def write(self, batch: dict[str, list[tuple]]) -> None:
+        """
+        Append one batch of records.
+
+        Args:
+            batch: Table name -> rows (tuples ordered like COLUMNS[table])
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class SQLiteActionWriter(ActionLogWriter):
+    """Writes each batch in one transaction to a SQLite database in WAL mode."""
+
+    def __init__(self, path: str | Path):
+        """
+        Open (or create) the database.
+
+        Args:
+            path: Database file path
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        for table, columns in COLUMNS.items():
+            definition = ", ".join(f"{c} {_SQL_TYPES.get(c, 'TEXT')}" for c in columns)
+            self._conn.execute(f"CREATE TABLE IF NOT EXISTS {table} ({definition})")
+        self._conn.commit()
+        self._inserts = {
+            table: f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+            for table, columns in COLUMNS.items()
+        }
+
+    def write(self, batch: dict[str, list[tuple]]) -> None:
+        with self._conn:
+            for table, rows in batch.items():
+                self._conn.executemany(self._inserts[table], rows)
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class JSONLActionWriter(ActionLogWriter):
+    """Appends JSON lines to numbered segment files, starting a new one every ``segment_records``."""
+
+    def __init__(self, directory: str | Path, segment_records: int = 100_000):
+        """
+        Open the next segment in a directory.
+
+        Args:
+            directory: Directory for segment files (created if missing)
+            segment_records: Records per segment file
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_records = segment_records
+        existing = [int(p.stem.split("-")[-1]) for p in self.directory.glob("actions-*.jsonl")]
+        # Never append to an earlier run's segments
+        self._segment = max(existing, default=0)
+        self._file = None
+        self._records_in_segment = segment_records
+
+    @property
+    def segment_path(self) -> Path:
+        return self.directory / f"actions-{self._segment:06d}.jsonl"
+
+    def write(self, batch: dict[str, list[tuple]]) -> None:
+        lines = [
+            json.dumps({"kind": table, **dict(zip(COLUMNS[table], row))}, separators=(",", ":"))
+            for table, rows in batch.items()
+            for row in rows
+        ]
+        while lines:
+            if self._records_in_segment >= self.segment_records:
+                if self._file is not None:
+                    self._file.close()
+                self._segment += 1
+                self._file = open(self.segment_path, "a", encoding="utf-8")
+                self._records_in_segment = 0
+            room = self.segment_records - self._records_in_segment
+            chunk, lines = lines[:room], lines[room:]
+            self._file.write("\n".join(chunk) + "\n")
+            self._records_in_segment += len(chunk)
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class ActionLog:
+    """
+    Non-blocking, batched, append-only record of what AI characters did.
+
+    Call the log_* methods from the game loop thread; storage is written on a
+    background thread.
+    """
+
+    def __init__(
+        self,
+        writer: ActionLogWriter,
+        batch_size: int = 512,
+        flush_interval: float = 0.5,
+        max_queue: int = 100_000,
+    ):
+        """
+        Start the background writer thread.
+
+        Args:
+            writer: Storage backend
+            batch_size: Records written per batch
+            flush_interval: Seconds before a partial batch is written
+            max_queue: Records waiting to be written before new ones are dropped
+        """
+        self.writer = writer
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: queue.Queue = queue.Queue(max_queue)
+        self.logged = 0
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="action-log-writer", daemon=True)
+        self._thread.start()
+
+    def _put(self, table: str, row: tuple) -> None:
+        if self._closed:
+            return
+        try:
+            self._queue.put_nowait((table, row))
+            self.logged += 1
+        except queue.Full:
+            self.dropped += 1
+
+    def log_decision(self, sim_time: float, character: Any, decision: Decision) -> None:
+        """
+        Record a decision.
+
+        Args:
+            sim_time: Simulation time of the observation the decision answers
+            character: Deciding character
+            decision: The decision
+        """
+        self._put("decisions", (
+            sim_time, time.time(), getattr(character, "entity_id", None), getattr(character, "name", None),
+            decision.type.value, decision.dx, decision.dy, decision.radius,
+            decision.target, decision.message, decision.interaction_type,
+        ))
+
+    def log_observation(self, sim_time: float, character: Any, summary: str) -> None:
+        """
+        Record what a character observed before deciding.
+
+        Args:
+            sim_time: Simulation time of the observation
+            character: Observing character
+            summary: Short text summary (e.g. the observation delta)
+        """
+        self._put("observations", (
+            sim_time, time.time(), getattr(character, "entity_id", None), getattr(character, "name", None),
+            summary,
+        ))
+
+    def log_llm_call(self, sim_time: float, character: Any, kind: str, latency: float, ok: bool = True) -> None:
+        """
+        Record the latency of an LLM call.
+
+        Args:
+            sim_time: Simulation time the call was made
+            character: Character the call was for
+            kind: What the call was for (e.g. "decision")
+            latency: Seconds from dispatch to result
+            ok: False if the call raised
+        """
+        self._put("llm_calls", (
+            sim_time, time.time(), getattr(character, "entity_id", None), getattr(character, "name", None),
+            kind, latency * 1000.0, int(ok),
+        ))
+
+    def _run(self) -> None:
+        get = self._queue.get
+        while True:
+            batch: dict[str, list[tuple]] = {}
+            count = 0
+            flushes = []
+            stop = False
+            deadline = None
+            while count < self.batch_size:
+                timeout = None if deadline is None else max(deadline - time.monotonic(), 0.0)
+                try:
+                    item = get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if isinstance(item, _Flush):
+                    flushes.append(item)
+                    stop = item.stop
+                    break
+                table, row = item
+                batch.setdefault(table, []).append(row)
+                count += 1
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+            if batch:
+                try:
+                    self.writer.write(batch)
+                    self.written += count
+                    self.batches += 1
+                except Exception as e:
+                    print(f"Error writing action log: {e}")
+            for marker in flushes:
+                marker.done.set()
+            if stop:
+                return
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """
+        Wait until every record logged so far is written.
+
+        Args:
+            timeout: Seconds to wait
+
+        Returns:
+            True if everything was written in time
+        """
+        if not self._thread.is_alive():
+            return False
+        marker = _Flush()
+        self._queue.put(marker)
+        return marker.done.wait(timeout)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Write everything still queued, stop the writer thread and close storage."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread.is_alive():
+            self._queue.put(_Flush(stop=True))
+            self._thread.join(timeout)
+        self.writer.close()
+
+    def stats(self) -> ActionLogStats:
+        return ActionLogStats(logged=self.logged, written=self.written, dropped=self.dropped, batches=self.batches)
+
+
+def create_action_log(config: ActionLogConfig) -> Optional[ActionLog]:
+    """
+    Build an action log from config.
+
+    Args:
+        config: Action log configuration
+
+    Returns:
+        ActionLog, or None if logging is disabled
+    """
+    if not config.enabled:
+        return None
+    if config.backend == "jsonl":
+        writer = JSONLActionWriter(config.path, config.segment_records)
+    else:
+        writer = SQLiteActionWriter(config.path)
+    return ActionLog(writer, config.batch_size, config.flush_interval, config.max_queue)
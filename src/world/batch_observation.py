@@ -0,0 +1,223 @@
+"""
+Vectorized observation building for many observers at once.
+
+Distances, vision masks, direction buckets and world bounds are computed with NumPy
+over contiguous position arrays. Pydantic ``WorldState``/``VisibleCharacter`` objects
+are only built when an observation is actually read.
+"""
+from typing import Optional, Sequence
+import numpy as np
+from .world_state import WorldState, VisibleCharacter, WorldBounds
+
+# Direction buckets in the same order as calculate_direction's 45° sectors
+# (0° = east, 90° = south), plus "here" for near-zero offsets.
+DIRECTIONS = np.array([
+    "east", "south-east", "south", "south-west",
+    "west", "north-west", "north", "north-east", "here",
+])
+HERE_INDEX = 8
+HERE_THRESHOLD = 0.1
+
+# Upper bound on observer x target pairs materialized per chunk (~16 MB of float64 offsets)
+MAX_PAIRS_PER_CHUNK = 1_000_000
+
+
+def direction_indices(dx: np.ndarray, dy: np.ndarray) -> np.ndarray:
+    """
+    Vectorized calculate_direction: map offsets to indices into DIRECTIONS.
+
+    Args:
+        dx: Delta x array (positive = east)
+        dy: Delta y array (positive = south)
+
+    Returns:
+        Integer array of direction indices
+    """
+    angle = np.degrees(np.arctan2(dy, dx)) % 360.0
+    indices = ((angle + 22.5) // 45.0).astype(np.intp) % 8
+    here = (np.abs(dx) < HERE_THRESHOLD) & (np.abs(dy) < HERE_THRESHOLD)
+    indices[here] = HERE_INDEX
+    return indices
+
+
+class ObservationBatch:
+    """
+    Observations for a batch of observers, stored as flat arrays.
+
+    Visible pairs are kept in CSR layout: the targets seen by observer ``i`` are
+    ``target_indices[offsets[i]:offsets[i + 1]]``. Indexing the batch materializes
+    (and caches) the corresponding ``WorldState``.
+    """
+
+    def __init__(
+        self,
+        observer_positions: np.ndarray,
+        vision_radii: np.ndarray,
+        offsets: np.ndarray,
+        target_indices: np.ndarray,
+        relative: np.ndarray,
+        distances: np.ndarray,
+        directions: np.ndarray,
+        bounds: np.ndarray,
+        world_width: int,
+        world_height: int,
+        target_names: Sequence[str],
+        target_types: Sequence[str],
+    ):
+        self.observer_positions = observer_positions
+        self.vision_radii = vision_radii
+        self.offsets = offsets
+        self.target_indices = target_indices
+        self.relative = relative
+        self.distances = distances
+        self.directions = directions
+        self.bounds = bounds
+        self.world_width = world_width
+        self.world_height = world_height
+        self.target_names = target_names
+        self.target_types = target_types
+        self._states: list[Optional[WorldState]] = [None] * len(observer_positions)
+
+    def __len__(self) -> int:
+        return len(self.observer_positions)
+
+    def __getitem__(self, i: int) -> WorldState:
+        state = self._states[i]
+        if state is None:
+            state = self._materialize(i)
+            self._states[i] = state
+        return state
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    @property
+    def visible_counts(self) -> np.ndarray:
+        """Number of visible characters per observer."""
+        return np.diff(self.offsets)
+
+    def visible_indices(self, i: int) -> np.ndarray:
+        """Indices (into the target arrays) of characters visible to observer ``i``."""
+        return self.target_indices[self.offsets[i]:self.offsets[i + 1]]
+
+    def _materialize(self, i: int) -> WorldState:
+        start, end = self.offsets[i], self.offsets[i + 1]
+        names, types = self.target_names, self.target_types
+        visible_chars = [
+            VisibleCharacter(
+                name=names[target],
+                character_type=types[target],
+                relative_x=rel_x,
+                relative_y=rel_y,
+                distance=distance,
+                direction=DIRECTIONS[direction],
+            )
+            for target, (rel_x, rel_y), distance, direction in zip(
+                self.target_indices[start:end].tolist(),
+                self.relative[start:end].tolist(),
+                self.distances[start:end].tolist(),
+                self.directions[start:end].tolist(),
+            )
+        ]
+        north, south, east, west = self.bounds[i].tolist()
+        x, y = self.observer_positions[i].tolist()
+        return WorldState(
+            observer_position=(x, y),
+            vision_radius=float(self.vision_radii[i]),
+            visible_characters=visible_chars,
+            world_bounds=WorldBounds(
+                distance_to_north=north,
+                distance_to_south=south,
+                distance_to_east=east,
+                distance_to_west=west,
+                world_width=self.world_width,
+                world_height=self.world_height,
+            ),
+        )
+
+
+def compute_observation_batch(
+    observer_positions: np.ndarray,
+    vision_radii: np.ndarray,
+    target_positions: np.ndarray,
+    world_width: int,
+    world_height: int,
+    target_names: Sequence[str],
+    target_types: Sequence[str],
+    observer_target_indices: Optional[np.ndarray] = None,
+) -> ObservationBatch:
+    """
+    Compute observations for many observers against a shared set of targets.
+
+    Args:
+        observer_positions: (M, 2) float array of observer positions
+        vision_radii: (M,) float array of vision radii
+        target_positions: (N, 2) float array of all character positions
+        world_width: World width in pixels
+        world_height: World height in pixels
+        target_names: Names of the N targets
+        target_types: Character types ("player"/"ai") of the N targets
+        observer_target_indices: (M,) index of each observer in the target arrays,
+                                 used to exclude self. -1 (or None) means not a target.
+
+    Returns:
+        ObservationBatch with lazily materialized WorldState objects
+    """
+    observers = np.ascontiguousarray(observer_positions, dtype=np.float64).reshape(-1, 2)
+    targets = np.ascontiguousarray(target_positions, dtype=np.float64).reshape(-1, 2)
+    radii = np.asarray(vision_radii, dtype=np.float64).reshape(-1)
+    num_observers, num_targets = len(observers), len(targets)
+    if observer_target_indices is None:
+        observer_target_indices = np.full(num_observers, -1, dtype=np.intp)
+
+    counts = np.zeros(num_observers, dtype=np.intp)
+    pair_targets, pair_relative, pair_distances = [], [], []
+
+    # Process observers in chunks so the (chunk, N, 2) offset tensor stays bounded
+    chunk = max(1, MAX_PAIRS_PER_CHUNK // max(num_targets, 1))
+    for start in range(0, num_observers, chunk):
+        stop = min(start + chunk, num_observers)
+        relative = targets[None, :, :] - observers[start:stop, None, :]
+        dist_sq = np.einsum("ijk,ijk->ij", relative, relative)
+        visible = dist_sq <= (radii[start:stop, None] ** 2)
+
+        self_rows = np.arange(stop - start)
+        self_cols = observer_target_indices[start:stop]
+        is_target = self_cols >= 0
+        visible[self_rows[is_target], self_cols[is_target]] = False
+
+        rows, cols = np.nonzero(visible)  # Row-major, so grouped by observer
+        counts[start:stop] = np.bincount(rows, minlength=stop - start)
+        pair_targets.append(cols)
+        pair_relative.append(relative[rows, cols])
+        pair_distances.append(np.sqrt(dist_sq[rows, cols]))
+
+    offsets = np.zeros(num_observers + 1, dtype=np.intp)
+    np.cumsum(counts, out=offsets[1:])
+    target_indices = np.concatenate(pair_targets) if pair_targets else np.zeros(0, dtype=np.intp)
+    relative = np.concatenate(pair_relative) if pair_relative else np.zeros((0, 2))
+    distances = np.concatenate(pair_distances) if pair_distances else np.zeros(0)
+    directions = direction_indices(relative[:, 0], relative[:, 1])
+
+    bounds = np.column_stack((
+        observers[:, 1],                 # north
+        world_height - observers[:, 1],  # south
+        world_width - observers[:, 0],   # east
+        observers[:, 0],                 # west
+    ))
+
+    return ObservationBatch(
+        observer_positions=observers,
+        vision_radii=radii,
+        offsets=offsets,
+        target_indices=target_indices,
+        relative=relative,
+        distances=distances,
+        directions=directions,
+        bounds=bounds,
+        world_width=world_width,
+        world_height=world_height,
+        target_names=target_names,
+        target_types=target_types,
+    )
@@ -26,12 +26,14 @@ class AICharacterA(AICharacter):
         """
         # Look up AI character instance config
         vision_radius = None
+        decision_interval = None
         ai_char_name = "AI Character A"
         if config.characters and "ai_character_a" in config.characters:
             char_data = config.characters["ai_character_a"]
             try:
                 ai_char_config = CharacterInstanceConfig(**char_data)
                 vision_radius = ai_char_config.vision_radius
+                decision_interval = ai_char_config.decision_interval
                 ai_char_name = ai_char_config.name
             except Exception:
                 pass
@@ -41,6 +43,7 @@ class AICharacterA(AICharacter):
             x, y,
             config=config,
             vision_radius=vision_radius,
+            decision_interval=decision_interval,
             world=world_ref,
         )
         self.name = ai_char_name
@@ -1,6 +1,7 @@
 """
 Character class for big_guy_1.
 """
+from typing import AsyncIterator
 from config import CharacterInstanceConfig, LittleWorldConfig
 from character import AICharacter
 from personality import load_personality
@@ -28,6 +29,7 @@ class BigGuyOne(AICharacter):
         """
         # Look up character instance config
         vision_radius = None
+        decision_interval = None
         char_name = "Big Guy 1"
         personality_file_path = None
         llm_config = None
@@ -37,6 +39,7 @@ class BigGuyOne(AICharacter):
             try:
                 char_config = CharacterInstanceConfig(**char_data)
                 vision_radius = char_config.vision_radius
+                decision_interval = char_config.decision_interval
                 char_name = char_config.name
                 llm_config = char_config.llm
                 # Get personality file path from raw data
@@ -71,6 +74,7 @@ class BigGuyOne(AICharacter):
             x, y,
             config=config,
             vision_radius=vision_radius,
+            decision_interval=decision_interval,
             world=world_ref,
             model=model,
             personality=personality,
@@ -90,19 +94,26 @@ class BigGuyOne(AICharacter):
         if self.model is None:
             return "No model available"
         
-        # Format world_state as text
-        observation_dict = world_state.to_structured_dict() if world_state else {}
-        world_state_text = f"""World State:
-- My position: {observation_dict.get('observer_position', 'unknown')}
-- Visible characters: {len(observation_dict.get('visible_characters', []))}
-"""
-        
-        if observation_dict.get('visible_characters'):
-            for char in observation_dict['visible_characters']:
-                world_state_text += f"- {char['name']} ({char['character_type']}) at {char['distance']:.1f} pixels {char['direction']} from me\n"
-        
         # Call model with world_state
-        messages = {"world_state": world_state_text, "input_messages": ""}
+        messages = {"world_state": self.model.render_world_state(world_state), "input_messages": ""}
         response = await self.model.basic_answering(messages)
         
-        return response
\ No newline at end of file
+        return response
+
+    async def stream_what_i_see(self, world_state) -> AsyncIterator[str]:
+        """
+        Streaming variant of test_what_i_see.
+        
+        Args:
+            world_state: WorldState object containing observation data
+            
+        Yields:
+            Chunks of the model's description as they are generated
+        """
+        if self.model is None:
+            yield "No model available"
+            return
+        
+        messages = {"world_state": self.model.render_world_state(world_state), "input_messages": ""}
+        async for chunk in self.model.stream_answering(messages):
+            yield chunk
@@ -0,0 +1,313 @@
+"""
+Non-blocking LLM decision scheduling for AI characters.
+
+LLM calls run on an asyncio event loop in a background thread, so the pygame frame
+loop never waits on a model. Results are handed back to the main thread and applied
+on the next frame via ``process_completed()``.
+
+Decisions are due either every ``decision_interval`` seconds (polling), or, in
+event-driven mode, when something requested one (``request_decision``, e.g. from a
+world event) or the character has been idle for ``max_idle_time`` seconds.
+"""
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import CancelledError, Future
+from typing import Any, Awaitable, Callable, Iterable, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from character import AICharacter
+    from world.world_state import WorldState
+    from world.action_log import ActionLog
+
+
+class DecisionScheduler:
+    """Dispatches AI decisions without blocking, on an interval or on request."""
+
+    def __init__(
+        self,
+        event_driven: bool = False,
+        max_idle_time: float = 30.0,
+        action_log: Optional["ActionLog"] = None,
+    ):
+        """
+        Initialize scheduler. Call start() before submitting work.
+
+        Args:
+            event_driven: Only decide on request_decision() or after max_idle_time,
+                          instead of every decision_interval
+            max_idle_time: Event-driven mode: seconds without a decision after which
+                           a character decides anyway
+            action_log: Records every decision and its LLM latency, if given
+        """
+        self.event_driven = event_driven
+        self.max_idle_time = max_idle_time
+        self.action_log = action_log
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        # Finished jobs waiting for their callbacks to run on the main thread
+        self._completed: queue.SimpleQueue = queue.SimpleQueue()
+        self._in_flight: dict["AICharacter", Future] = {}
+        self._last_decision: dict["AICharacter", float] = {}
+        self._requested: set["AICharacter"] = set()
+        self.dispatched = 0
+        self.skipped = 0  # Decisions skipped because the observation did not change
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def in_flight(self) -> int:
+        """Number of decisions currently waiting on the model."""
+        return len(self._in_flight)
+
+    def start(self) -> None:
+        """Start the background event loop thread (no-op if already running)."""
+        if self.running:
+            return
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._run_loop, name="decision-scheduler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        Cancel outstanding work and stop the background loop.
+
+        Args:
+            timeout: Seconds to wait for the loop thread to exit
+        """
+        if not self.running:
+            return
+        loop = self._loop
+
+        async def _shutdown():
+            tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            loop.stop()
+
+        asyncio.run_coroutine_threadsafe(_shutdown(), loop)
+        self._thread.join(timeout)
+        self._thread = None
+        self._in_flight.clear()
+
+    def _run_loop(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_forever()
+        finally:
+            self._loop.close()
+
+    def submit(
+        self,
+        coro: Awaitable[Any],
+        on_done: Optional[Callable[[Any], None]] = None,
+        on_error: Optional[Callable[[BaseException], None]] = None,
+    ) -> Future:
+        """
+        Run a coroutine on the background loop.
+
+        Callbacks are not called from the loop thread; they are queued and run by
+        the next process_completed() call on the caller's (main) thread.
+
+        Args:
+            coro: Coroutine to run
+            on_done: Called with the coroutine's result
+            on_error: Called with the raised exception (CancelledError if the
+                      coroutine was cancelled)
+
+        Returns:
+            concurrent.futures.Future for the coroutine
+        """
+        if not self.running:
+            self.start()
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        future.add_done_callback(
+            lambda f: self._completed.put((f, on_done, on_error))
+        )
+        return future
+
+    def process_completed(self) -> int:
+        """
+        Run callbacks for every job that finished since the last call.
+
+        Must be called from the thread that owns the world state (the game loop).
+
+        Returns:
+            Number of completed jobs processed
+        """
+        processed = 0
+        while True:
+            try:
+                future, on_done, on_error = self._completed.get_nowait()
+            except queue.Empty:
+                return processed
+            processed += 1
+            if future.cancelled():
+                # E.g. a coalesced call whose leader was cancelled; the owner still
+                # has to release its bookkeeping
+                if on_error is not None:
+                    on_error(CancelledError("cancelled"))
+                continue
+            error = future.exception()
+            if error is not None:
+                if on_error is not None:
+                    on_error(error)
+                else:
+                    print(f"Error in scheduled LLM call: {error}")
+            elif on_done is not None:
+                on_done(future.result())
+
+    def request_decision(self, character: "AICharacter") -> None:
+        """
+        Ask for a decision as soon as the character's decision_interval allows.
+
+        In polling mode every character is already due each interval, so this only
+        matters in event-driven mode.
+
+        Args:
+            character: AI character that should decide
+        """
+        self._requested.add(character)
+
+    def due_characters(self, characters: Iterable[Any], now: float) -> list["AICharacter"]:
+        """
+        Select characters that should decide now and have no call in flight.
+
+        A character is due on its first decision. After that it is due when its
+        decision_interval elapsed (polling mode), or when a decision was requested
+        and decision_interval elapsed, or max_idle_time elapsed (event-driven mode).
+
+        Args:
+            characters: Candidate characters (non-AI or model-less ones are skipped)
+            now: Current time in seconds
+
+        Returns:
+            Characters that should make a decision this frame
+        """
+        due = []
+        for character in characters:
+            if getattr(character, "model", None) is None:
+                continue
+            if character in self._in_flight:
+                continue
+            last = self._last_decision.get(character)
+            if last is None:
+                due.append(character)
+                continue
+            elapsed = now - last
+            if self.event_driven:
+                if elapsed >= self.max_idle_time or (
+                    character in self._requested and elapsed >= character.decision_interval
+                ):
+                    due.append(character)
+            elif elapsed >= character.decision_interval:
+                due.append(character)
+        return due
+
+    def last_decision(self, character: "AICharacter") -> Optional[float]:
+        """Time of the character's last dispatched or skipped decision, if any."""
+        return self._last_decision.get(character)
+
+    def set_last_decision(self, character: "AICharacter", time: float) -> None:
+        """
+        Set when a character last decided (e.g. restored from a snapshot).
+
+        Args:
+            character: AI character
+            time: Time in seconds
+        """
+        self._last_decision[character] = time
+
+    def forget(self, character: "AICharacter") -> None:
+        """
+        Drop scheduling state for a character removed from the world (or replaced
+        by a restore), cancelling its in-flight decision so it is never applied.
+        """
+        future = self._in_flight.pop(character, None)
+        if future is not None:
+            future.cancel()
+        self._last_decision.pop(character, None)
+        self._requested.discard(character)
+
+    def skip_decision(self, character: "AICharacter", now: float) -> None:
+        """
+        Skip a due decision (e.g. nothing changed in view); the character keeps its
+        current action until its next decision interval.
+
+        Args:
+            character: AI character whose decision is skipped
+            now: Current time in seconds
+        """
+        self._last_decision[character] = now
+        self._requested.discard(character)
+        self.skipped += 1
+
+    def dispatch_decision(
+        self,
+        character: "AICharacter",
+        world_state: "WorldState",
+        now: float,
+        messages: Optional[list[str]] = None,
+    ) -> Future:
+        """
+        Start a make_decision call for a character.
+
+        The resulting Decision is applied with ``character.apply_decision`` on the
+        frame after it completes.
+
+        Args:
+            character: AI character that should decide
+            world_state: Observation snapshot taken on the main thread
+            now: Current time in seconds
+            messages: Messages the character received since its last decision
+
+        Returns:
+            Future for the decision
+        """
+        self._last_decision[character] = now
+        self._requested.discard(character)
+        self.dispatched += 1
+        action_log = self.action_log
+        started = time.perf_counter()
+        latency = 0.0
+
+        async def _timed_decision():
+            nonlocal latency
+            try:
+                return await character.make_decision(world_state, character.personality, messages)
+            finally:
+                latency = time.perf_counter() - started
+
+        def _is_current() -> bool:
+            # A forgotten (removed or restored) character's result must not be applied
+            if self._in_flight.get(character) is not future:
+                return False
+            del self._in_flight[character]
+            return True
+
+        def _on_done(decision):
+            if not _is_current():
+                return
+            if action_log is not None:
+                action_log.log_llm_call(now, character, "decision", latency)
+            if decision is not None:
+                if action_log is not None:
+                    action_log.log_decision(now, character, decision)
+                character.apply_decision(decision)
+
+        def _on_error(error):
+            if not _is_current():
+                return
+            if action_log is not None:
+                action_log.log_llm_call(now, character, "decision", latency, ok=False)
+            print(f"Error in decision for {character.name}: {error}")
+
+        future = self.submit(_timed_decision(), on_done=_on_done, on_error=_on_error)
+        self._in_flight[character] = future
+        return future
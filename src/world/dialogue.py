@@ -1,10 +1,203 @@
 """
 Dialogue bubble rendering utilities.
+
+Bubbles are laid out and rendered once per distinct text/style and cached as a
+single surface, so drawing a bubble each frame is just one blit. Fonts are pooled
+per size instead of being created per call.
+
+``DialogueStream`` buffers a reply that is still being generated, so the bubble can
+show the text received so far on every frame.
 """
+import threading
 import pygame
+from functools import lru_cache
 from typing import Optional
 
 
+# Distance from the character center to the tip of the bubble's pointer
+POINTER_OFFSET = 40
+POINTER_SIZE = 10
+
+
+@lru_cache(maxsize=None)
+def get_font(size: int = 24) -> pygame.font.Font:
+    """
+    Get the pooled default font for a size.
+    
+    Args:
+        size: Font size in pixels
+        
+    Returns:
+        Shared pygame font object
+    """
+    if not pygame.font.get_init():
+        pygame.font.init()
+    _ensure_quit_hook()
+    return pygame.font.Font(None, size)
+
+
+@lru_cache(maxsize=1024)
+def wrap_text(text: str, font: pygame.font.Font, max_width: int) -> tuple[str, ...]:
+    """
+    Wrap text into lines no wider than max_width (memoized).
+    
+    Args:
+        text: Text to wrap
+        font: Font used to measure words
+        max_width: Maximum line width in pixels
+        
+    Returns:
+        Wrapped lines
+    """
+    space_width = font.size(' ')[0]
+    lines = []
+    current_line = []
+    current_width = 0
+    
+    for word in text.split(' '):
+        word_width = font.size(word)[0]
+        
+        if current_width + word_width <= max_width:
+            current_line.append(word)
+            current_width += word_width + space_width
+        else:
+            if current_line:
+                lines.append(' '.join(current_line))
+            current_line = [word]
+            current_width = word_width
+    
+    if current_line:
+        lines.append(' '.join(current_line))
+    return tuple(lines)
+
+
+@lru_cache(maxsize=256)
+def render_bubble_surface(
+    text: str,
+    font: pygame.font.Font,
+    max_width: int = 200,
+    padding: int = 10,
+    bg_color: tuple[int, int, int] = (255, 255, 255),
+    text_color: tuple[int, int, int] = (0, 0, 0),
+    border_color: tuple[int, int, int] = (0, 0, 0),
+    border_width: int = 2,
+) -> tuple[pygame.Surface, tuple[int, int]]:
+    """
+    Pre-render a complete dialogue bubble, pointer included (memoized).
+    
+    Args:
+        text: Text to display
+        font: Pygame font object
+        max_width: Width of the bubble in pixels
+        padding: Padding inside the bubble
+        bg_color: Background color (RGB)
+        text_color: Text color (RGB)
+        border_color: Border color (RGB)
+        border_width: Border width in pixels
+        
+    Returns:
+        Tuple of (surface, offset), where offset is the position of the surface's
+        top-left corner relative to the character center
+    """
+    lines = wrap_text(text, font, max_width - 2 * padding)
+    line_height = font.get_height()
+    bubble_height = len(lines) * line_height + 2 * padding
+    
+    # Layout relative to the character center
+    bubble_rect = pygame.Rect(-(max_width // 2), -POINTER_OFFSET - bubble_height, max_width, bubble_height)
+    triangle_points = [
+        (0, -POINTER_OFFSET),  # Bottom point (above character)
+        (-POINTER_SIZE, -POINTER_OFFSET - POINTER_SIZE),  # Top left
+        (POINTER_SIZE, -POINTER_OFFSET - POINTER_SIZE),  # Top right
+    ]
+    pointer_rect = pygame.Rect(
+        -POINTER_SIZE, -POINTER_OFFSET - POINTER_SIZE, 2 * POINTER_SIZE + 1, POINTER_SIZE + 1
+    )
+    bounds = bubble_rect.union(pointer_rect).inflate(2 * border_width, 2 * border_width)
+    
+    # Draw into a transparent surface whose origin is bounds.topleft
+    surface = pygame.Surface(bounds.size, pygame.SRCALPHA)
+    shift = (-bounds.x, -bounds.y)
+    local_rect = bubble_rect.move(shift)
+    local_triangle = [(px + shift[0], py + shift[1]) for px, py in triangle_points]
+    
+    pygame.draw.rect(surface, bg_color, local_rect)
+    pygame.draw.rect(surface, border_color, local_rect, border_width)
+    for i, line in enumerate(lines):
+        text_surface = font.render(line, True, text_color)
+        surface.blit(text_surface, (local_rect.x + padding, local_rect.y + padding + i * line_height))
+    pygame.draw.polygon(surface, bg_color, local_triangle)
+    pygame.draw.polygon(surface, border_color, local_triangle, border_width)
+    
+    if pygame.display.get_surface() is not None:
+        surface = surface.convert_alpha()
+    return surface, bounds.topleft
+
+
+class DialogueStream:
+    """
+    Text buffer filled chunk by chunk from the LLM loop thread and read by the game loop.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._chunks: list[str] = []
+        self._text = ""
+        self.done = False
+        self.error: Optional[BaseException] = None
+
+    def append(self, chunk: str) -> None:
+        """Add a chunk of generated text."""
+        with self._lock:
+            self._chunks.append(chunk)
+
+    def close(self, error: Optional[BaseException] = None) -> None:
+        """
+        Mark the stream as finished.
+
+        Args:
+            error: Exception that ended the stream early, if any
+        """
+        with self._lock:
+            self.error = error
+            self.done = True
+
+    @property
+    def text(self) -> str:
+        """Text received so far."""
+        with self._lock:
+            if len(self._chunks) > 1:
+                self._chunks = ["".join(self._chunks)]
+            if self._chunks:
+                self._text = self._chunks[0]
+            return self._text
+
+
+def clear_dialogue_cache() -> None:
+    """Drop pooled fonts, cached layouts and pre-rendered bubbles."""
+    render_bubble_surface.cache_clear()
+    wrap_text.cache_clear()
+    get_font.cache_clear()
+
+
+_quit_hook_registered = False
+
+
+def _on_pygame_quit() -> None:
+    global _quit_hook_registered
+    clear_dialogue_cache()
+    # pygame forgets quit hooks once they ran; re-register on next use
+    _quit_hook_registered = False
+
+
+def _ensure_quit_hook() -> None:
+    """Make sure the caches are dropped on pygame.quit (fonts die with pygame)."""
+    global _quit_hook_registered
+    if not _quit_hook_registered:
+        pygame.register_quit(_on_pygame_quit)
+        _quit_hook_registered = True
+
+
 def render_dialogue_bubble(
     screen: pygame.Surface,
     text: str,
@@ -17,7 +210,7 @@ def render_dialogue_bubble(
     text_color: tuple[int, int, int] = (0, 0, 0),
     border_color: tuple[int, int, int] = (0, 0, 0),
     border_width: int = 2,
-) -> None:
+) -> pygame.Rect:
     """
     Render a dialogue bubble with text above a character.
     
@@ -26,65 +219,23 @@ def render_dialogue_bubble(
         text: Text to display
         x: X position (character center)
         y: Y position (character center)
-        font: Pygame font object. If None, creates default font
+        font: Pygame font object. If None, uses the pooled default font
         max_width: Maximum width of the bubble in pixels
         padding: Padding inside the bubble
         bg_color: Background color (RGB)
         text_color: Text color (RGB)
         border_color: Border color (RGB)
         border_width: Border width in pixels
+        
+    Returns:
+        Screen area covered by the bubble and its pointer
     """
+    _ensure_quit_hook()
     if font is None:
-        font = pygame.font.Font(None, 24)
-    
-    # Wrap text to fit max_width
-    words = text.split(' ')
-    lines = []
-    current_line = []
-    current_width = 0
-    
-    for word in words:
-        word_surface = font.render(word, True, text_color)
-        word_width = word_surface.get_width()
-        
-        if current_width + word_width <= max_width - 2 * padding:
-            current_line.append(word)
-            current_width += word_width + font.size(' ')[0]
-        else:
-            if current_line:
-                lines.append(' '.join(current_line))
-            current_line = [word]
-            current_width = word_width
+        font = get_font(24)
     
-    if current_line:
-        lines.append(' '.join(current_line))
-    
-    # Calculate bubble dimensions
-    line_height = font.get_height()
-    bubble_height = len(lines) * line_height + 2 * padding
-    bubble_width = max_width
-    
-    # Position bubble above character (centered)
-    bubble_x = int(x - bubble_width // 2)
-    bubble_y = int(y - 40 - bubble_height)  # 40 pixels above character
-    
-    # Draw bubble background
-    bubble_rect = pygame.Rect(bubble_x, bubble_y, bubble_width, bubble_height)
-    pygame.draw.rect(screen, bg_color, bubble_rect)
-    pygame.draw.rect(screen, border_color, bubble_rect, border_width)
-    
-    # Draw text lines
-    for i, line in enumerate(lines):
-        text_surface = font.render(line, True, text_color)
-        text_x = bubble_x + padding
-        text_y = bubble_y + padding + i * line_height
-        screen.blit(text_surface, (text_x, text_y))
-    
-    # Draw small triangle pointing to character
-    triangle_points = [
-        (int(x), int(y - 40)),  # Bottom point (above character)
-        (int(x - 10), int(y - 40 - 10)),  # Top left
-        (int(x + 10), int(y - 40 - 10)),  # Top right
-    ]
-    pygame.draw.polygon(screen, bg_color, triangle_points)
-    pygame.draw.polygon(screen, border_color, triangle_points, border_width)
+    surface, (offset_x, offset_y) = render_bubble_surface(
+        text, font, max_width, padding,
+        tuple(bg_color), tuple(text_color), tuple(border_color), border_width,
+    )
+    return screen.blit(surface, (int(x) + offset_x, int(y) + offset_y))
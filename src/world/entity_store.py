@@ -0,0 +1,371 @@
+"""
+Structure-of-arrays storage for character state.
+
+Positions, velocities, speeds, radii, colors and vision radii of every entity live in
+contiguous NumPy arrays instead of per-object attributes, so bulk operations
+(movement, bounds clamping, rendering, observation building) run over arrays and
+large populations stay small in memory. Characters attached to a store keep
+their Python API; ``EntityHandle`` is a minimal ``__slots__`` view for entities
+that need nothing beyond it.
+"""
+from typing import Iterable, Optional, TYPE_CHECKING
+import numpy as np
+import pygame
+
+if TYPE_CHECKING:
+    from world.spatial_index import SpatialHashGrid
+
+
+class EntityStore:
+    """
+    Arrays of entity state indexed by entity id.
+
+    Ids are stable for the lifetime of an entity; ids of despawned entities are
+    reused. Arrays grow by doubling, so always index them through the store
+    (``store.pos[i]``) rather than keeping references to old arrays.
+    """
+
+    def __init__(self, width: int, height: int, capacity: int = 1024):
+        """
+        Initialize entity store.
+
+        Args:
+            width: World width in pixels (for bounds clamping)
+            height: World height in pixels (for bounds clamping)
+            capacity: Initial number of entity slots
+        """
+        self.width = width
+        self.height = height
+        capacity = max(1, capacity)
+        self.pos = np.zeros((capacity, 2), dtype=np.float64)
+        self.vel = np.zeros((capacity, 2), dtype=np.float64)  # pixels per second
+        self.radius = np.zeros(capacity, dtype=np.int32)
+        self.color = np.zeros((capacity, 3), dtype=np.uint8)
+        self.vision = np.zeros(capacity, dtype=np.float32)
+        self.speed = np.zeros(capacity, dtype=np.float32)  # pixels per second
+        # Random walk: entities with ``wander`` pick a new direction when their timer runs out
+        self.wander = np.zeros(capacity, dtype=bool)
+        self.walk_timer = np.zeros(capacity, dtype=np.float32)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self._size = 0  # One past the highest id ever used
+        self._count = 0
+        self._free: list[int] = []
+
+    _ARRAYS = ("pos", "vel", "radius", "color", "vision", "speed", "wander", "walk_timer", "alive")
+
+    @property
+    def capacity(self) -> int:
+        return len(self.alive)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the state arrays."""
+        return sum(getattr(self, name).nbytes for name in self._ARRAYS)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _grow(self, min_capacity: int) -> None:
+        capacity = self.capacity
+        while capacity < min_capacity:
+            capacity *= 2
+        for name in self._ARRAYS:
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self._size] = old[:self._size]
+            setattr(self, name, new)
+
+    def spawn(
+        self,
+        x: float,
+        y: float,
+        radius: int,
+        color: tuple[int, int, int],
+        vision_radius: float = 0.0,
+        speed: float = 0.0,
+        wander: bool = False,
+    ) -> int:
+        """
+        Add one entity.
+
+        Args:
+            x: Initial x position
+            y: Initial y position
+            radius: Radius in pixels
+            color: Color (RGB)
+            vision_radius: Vision radius in pixels (0 for entities that never observe)
+            speed: Movement speed in pixels per second
+            wander: Random-walk in the batch movement step
+
+        Returns:
+            Entity id
+        """
+        if self._free:
+            index = self._free.pop()
+        else:
+            if self._size == self.capacity:
+                self._grow(self._size + 1)
+            index = self._size
+            self._size += 1
+        self.pos[index] = (x, y)
+        self.vel[index] = 0.0
+        self.radius[index] = radius
+        self.color[index] = color
+        self.vision[index] = vision_radius
+        self.speed[index] = speed
+        self.wander[index] = wander
+        self.walk_timer[index] = 0.0
+        self.alive[index] = True
+        self._count += 1
+        return index
+
+    def spawn_many(
+        self,
+        positions: np.ndarray,
+        radius: int,
+        color: tuple[int, int, int],
+        vision_radius: float = 0.0,
+        speed: float = 0.0,
+        wander: bool = False,
+    ) -> np.ndarray:
+        """
+        Add many entities with shared radius/color/vision/speed in one pass.
+
+        Args:
+            positions: (n, 2) array of initial positions
+            radius: Radius in pixels
+            color: Color (RGB)
+            vision_radius: Vision radius in pixels
+            speed: Movement speed in pixels per second
+            wander: Random-walk in the batch movement step
+
+        Returns:
+            Array of new entity ids
+        """
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        n = len(positions)
+        if self._size + n > self.capacity:
+            self._grow(self._size + n)
+        # Appended at the end; free slots are left for single spawns
+        indices = np.arange(self._size, self._size + n)
+        self._size += n
+        self.pos[indices] = positions
+        self.vel[indices] = 0.0
+        self.radius[indices] = radius
+        self.color[indices] = color
+        self.vision[indices] = vision_radius
+        self.speed[indices] = speed
+        self.wander[indices] = wander
+        self.walk_timer[indices] = 0.0
+        self.alive[indices] = True
+        self._count += n
+        return indices
+
+    def export_arrays(self) -> dict[str, np.ndarray]:
+        """
+        Views of the used part of every state array, for saving.
+
+        Returns:
+            Dict of array name -> array (ids below the highest id ever used), plus
+            "free_ids" (ids of despawned entities awaiting reuse)
+        """
+        arrays = {name: getattr(self, name)[:self._size] for name in self._ARRAYS}
+        arrays["free_ids"] = np.array(self._free, dtype=np.int64)
+        return arrays
+
+    def load_arrays(self, arrays: dict[str, np.ndarray]) -> None:
+        """
+        Replace the store contents with saved arrays (as returned by export_arrays).
+
+        The arrays are adopted without copying (e.g. copy-on-write memory maps);
+        the store copies them only when it has to grow.
+
+        Args:
+            arrays: Dict of array name -> array
+        """
+        size = len(arrays["alive"])
+        for name in self._ARRAYS:
+            array = arrays[name]
+            expected = getattr(self, name)
+            if array.dtype != expected.dtype or array.shape[1:] != expected.shape[1:] or len(array) != size:
+                raise ValueError(f"Array {name!r} has dtype {array.dtype} and shape {array.shape}")
+        if size == 0:
+            self.__init__(self.width, self.height, self.capacity)
+            return
+        for name in self._ARRAYS:
+            setattr(self, name, arrays[name])
+        self._size = size
+        self._count = int(np.count_nonzero(self.alive))
+        self._free = [int(i) for i in arrays["free_ids"]]
+
+    def despawn(self, index: int) -> None:
+        """
+        Remove an entity; its id may be reused by a later spawn.
+
+        Args:
+            index: Entity id
+        """
+        if not self.alive[index]:
+            return
+        self.alive[index] = False
+        self.vel[index] = 0.0
+        self.wander[index] = False
+        self._count -= 1
+        self._free.append(index)
+
+    def active_indices(self) -> np.ndarray:
+        """Ids of all live entities, in ascending order."""
+        return np.flatnonzero(self.alive[:self._size])
+
+    def move(self, index: int, dx: float, dy: float) -> tuple[float, float]:
+        """
+        Move one entity by (dx, dy), keeping it within the world bounds.
+
+        Args:
+            index: Entity id
+            dx: Delta x in pixels
+            dy: Delta y in pixels
+
+        Returns:
+            New (x, y) position
+        """
+        r = int(self.radius[index])
+        x, y = self.pos[index].tolist()
+        x = max(r, min(self.width - r, x + dx))
+        y = max(r, min(self.height - r, y + dy))
+        self.pos[index] = (x, y)
+        return x, y
+
+    def move_many(self, indices: np.ndarray, deltas: np.ndarray) -> None:
+        """
+        Move many entities at once, keeping them within the world bounds.
+
+        Args:
+            indices: Entity ids (no duplicates)
+            deltas: (n, 2) array of (dx, dy) in pixels
+        """
+        self.pos[indices] += deltas
+        self.clamp(indices)
+
+    def clamp(self, indices: Optional[np.ndarray] = None) -> None:
+        """
+        Clamp positions so every entity lies fully inside the world.
+
+        Args:
+            indices: Entity ids to clamp. If None, clamps every slot.
+        """
+        if indices is None:
+            indices = slice(0, self._size)
+        r = self.radius[indices].astype(np.float64)
+        pos = self.pos[indices]
+        np.clip(pos[:, 0], r, self.width - r, out=pos[:, 0])
+        np.clip(pos[:, 1], r, self.height - r, out=pos[:, 1])
+        self.pos[indices] = pos
+
+    def rect(self, index: int) -> pygame.Rect:
+        """Screen area covered by an entity's circle (with a 1px margin)."""
+        r = int(self.radius[index])
+        x, y = self.pos[index].tolist()
+        return pygame.Rect(int(x) - r - 1, int(y) - r - 1, 2 * r + 2, 2 * r + 2)
+
+    def render(self, screen: pygame.Surface, indices: Optional[Iterable[int]] = None) -> None:
+        """
+        Draw entities as circles.
+
+        Args:
+            screen: Surface to draw on
+            indices: Entity ids to draw. If None, draws every live entity.
+        """
+        if indices is None:
+            indices = self.active_indices()
+        indices = np.asarray(indices, dtype=np.intp)
+        # Convert once to Python scalars; per-element numpy access is much slower
+        positions = self.pos[indices].astype(np.int64).tolist()
+        colors = self.color[indices].tolist()
+        radii = self.radius[indices].tolist()
+        draw_circle = pygame.draw.circle
+        for center, color, radius in zip(positions, colors, radii):
+            draw_circle(screen, color, center, radius)
+
+
+class EntityHandle:
+    """
+    Lightweight view of one entity in an EntityStore.
+
+    Exposes the parts of the Character API the world uses (position, color,
+    radius, vision radius, move, update, render, get_rect) without per-entity
+    config references or an instance ``__dict__``.
+    """
+
+    __slots__ = ("store", "index", "spatial_index")
+
+    def __init__(self, store: EntityStore, index: int):
+        """
+        Initialize handle.
+
+        Args:
+            store: Store holding the entity
+            index: Entity id in the store
+        """
+        self.store = store
+        self.index = index
+        self.spatial_index: Optional["SpatialHashGrid"] = None
+
+    def __repr__(self) -> str:
+        return f"EntityHandle({self.index}, x={self.x:.1f}, y={self.y:.1f})"
+
+    @property
+    def name(self) -> str:
+        return f"Entity {self.index}"
+
+    @property
+    def entity_id(self) -> int:
+        return self.index
+
+    @property
+    def x(self) -> float:
+        return float(self.store.pos[self.index, 0])
+
+    @x.setter
+    def x(self, value: float) -> None:
+        self.store.pos[self.index, 0] = value
+
+    @property
+    def y(self) -> float:
+        return float(self.store.pos[self.index, 1])
+
+    @y.setter
+    def y(self, value: float) -> None:
+        self.store.pos[self.index, 1] = value
+
+    @property
+    def radius(self) -> int:
+        return int(self.store.radius[self.index])
+
+    @property
+    def color(self) -> tuple[int, int, int]:
+        return tuple(self.store.color[self.index].tolist())
+
+    @property
+    def vision_radius(self) -> float:
+        return float(self.store.vision[self.index])
+
+    def move(self, dx: float, dy: float) -> None:
+        """Move by dx, dy, keeping within the world bounds"""
+        self.store.move(self.index, dx, dy)
+        if self.spatial_index is not None:
+            self.spatial_index.update(self)
+
+    def update(self, dt: float) -> None:
+        """Entities have no per-object behaviour; batch systems drive them."""
+        pass
+
+    def render(self, screen: pygame.Surface) -> None:
+        """Render the entity as a circle (use EntityStore.render to draw many at once)"""
+        store, index = self.store, self.index
+        x, y = store.pos[index].tolist()
+        pygame.draw.circle(screen, store.color[index].tolist(), (int(x), int(y)), int(store.radius[index]))
+
+    def get_rect(self) -> pygame.Rect:
+        """Screen area covered by render()"""
+        return self.store.rect(self.index)
@@ -0,0 +1,127 @@
+"""
+World event bus.
+
+The world publishes events about characters (someone came into view, a message
+arrived, a collision, hitting the edge of the world). Subscribers register for
+the event types they care about, either for one character (targeted) or for all
+events of a type. AI characters use this to request an LLM decision only when
+something relevant happened instead of polling on a fixed interval.
+"""
+from collections import Counter
+from enum import Enum
+from typing import Any, Callable, Iterable, Optional
+
+
+class EventType(str, Enum):
+    """Types of world events"""
+    ENTERED_VISION = "entered_vision"  # Another character came into view
+    MESSAGE_RECEIVED = "message_received"  # Another character spoke to / near the subject
+    COLLISION = "collision"  # The subject started touching another character
+    BOUNDARY_HIT = "boundary_hit"  # The subject reached the edge of the world
+
+
+class WorldEvent:
+    """An event about one character (the subject)."""
+
+    __slots__ = ("type", "subject", "other", "time", "message")
+
+    def __init__(
+        self,
+        type: EventType,
+        subject: Any,
+        time: float,
+        other: Any = None,
+        message: Optional[str] = None,
+    ):
+        """
+        Initialize event.
+
+        Args:
+            type: Event type
+            subject: Character the event happened to (receives targeted delivery)
+            time: Simulation time in seconds
+            other: The other character involved, if any
+            message: Message text (MESSAGE_RECEIVED)
+        """
+        self.type = type
+        self.subject = subject
+        self.time = time
+        self.other = other
+        self.message = message
+
+    def __repr__(self) -> str:
+        subject = getattr(self.subject, "name", self.subject)
+        other = getattr(self.other, "name", self.other)
+        return f"WorldEvent({self.type.value}, subject={subject!r}, other={other!r}, time={self.time:.2f})"
+
+
+EventHandler = Callable[[WorldEvent], None]
+
+
+class EventBus:
+    """Synchronous publish/subscribe for world events (game loop thread only)."""
+
+    def __init__(self):
+        self._handlers: dict[EventType, list[EventHandler]] = {}
+        self._targeted: dict[Any, list[tuple[frozenset[EventType], EventHandler]]] = {}
+        self.published: Counter[EventType] = Counter()
+
+    def __contains__(self, subject: Any) -> bool:
+        """True if ``subject`` has targeted subscriptions."""
+        return subject in self._targeted
+
+    @property
+    def subjects(self) -> list[Any]:
+        """Characters with targeted subscriptions."""
+        return list(self._targeted)
+
+    def subscribe(self, event_type: EventType, handler: EventHandler) -> None:
+        """
+        Receive every event of a type.
+
+        Args:
+            event_type: Event type to receive
+            handler: Called with each event
+        """
+        self._handlers.setdefault(event_type, []).append(handler)
+
+    def subscribe_to(
+        self,
+        subject: Any,
+        handler: EventHandler,
+        event_types: Optional[Iterable[EventType]] = None,
+    ) -> None:
+        """
+        Receive events about one character.
+
+        Args:
+            subject: Character whose events to receive
+            handler: Called with each matching event
+            event_types: Event types to receive. If None, receives all types.
+        """
+        types = frozenset(EventType if event_types is None else event_types)
+        self._targeted.setdefault(subject, []).append((types, handler))
+
+    def unsubscribe(self, subject: Any) -> None:
+        """Drop every targeted subscription for a character."""
+        self._targeted.pop(subject, None)
+
+    def wants(self, subject: Any, event_type: EventType) -> bool:
+        """True if anyone listens for ``event_type`` about ``subject``."""
+        if self._handlers.get(event_type):
+            return True
+        return any(event_type in types for types, _ in self._targeted.get(subject, ()))
+
+    def publish(self, event: WorldEvent) -> None:
+        """
+        Deliver an event to type subscribers and the subject's subscribers.
+
+        Args:
+            event: Event to deliver
+        """
+        self.published[event.type] += 1
+        for handler in self._handlers.get(event.type, ()):
+            handler(event)
+        for types, handler in self._targeted.get(event.subject, ()):
+            if event.type in types:
+                handler(event)
@@ -0,0 +1,58 @@
+"""
+Player input sources: live keyboard or scripted input for headless runs.
+"""
+from itertools import cycle
+from typing import Iterable
+import pygame
+
+
+class InputSource:
+    """Provides the player's movement direction each tick."""
+
+    def get_direction(self) -> tuple[int, int]:
+        """
+        Return the requested movement direction for this tick.
+
+        Returns:
+            (dx, dy) with each component in {-1, 0, 1}
+        """
+        return 0, 0
+
+
+class KeyboardInputSource(InputSource):
+    """Reads arrow keys / WASD from pygame (requires an initialized display)."""
+
+    def get_direction(self) -> tuple[int, int]:
+        keys = pygame.key.get_pressed()
+        dx = 0
+        dy = 0
+
+        if keys[pygame.K_UP] or keys[pygame.K_w]:
+            dy -= 1
+        if keys[pygame.K_DOWN] or keys[pygame.K_s]:
+            dy += 1
+        if keys[pygame.K_LEFT] or keys[pygame.K_a]:
+            dx -= 1
+        if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
+            dx += 1
+
+        return dx, dy
+
+
+class ScriptedInputSource(InputSource):
+    """Replays a fixed sequence of directions, one per tick."""
+
+    def __init__(self, directions: Iterable[tuple[int, int]], repeat: bool = False):
+        """
+        Initialize scripted input.
+
+        Args:
+            directions: (dx, dy) direction per tick
+            repeat: Loop the script forever. Otherwise the player stands still
+                    once the script is exhausted.
+        """
+        directions = list(directions)
+        self._directions = cycle(directions) if repeat and directions else iter(directions)
+
+    def get_direction(self) -> tuple[int, int]:
+        return next(self._directions, (0, 0))
@@ -0,0 +1,81 @@
+"""
+Vectorized movement for every entity in one NumPy pass per tick.
+
+Replaces per-object ``AICharacter.update``/``Character.move`` calls (Python
+``random.choice`` and ``max``/``min`` clamping per character) when many
+characters are moving.
+"""
+from typing import Any, Sequence
+import numpy as np
+from .entity_store import EntityStore
+from .spatial_index import SpatialHashGrid
+
+# Random-walk choices (unit vectors), same options as AICharacter's per-object walk:
+# up, down, left, right, stay
+RANDOM_WALK_DIRECTIONS = np.array(
+    [(0.0, -1.0), (0.0, 1.0), (-1.0, 0.0), (1.0, 0.0), (0.0, 0.0)]
+)
+
+
+def batch_move(
+    store: EntityStore,
+    indices: np.ndarray,
+    dt: float,
+    rng: np.random.Generator,
+    direction_change_interval: float = 1.0,
+) -> None:
+    """
+    Advance entities by one timestep.
+
+    Wandering entities whose timer ran out pick a new random direction, then every
+    entity moves by velocity * dt and is clamped to the world bounds.
+
+    Args:
+        store: Entity store holding the entities
+        indices: Entity ids to move (no duplicates)
+        dt: Simulated seconds to advance
+        rng: Seeded random generator for direction changes
+        direction_change_interval: Seconds between random-walk direction changes
+    """
+    if len(indices) == 0:
+        return
+    
+    wandering = indices[store.wander[indices]]
+    if len(wandering):
+        timers = store.walk_timer[wandering] + dt
+        due = timers >= direction_change_interval
+        changing = wandering[due]
+        if len(changing):
+            choices = rng.integers(0, len(RANDOM_WALK_DIRECTIONS), size=len(changing))
+            store.vel[changing] = RANDOM_WALK_DIRECTIONS[choices] * store.speed[changing, None]
+            timers[due] -= direction_change_interval
+        store.walk_timer[wandering] = timers
+    
+    store.move_many(indices, store.vel[indices] * dt)
+
+
+def sync_spatial_index(
+    spatial_index: SpatialHashGrid,
+    objects: Sequence[Any],
+    old_positions: np.ndarray,
+    new_positions: np.ndarray,
+) -> int:
+    """
+    Re-index only the objects whose grid cell changed during a batch move.
+
+    Args:
+        spatial_index: Index to update
+        objects: Indexed objects, aligned with the position arrays
+        old_positions: (n, 2) positions before the move
+        new_positions: (n, 2) positions after the move
+
+    Returns:
+        Number of objects that changed cell
+    """
+    cell_size = spatial_index.cell_size
+    changed = np.flatnonzero(
+        (np.floor(old_positions / cell_size) != np.floor(new_positions / cell_size)).any(axis=1)
+    )
+    for i in changed.tolist():
+        spatial_index.update(objects[i])
+    return len(changed)
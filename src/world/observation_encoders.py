@@ -0,0 +1,242 @@
+"""
+Observation encoders: WorldState -> prompt text.
+
+Every decision prompt carries an observation, so its size directly drives
+latency and cost at scale. The encoders trade readability for tokens:
+
+- verbose: the original sentence-per-character text (format_world_state_text)
+- json: the full WorldState dump (to_structured_dict), the most expensive
+- table: one terse row per visible character, with values rounded to
+  ``round_to`` pixels and compass abbreviations for bearings relative to the
+  observer, plus a line for the observer and the distances to the world edges
+- delta: like table, but after the first observation only the rows that changed
+  (+ appeared, ~ moved, - left), unless the full table is shorter. The model has
+  to see its earlier turns, so it needs conversation memory, and the full table
+  is sent again every ``full_every`` observations, before the turn holding the
+  last one leaves the memory's recent turns. Its baseline only advances on
+  commit(), once the model has actually answered the observation.
+
+Custom encoders can be added with register_observation_encoder().
+"""
+import json
+from typing import Callable, Optional
+from .world_state import WorldState, calculate_direction, format_world_state_text
+
+_COMPASS = {
+    "north": "N", "north-east": "NE", "east": "E", "south-east": "SE",
+    "south": "S", "south-west": "SW", "west": "W", "north-west": "NW", "here": "here",
+}
+_TYPES = {"player": "pl", "ai": "ai"}
+
+
+def _round(value: float, step: float) -> int:
+    """Round to the nearest multiple of ``step`` (to the nearest pixel if step <= 1)."""
+    if step <= 1:
+        return int(round(value))
+    return int(round(value / step) * step)
+
+
+class ObservationEncoder:
+    """Turns a WorldState into prompt text."""
+
+    name = ""
+    # Output depends on earlier observations: needs conversation memory, can't be
+    # answered from the response cache, and commit() must follow each answered call
+    incremental = False
+
+    def encode(self, world_state: Optional[WorldState]) -> str:
+        """
+        Encode an observation.
+
+        Args:
+            world_state: Observation to encode (None if unknown)
+
+        Returns:
+            Prompt text
+        """
+        raise NotImplementedError
+
+    def commit(self) -> None:
+        """Mark the last encoded observation as seen by the model."""
+
+    def limit_history(self, turns: int) -> None:
+        """Tell the encoder the model sees only its last ``turns`` turns verbatim."""
+
+    def reset(self) -> None:
+        """Forget any state kept between observations."""
+
+
+class VerboseEncoder(ObservationEncoder):
+    """Sentence per visible character (the original prompt format)."""
+
+    name = "verbose"
+
+    def encode(self, world_state: Optional[WorldState]) -> str:
+        return format_world_state_text(world_state)
+
+
+class JSONEncoder(ObservationEncoder):
+    """The full WorldState model as compact JSON."""
+
+    name = "json"
+
+    def encode(self, world_state: Optional[WorldState]) -> str:
+        if world_state is None:
+            return "{}"
+        return json.dumps(world_state.to_structured_dict(), separators=(",", ":"))
+
+
+class TableEncoder(ObservationEncoder):
+    """Terse rows with rounded distances and compass bearings."""
+
+    name = "table"
+    header = "seen name|type|dist|dir"
+
+    def __init__(self, round_to: float = 10.0):
+        """
+        Initialize table encoder.
+
+        Args:
+            round_to: Round positions and distances to multiples of this many
+                      pixels (<= 1 rounds to whole pixels)
+        """
+        self.round_to = round_to
+
+    def _me(self, world_state: WorldState) -> str:
+        x, y = world_state.observer_position
+        bounds = world_state.world_bounds
+        r = self.round_to
+        return (
+            f"me {_round(x, r)},{_round(y, r)} edges "
+            f"N{_round(bounds.distance_to_north, r)} S{_round(bounds.distance_to_south, r)} "
+            f"E{_round(bounds.distance_to_east, r)} W{_round(bounds.distance_to_west, r)}"
+        )
+
+    def _rows(self, world_state: WorldState) -> dict[str, str]:
+        """Row per visible character, keyed by its label in the table."""
+        rows = {}
+        occurrences: dict[str, int] = {}
+        for char in world_state.visible_characters:
+            # Characters sharing a name (e.g. the default "AI Character") are told
+            # apart by their order in the list: "AI Character", "AI Character#2", ...
+            count = occurrences[char.name] = occurrences.get(char.name, 0) + 1
+            label = char.name if count == 1 else f"{char.name}#{count}"
+            bearing = _COMPASS.get(calculate_direction(char.relative_x, char.relative_y), "?")
+            kind = _TYPES.get(char.character_type, char.character_type)
+            rows[label] = f"{label}|{kind}|{_round(char.distance, self.round_to)}|{bearing}"
+        return rows
+
+    def encode(self, world_state: Optional[WorldState]) -> str:
+        if world_state is None:
+            return "me unknown"
+        rows = self._rows(world_state)
+        lines = [self._me(world_state)]
+        if rows:
+            lines.append(self.header)
+            lines.extend(rows.values())
+        else:
+            lines.append("seen nobody")
+        return "\n".join(lines)
+
+
+class DeltaEncoder(TableEncoder):
+    """Table rows that changed since the last committed observation (the full table the first time, or when shorter)."""
+
+    name = "delta"
+    incremental = True
+
+    def __init__(self, round_to: float = 10.0, full_every: int = 8):
+        """
+        Initialize delta encoder.
+
+        Args:
+            round_to: Rounding step in pixels (see TableEncoder)
+            full_every: Send the full table at least every this many committed
+                        observations (1 = always)
+        """
+        super().__init__(round_to)
+        self.full_every = max(1, full_every)
+        self._me_line: Optional[str] = None
+        self._previous: Optional[dict[str, str]] = None
+        self._since_full = 0  # Committed deltas since the last full table
+        self._encoded: Optional[tuple[str, dict[str, str], int]] = None
+
+    def commit(self) -> None:
+        if self._encoded is not None:
+            self._me_line, self._previous, self._since_full = self._encoded
+            self._encoded = None
+
+    def limit_history(self, turns: int) -> None:
+        # The full table has to stay among the turns the model sees
+        self.full_every = max(1, min(self.full_every, turns))
+
+    def reset(self) -> None:
+        self._me_line = None
+        self._previous = None
+        self._since_full = 0
+        self._encoded = None
+
+    def encode(self, world_state: Optional[WorldState]) -> str:
+        if world_state is None:
+            self._encoded = None
+            return "me unknown"
+        me = self._me(world_state)
+        rows = self._rows(world_state)
+        previous, previous_me = self._previous, self._me_line
+        table = super().encode(world_state)
+        self._encoded = (me, rows, 0)
+        if previous is None or self._since_full + 1 >= self.full_every:
+            return table
+        lines = [me] if me != previous_me else []
+        for name, row in rows.items():
+            if name not in previous:
+                lines.append(f"+{row}")
+            elif previous[name] != row:
+                lines.append(f"~{row}")
+        lines.extend(f"-{name}" for name in previous if name not in rows)
+        delta = "\n".join(lines) if lines else "no change"
+        # In a busy scene most rows change; then the full table is shorter
+        if lines and len(delta) >= len(table):
+            return table
+        self._encoded = (me, rows, self._since_full + 1)
+        return delta
+
+
+_ENCODERS: dict[str, Callable[..., ObservationEncoder]] = {
+    "verbose": lambda round_to: VerboseEncoder(),
+    "json": lambda round_to: JSONEncoder(),
+    "table": TableEncoder,
+    "delta": DeltaEncoder,
+}
+
+
+def register_observation_encoder(name: str, factory: Callable[[float], ObservationEncoder]) -> None:
+    """
+    Make an encoder available by name (e.g. in LLMConfig.observation_format).
+
+    Args:
+        name: Format name
+        factory: Called with the round_to setting; returns a new encoder
+    """
+    _ENCODERS[name] = factory
+
+
+def create_observation_encoder(name: str = "verbose", round_to: float = 10.0) -> ObservationEncoder:
+    """
+    Build an observation encoder by format name.
+
+    Args:
+        name: Format name ("verbose", "json", "table", "delta" or a registered one)
+        round_to: Rounding step in pixels for formats that round
+
+    Returns:
+        New encoder (encoders like "delta" keep per-observer state, so use one per character)
+
+    Raises:
+        ValueError: If the format is unknown
+    """
+    try:
+        factory = _ENCODERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown observation format '{name}' (known: {', '.join(sorted(_ENCODERS))})") from None
+    return factory(round_to)
@@ -0,0 +1,159 @@
+"""
+Incremental observations: per-observer diffs instead of full WorldState rebuilds.
+
+The tracker remembers what each observer saw in its last snapshot (which
+characters, and where). A new observation is compared against it and reported as
+a compact ``WorldStateDelta``. When nothing entered or left vision and nothing
+moved beyond the threshold, the previous ``WorldState`` is reused as is and the
+delta is empty, so the caller can skip the LLM decision entirely.
+"""
+from typing import Any, Callable, Optional, Sequence, Union
+from math import hypot
+from pydantic import BaseModel, Field
+from .world_state import WorldState, VisibleCharacter
+
+
+class WorldStateDelta(BaseModel):
+    """Changes in an observer's view since its previous snapshot."""
+    observer_position: tuple[float, float] = Field(description="Observer's (x, y) position")
+    initial: bool = Field(default=False, description="First observation (no previous snapshot)")
+    observer_moved: bool = Field(default=False, description="Observer moved beyond the threshold")
+    entered: list[VisibleCharacter] = Field(default_factory=list, description="Characters that came into view")
+    left: list[str] = Field(default_factory=list, description="Names of characters that went out of view")
+    moved: list[VisibleCharacter] = Field(default_factory=list, description="Visible characters that moved beyond the threshold")
+
+    @property
+    def is_empty(self) -> bool:
+        """True if nothing relevant changed since the previous snapshot."""
+        return not (self.initial or self.observer_moved or self.entered or self.left or self.moved)
+
+    def describe(self) -> str:
+        """
+        Format the changes as short prompt text.
+
+        Returns:
+            One line per change, or "No changes." for an empty delta
+        """
+        if self.is_empty:
+            return "No changes."
+        lines = []
+        if self.initial:
+            lines.append("First observation.")
+        if self.observer_moved:
+            x, y = self.observer_position
+            lines.append(f"I moved to ({x:.0f}, {y:.0f}).")
+        for char in self.entered:
+            lines.append(f"{char.name} ({char.character_type}) appeared {char.distance:.0f} pixels {char.direction} of me.")
+        for char in self.moved:
+            lines.append(f"{char.name} is now {char.distance:.0f} pixels {char.direction} of me.")
+        for name in self.left:
+            lines.append(f"{name} is out of sight.")
+        return "\n".join(lines)
+
+
+class _ObserverRecord:
+    """What an observer saw in its last snapshot."""
+
+    __slots__ = ("position", "targets", "snapshot")
+
+    def __init__(self, position: tuple[float, float], targets: dict[Any, tuple[float, float]], snapshot: WorldState):
+        self.position = position
+        self.targets = targets
+        self.snapshot = snapshot
+
+
+class ObservationTracker:
+    """Tracks, per observer, what changed in view since the last snapshot."""
+
+    def __init__(self, move_threshold: float = 10.0):
+        """
+        Initialize tracker.
+
+        Args:
+            move_threshold: Pixels a character (or the observer) has to move from
+                            its snapshot position to count as moved
+        """
+        self.move_threshold = move_threshold
+        self._records: dict[Any, _ObserverRecord] = {}
+        self.snapshots_built = 0
+        self.snapshots_reused = 0
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def forget(self, observer: Any) -> None:
+        """Drop an observer's record (its next observation counts as initial)."""
+        self._records.pop(observer, None)
+
+    def previous(self, observer: Any) -> Optional[WorldState]:
+        """Return the observer's last snapshot, if any."""
+        record = self._records.get(observer)
+        return record.snapshot if record is not None else None
+
+    def diff(
+        self,
+        observer: Any,
+        observer_position: Sequence[float],
+        visible: Sequence[Any],
+        visible_positions: Sequence[Sequence[float]],
+        snapshot: Union[WorldState, Callable[[], WorldState]],
+    ) -> tuple[WorldState, WorldStateDelta]:
+        """
+        Compare a new observation with the observer's previous snapshot.
+
+        Args:
+            observer: Observing character (used as the record key)
+            observer_position: Observer's current (x, y)
+            visible: Characters currently in view
+            visible_positions: Their current (x, y), aligned with ``visible``
+            snapshot: The full observation, or a zero-argument callable building it.
+                      Its visible_characters must be aligned with ``visible``.
+                      Only built when something changed.
+
+        Returns:
+            Tuple of (world state, delta). The world state is the previous snapshot
+            object itself when the delta is empty.
+        """
+        x, y = float(observer_position[0]), float(observer_position[1])
+        threshold = self.move_threshold
+        record = self._records.get(observer)
+
+        if record is not None:
+            old_targets = record.targets
+            observer_moved = hypot(x - record.position[0], y - record.position[1]) > threshold
+            entered = []
+            moved = []
+            for i, (target, (tx, ty)) in enumerate(zip(visible, visible_positions)):
+                old = old_targets.get(target)
+                if old is None:
+                    entered.append(i)
+                elif hypot(tx - old[0], ty - old[1]) > threshold:
+                    moved.append(i)
+            current = set(visible)
+            left = [target for target in old_targets if target not in current]
+
+            if not (observer_moved or entered or moved or left):
+                self.snapshots_reused += 1
+                return record.snapshot, WorldStateDelta(observer_position=record.position)
+        else:
+            observer_moved = False
+            entered = list(range(len(visible)))
+            moved = []
+            left = []
+
+        state = snapshot() if callable(snapshot) else snapshot
+        self.snapshots_built += 1
+        self._records[observer] = _ObserverRecord(
+            (x, y),
+            {target: (float(tx), float(ty)) for target, (tx, ty) in zip(visible, visible_positions)},
+            state,
+        )
+        chars = state.visible_characters
+        return state, WorldStateDelta(
+            observer_position=(x, y),
+            initial=record is None,
+            observer_moved=observer_moved,
+            entered=[chars[i] for i in entered],
+            left=[getattr(target, "name", "someone") for target in left],
+            moved=[chars[i] for i in moved],
+        )
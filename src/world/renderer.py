@@ -0,0 +1,235 @@
+"""
+Layered dirty-rect renderer for the world view.
+
+The frame is composed of three layers, back to front:
+
+1. ground: a static background surface rendered once and cached,
+2. characters: circles redrawn only where something changed,
+3. dialogue: the speech bubble, always on top.
+
+Each frame only the rectangles that changed (where a character moved from/to, or
+where the bubble appeared/disappeared) are restored from the background, redrawn
+and pushed to the display with pygame.display.update(rects). Entities in an
+EntityStore are diffed and drawn from its arrays, so an idle world costs almost
+nothing per frame, however many entities it holds.
+"""
+import numpy as np
+import pygame
+from typing import Optional, Sequence
+from character import Character
+from .dialogue import render_dialogue_bubble
+from .entity_store import EntityStore
+
+
+# (text, x, y) of the dialogue bubble to show this frame
+DialogueSpec = tuple[str, float, float]
+
+
+class LayeredRenderer:
+    """Renders the world with a cached ground layer and dirty-rect display updates."""
+
+    def __init__(
+        self,
+        screen: pygame.Surface,
+        ground_color: tuple[int, int, int],
+        full_redraw_ratio: float = 0.5,
+    ):
+        """
+        Initialize renderer.
+        
+        Args:
+            screen: Display surface to render on
+            ground_color: Ground layer color (RGB)
+            full_redraw_ratio: If the dirty area exceeds this fraction of the screen,
+                               redraw everything and flip instead (cheaper than many
+                               small updates when most of the world is moving)
+        """
+        self.screen = screen
+        self.full_redraw_ratio = full_redraw_ratio
+        self.background = pygame.Surface(screen.get_size()).convert()
+        self.background.fill(ground_color)
+        
+        self._character_rects: dict[Character, pygame.Rect] = {}
+        # Store-backed entities as last drawn (ids, integer centers and radii)
+        self._entity_store: Optional[EntityStore] = None
+        self._entity_ids = np.empty(0, dtype=np.intp)
+        self._entity_pos = np.empty((0, 2), dtype=np.int64)
+        self._entity_radius = np.empty(0, dtype=np.int64)
+        self._dialogue: Optional[tuple[str, int, int]] = None
+        self._dialogue_rect: Optional[pygame.Rect] = None
+        self._needs_full_redraw = True
+
+    def invalidate(self) -> None:
+        """Force a full redraw on the next frame (e.g. after the background changed)."""
+        self._needs_full_redraw = True
+
+    def set_background(self, background: pygame.Surface) -> None:
+        """
+        Replace the cached ground layer.
+        
+        Args:
+            background: Surface the size of the screen
+        """
+        self.background = background.convert()
+        self.invalidate()
+
+    def render(
+        self,
+        characters: Sequence[Character],
+        dialogue: Optional[DialogueSpec] = None,
+        store: Optional[EntityStore] = None,
+        entity_ids: Optional[np.ndarray] = None,
+    ) -> list[pygame.Rect]:
+        """
+        Draw one frame and update the changed parts of the display.
+        
+        Store-backed entities (``entity_ids``) are drawn straight from the store's
+        arrays, and what moved is found by comparing their positions with the
+        last rendered ones in one vectorised step, so an idle population costs
+        next to nothing. ``characters`` are drawn one object at a time on top.
+        
+        Args:
+            characters: Characters to draw per object, back to front
+            dialogue: (text, x, y) of the bubble to show, or None
+            store: Entity store holding ``entity_ids``
+            entity_ids: Ids of entities to draw from ``store`` (below ``characters``)
+            
+        Returns:
+            Rectangles pushed to the display (the full screen on a full redraw,
+            empty if nothing changed)
+        """
+        if store is None or entity_ids is None:
+            entity_ids = np.empty(0, dtype=np.intp)
+        # Integer centers and radii, truncated exactly as circles are drawn
+        entity_pos = store.pos[entity_ids].astype(np.int64) if len(entity_ids) else np.empty((0, 2), np.int64)
+        entity_radius = store.radius[entity_ids].astype(np.int64) if len(entity_ids) else np.empty(0, np.int64)
+        new_rects = {character: character.get_rect() for character in characters}
+        dialogue_key = None
+        if dialogue is not None:
+            text, x, y = dialogue
+            dialogue_key = (text, int(x), int(y))
+        frame = (store, entity_ids, entity_pos, entity_radius, characters, new_rects, dialogue_key)
+        
+        same_population = (
+            self._entity_store is store
+            and len(self._entity_ids) == len(entity_ids)
+            and np.array_equal(self._entity_ids, entity_ids)
+        )
+        if self._needs_full_redraw or not same_population:
+            return self._full_redraw(*frame)
+        
+        # Areas to restore: wherever an entity or character was or now is, if it moved
+        dirty = self._moved_entity_rects(entity_pos, entity_radius)
+        for character, rect in new_rects.items():
+            old = self._character_rects.get(character)
+            if old is None:
+                dirty.append(rect)
+            elif old != rect:
+                # Small moves overlap; one merged rect is cheaper than two
+                dirty.extend([old.union(rect)] if old.colliderect(rect) else [old, rect])
+        for character, old in self._character_rects.items():
+            if character not in new_rects:
+                dirty.append(old)
+        
+        dialogue_changed = dialogue_key != self._dialogue
+        if dialogue_changed and self._dialogue_rect is not None:
+            dirty.append(self._dialogue_rect)
+        
+        if not dirty and not dialogue_changed:
+            return []
+        
+        screen_area = self.screen.get_width() * self.screen.get_height()
+        if sum(r.width * r.height for r in dirty) > self.full_redraw_ratio * screen_area:
+            return self._full_redraw(*frame)
+        
+        # Ground, entity and character layers, clipped to each dirty rect
+        left, top = (entity_pos - entity_radius[:, None] - 1).T
+        size = 2 * entity_radius + 2
+        # Entities sorted by left edge: each area only checks the ones in its x range
+        by_left = left.argsort()
+        sorted_left = left[by_left]
+        max_size = int(size.max()) if len(size) else 0
+        lows = sorted_left.searchsorted([area.left - max_size for area in dirty], side="right").tolist()
+        highs = sorted_left.searchsorted([area.right for area in dirty], side="left").tolist()
+        ordered = list(new_rects.values())
+        for area, lo, hi in zip(dirty, lows, highs):
+            self.screen.set_clip(area)
+            self.screen.blit(self.background, area, area)
+            if hi > lo:
+                near = by_left[lo:hi]
+                hit = near[
+                    (left[near] + size[near] > area.left) & (top[near] < area.bottom) & (top[near] + size[near] > area.top)
+                ]
+                if len(hit):
+                    # Ascending ids keep the back-to-front order of a full redraw
+                    hit.sort()
+                    store.render(self.screen, entity_ids[hit])
+            for i in area.collidelistall(ordered):
+                characters[i].render(self.screen)
+        self.screen.set_clip(None)
+        
+        # Dialogue layer: redraw on change or if anything underneath was repainted
+        if dialogue_key is not None and (
+            dialogue_changed or self._dialogue_rect.collidelist(dirty) != -1
+        ):
+            self._dialogue_rect = render_dialogue_bubble(self.screen, *dialogue_key)
+            dirty.append(self._dialogue_rect)
+        elif dialogue_key is None:
+            self._dialogue_rect = None
+        
+        self._remember(*frame)
+        pygame.display.update(dirty)
+        return dirty
+
+    def _moved_entity_rects(self, entity_pos: np.ndarray, entity_radius: np.ndarray) -> list[pygame.Rect]:
+        """Old and new areas of the entities whose drawn circle changed since the last frame."""
+        moved = np.flatnonzero(
+            (entity_pos != self._entity_pos).any(axis=1) | (entity_radius != self._entity_radius)
+        )
+        if not len(moved):
+            return []
+        old_r, new_r = self._entity_radius[moved], entity_radius[moved]
+        # (left, top, right, bottom) of each circle's area, with a 1px margin
+        old = np.column_stack([self._entity_pos[moved] - old_r[:, None] - 1, self._entity_pos[moved] + old_r[:, None] + 1])
+        new = np.column_stack([entity_pos[moved] - new_r[:, None] - 1, entity_pos[moved] + new_r[:, None] + 1])
+        overlap = (
+            (old[:, 0] < new[:, 2]) & (new[:, 0] < old[:, 2]) & (old[:, 1] < new[:, 3]) & (new[:, 1] < old[:, 3])
+        )
+        # Small moves overlap; one merged rect is cheaper than two
+        merged = np.column_stack([np.minimum(old[:, :2], new[:, :2]), np.maximum(old[:, 2:], new[:, 2:])])
+        boxes = np.concatenate([merged[overlap], old[~overlap], new[~overlap]])
+        return [pygame.Rect(x0, y0, x1 - x0, y1 - y0) for x0, y0, x1, y1 in boxes.tolist()]
+
+    def _remember(self, store, entity_ids, entity_pos, entity_radius, characters, new_rects, dialogue_key) -> None:
+        """Keep what this frame drew, to diff the next frame against."""
+        self._entity_store = store
+        self._entity_ids = entity_ids.copy()
+        self._entity_pos = entity_pos
+        self._entity_radius = entity_radius
+        self._character_rects = new_rects
+        self._dialogue = dialogue_key
+
+    def _full_redraw(
+        self,
+        store: Optional[EntityStore],
+        entity_ids: np.ndarray,
+        entity_pos: np.ndarray,
+        entity_radius: np.ndarray,
+        characters: Sequence[Character],
+        new_rects: dict[Character, pygame.Rect],
+        dialogue_key: Optional[tuple[str, int, int]],
+    ) -> list[pygame.Rect]:
+        """Draw every layer and flip the whole display."""
+        self.screen.blit(self.background, (0, 0))
+        if len(entity_ids):
+            store.render(self.screen, entity_ids)
+        for character in characters:
+            character.render(self.screen)
+        self._dialogue_rect = (
+            render_dialogue_bubble(self.screen, *dialogue_key) if dialogue_key is not None else None
+        )
+        
+        self._remember(store, entity_ids, entity_pos, entity_radius, characters, new_rects, dialogue_key)
+        self._needs_full_redraw = False
+        pygame.display.flip()
+        return [self.screen.get_rect()]
@@ -0,0 +1,352 @@
+"""
+Multi-process sharded simulation for very large entity populations.
+
+The map is cut into vertical strips, one per worker process. Entity state lives in
+a ``SharedEntityStore`` whose arrays are backed by ``multiprocessing.shared_memory``,
+so workers and the coordinator read and write the same memory without copying or
+pickling. Each tick runs in lockstep phases separated by barriers:
+
+1. Move: each worker claims the entities whose center lies in its strip, waits
+   until every worker has claimed, then random-walks and moves them (it writes
+   only their rows).
+2. Collide: each worker reads its entities plus a halo of entities within one
+   circle diameter of its strip borders, resolves collisions on that local copy,
+   waits until every worker has read, then writes back only its own entities.
+
+Border entities are therefore exchanged through shared memory every tick, and an
+entity migrates to a neighbouring shard simply by crossing the strip border. The
+coordinator (``ShardedWorld``) drives the ticks and renders or reads the merged
+state directly from the shared arrays between ticks.
+"""
+import multiprocessing
+import os
+from multiprocessing import shared_memory
+from threading import BrokenBarrierError
+from typing import Optional
+import numpy as np
+import pygame
+from pydantic import BaseModel, Field
+from config import LittleWorldConfig
+from .entity_store import EntityStore
+from .movement import batch_move
+from .collision import find_overlapping_pairs, separate_pairs
+
+_ALIGNMENT = 64
+_STEP = 0.0
+_STOP = 1.0
+_STATS_FIELDS = 3  # owned, halo, contacts
+
+
+def _layout(capacity: int) -> tuple[dict[str, tuple[int, tuple[int, ...], np.dtype]], int]:
+    """
+    Offsets of the store arrays inside one shared memory block.
+
+    Args:
+        capacity: Number of entity slots
+
+    Returns:
+        Tuple of ({array name: (offset, shape, dtype)}, total size in bytes)
+    """
+    template = EntityStore(1, 1, capacity=1)
+    layout = {}
+    offset = 0
+    for name in EntityStore._ARRAYS:
+        array = getattr(template, name)
+        shape = (capacity,) + array.shape[1:]
+        layout[name] = (offset, shape, array.dtype)
+        size = int(np.prod(shape)) * array.dtype.itemsize
+        offset += -(-size // _ALIGNMENT) * _ALIGNMENT
+    return layout, max(offset, 1)
+
+
+class SharedEntityStore(EntityStore):
+    """
+    EntityStore whose arrays live in a shared memory block.
+
+    The capacity is fixed: the arrays cannot grow because other processes map the
+    block by name and size.
+    """
+
+    def __init__(self, width: int, height: int, capacity: int, name: Optional[str] = None):
+        """
+        Create a shared store or attach to an existing one.
+
+        Args:
+            width: World width in pixels
+            height: World height in pixels
+            capacity: Number of entity slots
+            name: Shared memory block to attach to. If None, creates a new block.
+        """
+        super().__init__(width, height, capacity=1)
+        layout, size = _layout(capacity)
+        self.owner = name is None
+        # Only the creator tracks the block, so an exiting worker cannot unlink it
+        self.shm = shared_memory.SharedMemory(name=name, create=self.owner, size=size, track=self.owner)
+        for field, (offset, shape, dtype) in layout.items():
+            array = np.ndarray(shape, dtype=dtype, buffer=self.shm.buf, offset=offset)
+            if self.owner:
+                array.fill(0)
+            setattr(self, field, array)
+
+    @property
+    def name(self) -> str:
+        """Shared memory block name (pass to attach from another process)."""
+        return self.shm.name
+
+    def _grow(self, min_capacity: int) -> None:
+        raise RuntimeError(
+            f"SharedEntityStore has a fixed capacity of {self.capacity}, {min_capacity} slots needed"
+        )
+
+    def close(self) -> None:
+        """Unmap the block; the creating process also frees it."""
+        if self.shm is None:
+            return
+        # The block cannot be unmapped while arrays still point into it
+        for field in self._ARRAYS:
+            setattr(self, field, None)
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+        self.shm = None
+
+
+def strip_owners(x: np.ndarray, width: float, num_shards: int) -> np.ndarray:
+    """
+    Shard owning each position (vertical strips of equal width).
+
+    Args:
+        x: X coordinates
+        width: World width in pixels
+        num_shards: Number of strips
+
+    Returns:
+        Shard index per coordinate
+    """
+    strip = (x * (num_shards / width)).astype(np.intp)
+    return np.clip(strip, 0, num_shards - 1)
+
+
+def _shard_worker(
+    shard: int,
+    num_shards: int,
+    store_name: str,
+    width: int,
+    height: int,
+    capacity: int,
+    seed: Optional[int],
+    walk_interval: float,
+    collisions: bool,
+    collision_iterations: int,
+    control,
+    stats,
+    tick_barrier,
+    phase_barrier,
+) -> None:
+    """Worker process loop: simulate one strip per tick until told to stop."""
+    store = SharedEntityStore(width, height, capacity, name=store_name)
+    rng = np.random.default_rng(None if seed is None else [seed, shard])
+    strip_width = width / num_shards
+    low, high = shard * strip_width, (shard + 1) * strip_width
+    try:
+        while True:
+            tick_barrier.wait()
+            if control[0] == _STOP:
+                break
+            dt = control[1]
+
+            # Move the entities in this strip
+            alive = np.flatnonzero(store.alive)
+            owned = alive[strip_owners(store.pos[alive, 0], width, num_shards) == shard]
+            phase_barrier.wait()  # Every shard has claimed its entities before any moves
+            batch_move(store, owned, dt, rng, walk_interval)
+            phase_barrier.wait()
+
+            # Collide own entities plus the halo across the strip borders
+            halo = owned[:0]
+            contacts = 0
+            if collisions and len(alive):
+                x = store.pos[alive, 0]
+                owners = strip_owners(x, width, num_shards)
+                owned = alive[owners == shard]
+                margin = 2.0 * float(store.radius[alive].max())
+                halo = alive[(owners != shard) & (x >= low - margin) & (x < high + margin)]
+                local = np.concatenate([owned, halo])
+                positions = store.pos[local]
+                radii = store.radius[local].astype(np.float64)
+                for iteration in range(collision_iterations):
+                    i, j = find_overlapping_pairs(positions, radii)
+                    if iteration == 0:
+                        # Pairs with two owned entities, plus border pairs (counted by both shards)
+                        contacts = int(np.count_nonzero((i < len(owned)) | (j < len(owned))))
+                    if len(i) == 0:
+                        break
+                    separate_pairs(positions, radii, i, j)
+                phase_barrier.wait()  # Every shard has read its halo
+                store.pos[owned] = positions[:len(owned)]
+                store.clamp(owned)
+
+            stats[shard * _STATS_FIELDS:(shard + 1) * _STATS_FIELDS] = [len(owned), len(halo), contacts]
+            tick_barrier.wait()
+    except BrokenBarrierError:
+        pass
+    except BaseException:
+        tick_barrier.abort()
+        phase_barrier.abort()
+        raise
+    finally:
+        store.close()
+
+
+class ShardStats(BaseModel):
+    """Work done by one shard in the last tick."""
+    shard: int
+    entities: int = Field(description="Entities whose center is in the shard's strip")
+    halo: int = Field(description="Entities of neighbouring strips read for border collisions")
+    contacts: int = Field(description="Overlapping pairs involving the shard's entities")
+
+
+class ShardedWorld:
+    """
+    Coordinator for a multi-process simulation of wandering, colliding entities.
+
+    Only entity movement and collisions are sharded; LLM characters, input and
+    events stay in ``World``. Spawn entities and read positions between ticks.
+    Use as a context manager, or call ``close()``, to stop the workers and free
+    the shared memory.
+    """
+
+    def __init__(
+        self,
+        config: LittleWorldConfig,
+        capacity: int,
+        num_shards: Optional[int] = None,
+        start_method: Optional[str] = None,
+        timeout: float = 60.0,
+    ):
+        """
+        Start the worker processes.
+
+        Args:
+            config: LittleWorldConfig (window size, simulation settings)
+            capacity: Maximum number of entities
+            num_shards: Worker processes. If None, uses config.simulation.shards,
+                        then the number of CPU cores.
+            start_method: multiprocessing start method (None = platform default)
+            timeout: Seconds to wait for the workers at a barrier before giving up
+        """
+        self.config = config
+        simulation = config.simulation
+        self.num_shards = num_shards or simulation.shards or os.cpu_count() or 1
+        self.timestep = config.game.timestep
+        self.timeout = timeout
+        self.tick_count = 0
+        width, height = config.window.width, config.window.height
+
+        self.store = SharedEntityStore(width, height, capacity)
+        context = multiprocessing.get_context(start_method)
+        self._control = context.RawArray("d", 2)
+        self._stats = context.RawArray("q", self.num_shards * _STATS_FIELDS)
+        # Workers plus the coordinator meet at tick start and end; workers alone between phases
+        self._tick_barrier = context.Barrier(self.num_shards + 1)
+        phase_barrier = context.Barrier(self.num_shards)
+        self._workers = [
+            context.Process(
+                target=_shard_worker,
+                args=(
+                    shard, self.num_shards, self.store.name, width, height, capacity,
+                    simulation.seed, simulation.random_walk_interval,
+                    simulation.collisions, simulation.collision_iterations,
+                    self._control, self._stats, self._tick_barrier, phase_barrier,
+                ),
+                daemon=True,
+                name=f"littleworld-shard-{shard}",
+            )
+            for shard in range(self.num_shards)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def __enter__(self) -> "ShardedWorld":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.store)
+
+    def spawn_entities(
+        self,
+        positions: np.ndarray,
+        radius: int,
+        color: tuple[int, int, int],
+        speed: Optional[float] = None,
+        wander: bool = True,
+    ) -> np.ndarray:
+        """
+        Add many entities at once.
+
+        Args:
+            positions: (n, 2) initial positions
+            radius: Radius in pixels
+            color: Color (RGB)
+            speed: Pixels per second. If None, uses config.character.speed.
+            wander: Random-walk each tick
+
+        Returns:
+            Array of new entity ids
+        """
+        if speed is None:
+            speed = self.config.character.speed
+        return self.store.spawn_many(positions, radius, color, speed=speed, wander=wander)
+
+    def step(self, dt: Optional[float] = None) -> None:
+        """
+        Advance every shard by one timestep and wait for all of them.
+
+        Args:
+            dt: Simulated seconds to advance. If None, uses config.game.timestep.
+        """
+        self._control[0] = _STEP
+        self._control[1] = self.timestep if dt is None else dt
+        try:
+            self._tick_barrier.wait(self.timeout)  # Start the tick
+            self._tick_barrier.wait(self.timeout)  # Every shard finished it
+        except BrokenBarrierError:
+            raise RuntimeError("A shard worker failed or timed out") from None
+        self.tick_count += 1
+
+    def positions(self) -> np.ndarray:
+        """Copy of the (n, 2) positions of all live entities, in id order."""
+        return self.store.pos[self.store.active_indices()].copy()
+
+    def stats(self) -> list[ShardStats]:
+        """Per-shard work in the last tick."""
+        values = list(self._stats)
+        return [
+            ShardStats(
+                shard=shard,
+                **dict(zip(("entities", "halo", "contacts"), values[shard * _STATS_FIELDS:(shard + 1) * _STATS_FIELDS])),
+            )
+            for shard in range(self.num_shards)
+        ]
+
+    def render(self, screen: pygame.Surface) -> None:
+        """Draw every shard's entities onto one screen (call between ticks)."""
+        self.store.render(screen)
+
+    def close(self) -> None:
+        """Stop the workers and free the shared memory."""
+        if self.store.shm is None:
+            return
+        self._control[0] = _STOP
+        try:
+            self._tick_barrier.wait(self.timeout)
+        except BrokenBarrierError:
+            pass
+        for worker in self._workers:
+            worker.join(self.timeout)
+            if worker.is_alive():
+                worker.terminate()
+        self.store.close()
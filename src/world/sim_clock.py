@@ -0,0 +1,89 @@
+"""
+Fixed-timestep simulation clock, decoupled from the render frame rate.
+"""
+from math import floor
+
+
+class SimulationClock:
+    """
+    Converts real elapsed time into a whole number of fixed simulation steps.
+
+    Each rendered frame adds its real duration (times ``time_scale``) to an
+    accumulator and the world advances one ``timestep`` per accumulated step, so
+    simulation speed does not depend on the achieved FPS: a slow frame is followed
+    by extra catch-up steps instead of slowing the world down.
+    """
+
+    MIN_TIME_SCALE = 0.5
+    MAX_TIME_SCALE = 100.0
+
+    def __init__(
+        self,
+        timestep: float = 1.0 / 60.0,
+        time_scale: float = 1.0,
+        max_frame_time: float = 0.25,
+    ):
+        """
+        Initialize simulation clock.
+
+        Args:
+            timestep: Simulated seconds per step
+            time_scale: Simulated seconds per real second (0.5x - 100x)
+            max_frame_time: Real frame durations are clamped to this many seconds,
+                            so a long stall (e.g. window drag) does not trigger an
+                            unbounded burst of catch-up steps
+        """
+        if timestep <= 0:
+            raise ValueError(f"timestep must be positive, got {timestep}")
+        self.timestep = timestep
+        self.max_frame_time = max_frame_time
+        self.time_scale = 1.0
+        self.set_time_scale(time_scale)
+        self.sim_time = 0.0
+        self.step_count = 0
+        self._accumulator = 0.0
+
+    def set_time_scale(self, time_scale: float) -> None:
+        """
+        Change how fast simulated time runs relative to real time.
+
+        Args:
+            time_scale: Multiplier between MIN_TIME_SCALE and MAX_TIME_SCALE
+        """
+        if not self.MIN_TIME_SCALE <= time_scale <= self.MAX_TIME_SCALE:
+            raise ValueError(
+                f"time_scale must be between {self.MIN_TIME_SCALE} and {self.MAX_TIME_SCALE}, got {time_scale}"
+            )
+        self.time_scale = time_scale
+
+    def advance(self, real_dt: float) -> int:
+        """
+        Account for a rendered frame and return how many steps to simulate.
+
+        Args:
+            real_dt: Real seconds since the previous frame
+
+        Returns:
+            Number of fixed steps the world should run this frame
+        """
+        self._accumulator += min(max(real_dt, 0.0), self.max_frame_time) * self.time_scale
+        # Small epsilon so float error (e.g. 0.05 + 0.05 < 0.1) doesn't drop a step
+        steps = floor(self._accumulator / self.timestep + 1e-9)
+        self._accumulator = max(self._accumulator - steps * self.timestep, 0.0)
+        return steps
+
+    def step(self) -> float:
+        """
+        Record one simulated step.
+
+        Returns:
+            Simulation time after the step, in seconds
+        """
+        self.step_count += 1
+        self.sim_time = self.step_count * self.timestep
+        return self.sim_time
+
+    @property
+    def alpha(self) -> float:
+        """Fraction of a step left in the accumulator (for render interpolation)."""
+        return self._accumulator / self.timestep
@@ -0,0 +1,102 @@
+"""
+Binary world snapshots that load through a memory map.
+
+File layout (little-endian)::
+
+    header    magic (8 bytes), format version (uint32), reserved (uint32),
+              metadata offset (uint64), metadata length (uint64)
+    arrays    raw array bytes, each starting on a 64-byte boundary
+    metadata  UTF-8 JSON: array table (offset, dtype, shape) and small state
+              (clock, RNG states, dialogue, per-character state)
+
+Saving is one write per array. Loading maps the file copy-on-write and hands out
+array views into the mapping, so nothing is parsed or copied up front; pages are
+read from disk as they are touched and writes never reach the file.
+"""
+import json
+import struct
+from pathlib import Path
+from typing import Any, Union
+import numpy as np
+
+MAGIC = b"LWSNAP\x00\x00"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<8sIIQQ")
+_ALIGNMENT = 64
+
+
+class SnapshotError(ValueError):
+    """The file is not a snapshot, has an unsupported version or does not fit the world."""
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+def save_snapshot(path: Union[str, Path], arrays: dict[str, np.ndarray], metadata: dict[str, Any]) -> int:
+    """
+    Write arrays and JSON metadata to a snapshot file.
+
+    Args:
+        path: File to write (replaced if it exists)
+        arrays: Named arrays to store
+        metadata: JSON-serializable state
+
+    Returns:
+        Size of the file in bytes
+    """
+    table = {}
+    with open(path, "wb") as f:
+        f.write(b"\x00" * _HEADER.size)
+        for name, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            offset = _aligned(f.tell())
+            f.write(b"\x00" * (offset - f.tell()))
+            f.write(array.reshape(-1).view(np.uint8))
+            table[name] = {"offset": offset, "dtype": array.dtype.str, "shape": list(array.shape)}
+
+        meta = json.dumps({"arrays": table, **metadata}, separators=(",", ":")).encode("utf-8")
+        meta_offset = f.tell()
+        f.write(meta)
+        size = f.tell()
+        f.seek(0)
+        f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, 0, meta_offset, len(meta)))
+    return size
+
+
+def load_snapshot(path: Union[str, Path]) -> tuple[dict[str, np.ndarray], dict[str, Any]]:
+    """
+    Map a snapshot file and return views of its arrays.
+
+    Args:
+        path: Snapshot file
+
+    Returns:
+        Tuple of (arrays, metadata). Arrays are writable copy-on-write views of the
+        mapped file.
+
+    Raises:
+        SnapshotError: If the file is not a snapshot or has an unsupported version
+    """
+    with open(path, "rb") as f:
+        header = f.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            raise SnapshotError(f"{path} is too short to be a snapshot")
+        magic, version, _, meta_offset, meta_length = _HEADER.unpack(header)
+        if magic != MAGIC:
+            raise SnapshotError(f"{path} is not a LittleWorld snapshot")
+        if version != FORMAT_VERSION:
+            raise SnapshotError(f"{path} has snapshot format {version}, expected {FORMAT_VERSION}")
+        f.seek(meta_offset)
+        metadata = json.loads(f.read(meta_length).decode("utf-8"))
+
+    # Plain ndarray views of the mapping: memmap's per-item indexing overhead is large
+    data = np.memmap(path, dtype=np.uint8, mode="c").view(np.ndarray)
+    arrays = {}
+    for name, entry in metadata.pop("arrays").items():
+        dtype = np.dtype(entry["dtype"])
+        shape = tuple(entry["shape"])
+        count = int(np.prod(shape, dtype=np.int64))
+        start = entry["offset"]
+        arrays[name] = data[start:start + count * dtype.itemsize].view(dtype).reshape(shape)
+    return arrays, metadata
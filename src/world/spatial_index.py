@@ -0,0 +1,153 @@
+"""
+Uniform grid spatial index for radius queries over characters.
+"""
+from math import floor
+from typing import Any, Iterator, Sequence
+import numpy as np
+
+
+class SpatialHashGrid:
+    """
+    Spatial hash grid that buckets objects with ``x``/``y`` attributes into square cells.
+
+    Radius queries only visit the cells overlapping the query circle's bounding box,
+    so a vision query costs O(nearby objects) instead of O(all objects).
+    Objects must be re-indexed with ``update()`` whenever their position changes
+    (``Character.move`` does this automatically).
+    """
+
+    def __init__(self, cell_size: float = 200.0):
+        """
+        Initialize spatial hash grid.
+
+        Args:
+            cell_size: Width/height of a grid cell in pixels. A value close to the
+                       typical vision radius keeps queries to a 3x3 block of cells.
+        """
+        if cell_size <= 0:
+            raise ValueError(f"cell_size must be positive, got {cell_size}")
+        self.cell_size = float(cell_size)
+        # Cells hold insertion-ordered dicts (used as ordered sets) so query
+        # results are deterministic for a given sequence of inserts/moves.
+        self._cells: dict[tuple[int, int], dict[Any, None]] = {}
+        self._object_cells: dict[Any, tuple[int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._object_cells)
+
+    def __contains__(self, obj: Any) -> bool:
+        return obj in self._object_cells
+
+    def cell_of(self, x: float, y: float) -> tuple[int, int]:
+        """Return the (column, row) cell key containing point (x, y)."""
+        return floor(x / self.cell_size), floor(y / self.cell_size)
+
+    def insert(self, obj: Any) -> None:
+        """
+        Add an object to the index at its current position.
+
+        Args:
+            obj: Object exposing ``x`` and ``y`` attributes
+        """
+        if obj in self._object_cells:
+            self.update(obj)
+            return
+        cell = self.cell_of(obj.x, obj.y)
+        self._cells.setdefault(cell, {})[obj] = None
+        self._object_cells[obj] = cell
+
+    def insert_many(self, objects: Sequence[Any], positions: np.ndarray) -> None:
+        """
+        Add many objects at once, computing their cells in one array pass.
+
+        Args:
+            objects: Objects not yet in the index
+            positions: (n, 2) their current positions, aligned with ``objects``
+        """
+        cells = np.floor(np.asarray(positions) / self.cell_size).astype(np.int64).tolist()
+        buckets = self._cells
+        object_cells = self._object_cells
+        for obj, (column, row) in zip(objects, cells):
+            cell = (column, row)
+            buckets.setdefault(cell, {})[obj] = None
+            object_cells[obj] = cell
+
+    def remove(self, obj: Any) -> None:
+        """Remove an object from the index (no-op if it is not indexed)."""
+        cell = self._object_cells.pop(obj, None)
+        if cell is None:
+            return
+        bucket = self._cells[cell]
+        del bucket[obj]
+        if not bucket:
+            del self._cells[cell]
+
+    def update(self, obj: Any) -> None:
+        """
+        Re-index an object after it moved.
+
+        Only touches the grid when the object crossed into a different cell.
+
+        Args:
+            obj: Previously inserted object
+        """
+        old_cell = self._object_cells.get(obj)
+        if old_cell is None:
+            self.insert(obj)
+            return
+        new_cell = self.cell_of(obj.x, obj.y)
+        if new_cell == old_cell:
+            return
+        bucket = self._cells[old_cell]
+        del bucket[obj]
+        if not bucket:
+            del self._cells[old_cell]
+        self._cells.setdefault(new_cell, {})[obj] = None
+        self._object_cells[obj] = new_cell
+
+    def clear(self) -> None:
+        """Remove every object from the index."""
+        self._cells.clear()
+        self._object_cells.clear()
+
+    def candidates(self, x: float, y: float, radius: float) -> Iterator[Any]:
+        """
+        Yield objects in cells overlapping the bounding box of a query circle.
+
+        This is the broad phase: results may lie outside ``radius`` and callers
+        are expected to do the exact distance check themselves.
+
+        Args:
+            x: Query center x
+            y: Query center y
+            radius: Query radius in pixels
+        """
+        min_col, min_row = self.cell_of(x - radius, y - radius)
+        max_col, max_row = self.cell_of(x + radius, y + radius)
+        cells = self._cells
+        for col in range(min_col, max_col + 1):
+            for row in range(min_row, max_row + 1):
+                bucket = cells.get((col, row))
+                if bucket:
+                    yield from bucket
+
+    def query_radius(self, x: float, y: float, radius: float) -> list[Any]:
+        """
+        Return all indexed objects within ``radius`` of (x, y).
+
+        Args:
+            x: Query center x
+            y: Query center y
+            radius: Query radius in pixels
+
+        Returns:
+            List of objects whose position lies inside the query circle
+        """
+        radius_sq = radius * radius
+        result = []
+        for obj in self.candidates(x, y, radius):
+            dx = obj.x - x
+            dy = obj.y - y
+            if dx * dx + dy * dy <= radius_sq:
+                result.append(obj)
+        return result
@@ -2,32 +2,96 @@
 Main World class for managing the game world, game loop, and character interactions.
 """
 import pygame
-from typing import Optional
+import random
+import numpy as np
+from collections import deque
+from pathlib import Path
+from typing import AsyncIterator, Optional, Sequence
 from config import LittleWorldConfig, load_config
+from language_model.dispatcher import configure_providers
 from character import Character, AICharacter
 from .world_state import WorldState, VisibleCharacter, WorldBounds, calculate_distance, calculate_direction
 from .world_setup import setup_pygame
+from .spatial_index import SpatialHashGrid
+from .entity_store import EntityStore, EntityHandle
+from .movement import batch_move, sync_spatial_index
+from .collision import resolve_collisions
+from .events import EventBus, EventType, WorldEvent
+from .batch_observation import ObservationBatch, compute_observation_batch
+from .observation_tracker import ObservationTracker, WorldStateDelta
 from .character_setup import PlayerA, AICharacterA, BigGuyOne
-from .dialogue import render_dialogue_bubble
-import asyncio
+from .renderer import LayeredRenderer
+from .dialogue import DialogueStream
+from .decision_scheduler import DecisionScheduler
+from .input_source import InputSource, KeyboardInputSource
+from .sim_clock import SimulationClock
+from .snapshot import SnapshotError, load_snapshot, save_snapshot
+from .action_log import create_action_log
 
+MAX_PENDING_MESSAGES = 8  # Messages kept per character between decisions (oldest dropped)
 
 class World:
-    def __init__(self, config: LittleWorldConfig | None = None):
+    def __init__(
+        self,
+        config: LittleWorldConfig | None = None,
+        headless: bool = False,
+        input_source: Optional[InputSource] = None,
+    ):
         """
         Initialize world.
         
         Args:
             config: Configuration object. If None, loads from YAML.
+            headless: Run without a display: no window, no rendering, and ticks
+                      are not paced to the configured FPS.
+            input_source: Source of player movement. If None, reads the keyboard
+                          (or stands still when headless).
         """
         # Load config if not provided (dependency injection)
         if config is None:
             config = load_config()
         self.config = config
+        self.headless = headless
         
-        # Setup pygame (window, screen, clock)
-        self.screen, self.clock = setup_pygame(config)
+        # Setup pygame (window, screen, clock) unless running headless
+        if headless:
+            self.screen, self.clock = None, None
+        else:
+            self.screen, self.clock = setup_pygame(config)
+        self.renderer = None if headless else LayeredRenderer(self.screen, config.colors.ground)
         self.running = True
+        self.tick_count = 0
+        
+        # Fixed-timestep simulation clock (decoupled from the render frame rate)
+        self.sim_clock = SimulationClock(
+            timestep=config.game.timestep,
+            time_scale=config.game.time_scale,
+            max_frame_time=config.game.max_frame_time,
+        )
+        # World RNG; seeds every character's RNG so seeded runs are reproducible
+        self.rng = random.Random(config.simulation.seed)
+        
+        if input_source is None:
+            input_source = InputSource() if headless else KeyboardInputSource()
+        self.input_source = input_source
+        
+        # Spatial index for vision queries (kept in sync by Character.move)
+        self.spatial_index = SpatialHashGrid(config.simulation.spatial_cell_size)
+        
+        # Array storage for every character's position/velocity/appearance
+        self.entities = EntityStore(
+            config.window.width,
+            config.window.height,
+            capacity=config.simulation.entity_capacity,
+        )
+        
+        # World events (AI characters subscribe to request decisions)
+        self.events = EventBus()
+        self._entity_objects: dict[int, Character] = {}  # Entity id -> character
+        self._seen: dict[Character, set] = {}  # Event subject -> characters in view
+        self._at_boundary: set[Character] = set()
+        self._touching: set[tuple[int, int]] = set()  # Entity id pairs in contact (subjects only)
+        self._inbox: dict[Character, deque[WorldEvent]] = {}  # AI character -> messages not yet in a prompt
         
         # Create characters using character classes
         self.player = PlayerA(
@@ -52,17 +116,44 @@ class World:
         )
         
         # List of all characters
-        self.characters = [self.player, self.ai_character, self.big_guy]
+        self.characters: list[Character] = []
+        self._movement_groups = None  # Cached (ai characters, batch movers); reset on add/remove
+        self._render_groups = None  # Cached (per-object characters, store-drawn entity ids); reset on add/remove
+        for character in (self.player, self.ai_character, self.big_guy):
+            self.add_character(character)
         
         # Dialogue bubble storage
         self.dialogue_text = None
         self.dialogue_character = None
+        self._dialogue_stream: Optional[DialogueStream] = None
+        
+        # Per-observer snapshots for incremental observations
+        self.observation_tracker = ObservationTracker(config.simulation.observation_move_threshold)
+        
+        # Seeded generator for batch movement (random-walk direction changes)
+        self.movement_rng = np.random.default_rng(self.rng.getrandbits(64))
+        
+        # Decisions, observations and LLM latencies (None when disabled)
+        self.action_log = create_action_log(config.action_log)
+        
+        # Request limits are per provider, shared by every character's model
+        configure_providers(config.llm_providers)
+        
+        # LLM calls run on a background event loop so they never block rendering
+        self.scheduler = DecisionScheduler(
+            event_driven=config.simulation.event_driven_decisions,
+            max_idle_time=config.simulation.max_idle_time,
+            action_log=self.action_log,
+        )
+        self.scheduler.start()
         
         # Call test method after initialization
         self._init_test_observation()
 
     def handle_events(self):
         """Handle pygame events"""
+        if self.headless:
+            return
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.running = False
@@ -70,43 +161,295 @@ class World:
                 if event.key == pygame.K_ESCAPE:
                     self.running = False
 
-    def get_world_state_for(self, character: Character, vision_radius: float) -> WorldState:
+    def add_character(self, character: Character) -> None:
+        """
+        Register a character in the world and its spatial index.
+        
+        Args:
+            character: Character to add
+        """
+        if isinstance(character, Character):
+            character.attach_to_store(self.entities)
+            # Model-less AI characters random-walk; batch movement needs to know
+            self.entities.wander[character.entity_id] = (
+                isinstance(character, AICharacter) and character.model is None
+            )
+        self.characters.append(character)
+        self._entity_objects[character.entity_id] = character
+        self._movement_groups = None
+        self._render_groups = None
+        if isinstance(character, AICharacter) and character.model is not None:
+            # Relevant events make the character decide (event-driven scheduling)
+            self.events.subscribe_to(
+                character,
+                lambda event, c=character: self.scheduler.request_decision(c),
+                character.decision_triggers,
+            )
+            # Messages are queued for the next decision prompt, whatever the triggers
+            self.events.subscribe_to(
+                character,
+                lambda event, c=character: self._inbox.setdefault(
+                    c, deque(maxlen=MAX_PENDING_MESSAGES)
+                ).append(event),
+                (EventType.MESSAGE_RECEIVED,),
+            )
+        self.spatial_index.insert(character)
+        character.spatial_index = self.spatial_index
+        if isinstance(getattr(character, 'rng', None), random.Random):
+            character.rng.seed(self.rng.getrandbits(64))
+
+    def remove_character(self, character: Character) -> None:
+        """
+        Remove a character from the world and its spatial index.
+        
+        Args:
+            character: Character to remove
+        """
+        self.characters.remove(character)
+        self._entity_objects.pop(character.entity_id, None)
+        self._movement_groups = None
+        self._render_groups = None
+        self.events.unsubscribe(character)
+        self._seen.pop(character, None)
+        self._inbox.pop(character, None)
+        self._at_boundary.discard(character)
+        self.scheduler.forget(character)
+        self.spatial_index.remove(character)
+        character.spatial_index = None
+        self.observation_tracker.forget(character)
+        if isinstance(character, Character):
+            character.detach_from_store()
+        else:
+            self.entities.despawn(character.entity_id)
+
+    def spawn_entities(
+        self,
+        count: int,
+        radius: Optional[int] = None,
+        color: Optional[tuple[int, int, int]] = None,
+        vision_radius: float = 0.0,
+        positions: Optional[np.ndarray] = None,
+        wander: bool = True,
+    ) -> list[EntityHandle]:
+        """
+        Add many lightweight entities (no per-object config or behaviour).
+        
+        Args:
+            count: Number of entities to add
+            radius: Radius in pixels. If None, uses config.character.radius
+            color: Color (RGB). If None, uses config.colors.character
+            vision_radius: Vision radius in pixels
+            positions: (count, 2) initial positions. If None, placed uniformly at
+                       random (seeded from the world RNG)
+            wander: Random-walk at config.character.speed (moved by batch movement)
+            
+        Returns:
+            Handles for the new entities
+        """
+        radius = self.config.character.radius if radius is None else radius
+        color = color or self.config.colors.character
+        if positions is None:
+            rng = np.random.default_rng(self.rng.getrandbits(64))
+            low = (radius, radius)
+            high = (self.config.window.width - radius, self.config.window.height - radius)
+            positions = rng.uniform(low, high, size=(count, 2))
+        
+        indices = self.entities.spawn_many(
+            positions, radius, color, vision_radius,
+            speed=self.config.character.speed, wander=wander,
+        )
+        handles = [EntityHandle(self.entities, index) for index in indices.tolist()]
+        for handle in handles:
+            handle.spatial_index = self.spatial_index
+            self._entity_objects[handle.index] = handle
+            self.spatial_index.insert(handle)
+        self.characters.extend(handles)
+        self._movement_groups = None
+        self._render_groups = None
+        return handles
+
+    @staticmethod
+    def _snapshot_key(character: Character) -> str:
+        """Identifies a character across runs of the same config."""
+        return f"{type(character).__name__}:{getattr(character, 'name', '')}"
+
+    def snapshot(self, path: str | Path) -> int:
+        """
+        Save the world's entities, clock, RNG states, dialogue and per-character state.
+        
+        Args:
+            path: File to write (see world.snapshot for the format)
+            
+        Returns:
+            Size of the file in bytes
+        """
+        arrays = self.entities.export_arrays()
+        arrays["order"] = self._get_movement_groups()[3].astype(np.int64)
+        characters = [
+            {
+                "key": self._snapshot_key(c),
+                "entity_id": c.entity_id,
+                "state": c.export_state(),
+                "last_decision": self.scheduler.last_decision(c),
+            }
+            for c in self.characters
+            if isinstance(c, Character)
+        ]
+        rng_version, rng_internal, rng_gauss = self.rng.getstate()
+        speaker = self.dialogue_character
+        metadata = {
+            "world": {
+                "width": self.entities.width,
+                "height": self.entities.height,
+                "tick_count": self.tick_count,
+                "step_count": self.sim_clock.step_count,
+                "rng": [rng_version, list(rng_internal), rng_gauss],
+                "movement_rng": self.movement_rng.bit_generator.state,
+            },
+            "dialogue": {
+                "text": self.dialogue_text,
+                "speaker": speaker.entity_id if speaker is not None else None,
+            },
+            "characters": characters,
+        }
+        return save_snapshot(path, arrays, metadata)
+
+    def restore(self, path: str | Path) -> None:
+        """
+        Replace the world's state with a snapshot.
+        
+        The world must already contain the snapshot's characters (matched by class
+        and name), e.g. a World built from the same config; their models and config
+        are kept. Characters not in the snapshot are removed and lightweight entities
+        are recreated. Entity arrays are memory-mapped from the file rather than
+        parsed. Event, observation and pending-decision state starts fresh.
+        
+        Args:
+            path: Snapshot file written by snapshot()
+            
+        Raises:
+            SnapshotError: If the file is not a snapshot or does not fit this world
+        """
+        arrays, metadata = load_snapshot(path)
+        saved = metadata["world"]
+        if (saved["width"], saved["height"]) != (self.entities.width, self.entities.height):
+            raise SnapshotError(
+                f"Snapshot is for a {saved['width']}x{saved['height']} world, "
+                f"this world is {self.entities.width}x{self.entities.height}"
+            )
+        existing = {self._snapshot_key(c): c for c in self.characters if isinstance(c, Character)}
+        records = metadata["characters"]
+        missing = [record["key"] for record in records if record["key"] not in existing]
+        if missing:
+            raise SnapshotError(f"World has no character matching {', '.join(missing)}")
+        
+        # Drop characters the snapshot doesn't have; the others are re-bound to their saved entities
+        restored = {record["key"] for record in records}
+        for key, character in existing.items():
+            if key not in restored:
+                self.remove_character(character)
+        self.entities.load_arrays(arrays)
+        
+        objects = {}
+        for record in records:
+            character = existing[record["key"]]
+            character.bind_entity(self.entities, record["entity_id"])
+            character.import_state(record["state"])
+            self.scheduler.forget(character)
+            if record["last_decision"] is not None:
+                self.scheduler.set_last_decision(character, record["last_decision"])
+            objects[record["entity_id"]] = character
+        
+        self.characters = [
+            objects.get(entity_id) or EntityHandle(self.entities, entity_id)
+            for entity_id in arrays["order"].tolist()
+        ]
+        self._entity_objects = {c.entity_id: c for c in self.characters}
+        self._movement_groups = None
+        self._render_groups = None
+        for character in self.characters:
+            character.spatial_index = self.spatial_index
+        self.spatial_index.clear()
+        self.spatial_index.insert_many(self.characters, self.entities.pos[arrays["order"]])
+        self._seen.clear()
+        self._inbox.clear()
+        self._at_boundary.clear()
+        self._touching = set()
+        self.observation_tracker = ObservationTracker(self.config.simulation.observation_move_threshold)
+        
+        self.tick_count = saved["tick_count"]
+        self.sim_clock.step_count = saved["step_count"]
+        self.sim_clock.sim_time = saved["step_count"] * self.sim_clock.timestep
+        rng_version, rng_internal, rng_gauss = saved["rng"]
+        self.rng.setstate((rng_version, tuple(rng_internal), rng_gauss))
+        self.movement_rng.bit_generator.state = saved["movement_rng"]
+        
+        dialogue = metadata["dialogue"]
+        self.show_dialogue(self._entity_objects.get(dialogue["speaker"]), dialogue["text"])
+        if self.renderer is not None:
+            self.renderer.invalidate()
+
+    def visible_characters_for(self, character: Character, vision_radius: float) -> list[Character]:
+        """
+        Find the characters within a character's vision radius.
+        
+        Args:
+            character: The observing character
+            vision_radius: Vision radius in pixels
+            
+        Returns:
+            Visible characters (excluding the observer), in spatial index order
+        """
+        observer_x, observer_y = character.x, character.y
+        # The spatial index only yields characters from nearby grid cells
+        return [
+            other_char
+            for other_char in self.spatial_index.candidates(observer_x, observer_y, vision_radius)
+            if other_char is not character
+            and calculate_distance(observer_x, observer_y, other_char.x, other_char.y) <= vision_radius
+        ]
+
+    def get_world_state_for(
+        self,
+        character: Character,
+        vision_radius: float,
+        visible: Optional[Sequence[Character]] = None,
+    ) -> WorldState:
         """
         Get world state observation for a specific character.
         
         Args:
             character: The character requesting the observation
             vision_radius: Vision radius in pixels
+            visible: Characters in view, as returned by visible_characters_for.
+                     If None, they are looked up.
             
         Returns:
-            WorldState object with structured observation data
+            WorldState object with structured observation data, with
+            visible_characters in the same order as ``visible``
         """
         observer_x, observer_y = character.x, character.y
+        if visible is None:
+            visible = self.visible_characters_for(character, vision_radius)
         
-        # Find visible characters (within vision radius, excluding self)
         visible_chars = []
-        for other_char in self.characters:
-            if other_char is character:
-                continue
-            
+        for other_char in visible:
+            relative_x = other_char.x - observer_x
+            relative_y = other_char.y - observer_y
             distance = calculate_distance(observer_x, observer_y, other_char.x, other_char.y)
-            if distance <= vision_radius:
-                relative_x = other_char.x - observer_x
-                relative_y = other_char.y - observer_y
-                direction = calculate_direction(relative_x, relative_y)
-                
-                # Determine character type
-                char_type = "player" if isinstance(other_char, type(self.player)) else "ai"
-                char_name = getattr(other_char, 'name', f"{char_type}_character")
-                
-                visible_chars.append(VisibleCharacter(
-                    name=char_name,
-                    character_type=char_type,
-                    relative_x=relative_x,
-                    relative_y=relative_y,
-                    distance=distance,
-                    direction=direction
-                ))
+            direction = calculate_direction(relative_x, relative_y)
+            
+            char_type = self._character_type(other_char)
+            char_name = getattr(other_char, 'name', f"{char_type}_character")
+            
+            visible_chars.append(VisibleCharacter(
+                name=char_name,
+                character_type=char_type,
+                relative_x=relative_x,
+                relative_y=relative_y,
+                distance=distance,
+                direction=direction
+            ))
         
         # Calculate world bounds
         world_bounds = WorldBounds(
@@ -125,69 +468,414 @@ class World:
             world_bounds=world_bounds
         )
 
-    def update(self):
-        """Update world state"""
+    def observe_incremental(self, character: Character) -> tuple[WorldState, WorldStateDelta]:
+        """
+        Observe for a character, reporting only what changed since its last snapshot.
+        
+        Args:
+            character: The observing character (uses its vision_radius)
+            
+        Returns:
+            Tuple of (world state, delta). The world state is the previous snapshot
+            object when the delta is empty.
+        """
+        vision_radius = getattr(character, 'vision_radius', 200.0)
+        visible = self.visible_characters_for(character, vision_radius)
+        return self.observation_tracker.diff(
+            character,
+            (character.x, character.y),
+            visible,
+            [(c.x, c.y) for c in visible],
+            lambda: self.get_world_state_for(character, vision_radius, visible),
+        )
+
+    def get_world_states_batch(
+        self,
+        characters: Optional[Sequence[Character]] = None,
+    ) -> ObservationBatch:
+        """
+        Get world state observations for many characters in one vectorized pass.
+        
+        Equivalent to calling get_world_state_for for each character with its own
+        vision radius, but distances, vision masks, directions and bounds are
+        computed with NumPy. WorldState objects are built lazily on indexing.
+        
+        Args:
+            characters: Observing characters. If None, uses every AI character.
+            
+        Returns:
+            ObservationBatch indexed in the same order as ``characters``
+        """
+        if characters is None:
+            characters = [c for c in self.characters if isinstance(c, AICharacter)]
+        
+        targets = self.characters
+        # Positions come straight from the entity store's arrays
+        target_positions = self.entities.pos[[c.entity_id for c in targets]]
+        target_types = [self._character_type(c) for c in targets]
+        target_names = [
+            getattr(c, 'name', f"{char_type}_character")
+            for c, char_type in zip(targets, target_types)
+        ]
+        target_index = {id(c): i for i, c in enumerate(targets)}
+        
+        return compute_observation_batch(
+            observer_positions=self.entities.pos[[c.entity_id for c in characters]],
+            vision_radii=np.array([getattr(c, 'vision_radius', 200.0) for c in characters], dtype=np.float64),
+            target_positions=target_positions,
+            world_width=self.config.window.width,
+            world_height=self.config.window.height,
+            target_names=target_names,
+            target_types=target_types,
+            observer_target_indices=np.array(
+                [target_index.get(id(c), -1) for c in characters], dtype=np.intp
+            ),
+        )
+
+    def _character_type(self, character: Character) -> str:
+        """Return the observation type ("player" or "ai") of a character."""
+        return "player" if isinstance(character, type(self.player)) else "ai"
+
+    def update(self, dt: Optional[float] = None):
+        """
+        Advance the world by one fixed simulation step.
+        
+        Args:
+            dt: Simulated seconds to advance. If None, uses the clock's timestep.
+        """
+        if dt is None:
+            dt = self.sim_clock.timestep
+        now = self.sim_clock.step()
+        self.tick_count += 1
+        
+        # Apply LLM results (decisions, dialogue) that completed since last step
+        self.scheduler.process_completed()
+        self._sync_dialogue_stream()
+        
         # Handle player input
-        keys = pygame.key.get_pressed()
-        self.player.handle_input(keys)
+        self.player.apply_input(*self.input_source.get_direction(), dt)
+        
+        # Dispatch decisions for AI characters whose decision interval elapsed
+        self._schedule_decisions(now)
+        
+        # Move AI characters and entities
+        ai_characters, movers, mover_ids, _ = self._get_movement_groups()
+        if len(ai_characters) < self.config.simulation.batch_movement_threshold:
+            for character in ai_characters:
+                character.update(dt)
+        self._batch_move(movers, mover_ids, dt)
+        
+        # Keep characters from overlapping
+        contacts = None
+        if self.config.simulation.collisions:
+            contacts = self._resolve_collisions()
         
-        # Update AI character - pass world state (passive mode)
-        if isinstance(self.ai_character, AICharacter):
-            world_state = self.get_world_state_for(self.ai_character, self.ai_character.vision_radius)
-            self.ai_character.update(world_state=world_state)
+        self._publish_events(now, contacts)
+
+    def deliver_message(self, speaker: Character, text: str, target: Optional[str] = None) -> int:
+        """
+        Deliver a spoken message as MESSAGE_RECEIVED events.
+        
+        Args:
+            speaker: Speaking character
+            text: Message text
+            target: Name of the addressed character. If None, everyone within the
+                    speaker's vision radius hears it.
+            
+        Returns:
+            Number of recipients
+        """
+        if target is not None:
+            recipients = [c for c in self.characters if getattr(c, 'name', None) == target]
         else:
-            self.ai_character.update()
+            recipients = self.visible_characters_for(speaker, getattr(speaker, 'vision_radius', 200.0))
+        now = self.sim_clock.sim_time
+        for recipient in recipients:
+            if recipient is not speaker:
+                self.events.publish(WorldEvent(
+                    EventType.MESSAGE_RECEIVED, recipient, now, other=speaker, message=text
+                ))
+        return len(recipients)
+
+    def _publish_events(self, now: float, contacts: Optional[tuple[np.ndarray, np.ndarray]]):
+        """
+        Detect and publish ENTERED_VISION, BOUNDARY_HIT and COLLISION events.
+        
+        Only characters with targeted event subscriptions are checked, so the cost
+        scales with the number of subscribers, not the population. Each event is
+        published once when the condition starts (not every tick while it holds).
+        
+        Args:
+            now: Current simulation time in seconds
+            contacts: Entity id pairs in contact this tick (from collision resolution)
+        """
+        subjects = self.events.subjects
+        if not subjects:
+            return
+        publish = self.events.publish
+        
+        # Characters coming into view
+        for subject in subjects:
+            radius = getattr(subject, 'vision_radius', 0.0)
+            if not radius:
+                continue
+            visible = set(self.visible_characters_for(subject, radius))
+            seen = self._seen.get(subject, set())
+            for other in visible - seen:
+                publish(WorldEvent(EventType.ENTERED_VISION, subject, now, other=other))
+            self._seen[subject] = visible
+        
+        # Reaching the edge of the world
+        ids = np.array([subject.entity_id for subject in subjects], dtype=np.intp)
+        positions = self.entities.pos[ids]
+        reach = self.entities.radius[ids].astype(np.float64)[:, None] + 0.5
+        limits = np.array([self.config.window.width, self.config.window.height], dtype=np.float64)
+        at_edge = ((positions <= reach) | (positions >= limits - reach)).any(axis=1)
+        at_boundary = {subject for subject, edge in zip(subjects, at_edge.tolist()) if edge}
+        for subject in at_boundary - self._at_boundary:
+            publish(WorldEvent(EventType.BOUNDARY_HIT, subject, now))
+        self._at_boundary = at_boundary
+        
+        # New contacts involving a subscriber
+        touching = set()
+        if contacts is not None and len(contacts[0]):
+            first, second = contacts
+            involved = np.isin(first, ids) | np.isin(second, ids)
+            for a, b in zip(first[involved].tolist(), second[involved].tolist()):
+                pair = (a, b) if a < b else (b, a)
+                touching.add(pair)
+                if pair in self._touching:
+                    continue
+                obj_a, obj_b = self._entity_objects.get(a), self._entity_objects.get(b)
+                if obj_a in self.events:
+                    publish(WorldEvent(EventType.COLLISION, obj_a, now, other=obj_b))
+                if obj_b in self.events:
+                    publish(WorldEvent(EventType.COLLISION, obj_b, now, other=obj_a))
+        self._touching = touching
+
+    def _get_movement_groups(self) -> tuple[list[AICharacter], list, np.ndarray, np.ndarray]:
+        """
+        Split characters into per-object updaters and batch movers.
+        
+        Returns:
+            Tuple of (AI characters, objects moved by batch movement, their entity ids,
+            entity ids of all characters in self.characters order). AI characters are
+            batch-moved only at or above batch_movement_threshold.
+        """
+        if self._movement_groups is None:
+            ai_characters = [c for c in self.characters if isinstance(c, AICharacter)]
+            batch_ai = len(ai_characters) >= self.config.simulation.batch_movement_threshold
+            movers = [
+                c for c in self.characters
+                if isinstance(c, EntityHandle) or (batch_ai and isinstance(c, AICharacter))
+            ]
+            mover_ids = np.array([c.entity_id for c in movers], dtype=np.intp)
+            all_ids = np.array([c.entity_id for c in self.characters], dtype=np.intp)
+            self._movement_groups = (ai_characters, movers, mover_ids, all_ids)
+        return self._movement_groups
+
+    def _get_render_groups(self) -> tuple[list[Character], np.ndarray]:
+        """
+        Split characters into per-object renders and entities drawn from the store.
+        
+        Returns:
+            Tuple of (full characters, entity ids of EntityHandles), both in
+            self.characters order
+        """
+        if self._render_groups is None:
+            characters = [c for c in self.characters if not isinstance(c, EntityHandle)]
+            entity_ids = np.array(
+                [c.index for c in self.characters if isinstance(c, EntityHandle)], dtype=np.intp
+            )
+            self._render_groups = (characters, entity_ids)
+        return self._render_groups
+
+    def _resolve_collisions(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Push overlapping characters apart and re-index those that changed cell.
+        
+        Returns:
+            Tuple of (a, b) entity id arrays of the pairs that were in contact
+        """
+        ids = self._get_movement_groups()[3]
+        old_positions = self.entities.pos[ids]
+        contacts = resolve_collisions(self.entities, ids, self.config.simulation.collision_iterations)
+        if len(contacts[0]):
+            sync_spatial_index(self.spatial_index, self.characters, old_positions, self.entities.pos[ids])
+        return contacts
+
+    def _batch_move(self, movers: list, mover_ids: np.ndarray, dt: float):
+        """
+        Move entities in one vectorized pass and re-index those that changed cell.
+        
+        Args:
+            movers: Objects to move
+            mover_ids: Their entity ids
+            dt: Simulated seconds to advance
+        """
+        if len(mover_ids) == 0:
+            return
+        old_positions = self.entities.pos[mover_ids]
+        batch_move(
+            self.entities, mover_ids, dt, self.movement_rng,
+            self.config.simulation.random_walk_interval,
+        )
+        sync_spatial_index(self.spatial_index, movers, old_positions, self.entities.pos[mover_ids])
+
+    def _schedule_decisions(self, now: float):
+        """
+        Start LLM decisions for every AI character that is due.
+        
+        Observations are snapshotted here on the game loop thread; the LLM calls
+        themselves run on the scheduler's background loop. With
+        skip_unchanged_observations, a character whose view has not changed since
+        its last decision and who has no pending messages keeps its current action
+        and no LLM call is made. Pending messages go into the decision prompt.
+        
+        Args:
+            now: Current simulation time in seconds
+        """
+        due = self.scheduler.due_characters(self.characters, now)
+        if not due:
+            return
+        observations = self.get_world_states_batch(due)
+        skip_unchanged = self.config.simulation.skip_unchanged_observations
+        for i, character in enumerate(due):
+            visible = [self.characters[t] for t in observations.visible_indices(i).tolist()]
+            world_state, delta = self.observation_tracker.diff(
+                character,
+                observations.observer_positions[i].tolist(),
+                visible,
+                self.entities.pos[[c.entity_id for c in visible]].tolist(),
+                lambda i=i: observations[i],
+            )
+            inbox = self._inbox.pop(character, ())
+            if skip_unchanged and delta.is_empty and not inbox:
+                self.scheduler.skip_decision(character, now)
+                continue
+            if self.action_log is not None:
+                self.action_log.log_observation(now, character, delta.describe())
+            messages = [f'{getattr(e.other, "name", "Someone")} said: "{e.message}"' for e in inbox]
+            self.scheduler.dispatch_decision(character, world_state, now, messages)
+
+    def show_dialogue(self, character: Character, text: str):
+        """
+        Show a dialogue bubble above a character.
+        
+        Args:
+            character: Speaking character
+            text: Text to display
+        """
+        self.dialogue_text = text
+        self.dialogue_character = character
+        self._dialogue_stream = None
+
+    def show_dialogue_stream(self, character: Character, chunks: AsyncIterator[str]) -> DialogueStream:
+        """
+        Show a dialogue bubble that fills in while the reply is generated.
+        
+        The chunks are consumed on the scheduler's loop; every frame shows the text
+        received so far, so the bubble appears at the first token instead of after
+        the whole completion.
+        
+        Args:
+            character: Speaking character
+            chunks: Async iterator of text chunks (e.g. BaseAIModelEngine.stream_answering)
+            
+        Returns:
+            The buffer receiving the text
+        """
+        stream = DialogueStream()
+        
+        async def consume():
+            try:
+                async for chunk in chunks:
+                    stream.append(chunk)
+            except BaseException as error:
+                stream.close(error)
+                raise
+            stream.close()
+            return stream.text
+        
+        def on_error(error):
+            print(f"Error in dialogue stream: {error}")
+        
+        self.dialogue_text = ""
+        self.dialogue_character = character
+        self._dialogue_stream = stream
+        self.scheduler.submit(consume(), on_error=on_error)
+        return stream
+
+    def _sync_dialogue_stream(self):
+        """Copy the active dialogue stream's text into the bubble."""
+        stream = self._dialogue_stream
+        if stream is None:
+            return
+        done = stream.done
+        text = stream.text
+        if stream.error is not None:
+            text = f"{text} [Error: {stream.error}]" if text else f"Error: {stream.error}"
+        self.dialogue_text = text
+        if done:
+            self._dialogue_stream = None
 
     def _init_test_observation(self):
-        """Initialize and call test observation for BigGuyOne."""
-        async def test_observation():
-            if hasattr(self.big_guy, 'model') and self.big_guy.model:
-                world_state = self.get_world_state_for(self.big_guy, self.big_guy.vision_radius)
-                response = await self.big_guy.test_what_i_see(world_state)
-                # Extract text from response (handle different response types)
-                if hasattr(response, 'content'):
-                    self.dialogue_text = response.content
-                elif isinstance(response, str):
-                    self.dialogue_text = response
-                else:
-                    self.dialogue_text = str(response)
-                self.dialogue_character = self.big_guy
-        
-        # Run async function
-        try:
-            asyncio.run(test_observation())
-        except Exception as e:
-            print(f"Error in test observation: {e}")
-            self.dialogue_text = f"Error: {e}"
-            self.dialogue_character = self.big_guy
+        """Start the test observation for BigGuyOne without blocking startup."""
+        if not (hasattr(self.big_guy, 'model') and self.big_guy.model):
+            return
+        
+        world_state = self.get_world_state_for(self.big_guy, self.big_guy.vision_radius)
+        self.show_dialogue_stream(self.big_guy, self.big_guy.stream_what_i_see(world_state))
 
     def render(self):
         """Render the world"""
-        # Fill screen with ground color
-        self.screen.fill(self.config.colors.ground)
-        
-        # Render all characters
-        for character in self.characters:
-            character.render(self.screen)
+        if self.headless:
+            return
         
-        # Render dialogue bubble if there's dialogue text
+        self._sync_dialogue_stream()
+        dialogue = None
         if self.dialogue_text and self.dialogue_character:
-            render_dialogue_bubble(
-                self.screen,
-                self.dialogue_text,
-                self.dialogue_character.x,
-                self.dialogue_character.y,
-            )
+            dialogue = (self.dialogue_text, self.dialogue_character.x, self.dialogue_character.y)
         
-        # Update display
-        pygame.display.flip()
+        # Only the parts of the screen that changed are redrawn and updated; entity
+        # handles are drawn straight from the store's arrays, beneath full characters
+        characters, entity_ids = self._get_render_groups()
+        self.renderer.render(characters, dialogue, self.entities, entity_ids)
 
-    def run(self):
-        """Main game loop"""
+    def run(self, max_ticks: Optional[int] = None):
+        """
+        Main game loop.
+        
+        Windowed runs render at the configured FPS and advance the simulation by
+        however many fixed steps the elapsed real time (times time_scale) covers.
+        Headless runs advance exactly one fixed step per iteration as fast as
+        possible, which is deterministic for a given seed.
+        
+        Args:
+            max_ticks: Stop after this many simulation steps. If None, runs until quit.
+        """
+        if not self.headless:
+            self.clock.tick()  # Reset frame timer so startup time is not simulated
+        
         while self.running:
             self.handle_events()
-            self.update()
+            
+            if self.headless:
+                steps = 1
+            else:
+                real_dt = self.clock.tick(self.config.game.fps) / 1000.0
+                steps = self.sim_clock.advance(real_dt)
+            
+            for _ in range(steps):
+                self.update()
+                if max_ticks is not None and self.tick_count >= max_ticks:
+                    self.running = False
+                    break
+            
             self.render()
-            self.clock.tick(self.config.game.fps)
         
-        pygame.quit()
+        self.scheduler.stop()
+        if self.action_log is not None:
+            self.action_log.close()
+        if not self.headless:
+            pygame.quit()
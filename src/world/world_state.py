@@ -36,6 +36,73 @@ class WorldState(BaseModel):
     def to_structured_dict(self) -> dict:
         """Convert to structured dictionary for LLM processing."""
         return self.model_dump()
+    
+    def quantized(self, step: float) -> "WorldState":
+        """
+        Return a copy with positions and distances rounded to multiples of ``step``.
+        
+        Near-identical observations quantize to the same values, so they render to
+        the same prompt text (and hit the same response cache entry). Directions are
+        recomputed from the rounded offsets.
+        
+        Args:
+            step: Quantization step in pixels. 0 returns self unchanged.
+            
+        Returns:
+            Quantized WorldState
+        """
+        if step <= 0:
+            return self
+        
+        def q(value: float) -> float:
+            return round(value / step) * step
+        
+        bounds = self.world_bounds
+        return WorldState(
+            observer_position=(q(self.observer_position[0]), q(self.observer_position[1])),
+            vision_radius=self.vision_radius,
+            visible_characters=[
+                VisibleCharacter(
+                    name=char.name,
+                    character_type=char.character_type,
+                    relative_x=q(char.relative_x),
+                    relative_y=q(char.relative_y),
+                    distance=q(char.distance),
+                    direction=calculate_direction(q(char.relative_x), q(char.relative_y)),
+                )
+                for char in self.visible_characters
+            ],
+            world_bounds=WorldBounds(
+                distance_to_north=q(bounds.distance_to_north),
+                distance_to_south=q(bounds.distance_to_south),
+                distance_to_east=q(bounds.distance_to_east),
+                distance_to_west=q(bounds.distance_to_west),
+                world_width=bounds.world_width,
+                world_height=bounds.world_height,
+            ),
+        )
+
+
+def format_world_state_text(world_state: Optional[WorldState]) -> str:
+    """
+    Format a world state as prompt text for an AI character.
+    
+    Args:
+        world_state: WorldState to describe. If None, describes an unknown state.
+        
+    Returns:
+        Human-readable description of what the observer sees
+    """
+    observation_dict = world_state.to_structured_dict() if world_state else {}
+    world_state_text = f"""World State:
+- My position: {observation_dict.get('observer_position', 'unknown')}
+- Visible characters: {len(observation_dict.get('visible_characters', []))}
+"""
+    
+    for char in observation_dict.get('visible_characters', []):
+        world_state_text += f"- {char['name']} ({char['character_type']}) at {char['distance']:.1f} pixels {char['direction']} from me\n"
+    
+    return world_state_text
 
 
 def calculate_distance(x1: float, y1: float, x2: float, y2: float) -> float:
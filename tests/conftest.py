@@ -0,0 +1,16 @@
+"""
+Shared pytest configuration for LittleWorld tests.
+"""
+import os
+import sys
+from pathlib import Path
+
+# Source modules import each other as top-level packages (e.g. ``from config import ...``),
+# the same way ``src/main.py`` runs them, so ``src`` has to be importable directly.
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+# Never open a real window from tests.
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
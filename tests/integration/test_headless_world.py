@@ -0,0 +1,58 @@
+"""
+Integration tests for running World headless (no display).
+"""
+import pytest
+from config import LittleWorldConfig, SimulationConfig, WindowConfig
+from world import World
+from world.input_source import ScriptedInputSource
+
+
+class TestHeadlessWorld:
+    """Test World(headless=True)."""
+
+    def test_runs_without_display(self):
+        """Test a headless world runs a fixed number of ticks without a screen."""
+        world = World(LittleWorldConfig(), headless=True)
+
+        world.run(max_ticks=50)
+
+        assert world.screen is None
+        assert world.tick_count == 50
+        assert not world.running
+
+    def test_scripted_input_moves_player(self):
+        """Test a scripted input source replaces the keyboard."""
+        config = LittleWorldConfig(window=WindowConfig(width=800, height=600))
+        script = [(1, 0)] * 10 + [(0, -1)] * 4
+        world = World(config, headless=True, input_source=ScriptedInputSource(script))
+        start_x, start_y = world.player.x, world.player.y
+        step = config.character.speed * config.game.timestep
+
+        world.run(max_ticks=20)
+
+        assert world.player.x == pytest.approx(start_x + 10 * step)
+        assert world.player.y == pytest.approx(start_y - 4 * step)
+
+    def test_seeded_runs_are_reproducible(self):
+        """Test two headless runs with the same seed end in the same state."""
+        def final_positions():
+            world = World(LittleWorldConfig(simulation=SimulationConfig(seed=7)), headless=True)
+            world.run(max_ticks=120)
+            return [(c.name, c.x, c.y) for c in world.characters]
+
+        assert final_positions() == final_positions()
+
+    def test_sim_time_follows_steps(self):
+        """Test simulation time advances one timestep per tick."""
+        config = LittleWorldConfig()
+        world = World(config, headless=True)
+
+        world.run(max_ticks=30)
+
+        assert world.sim_clock.sim_time == pytest.approx(30 * config.game.timestep)
+
+    def test_repeating_script(self):
+        """Test a repeating script loops instead of stopping."""
+        source = ScriptedInputSource([(1, 0), (0, 1)], repeat=True)
+
+        assert [source.get_direction() for _ in range(5)] == [(1, 0), (0, 1), (1, 0), (0, 1), (1, 0)]
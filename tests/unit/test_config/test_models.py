@@ -76,7 +76,7 @@ class TestCharacterConfig:
         """Test CharacterConfig default values."""
         config = CharacterConfig()
         assert config.radius == 20
-        assert config.speed == 5
+        assert config.speed == 300.0
 
 
 class TestGameConfig:
@@ -91,6 +91,15 @@ class TestGameConfig:
         """Test GameConfig default values."""
         config = GameConfig()
         assert config.fps == 60
+        assert config.timestep == pytest.approx(1 / 60)
+        assert config.time_scale == 1.0
+    
+    def test_game_config_time_scale_range(self):
+        """Test GameConfig rejects time scales outside 0.5x - 100x."""
+        with pytest.raises(ValidationError):
+            GameConfig(time_scale=0.1)
+        with pytest.raises(ValidationError):
+            GameConfig(time_scale=500)
 
 
 class TestLittleWorldConfig:
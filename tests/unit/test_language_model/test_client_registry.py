@@ -0,0 +1,69 @@
+"""
+Tests for language_model.providers.client_registry module.
+"""
+import asyncio
+from config import LLMConfig
+from language_model.providers.client_registry import ClientRegistry
+from language_model.providers.provider_factory import create_llm_instance
+
+
+class TestClientRegistry:
+    """Test ClientRegistry."""
+
+    def test_get_or_create_reuses_client(self):
+        """Test the factory only runs once per (provider, base_url, model)."""
+        registry = ClientRegistry()
+        created = []
+
+        def factory():
+            created.append(object())
+            return created[-1]
+
+        first = registry.get_or_create("vllm", "http://a/v1", "m", factory)
+        second = registry.get_or_create("vllm", "http://a/v1", "m", factory)
+        other = registry.get_or_create("vllm", "http://b/v1", "m", factory)
+
+        assert first is second
+        assert other is not first
+        assert len(created) == 2
+        assert len(registry) == 2
+
+    def test_http_client_shared_per_endpoint(self):
+        """Test one pooled httpx client per (provider, base_url)."""
+        registry = ClientRegistry()
+
+        first = registry.http_client("openai", None, max_connections=5)
+        second = registry.http_client("openai", None, max_connections=50)
+        other = registry.http_client("vllm", "http://localhost:8000/v1")
+
+        assert first is second
+        assert other is not first
+
+        asyncio.run(registry.aclose())
+        assert first.is_closed
+        assert len(registry) == 0
+
+
+class TestCreateLLMInstance:
+    """Test create_llm_instance uses the process-wide registry."""
+
+    def test_vllm_characters_share_client(self):
+        """Test many vLLM configs pointing at one server share one AsyncOpenAI client."""
+        configs = [
+            LLMConfig(type="vllm", version="qwen", api_key="k", base_url="http://shared-test:8000/v1")
+            for _ in range(20)
+        ]
+
+        clients = {id(create_llm_instance(config)) for config in configs}
+
+        assert len(clients) == 1
+
+    def test_openai_clients_keyed_by_model(self, monkeypatch):
+        """Test OpenAI chat clients are shared per model, and models share one pool."""
+        monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+        gpt4o = LLMConfig(type="openai", version="gpt-4o", api_key="k", base_url="http://openai-test/v1")
+        mini = LLMConfig(type="openai", version="gpt-4o-mini", api_key="k", base_url="http://openai-test/v1")
+
+        assert create_llm_instance(gpt4o) is create_llm_instance(gpt4o)
+        assert create_llm_instance(gpt4o) is not create_llm_instance(mini)
+        assert create_llm_instance(gpt4o).http_async_client is create_llm_instance(mini).http_async_client
@@ -0,0 +1,169 @@
+"""
+Tests for language_model.dispatcher module.
+"""
+import asyncio
+import time
+import pytest
+from language_model.dispatcher import LLMDispatcher, ProviderLimits, TokenBucket, message_fingerprint
+
+
+class CallTracker:
+    """Fake LLM call recording how many calls overlap."""
+
+    def __init__(self, delay=0.02):
+        self.delay = delay
+        self.calls = 0
+        self.active = 0
+        self.max_active = 0
+        self.start_times = []
+
+    def make_call(self, result):
+        async def call():
+            self.calls += 1
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            self.start_times.append(time.monotonic())
+            try:
+                await asyncio.sleep(self.delay)
+                return result
+            finally:
+                self.active -= 1
+        return call
+
+
+class TestLLMDispatcher:
+    """Test LLMDispatcher."""
+
+    def test_concurrency_limit(self):
+        """Test that no more than max_concurrency calls run at once."""
+        dispatcher = LLMDispatcher({"openai": ProviderLimits(max_concurrency=3)})
+        tracker = CallTracker()
+
+        async def main():
+            return await asyncio.gather(*[
+                dispatcher.submit("openai", tracker.make_call(i)) for i in range(10)
+            ])
+
+        assert asyncio.run(main()) == list(range(10))
+        assert tracker.max_active == 3
+        stats = dispatcher.stats()["openai"]
+        assert stats.completed == 10
+        assert stats.queue_depth == 0
+        assert stats.in_flight == 0
+        assert stats.max_wait_seconds > 0
+
+    def test_coalesces_identical_requests(self):
+        """Test concurrent requests with the same key share one call."""
+        dispatcher = LLMDispatcher({})
+        tracker = CallTracker()
+
+        async def main():
+            return await asyncio.gather(
+                dispatcher.submit("openai", tracker.make_call("a"), key="same"),
+                dispatcher.submit("openai", tracker.make_call("b"), key="same"),
+                dispatcher.submit("openai", tracker.make_call("c"), key="other"),
+            )
+
+        assert asyncio.run(main()) == ["a", "a", "c"]
+        assert tracker.calls == 2
+        assert dispatcher.stats()["openai"].coalesced == 1
+
+    def test_coalesced_requests_share_errors(self):
+        """Test that followers of a failed request see the same error."""
+        dispatcher = LLMDispatcher({})
+
+        async def failing():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("boom")
+
+        async def main():
+            return await asyncio.gather(
+                dispatcher.submit("openai", failing, key="k"),
+                dispatcher.submit("openai", failing, key="k"),
+                return_exceptions=True,
+            )
+
+        results = asyncio.run(main())
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert dispatcher.stats()["openai"].failed == 1
+
+    def test_reconfigure_keeps_running_requests_counted(self):
+        """Test new limits apply to the existing lane, counting requests already running."""
+        dispatcher = LLMDispatcher({"vllm": ProviderLimits(max_concurrency=2)})
+        tracker = CallTracker(delay=0.05)
+
+        async def main():
+            first = [asyncio.create_task(dispatcher.submit("vllm", tracker.make_call(i))) for i in range(4)]
+            await asyncio.sleep(0.01)
+            # Lowering the limit must not admit anything until running calls finish,
+            # raising it admits waiting calls at once
+            dispatcher.configure("vllm", ProviderLimits(max_concurrency=1))
+            second = [asyncio.create_task(dispatcher.submit("vllm", tracker.make_call(i))) for i in range(4, 6)]
+            await asyncio.sleep(0.01)
+            active_after_lowering = tracker.active
+            dispatcher.configure("vllm", ProviderLimits(max_concurrency=3))
+            await asyncio.sleep(0.01)
+            return active_after_lowering, tracker.active, await asyncio.gather(*first, *second)
+
+        lowered, raised, results = asyncio.run(main())
+
+        assert (lowered, raised) == (2, 3)
+        assert results == list(range(6))
+        assert tracker.max_active == 3
+        assert dispatcher.stats()["vllm"].completed == 6
+
+    def test_configure_providers_from_app_config(self, monkeypatch):
+        """Test app-level provider settings override only the fields they set."""
+        from config import LLMProviderConfig
+        from language_model import dispatcher as dispatcher_module
+
+        monkeypatch.setattr(dispatcher_module, "_dispatcher", LLMDispatcher())
+        dispatcher_module.configure_providers({"openai": LLMProviderConfig(max_concurrency=2)})
+
+        limits = dispatcher_module.get_dispatcher().limits_for("openai")
+        assert (limits.max_concurrency, limits.requests_per_second) == (2, 8.0)
+
+    def test_unconfigured_provider_is_unlimited(self):
+        """Test that providers without limits run everything concurrently."""
+        dispatcher = LLMDispatcher({})
+        tracker = CallTracker()
+
+        async def main():
+            await asyncio.gather(*[dispatcher.submit("mock", tracker.make_call(i)) for i in range(20)])
+
+        asyncio.run(main())
+        assert tracker.max_active == 20
+
+    def test_works_across_event_loops(self):
+        """Test the dispatcher can be reused from a new event loop."""
+        dispatcher = LLMDispatcher({"openai": ProviderLimits(max_concurrency=1)})
+        tracker = CallTracker(delay=0.0)
+
+        asyncio.run(dispatcher.submit("openai", tracker.make_call(1)))
+        asyncio.run(dispatcher.submit("openai", tracker.make_call(2)))
+
+        assert dispatcher.stats()["openai"].completed == 2
+
+
+class TestTokenBucket:
+    """Test TokenBucket rate limiter."""
+
+    def test_rate_limit(self):
+        """Test that acquisitions beyond the burst are spread over time."""
+        async def main():
+            bucket = TokenBucket(rate=100.0, capacity=1.0)
+            start = time.monotonic()
+            for _ in range(6):
+                await bucket.acquire()
+            return time.monotonic() - start
+
+        assert asyncio.run(main()) >= 0.045
+
+
+def test_message_fingerprint_is_hashable():
+    """Test fingerprints of message lists can be used as dict keys."""
+    from langchain_core.messages import HumanMessage, SystemMessage
+
+    fingerprint = message_fingerprint([SystemMessage("sys"), HumanMessage("hi")])
+    assert {fingerprint: 1}[fingerprint] == 1
+    assert fingerprint == (("system", "sys"), ("human", "hi"))
@@ -0,0 +1,164 @@
+"""
+Tests for language_model.episodic_memory module.
+"""
+import numpy as np
+from config import EpisodicMemoryConfig, LLMConfig, MemoryConfig
+from language_model.episodic_memory import (
+    EpisodicMemory,
+    HashingEmbedder,
+    VectorIndex,
+    create_episodic_memory,
+)
+from language_model.llm_base_engine import BaseAIModelEngine
+
+
+def clustered_vectors(count, dim=32, clusters=20, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim))
+    vectors = centers[rng.integers(0, clusters, count)] + 0.3 * rng.normal(size=(count, dim))
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors.astype(np.float32)
+
+
+class TestHashingEmbedder:
+    """Test HashingEmbedder."""
+
+    def test_normalized_and_deterministic(self):
+        embedder = HashingEmbedder(dim=64)
+        vector = embedder.embed("Ann waved at me near the well")
+
+        assert vector.shape == (64,) and vector.dtype == np.float32
+        assert np.isclose(np.linalg.norm(vector), 1.0)
+        np.testing.assert_array_equal(vector, HashingEmbedder(dim=64).embed("ann waved at me near the WELL"))
+        np.testing.assert_allclose(embedder.embed_many(["Ann waved at me near the well", ""])[0], vector)
+        assert not embedder.embed("...").any()
+
+    def test_similar_texts_are_closer(self):
+        embedder = HashingEmbedder()
+        query = embedder.embed("Bob said hello at the bakery")
+
+        assert query @ embedder.embed("Bob said hello near the bakery") > query @ embedder.embed("Ann walked west")
+
+
+class TestVectorIndex:
+    """Test VectorIndex brute-force and IVF search."""
+
+    def test_brute_force_is_exact(self):
+        vectors = clustered_vectors(500)
+        index = VectorIndex(32)
+        index.add_many(vectors)
+
+        ids, scores = index.search(vectors[42], 3)
+
+        assert index.centroids is None
+        assert ids[0] == 42 and np.isclose(scores[0], 1.0)
+        assert list(scores) == sorted(scores, reverse=True)
+        np.testing.assert_array_equal(ids, np.argsort(-(vectors @ vectors[42]))[:3])
+
+    def test_ivf_recall_and_storage(self):
+        vectors = clustered_vectors(6000)
+        index = VectorIndex(32, ivf_threshold=1000, ivf_lists=32, ivf_probe=4)
+        index.add_many(vectors[:1500])
+        for vector in vectors[1500:1600]:
+            index.add(vector)
+        index.add_many(vectors[1600:])  # Crosses 2x the training size: retrains
+
+        assert index.centroids is not None
+        assert len(index) == 6000
+        np.testing.assert_array_equal(index.vectors, vectors)
+        hits = 0
+        for q in range(0, 6000, 60):
+            ids, _ = index.search(vectors[q], 10)
+            hits += len(set(ids.tolist()) & set(np.argsort(-(vectors @ vectors[q]))[:10].tolist()))
+        assert hits / 1000 > 0.9
+
+    def test_max_id_excludes_newest(self):
+        vectors = clustered_vectors(2000)
+        for threshold in (10_000, 500):
+            index = VectorIndex(32, ivf_threshold=threshold, ivf_lists=16)
+            index.add_many(vectors)
+
+            ids, _ = index.search(vectors[1999], 5, max_id=1000)
+
+            assert len(ids) == 5 and ids.max() < 1000
+            assert len(index.search(vectors[0], 5, max_id=0)[0]) == 0
+
+
+class TestEpisodicMemory:
+    """Test EpisodicMemory."""
+
+    def make_memory(self, **kwargs):
+        memory = EpisodicMemory(**kwargs)
+        memory.add("Ann gave me an apple at the market", 10.0)
+        memory.add("It started raining in the north field", 20.0)
+        memory.add("Bob told me the bridge is broken", 30.0)
+        return memory
+
+    def test_search_recalls_relevant_episode(self):
+        memory = self.make_memory()
+
+        episodes = memory.search("Where is the bridge? Ask Bob", k=1)
+
+        assert [e.text for e in episodes] == ["Bob told me the bridge is broken"]
+        assert episodes[0].time == 30.0
+        assert all(e.text != episodes[0].text for e in memory.search("Where is the bridge? Ask Bob", skip_latest=1))
+
+    def test_render_within_budget_in_time_order(self):
+        memory = self.make_memory()
+
+        text = memory.render("Bob and Ann at the market bridge")
+        lines = text.splitlines()
+
+        assert lines[0] == "Things I remember:"
+        times = [float(line.split("t=")[1].split("s]")[0]) for line in lines[1:]]
+        assert times == sorted(times) and len(times) >= 2
+        assert memory.counter.count(memory.render("Bob bridge", max_tokens=15)) <= 15
+        assert memory.render("zebra") == ""
+
+    def test_export_import_round_trip(self):
+        memory = self.make_memory()
+
+        restored = EpisodicMemory()
+        restored.import_state(memory.export_state())
+
+        assert len(restored) == 3
+        assert restored.search("bridge") == memory.search("bridge")
+
+    def test_disabled_config(self):
+        assert create_episodic_memory(None) is None
+        assert create_episodic_memory(EpisodicMemoryConfig(enabled=False)) is None
+
+
+class TestEngineEpisodicMemory:
+    """Test episodic recall in BaseAIModelEngine prompts."""
+
+    def test_prompt_recalls_older_episodes_only(self):
+        config = LLMConfig(
+            type="vllm",
+            version="test-model",
+            api_key="k",
+            memory=MemoryConfig(encoding=None, max_turns=2, summarize_every=2),
+            episodic_memory=EpisodicMemoryConfig(),
+        )
+        engine = BaseAIModelEngine(config=config, personality_prompt="You are a test.")
+        turns = [
+            ("Bob said the bridge is broken", "stay"),
+            ("Ann is at the market", "move (1, 0)"),
+            ("Rain in the field", "stay"),
+            ("A cat sleeps by the well", "stay"),
+            ("Nobody is around", "move (1, 1)"),
+            ("Bob is at the bridge", "move (0, 1)"),
+        ]
+        for i, (observation, response) in enumerate(turns):
+            engine.memory.add_turn(observation, response, float(i))
+            engine.episodic_memory.add(f"{observation} -> {response}", float(i))
+
+        prompt = engine.build_prompt({"world_state": "I see Bob near the bridge", "input_messages": ""})
+        contents = [m.content for m in prompt.to_messages()]
+
+        recalled = contents[-2]
+        assert recalled.startswith("Things I remember:\n")
+        assert "Bob said the bridge is broken" in recalled
+        # The two newest turns are in the conversation memory, not recalled again
+        assert "Bob is at the bridge" not in recalled
+        assert contents[-3].startswith("Recent events")
@@ -0,0 +1,116 @@
+"""
+Tests for structured-output binding reuse in language_model.llm_base_chatmodel.
+"""
+import asyncio
+from types import SimpleNamespace
+from config import LLMConfig
+from decisions import Decision, ActionType
+from language_model.llm_base_chatmodel import VLLMEngine
+from language_model.llm_base_engine import BaseAIModelEngine
+
+
+class CountingEngine:
+    """Engine stand-in counting how often bindings are built."""
+
+    def __init__(self, schema=None):
+        self.schema = schema
+        self.bind_calls = 0
+
+    async def ainvoke(self, messages):
+        return Decision(type=ActionType.STAY) if self.schema else "text"
+
+    def with_structured_output(self, schema):
+        self.bind_calls += 1
+        return CountingEngine(schema)
+
+    def bind_tools(self, tools):
+        self.bind_calls += 1
+        return self
+
+
+class FakeCompletions:
+    def __init__(self, content):
+        self.content = content
+        self.payloads = []
+
+    async def create(self, **payload):
+        self.payloads.append(payload)
+        message = SimpleNamespace(content=self.content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def make_engine():
+    config = LLMConfig(type="vllm", version="binding-test", api_key="k", coalesce_requests=False)
+    engine = BaseAIModelEngine(config=config, personality_prompt="p", structured_output_schema=Decision)
+    engine.llm = CountingEngine()
+    return engine
+
+
+class TestBoundLLMCache:
+    """Test that bindings are built once per (schema, tools)."""
+
+    def test_repeated_calls_bind_once(self):
+        engine = make_engine()
+        base = engine.llm
+
+        async def run():
+            for _ in range(5):
+                await engine.basic_answering({"world_state": "", "input_messages": ""})
+                await engine.structured_answering({"world_state": "", "input_messages": ""}, Decision)
+
+        asyncio.run(run())
+
+        assert base.bind_calls == 1
+        assert engine.llm is base  # _call_llm no longer rebinds self.llm
+
+    def test_distinct_bindings_are_cached_separately(self):
+        engine = make_engine()
+        tools = [{"type": "function", "function": {"name": "wave"}}]
+
+        with_schema = engine.bound_llm(schema=Decision)
+        with_tools = engine.bound_llm(tools=tools)
+
+        assert engine.bound_llm(schema=Decision) is with_schema
+        assert engine.bound_llm(tools=tools) is with_tools
+        assert with_schema is not with_tools
+        assert engine.bound_llm() is engine.llm
+
+    def test_replacing_llm_invalidates_bindings(self):
+        engine = make_engine()
+        first = engine.bound_llm(schema=Decision)
+
+        engine.llm = CountingEngine()
+
+        assert engine.bound_llm(schema=Decision) is not first
+
+
+class TestVLLMEngineSchema:
+    """Test VLLMEngine schema handling."""
+
+    def test_schema_normalized_once_per_class(self):
+        config = LLMConfig(type="vllm", version="m", api_key="k")
+        first = VLLMEngine(client=None, config=config).with_structured_output(Decision)
+        second = VLLMEngine(client=None, config=config).with_structured_output(Decision)
+
+        assert first.guided_json is second.guided_json
+        assert first.guided_json["title"] == "Decision"
+
+    def test_structured_response_is_parsed(self):
+        config = LLMConfig(type="vllm", version="m", api_key="k")
+        completions = FakeCompletions('{"type": "move", "dx": 1, "dy": -1}')
+        client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+        engine = VLLMEngine(client=client, config=config).with_structured_output(Decision)
+
+        decision = asyncio.run(engine.ainvoke([]))
+
+        assert decision == Decision(type=ActionType.MOVE, dx=1, dy=-1)
+        assert completions.payloads[0]["extra_body"]["guided_json"] is engine.guided_json
+
+    def test_bind_tools_does_not_mutate_engine(self):
+        config = LLMConfig(type="vllm", version="m", api_key="k")
+        engine = VLLMEngine(client=None, config=config)
+
+        bound = engine.bind_tools([{"type": "function"}])
+
+        assert engine.tools is None
+        assert bound.tools == [{"type": "function"}]
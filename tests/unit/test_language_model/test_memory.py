@@ -0,0 +1,238 @@
+"""
+Tests for language_model.memory module.
+"""
+import asyncio
+from langchain_core.messages import AIMessage
+from config import LLMConfig, LittleWorldConfig, MemoryConfig
+from character import AICharacter
+from decisions import ActionType, Decision
+from language_model.llm_base_engine import BaseAIModelEngine
+from language_model.memory import ConversationMemory, TokenCounter, create_conversation_memory
+
+
+class FakeLLM:
+    """Engine stand-in answering with a numbered summary."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def ainvoke(self, messages):
+        self.calls += 1
+        return AIMessage(content=f"summary {self.calls}")
+
+
+def make_engine(**memory):
+    config = LLMConfig(
+        type="vllm",
+        version="test-model",
+        api_key="k",
+        memory=MemoryConfig(encoding=None, **memory),
+    )
+    engine = BaseAIModelEngine(config=config, personality_prompt="You are a test.")
+    engine.llm = FakeLLM()
+    return engine
+
+
+class TestTokenCounter:
+    """Test TokenCounter without tiktoken encodings."""
+
+    def test_estimate_and_truncate(self):
+        counter = TokenCounter(None)
+
+        assert not counter.exact
+        assert counter.count("") == 0
+        assert counter.count("abcde") == 2
+        assert counter.truncate("abcdefghij", 2) == "abcdefgh"
+        assert counter.truncate("abcdefghij", 2, keep_end=True) == "cdefghij"
+        assert counter.truncate("abc", 2) == "abc"
+
+
+class TestConversationMemory:
+    """Test ConversationMemory."""
+
+    def test_ring_buffer_compacts_older_turns_without_summarizer(self):
+        memory = ConversationMemory(max_turns=3, summarize_every=2, summary_tokens=20)
+        for i in range(10):
+            memory.add_turn(f"saw {i}", f"did {i}")
+
+        stats = memory.stats()
+        assert (stats.recent, stats.pending, stats.summarized) == (3, 1, 6)
+        assert stats.summary_tokens <= 20
+        # The summary keeps the newest of the compacted turns
+        assert memory.summary.endswith("saw 5 -> did 5")
+
+    def test_background_summarization(self):
+        seen = []
+
+        async def summarizer(summary, turns):
+            seen.append((summary, turns))
+            await asyncio.sleep(0.01)
+            return f"summary of {len(turns)}"
+
+        async def run():
+            memory = ConversationMemory(max_turns=2, summarize_every=2, summarizer=summarizer)
+            for i in range(4):
+                memory.add_turn(f"saw {i}", f"did {i}", time=float(i))
+            # Turns being summarized stay in the prompt until the summary lands
+            assert "[t=0.0s] saw 0 -> did 0" in memory.render(1000)
+            await memory.wait_summarized()
+            return memory
+
+        memory = asyncio.run(run())
+
+        assert seen == [("", ["[t=0.0s] saw 0 -> did 0", "[t=1.0s] saw 1 -> did 1"])]
+        text = memory.render(1000)
+        assert text.startswith("Summary of earlier events:\nsummary of 2")
+        assert "saw 0" not in text and "saw 3" in text
+        assert memory.stats().summarized == 2
+
+    def test_turns_compacted_while_summarizer_lags_are_kept(self):
+        release = asyncio.Event()
+
+        async def summarizer(summary, turns):
+            await release.wait()
+            return f"summary of {len(turns)}"
+
+        async def run():
+            memory = ConversationMemory(max_turns=1, summarize_every=1, summarizer=summarizer)
+            for i in range(4):
+                memory.add_turn(f"saw {i}", f"did {i}")
+            # saw 0 is being summarized, saw 1 was compacted to cut the backlog
+            assert "saw 1 -> did 1" in memory.summary
+            release.set()
+            await memory.wait_summarized()
+            return memory
+
+        memory = asyncio.run(run())
+
+        assert memory.summary == "summary of 1\nsaw 1 -> did 1"
+        assert memory.stats().summarized == 2
+
+    def test_import_discards_summary_started_before_it(self):
+        release = asyncio.Event()
+
+        async def summarizer(summary, turns):
+            await release.wait()
+            return "stale summary"
+
+        async def run():
+            memory = ConversationMemory(max_turns=1, summarize_every=1, summarizer=summarizer)
+            memory.add_turn("saw 0", "did 0")
+            memory.add_turn("saw 1", "did 1")
+            stale = memory._task
+            memory.import_state({"summary": "met Ann", "summarized": 5, "turns": [[None, "saw 9", "did 9"]]})
+            release.set()
+            await stale
+            return memory
+
+        memory = asyncio.run(run())
+
+        assert memory.summary == "met Ann"
+        assert memory.stats().summarized == 5
+
+    def test_failed_summary_falls_back_to_truncation(self):
+        async def summarizer(summary, turns):
+            raise RuntimeError("provider down")
+
+        async def run():
+            memory = ConversationMemory(max_turns=1, summarize_every=1, summarizer=summarizer)
+            memory.add_turn("saw 0", "did 0")
+            memory.add_turn("saw 1", "did 1")
+            await memory.wait_summarized()
+            return memory
+
+        memory = asyncio.run(run())
+
+        assert memory.summary == "saw 0 -> did 0"
+        assert memory.stats().failed_summaries == 1
+
+    def test_render_keeps_newest_turns_within_budget(self):
+        memory = ConversationMemory(max_turns=50)
+        for i in range(50):
+            memory.add_turn(f"observation number {i}", "stay")
+
+        text = memory.render(40)
+
+        assert memory.counter.count(text) <= 40
+        assert "observation number 49" in text
+        assert "observation number 0 " not in text
+        assert memory.render(0) == ""
+
+    def test_export_import_round_trip(self):
+        memory = ConversationMemory(max_turns=2, summarize_every=5)
+        for i in range(4):
+            memory.add_turn(f"saw {i}", f"did {i}", time=float(i))
+        memory.summary = "met Ann"
+
+        restored = ConversationMemory(max_turns=2, summarize_every=5)
+        restored.import_state(memory.export_state())
+
+        assert restored.render(1000) == memory.render(1000)
+        assert restored.stats() == memory.stats()
+
+    def test_disabled_config(self):
+        assert create_conversation_memory(None) is None
+        assert create_conversation_memory(MemoryConfig(enabled=False)) is None
+
+
+class TestEngineMemory:
+    """Test conversation memory in BaseAIModelEngine prompts."""
+
+    def test_prompt_size_stays_within_budget(self):
+        engine = make_engine(max_turns=200, prompt_token_budget=300)
+        messages = {"world_state": "World State:\n- My position: (1, 2)", "input_messages": ""}
+
+        sizes = []
+        for i in range(200):
+            engine.memory.add_turn(f"I saw character {i} walking past", "move (1, 0)", time=float(i))
+            prompt = engine.build_prompt(messages).to_messages()
+            sizes.append(engine.token_counter.count_messages(prompt))
+
+        assert max(sizes) <= 300
+        assert sizes[-1] == engine.last_prompt_tokens
+        # Memory sits between the personality and the current observation
+        assert "character 199" in prompt[-2].content
+        assert prompt[-1].content.startswith("World State")
+
+    def test_llm_summarizer(self):
+        engine = make_engine(max_turns=1, summarize_every=1)
+
+        async def run():
+            engine.memory.add_turn("saw Ann", "stay")
+            engine.memory.add_turn("saw Bob", "stay")
+            await engine.memory.wait_summarized()
+
+        asyncio.run(run())
+
+        assert engine.memory.summary == "summary 1"
+        assert engine.llm.calls == 1
+
+    def test_prompt_unchanged_without_memory(self):
+        config = LLMConfig(type="vllm", version="test-model", api_key="k")
+        engine = BaseAIModelEngine(config=config, personality_prompt="You are a test.", world_rules=None)
+
+        assert engine.memory is None and engine.memory_stats() is None
+        prompt = engine.build_prompt({"world_state": "w", "input_messages": ""})
+        assert [m.content for m in prompt.to_messages()] == ["You are a test.", "w, "]
+
+
+class TestCharacterMemory:
+    """Test AI characters record decisions and persist their memory."""
+
+    def test_decisions_are_remembered_and_exported(self):
+        engine = make_engine()
+
+        async def structured_answering(messages, schema):
+            return Decision(type=ActionType.COMMUNICATE, target="Ann", message="Hi")
+
+        engine.structured_answering = structured_answering
+        config = LittleWorldConfig()
+        character = AICharacter(10, 10, config, model=engine)
+
+        asyncio.run(character.make_decision(None))
+        state = character.export_state()
+
+        assert state["memory"]["turns"][0][2] == 'communicate to Ann: "Hi"'
+        other = AICharacter(10, 10, config, model=make_engine())
+        other.import_state(state)
+        assert other.model.memory.render(1000) == engine.memory.render(1000)
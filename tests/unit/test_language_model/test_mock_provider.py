@@ -0,0 +1,148 @@
+"""
+Tests for the offline mock provider (language_model.providers.mock_llm).
+"""
+import asyncio
+import statistics
+import time
+from typing import Literal, Optional
+import pytest
+from pydantic import BaseModel
+from config import LLMConfig, MockLLMConfig
+from config.enum import Provider
+from decisions import Decision
+from language_model.llm_base_chatmodel import MockEngine, create_chat_engine
+from language_model.llm_base_engine import BaseAIModelEngine
+from language_model.providers.mock_llm import MockLLM, MockLLMError
+
+MESSAGES = {"world_state": "I see Ann.", "input_messages": ""}
+
+
+def make_engine(**mock):
+    config = LLMConfig(
+        type=Provider.MOCK, version="mock", api_key="", coalesce_requests=False,
+        mock=MockLLMConfig(latency_ms=0, **mock),
+    )
+    return BaseAIModelEngine(config=config, personality_prompt="You are a test.")
+
+
+class Mood(BaseModel):
+    label: Literal["happy", "sad"]
+    score: float
+    reason: Optional[str]
+    note: str = "none"
+
+
+class TestMockLLM:
+    """Test MockLLM replies, errors and latency sampling."""
+
+    def test_replies_depend_on_prompt_and_seed(self):
+        async def decide(seed, prompts):
+            llm = MockLLM(MockLLMConfig(latency_ms=0, seed=seed))
+            return [await llm.complete(prompt, Decision) for prompt in prompts]
+
+        prompts = [[f"I see tree {i}"] for i in range(20)] + [["I see tree 0"]]
+        first = asyncio.run(decide(0, prompts))
+        again = asyncio.run(decide(0, prompts))
+        other = asyncio.run(decide(1, prompts))
+
+        assert all(isinstance(d, Decision) for d in first)
+        assert first == again
+        assert first[0] == first[-1]
+        assert first != other
+        assert len({d.type for d in first}) > 1
+
+    def test_error_rate_and_stats(self):
+        llm = MockLLM(MockLLMConfig(latency_ms=0, error_rate=0.5, output_tokens=10))
+
+        async def run():
+            failures = 0
+            for i in range(200):
+                try:
+                    await llm.complete([f"prompt {i}"])
+                except MockLLMError:
+                    failures += 1
+            return failures
+
+        failures = asyncio.run(run())
+        stats = llm.stats()
+
+        assert 60 < failures < 140
+        assert (stats.requests, stats.failed) == (200, failures)
+        assert stats.output_tokens == 10 * (200 - failures)
+        assert stats.input_tokens > 0
+
+    def test_failures_take_the_time_to_first_token(self):
+        llm = MockLLM(MockLLMConfig(latency="fixed", latency_ms=20, per_token_ms=5, error_rate=1.0))
+
+        async def run():
+            start = time.perf_counter()
+            with pytest.raises(MockLLMError):
+                await llm.complete(["hi"])
+            with pytest.raises(MockLLMError):
+                async for _ in llm.stream(["hi"]):
+                    pass
+            return time.perf_counter() - start
+
+        assert asyncio.run(run()) >= 0.04
+        stats = llm.stats()
+        assert (stats.failed, stats.output_tokens) == (2, 0)
+        assert stats.mean_latency_seconds == pytest.approx(0.02)
+
+    @pytest.mark.parametrize("latency", ["uniform", "normal", "lognormal", "exponential"])
+    def test_latency_distributions_have_the_configured_mean(self, latency):
+        llm = MockLLM(MockLLMConfig(latency=latency, latency_ms=200, latency_spread_ms=50))
+
+        samples = [llm.sample_latency() for _ in range(5000)]
+
+        assert min(samples) >= 0
+        assert statistics.fmean(samples) == pytest.approx(0.2, rel=0.1)
+        assert MockLLM(MockLLMConfig(latency="fixed", latency_ms=200)).sample_latency() == 0.2
+
+    def test_token_counts_and_per_token_latency(self):
+        llm = MockLLM(MockLLMConfig(latency="fixed", latency_ms=0, per_token_ms=1, output_tokens=5, output_tokens_spread=2))
+
+        reply = asyncio.run(llm.complete(["hi"]))
+
+        assert 3 <= reply.usage_metadata["output_tokens"] <= 7
+        assert len(reply.content.split()) == reply.usage_metadata["output_tokens"]
+        assert llm.stats().mean_latency_seconds == pytest.approx(reply.usage_metadata["output_tokens"] / 1000)
+
+    def test_generic_schema(self):
+        mood = asyncio.run(MockLLM(MockLLMConfig(latency_ms=0)).complete(["hi"], Mood))
+
+        assert isinstance(mood, Mood)
+        assert mood.note == "none"
+
+
+class TestMockEngine:
+    """Test the mock provider through the chat model and engine."""
+
+    def test_created_from_config(self):
+        engine = create_chat_engine(LLMConfig(type="mock", version="mock", api_key=""))
+
+        assert isinstance(engine, MockEngine)
+        assert engine.client.config == MockLLMConfig()
+
+    def test_structured_text_tools_and_stream(self):
+        engine = make_engine(output_tokens=4)
+        tools = [{"type": "function", "function": {"name": "wave"}}]
+
+        async def run():
+            decision = await engine.structured_answering(MESSAGES, Decision)
+            text = await engine.basic_answering(MESSAGES)
+            called = await engine.bind_tools(tools).ainvoke(engine.build_prompt(MESSAGES))
+            chunks = [chunk async for chunk in engine.stream_answering(MESSAGES)]
+            return decision, text, called, chunks
+
+        decision, text, called, chunks = asyncio.run(run())
+
+        assert isinstance(decision, Decision)
+        assert len(text.content.split()) == 4
+        assert called.tool_calls[0]["name"] == "wave"
+        assert len(chunks) == 4 and "".join(chunks) == text.content
+
+    def test_errors_reach_the_caller(self):
+        engine = make_engine(error_rate=1.0)
+
+        with pytest.raises(MockLLMError):
+            asyncio.run(engine.structured_answering(MESSAGES, Decision))
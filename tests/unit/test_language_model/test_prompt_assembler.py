@@ -0,0 +1,122 @@
+"""
+Tests for language_model.prompt_assembler module.
+"""
+import asyncio
+from langchain_core.messages import AIMessage
+from config import LLMConfig, MemoryConfig, MockLLMConfig
+from decisions import Decision
+from language_model.llm_base_engine import BaseAIModelEngine
+from language_model.prompt_assembler import WORLD_RULES, PromptAssembler
+
+
+class RecordingLLM:
+    """Engine stand-in recording the prompts it receives."""
+
+    def __init__(self):
+        self.prompts = []
+
+    async def ainvoke(self, messages):
+        self.prompts.append(messages)
+        return AIMessage(content="summary")
+
+
+def contents(prompt):
+    return [m.content for m in prompt.to_messages()]
+
+
+class TestPromptAssembler:
+    """Test PromptAssembler section order and prefix stats."""
+
+    def test_sections_from_stable_to_volatile(self):
+        assembler = PromptAssembler("You are Ann.", ["{world_state}"], world_rules="Rules.")
+
+        prompt = assembler.render({"world_state": "I see Bob."}, summary="Met Bob.", recalled="Bob likes tea.")
+
+        assert contents(prompt) == ["Rules.\n\nYou are Ann.", "Met Bob.", "Bob likes tea.", "I see Bob."]
+        assert [m.type for m in prompt.to_messages()] == ["system", "human", "human", "human"]
+        assert contents(assembler.invoke({"world_state": "x"})) == ["Rules.\n\nYou are Ann.", "x"]
+
+    def test_prefix_is_byte_identical(self):
+        """Test the same content renders to the same bytes, and characters share the rules."""
+        ann = PromptAssembler("You are Ann.\r\n", ["{world_state}"])
+        ann_again = PromptAssembler("  You are Ann.\n", ["{world_state}"])
+        bob = PromptAssembler("You are Bob.", ["{world_state}"])
+
+        first = contents(ann.render({"world_state": "a"}, summary="Met Bob.\r\n"))
+        second = contents(ann_again.render({"world_state": "b"}, summary="Met Bob."))
+
+        assert first[:2] == second[:2]
+        assert contents(bob.render({"world_state": "a"}))[0].startswith(WORLD_RULES + "\n\n")
+
+    def test_prefix_stats(self):
+        assembler = PromptAssembler("You are Ann.", ["{world_state}"], world_rules=None)
+
+        assembler.assemble({"world_state": "I see Bob."}, summary="Met Bob.")
+        assembler.assemble({"world_state": "I see Cid."}, summary="Met Bob.")
+        assembler.assemble({"world_state": "I see Cid."}, summary="Met Bob and Cid.")
+        stats = assembler.stats()
+
+        assert stats.prompts == 3
+        assert stats.section_changes == {"system": 0, "summary": 1, "recent": 0, "recalled": 0, "observation": 1}
+        summary_tokens = assembler.counter.count("Met Bob.") + 4
+        shared_observation = assembler.counter.count("I see ")
+        shared_summary = assembler.counter.count("Met Bob")
+        assert stats.reused_tokens == (
+            stats.system_tokens + summary_tokens + shared_observation + stats.system_tokens + shared_summary
+        )
+        assert 0 < stats.reuse_rate < 1
+
+
+class TestEnginePromptAssembly:
+    """Test BaseAIModelEngine builds prompts through the assembler."""
+
+    def test_memory_sections_keep_prefix_stable(self):
+        config = LLMConfig(
+            type="vllm",
+            version="test-model",
+            api_key="k",
+            memory=MemoryConfig(encoding=None, max_turns=4, summarize_every=4),
+        )
+        engine = BaseAIModelEngine(config=config, personality_prompt="You are a test.")
+
+        prompts = []
+        for i in range(12):
+            prompts.append(contents(engine.build_prompt({"world_state": f"I see tree {i}", "input_messages": ""})))
+            engine.memory.add_turn(f"I see tree {i}", "stay", float(i))
+
+        # The summary only changes every summarize_every turns, and it comes before
+        # the recent turns, which change every turn
+        summaries = [p[1] for p in prompts if p[1].startswith("Summary")]
+        assert len(set(summaries)) < len(summaries)
+        assert all(p[0] == prompts[0][0] for p in prompts)
+        stats = engine.prompt_stats()
+        assert stats.prompts == 12
+        assert stats.section_changes["summary"] < stats.section_changes["recent"]
+
+    def test_summaries_share_the_system_prefix(self):
+        config = LLMConfig(type="vllm", version="test-model", api_key="k", memory=MemoryConfig(encoding=None))
+        engine = BaseAIModelEngine(config=config, personality_prompt="You are a test.")
+        engine.llm = RecordingLLM()
+
+        asyncio.run(engine.summarize("", ["saw Ann -> stay"]))
+
+        system = engine.build_prompt({"world_state": "w", "input_messages": ""}, rules=True).to_messages()[0]
+        assert engine.llm.prompts[0][0].content == system.content
+
+    def test_rules_only_in_decision_prompts(self):
+        config = LLMConfig(type="mock", version="mock", api_key="", mock=MockLLMConfig(latency_ms=0))
+        engine = BaseAIModelEngine(config=config, personality_prompt="You are a test.")
+        messages = {"world_state": "I see Ann.", "input_messages": ""}
+        dispatch, systems = engine._dispatch, []
+
+        async def recording_dispatch(llm, prompt, schema=None):
+            systems.append(prompt.to_messages()[0].content)
+            return await dispatch(llm, prompt, schema)
+
+        engine._dispatch = recording_dispatch
+        asyncio.run(engine.structured_answering(messages, Decision))
+        asyncio.run(engine.basic_answering(messages))
+
+        assert systems[0].startswith(WORLD_RULES)
+        assert systems[1] == "You are a test."
+        assert engine.build_prompt(messages).to_messages()[0].content == "You are a test."
@@ -0,0 +1,193 @@
+"""
+Tests for language_model.response_cache module.
+"""
+import asyncio
+import time
+from langchain_core.messages import AIMessage
+from langchain_core.prompts.chat import ChatPromptTemplate
+from config import LLMConfig, ResponseCacheConfig
+from language_model.llm_base_engine import BaseAIModelEngine
+from language_model.response_cache import (
+    InMemoryResponseCache,
+    SQLiteResponseCache,
+    create_response_cache,
+    make_cache_key,
+)
+from world.world_state import WorldState, VisibleCharacter, WorldBounds
+
+
+def make_world_state(x, y, other_dx):
+    return WorldState(
+        observer_position=(x, y),
+        vision_radius=200.0,
+        visible_characters=[
+            VisibleCharacter(
+                name="Player A",
+                character_type="player",
+                relative_x=other_dx,
+                relative_y=0.0,
+                distance=abs(other_dx),
+                direction="east",
+            )
+        ],
+        world_bounds=WorldBounds(
+            distance_to_north=y,
+            distance_to_south=600 - y,
+            distance_to_east=800 - x,
+            distance_to_west=x,
+            world_width=800,
+            world_height=600,
+        ),
+    )
+
+
+class FakeLLM:
+    """Engine stand-in counting calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def ainvoke(self, messages):
+        self.calls += 1
+        return AIMessage(content=f"answer {self.calls}")
+
+
+class TestInMemoryResponseCache:
+    """Test InMemoryResponseCache."""
+
+    def test_hit_and_miss_counters(self):
+        cache = InMemoryResponseCache(max_entries=10)
+
+        assert cache.get("k") is None
+        cache.set("k", "v")
+        assert cache.get("k") == "v"
+
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+        assert stats.hit_rate == 0.5
+
+    def test_lru_eviction(self):
+        cache = InMemoryResponseCache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")  # "b" becomes least recently used
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+
+    def test_ttl_expiry(self):
+        cache = InMemoryResponseCache(ttl_seconds=0.01)
+        cache.set("k", "v")
+        time.sleep(0.02)
+
+        assert cache.get("k") is None
+        assert len(cache) == 0
+
+
+class TestSQLiteResponseCache:
+    """Test SQLiteResponseCache."""
+
+    def test_roundtrip_persists_across_instances(self, tmp_path):
+        path = tmp_path / "cache.sqlite"
+        cache = SQLiteResponseCache(path)
+        cache.set("k", AIMessage(content="hello"))
+        cache.close()
+
+        reopened = SQLiteResponseCache(path)
+        assert reopened.get("k").content == "hello"
+        assert reopened.get("missing") is None
+        assert reopened.stats().entries == 1
+
+    def test_max_entries(self, tmp_path):
+        cache = SQLiteResponseCache(tmp_path / "cache.sqlite", max_entries=2)
+        for i in range(5):
+            cache.set(f"k{i}", i)
+            time.sleep(0.001)
+
+        assert len(cache) == 2
+        assert cache.get("k4") == 4
+
+    def test_eviction_counts_rows_across_instances(self, tmp_path):
+        path = tmp_path / "cache.sqlite"
+        cache = SQLiteResponseCache(path, max_entries=3)
+        for i in range(3):
+            cache.set(f"k{i}", i)
+            time.sleep(0.001)
+        # Replacing an entry does not make room by evicting another
+        cache.set("k0", "again")
+        assert len(cache) == 3 and cache.get("k1") == 1
+        cache.close()
+
+        reopened = SQLiteResponseCache(path, max_entries=3)
+        reopened.set("k3", 3)
+
+        assert len(reopened) == 3
+        assert reopened.get("k1") is None and reopened.get("k0") == "again"
+        plan = reopened._conn.execute(
+            "EXPLAIN QUERY PLAN SELECT key FROM responses ORDER BY created_at LIMIT 1"
+        ).fetchall()
+        assert "responses_created_at" in str(plan)
+
+
+class TestCacheKeys:
+    """Test cache keys and world state quantization."""
+
+    def test_key_depends_on_messages_model_and_schema(self):
+        template = ChatPromptTemplate.from_messages([("system", "sys"), ("human", "{x}")])
+        base = make_cache_key(template.invoke({"x": "a"}), "gpt-4o")
+
+        assert base == make_cache_key(template.invoke({"x": "a"}), "gpt-4o")
+        assert base != make_cache_key(template.invoke({"x": "b"}), "gpt-4o")
+        assert base != make_cache_key(template.invoke({"x": "a"}), "gpt-4o-mini")
+        assert base != make_cache_key(template.invoke({"x": "a"}), "gpt-4o", WorldState)
+
+    def test_quantized_world_states_match(self):
+        first = make_world_state(101.2, 99.7, 48.9).quantized(10)
+        second = make_world_state(98.9, 100.4, 51.3).quantized(10)
+
+        assert first == second
+        assert first.visible_characters[0].distance == 50
+
+    def test_create_response_cache(self, tmp_path):
+        assert create_response_cache(None) is None
+        assert create_response_cache(ResponseCacheConfig(enabled=False)) is None
+        assert isinstance(create_response_cache(ResponseCacheConfig()), InMemoryResponseCache)
+        sqlite_config = ResponseCacheConfig(backend="sqlite", sqlite_path=str(tmp_path / "c.sqlite"))
+        assert isinstance(create_response_cache(sqlite_config), SQLiteResponseCache)
+
+
+class TestEngineCache:
+    """Test BaseAIModelEngine uses the cache for near-identical observations."""
+
+    def test_quantized_observations_hit_cache(self):
+        config = LLMConfig(
+            type="vllm",
+            version="test-model",
+            api_key="k",
+            cache=ResponseCacheConfig(quantization_step=10),
+        )
+        engine = BaseAIModelEngine(config=config, personality_prompt="You are a test.")
+        engine.llm = FakeLLM()
+
+        async def ask(world_state):
+            messages = {"world_state": engine.render_world_state(world_state), "input_messages": ""}
+            return await engine.basic_answering(messages)
+
+        first = asyncio.run(ask(make_world_state(101.2, 99.7, 48.9)))
+        second = asyncio.run(ask(make_world_state(98.9, 100.4, 51.3)))
+        third = asyncio.run(ask(make_world_state(300.0, 100.0, 50.0)))
+
+        assert first.content == second.content == "answer 1"
+        assert third.content == "answer 2"
+        stats = engine.cache_stats()
+        assert (stats.hits, stats.misses) == (1, 2)
+
+    def test_stats_of_empty_cache(self):
+        config = LLMConfig(type="vllm", version="test-model", api_key="k", cache=ResponseCacheConfig())
+        engine = BaseAIModelEngine(config=config, personality_prompt="You are a test.")
+
+        stats = engine.cache_stats()
+
+        assert stats is not None and (stats.hits, stats.misses) == (0, 0)
@@ -0,0 +1,125 @@
+"""
+Tests for streaming replies (astream / stream_answering) in language_model.
+"""
+import asyncio
+from types import SimpleNamespace
+import pytest
+from langchain_core.messages import AIMessageChunk
+from config import LLMConfig
+from language_model.llm_base_chatmodel import OpenAIEngine, VLLMEngine
+from language_model.llm_base_engine import BaseAIModelEngine
+from language_model.response_cache import InMemoryResponseCache
+
+MESSAGES = {"world_state": "", "input_messages": ""}
+
+
+def collect(stream) -> list[str]:
+    async def run():
+        return [chunk async for chunk in stream]
+    return asyncio.run(run())
+
+
+class FakeStream:
+    """Async iterator of OpenAI-style completion chunks."""
+
+    def __init__(self, pieces):
+        self.chunks = iter([
+            SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=piece))])
+            for piece in pieces
+        ])
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self.chunks)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class FakeCompletions:
+    def __init__(self, pieces):
+        self.pieces = pieces
+        self.payloads = []
+
+    async def create(self, **payload):
+        self.payloads.append(payload)
+        return FakeStream(self.pieces)
+
+
+class FakeChatModel:
+    """LangChain chat model stand-in yielding message chunks."""
+
+    def __init__(self, pieces, fail_after=None):
+        self.pieces = pieces
+        self.fail_after = fail_after
+        self.stream_calls = 0
+
+    async def astream(self, messages):
+        self.stream_calls += 1
+        for i, piece in enumerate(self.pieces):
+            if i == self.fail_after:
+                raise RuntimeError("connection dropped")
+            yield AIMessageChunk(content=piece)
+
+
+def make_engine(llm, **kwargs):
+    config = LLMConfig(type="vllm", version="stream-test", api_key="k", coalesce_requests=False)
+    engine = BaseAIModelEngine(config=config, personality_prompt="p", **kwargs)
+    engine.llm = llm
+    return engine
+
+
+class TestEngineStreaming:
+    """Test astream on the provider engines."""
+
+    def test_vllm_requests_stream_and_yields_deltas(self):
+        completions = FakeCompletions(["Hel", "lo", None, " there"])
+        client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+        config = LLMConfig(type="vllm", version="m", api_key="k")
+        engine = VLLMEngine(client, config)
+
+        prompt = make_engine(engine).template.invoke(MESSAGES)
+        chunks = collect(engine.astream(prompt))
+
+        assert chunks == ["Hel", "lo", " there"]
+        assert completions.payloads[0]["stream"] is True
+
+    def test_openai_engine_yields_text(self):
+        engine = OpenAIEngine(FakeChatModel(["a", "", "b"]))
+
+        assert collect(engine.astream("prompt")) == ["a", "b"]
+
+
+class TestStreamAnswering:
+    """Test BaseAIModelEngine.stream_answering."""
+
+    def test_yields_chunks_in_order(self):
+        engine = make_engine(OpenAIEngine(FakeChatModel(["I see ", "a ", "tree."])))
+
+        assert collect(engine.stream_answering(MESSAGES)) == ["I see ", "a ", "tree."]
+
+    def test_streamed_answer_is_cached(self):
+        llm = FakeChatModel(["I see ", "a tree."])
+        engine = make_engine(OpenAIEngine(llm), response_cache=InMemoryResponseCache())
+
+        collect(engine.stream_answering(MESSAGES))
+        again = collect(engine.stream_answering(MESSAGES))
+        basic = asyncio.run(engine.basic_answering(MESSAGES))
+
+        assert again == ["I see a tree."]
+        assert basic.content == "I see a tree."
+        assert llm.stream_calls == 1
+
+    def test_errors_propagate_after_partial_text(self):
+        engine = make_engine(OpenAIEngine(FakeChatModel(["one ", "two"], fail_after=1)))
+        received = []
+
+        async def run():
+            async for chunk in engine.stream_answering(MESSAGES):
+                received.append(chunk)
+
+        with pytest.raises(RuntimeError, match="connection dropped"):
+            asyncio.run(run())
+        assert received == ["one "]
@@ -0,0 +1,136 @@
+"""
+Unit tests for the batched action/decision log.
+"""
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from character import AICharacter
+from config import ActionLogConfig, LittleWorldConfig, SimulationConfig
+from decisions import Decision, ActionType
+from world import World
+from world.action_log import ActionLog, ActionLogWriter, JSONLActionWriter, SQLiteActionWriter, create_action_log
+from world.decision_scheduler import DecisionScheduler
+
+
+class SlowModel:
+    """Model stand-in that moves east after a short delay."""
+
+    def render_world_state(self, world_state):
+        return ""
+
+    async def structured_answering(self, messages, schema):
+        await asyncio.sleep(0.01)
+        return Decision(type=ActionType.MOVE, dx=1, dy=0)
+
+
+class GatedWriter(ActionLogWriter):
+    """Writer that blocks until ``gate`` is set."""
+
+    def __init__(self):
+        self.gate = threading.Event()
+        self.rows = []
+
+    def write(self, batch):
+        self.gate.wait()
+        for rows in batch.values():
+            self.rows.extend(rows)
+
+
+def rows(path, query):
+    with sqlite3.connect(path) as conn:
+        return conn.execute(query).fetchall()
+
+
+class TestActionLog:
+    """Test ActionLog batching and backends."""
+
+    def test_sqlite_records_in_batches(self, tmp_path):
+        path = tmp_path / "actions.sqlite"
+        log = ActionLog(SQLiteActionWriter(path), batch_size=100, flush_interval=10.0)
+        character = type("C", (), {"name": "Bob", "entity_id": 7})()
+
+        for i in range(250):
+            log.log_decision(float(i), character, Decision(type=ActionType.COMMUNICATE, message=f"hi {i}", target="Ann"))
+        log.log_observation(1.5, character, "Ann appeared.")
+        log.log_llm_call(1.5, character, "decision", 0.25)
+        assert log.flush()
+
+        assert rows(path, "SELECT COUNT(*) FROM decisions") == [(250,)]
+        assert rows(path, "SELECT character, type, target, message FROM decisions WHERE sim_time = 3")[0] == (
+            "Bob", "communicate", "Ann", "hi 3",
+        )
+        assert rows(path, "SELECT summary FROM observations") == [("Ann appeared.",)]
+        assert rows(path, "SELECT latency_ms, ok FROM llm_calls") == [(250.0, 1)]
+        stats = log.stats()
+        assert stats.written == stats.logged == 252
+        assert stats.batches == 3
+        assert rows(path, "PRAGMA journal_mode") == [("wal",)]
+        log.close()
+
+    def test_jsonl_segments(self, tmp_path):
+        log = ActionLog(JSONLActionWriter(tmp_path, segment_records=3), batch_size=2)
+        for i in range(7):
+            log.log_observation(float(i), None, f"step {i}")
+        log.close()
+
+        segments = sorted(tmp_path.glob("actions-*.jsonl"))
+        lines = [json.loads(line) for p in segments for line in p.read_text().splitlines()]
+        assert [len(p.read_text().splitlines()) for p in segments] == [3, 3, 1]
+        assert [line["summary"] for line in lines] == [f"step {i}" for i in range(7)]
+        assert lines[0]["kind"] == "observations"
+
+        # A new log never appends to earlier segments
+        writer = JSONLActionWriter(tmp_path, segment_records=3)
+        writer.write({"observations": [(0.0, 0.0, None, None, "again")]})
+        writer.close()
+        assert len(list(tmp_path.glob("actions-*.jsonl"))) == 4
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        writer = GatedWriter()
+        log = ActionLog(writer, batch_size=1, max_queue=2)
+
+        start = time.perf_counter()
+        for i in range(6):
+            log.log_observation(float(i), None, "x")
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.1
+        assert log.logged + log.dropped == 6
+        assert log.dropped >= 3
+        writer.gate.set()
+        log.close()
+        assert len(writer.rows) == log.logged
+
+    def test_disabled_by_default(self):
+        assert create_action_log(ActionLogConfig()) is None
+
+
+class TestDecisionLogging:
+    """Test decisions and latencies reach the log."""
+
+    def test_scheduler_logs_decisions_and_latency(self, tmp_path):
+        path = tmp_path / "actions.sqlite"
+        log = create_action_log(ActionLogConfig(enabled=True, path=str(path)))
+        config = LittleWorldConfig(simulation=SimulationConfig(seed=0))
+        world = World(config, headless=True)
+        world.action_log = world.scheduler.action_log = log
+        character = AICharacter(400, 100, config, world=world, model=SlowModel(), vision_radius=100)
+        character.name = "Walker"
+        world.add_character(character)
+        try:
+            world.update()
+            deadline = time.monotonic() + 2.0
+            while world.scheduler.in_flight and time.monotonic() < deadline:
+                time.sleep(0.005)
+                world.scheduler.process_completed()
+            log.flush()
+
+            assert rows(path, "SELECT character, type, dx, dy FROM decisions") == [("Walker", "move", 1, 0)]
+            assert rows(path, "SELECT character, summary FROM observations") == [("Walker", "First observation.")]
+            (latency, ok), = rows(path, "SELECT latency_ms, ok FROM llm_calls")
+            assert ok == 1 and latency >= 10.0
+        finally:
+            world.scheduler.stop()
+            log.close()
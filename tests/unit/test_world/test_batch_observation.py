@@ -0,0 +1,109 @@
+"""
+Tests for world.batch_observation module.
+"""
+import numpy as np
+import pytest
+from world.batch_observation import DIRECTIONS, compute_observation_batch, direction_indices
+from world.world_state import calculate_distance, calculate_direction
+
+
+def scalar_visible(positions, i, radius):
+    """Reference implementation mirroring World.get_world_state_for."""
+    ox, oy = positions[i]
+    visible = []
+    for j, (x, y) in enumerate(positions):
+        if j == i:
+            continue
+        distance = calculate_distance(ox, oy, x, y)
+        if distance <= radius:
+            visible.append((j, x - ox, y - oy, distance, calculate_direction(x - ox, y - oy)))
+    return visible
+
+
+class TestDirectionIndices:
+    """Test vectorized direction bucketing."""
+
+    def test_matches_calculate_direction(self):
+        """Test that every bucket agrees with the scalar implementation."""
+        rng = np.random.default_rng(0)
+        dx = rng.uniform(-100, 100, 2000)
+        dy = rng.uniform(-100, 100, 2000)
+        dx[:5] = [0.0, 0.05, 10.0, 0.0, -10.0]
+        dy[:5] = [0.0, -0.05, 0.0, 10.0, 0.0]
+
+        names = DIRECTIONS[direction_indices(dx, dy)]
+
+        assert list(names) == [calculate_direction(a, b) for a, b in zip(dx, dy)]
+
+
+class TestComputeObservationBatch:
+    """Test compute_observation_batch against the per-character path."""
+
+    def test_matches_scalar_observations(self):
+        """Test visible sets, distances and directions match the scalar loop."""
+        # Arrange
+        rng = np.random.default_rng(1)
+        positions = rng.uniform(0, 800, size=(120, 2))
+        radii = rng.uniform(50, 300, size=120)
+        names = [f"c{i}" for i in range(120)]
+        types = ["ai"] * 120
+
+        # Act
+        batch = compute_observation_batch(
+            observer_positions=positions,
+            vision_radii=radii,
+            target_positions=positions,
+            world_width=800,
+            world_height=600,
+            target_names=names,
+            target_types=types,
+            observer_target_indices=np.arange(120),
+        )
+
+        # Assert
+        assert len(batch) == 120
+        for i in range(120):
+            expected = scalar_visible(positions, i, radii[i])
+            state = batch[i]
+            assert [c.name for c in state.visible_characters] == [names[j] for j, *_ in expected]
+            for char, (_, rel_x, rel_y, distance, direction) in zip(state.visible_characters, expected):
+                assert char.relative_x == pytest.approx(rel_x)
+                assert char.relative_y == pytest.approx(rel_y)
+                assert char.distance == pytest.approx(distance)
+                assert char.direction == direction
+            assert state.world_bounds.distance_to_south == pytest.approx(600 - positions[i][1])
+            assert state.world_bounds.distance_to_east == pytest.approx(800 - positions[i][0])
+        assert batch.visible_counts.sum() == len(batch.target_indices)
+
+    def test_states_are_materialized_lazily_and_cached(self):
+        """Test WorldState objects are only built on access and then reused."""
+        positions = np.array([[0.0, 0.0], [10.0, 0.0]])
+        batch = compute_observation_batch(
+            observer_positions=positions,
+            vision_radii=np.array([50.0, 50.0]),
+            target_positions=positions,
+            world_width=100,
+            world_height=100,
+            target_names=["a", "b"],
+            target_types=["player", "ai"],
+            observer_target_indices=np.array([0, 1]),
+        )
+
+        assert batch._states == [None, None]
+        assert batch[1] is batch[1]
+        assert batch._states[0] is None
+        assert batch[1].visible_characters[0].character_type == "player"
+
+    def test_empty_batch(self):
+        """Test that no observers yields an empty batch."""
+        batch = compute_observation_batch(
+            observer_positions=np.zeros((0, 2)),
+            vision_radii=np.zeros(0),
+            target_positions=np.zeros((3, 2)),
+            world_width=100,
+            world_height=100,
+            target_names=["a", "b", "c"],
+            target_types=["ai"] * 3,
+        )
+        assert len(batch) == 0
+        assert list(batch) == []
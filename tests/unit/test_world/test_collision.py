@@ -0,0 +1,115 @@
+"""
+Unit tests for circle collision detection and resolution.
+"""
+import numpy as np
+import pytest
+from config import LittleWorldConfig, SimulationConfig
+from world import World
+from world.entity_store import EntityStore
+from world.collision import find_overlapping_pairs, separate_pairs, resolve_collisions
+
+
+def brute_force_pairs(positions, radii):
+    """O(N²) reference: all pairs closer than the sum of their radii."""
+    pairs = set()
+    for a in range(len(positions)):
+        for b in range(a + 1, len(positions)):
+            if np.sum((positions[a] - positions[b]) ** 2) < (radii[a] + radii[b]) ** 2:
+                pairs.add((a, b))
+    return pairs
+
+
+def as_pair_set(i, j):
+    return {(min(a, b), max(a, b)) for a, b in zip(i.tolist(), j.tolist())}
+
+
+class TestFindOverlappingPairs:
+    """Test the sweep-and-prune broad phase plus narrow phase."""
+
+    @pytest.mark.parametrize("seed", [0, 1, 2])
+    def test_matches_brute_force(self, seed):
+        """Test the same pairs are found as with an all-pairs check."""
+        rng = np.random.default_rng(seed)
+        positions = rng.uniform(0, 400, (300, 2))
+        radii = rng.uniform(5, 20, 300)
+
+        i, j = find_overlapping_pairs(positions, radii)
+
+        assert as_pair_set(i, j) == brute_force_pairs(positions, radii)
+        assert len(i) == len(as_pair_set(i, j))
+
+    def test_column_of_circles(self):
+        """Test circles stacked along y are swept along y."""
+        positions = np.column_stack([np.full(50, 100.0), np.arange(50) * 15.0])
+        radii = np.full(50, 10.0)
+
+        i, j = find_overlapping_pairs(positions, radii)
+
+        assert as_pair_set(i, j) == {(a, a + 1) for a in range(49)}
+
+    def test_touching_circles_do_not_overlap(self):
+        """Test circles exactly touching are not reported."""
+        i, _ = find_overlapping_pairs(np.array([[0.0, 0.0], [20.0, 0.0]]), np.array([10.0, 10.0]))
+
+        assert len(i) == 0
+
+
+class TestSeparatePairs:
+    """Test the narrow-phase push-apart."""
+
+    def test_pair_is_separated_symmetrically(self):
+        """Test two overlapping circles end up exactly touching."""
+        positions = np.array([[100.0, 100.0], [110.0, 100.0]])
+
+        separate_pairs(positions, np.array([10.0, 10.0]), np.array([0]), np.array([1]))
+
+        assert positions.tolist() == [[95.0, 100.0], [115.0, 100.0]]
+
+    def test_coincident_centers(self):
+        """Test circles at the same point are pushed apart deterministically."""
+        positions = np.array([[100.0, 100.0], [100.0, 100.0]])
+
+        separate_pairs(positions, np.array([10.0, 10.0]), np.array([0]), np.array([1]))
+
+        assert positions.tolist() == [[90.0, 100.0], [110.0, 100.0]]
+
+
+class TestResolveCollisions:
+    """Test resolve_collisions on an entity store."""
+
+    def test_crowd_settles(self):
+        """Test repeated resolution shrinks the deepest overlap in a crowd."""
+        store = EntityStore(800, 600)
+        ids = store.spawn_many(np.random.default_rng(0).uniform(300, 500, (200, 2)), 10, (0, 0, 0))
+
+        def max_penetration():
+            positions = store.pos[ids]
+            i, j = find_overlapping_pairs(positions, np.full(len(ids), 10.0))
+            return (20.0 - np.hypot(*(positions[i] - positions[j]).T)).max(initial=0.0)
+
+        before = max_penetration()
+        first, _ = resolve_collisions(store, ids)
+        for _ in range(30):
+            resolve_collisions(store, ids, iterations=3)
+
+        assert len(first) > 100
+        assert max_penetration() < before / 3
+        positions = store.pos[ids]
+        assert (positions >= 10).all() and (positions[:, 0] <= 790).all() and (positions[:, 1] <= 590).all()
+
+    def test_world_characters_do_not_stack(self):
+        """Test entities spawned on one spot spread out as the world runs."""
+        world = World(LittleWorldConfig(simulation=SimulationConfig(seed=0)), headless=True)
+        try:
+            handles = world.spawn_entities(30, positions=np.full((30, 2), 400.0), wander=False)
+
+            world.run(max_ticks=120)
+
+            positions = world.entities.pos[[h.index for h in handles]]
+            i, _ = find_overlapping_pairs(positions, np.full(30, 20.0))
+            assert len(np.unique(positions, axis=0)) == 30
+            assert len(i) < 30
+            for handle in handles:
+                assert world.spatial_index.cell_of(handle.x, handle.y) == world.spatial_index._object_cells[handle]
+        finally:
+            world.scheduler.stop()
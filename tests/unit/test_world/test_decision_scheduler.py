@@ -0,0 +1,129 @@
+"""
+Tests for world.decision_scheduler module.
+"""
+import asyncio
+import time
+import pytest
+from decisions import Decision, ActionType
+from world.decision_scheduler import DecisionScheduler
+
+
+class FakeAICharacter:
+    """AI character stand-in whose model takes ``delay`` seconds to decide."""
+
+    def __init__(self, name="fake", delay=0.0, decision_interval=3.0, fail=False, cancelled=False):
+        self.name = name
+        self.model = object()
+        self.personality = None
+        self.decision_interval = decision_interval
+        self.delay = delay
+        self.fail = fail
+        self.cancelled = cancelled
+        self.applied = []
+
+    async def make_decision(self, world_state, personality=None, received=None):
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("model unavailable")
+        if self.cancelled:
+            raise asyncio.CancelledError()
+        return Decision(type=ActionType.MOVE, dx=1, dy=0)
+
+    def apply_decision(self, decision):
+        self.applied.append(decision)
+
+
+def wait_for(scheduler, condition, timeout=2.0):
+    """Pump process_completed() until ``condition()`` holds."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        scheduler.process_completed()
+        if condition():
+            return
+        time.sleep(0.005)
+    raise AssertionError("condition not met before timeout")
+
+
+@pytest.fixture
+def scheduler():
+    scheduler = DecisionScheduler()
+    scheduler.start()
+    yield scheduler
+    scheduler.stop()
+
+
+class TestDecisionScheduler:
+    """Test DecisionScheduler."""
+
+    def test_dispatch_does_not_block(self, scheduler):
+        """Test that dispatching a slow decision returns immediately."""
+        character = FakeAICharacter(delay=0.5)
+
+        start = time.perf_counter()
+        scheduler.dispatch_decision(character, world_state=None, now=0.0)
+
+        assert time.perf_counter() - start < 0.1
+        assert scheduler.in_flight == 1
+
+    def test_decision_applied_only_by_process_completed(self, scheduler):
+        """Test that decisions are applied on the caller's thread, not the loop thread."""
+        character = FakeAICharacter()
+        future = scheduler.dispatch_decision(character, world_state=None, now=0.0)
+        future.result(timeout=2.0)
+
+        assert character.applied == []
+        wait_for(scheduler, lambda: character.applied)
+        assert character.applied[0].type == ActionType.MOVE
+        assert scheduler.in_flight == 0
+
+    def test_due_characters_respects_interval_and_in_flight(self, scheduler):
+        """Test characters are due once per interval and never twice concurrently."""
+        character = FakeAICharacter(delay=0.05, decision_interval=1.0)
+        no_model = FakeAICharacter()
+        no_model.model = None
+
+        assert scheduler.due_characters([character, no_model], now=0.0) == [character]
+        scheduler.dispatch_decision(character, world_state=None, now=0.0)
+        assert scheduler.due_characters([character], now=5.0) == []
+
+        wait_for(scheduler, lambda: scheduler.in_flight == 0)
+        assert scheduler.due_characters([character], now=0.5) == []
+        assert scheduler.due_characters([character], now=1.0) == [character]
+
+    def test_errors_release_character(self, scheduler, capsys):
+        """Test that a failed decision is reported and the character can decide again."""
+        character = FakeAICharacter(fail=True, decision_interval=0.0)
+        scheduler.dispatch_decision(character, world_state=None, now=0.0)
+
+        wait_for(scheduler, lambda: scheduler.in_flight == 0)
+
+        assert character.applied == []
+        assert "model unavailable" in capsys.readouterr().out
+        assert scheduler.due_characters([character], now=0.0) == [character]
+
+    def test_cancelled_decisions_release_character(self, scheduler):
+        """Test a decision cancelled from elsewhere (e.g. a coalescing leader) frees the character."""
+        character = FakeAICharacter(cancelled=True, decision_interval=0.0)
+        future = scheduler.dispatch_decision(character, world_state=None, now=0.0)
+
+        wait_for(scheduler, lambda: scheduler.in_flight == 0)
+
+        assert future.cancelled()
+        assert scheduler.due_characters([character], now=0.0) == [character]
+
+    def test_forget_drops_in_flight_decisions(self, scheduler):
+        """Test a removed (or restored) character never gets a decision started before."""
+        slow = FakeAICharacter(delay=0.5)
+        finished = FakeAICharacter()
+        slow_future = scheduler.dispatch_decision(slow, world_state=None, now=0.0)
+        scheduler.dispatch_decision(finished, world_state=None, now=0.0).result(timeout=2.0)
+
+        scheduler.forget(slow)
+        scheduler.forget(finished)
+        # A new decision for the same character is unaffected by the stale one
+        scheduler.dispatch_decision(finished, world_state=None, now=1.0)
+        wait_for(scheduler, lambda: scheduler.in_flight == 0)
+
+        assert slow_future.cancelled()
+        assert slow.applied == []
+        assert len(finished.applied) == 1
@@ -0,0 +1,125 @@
+"""
+Unit tests for cached dialogue bubble rendering and streamed dialogue.
+"""
+import asyncio
+import threading
+import time
+import pygame
+import pytest
+from config import LittleWorldConfig, SimulationConfig
+from world import World
+from world.dialogue import (
+    DialogueStream,
+    get_font,
+    wrap_text,
+    render_bubble_surface,
+    render_dialogue_bubble,
+    clear_dialogue_cache,
+)
+
+
+@pytest.fixture
+def screen():
+    pygame.init()
+    surface = pygame.display.set_mode((400, 300))
+    yield surface
+    pygame.quit()
+
+
+class TestDialogueCache:
+    """Test dialogue layout and surface caching."""
+
+    def test_font_is_pooled_per_size(self, screen):
+        """Test the same font object is reused for a size."""
+        assert get_font(24) is get_font(24)
+        assert get_font(24) is not get_font(18)
+
+    def test_wrap_text_fits_width(self, screen):
+        """Test every wrapped line fits within max_width."""
+        font = get_font(24)
+        text = "the quick brown fox jumps over the lazy dog " * 3
+
+        lines = wrap_text(text.strip(), font, 180)
+
+        assert len(lines) > 1
+        assert " ".join(lines) == text.strip()
+        assert all(font.size(line)[0] <= 180 for line in lines)
+
+    def test_bubble_rendered_once(self, screen):
+        """Test drawing the same bubble every frame reuses one pre-rendered surface."""
+        clear_dialogue_cache()
+
+        rects = [render_dialogue_bubble(screen, "Hello there", 200, 200) for _ in range(50)]
+
+        info = render_bubble_surface.cache_info()
+        assert info.misses == 1
+        assert info.hits == 49
+        assert len(set(map(tuple, rects))) == 1
+
+    def test_bubble_position_follows_character(self, screen):
+        """Test the bubble is drawn above the character, centered on it."""
+        rect = render_dialogue_bubble(screen, "Hi", 200, 200)
+
+        assert rect.bottom < 200
+        assert rect.centerx == pytest.approx(200, abs=2)
+        # Bubble background is drawn into the returned area
+        assert screen.get_at((200, rect.top + 5))[:3] == (255, 255, 255)
+
+    def test_cache_cleared_on_quit(self, screen):
+        """Test pygame.quit drops cached fonts and surfaces."""
+        render_dialogue_bubble(screen, "Hello", 200, 200)
+
+        pygame.quit()
+
+        assert render_bubble_surface.cache_info().currsize == 0
+        assert get_font.cache_info().currsize == 0
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+class TestDialogueStream:
+    """Test dialogue text filling in while a reply streams."""
+
+    def test_buffer_joins_chunks(self):
+        stream = DialogueStream()
+        stream.append("Hel")
+        stream.append("lo")
+
+        assert stream.text == "Hello"
+        assert not stream.done
+        stream.close()
+        assert stream.done and stream.error is None
+
+    def test_world_shows_partial_text_each_step(self):
+        """Test the bubble shows each chunk as soon as it arrives, before the reply is complete."""
+        world = World(LittleWorldConfig(simulation=SimulationConfig(seed=0)), headless=True)
+        gates = [threading.Event() for _ in range(3)]
+
+        async def chunks():
+            for gate, piece in zip(gates, ["I see ", "a ", "tree."]):
+                await asyncio.to_thread(gate.wait)
+                yield piece
+
+        try:
+            stream = world.show_dialogue_stream(world.big_guy, chunks())
+            seen = []
+            for gate, expected in zip(gates, ["I see ", "I see a ", "I see a tree."]):
+                gate.set()
+                wait_for(lambda: stream.text == expected)
+                world.update()
+                seen.append(world.dialogue_text)
+
+            wait_for(lambda: stream.done)
+            world.update()
+
+            assert seen == ["I see ", "I see a ", "I see a tree."]
+            assert world.dialogue_character is world.big_guy
+            assert world.dialogue_text == "I see a tree."
+            assert world._dialogue_stream is None
+        finally:
+            world.scheduler.stop()
@@ -0,0 +1,114 @@
+"""
+Unit tests for the structure-of-arrays entity store.
+"""
+import sys
+import numpy as np
+import pytest
+from character import Character
+from config import LittleWorldConfig, SimulationConfig
+from world import World
+from world.entity_store import EntityStore, EntityHandle
+
+
+class TestEntityStore:
+    """Test EntityStore."""
+
+    def test_spawn_and_despawn_reuses_ids(self):
+        """Test despawned ids are reused by later spawns."""
+        store = EntityStore(800, 600, capacity=4)
+        a = store.spawn(10, 20, 5, (255, 0, 0))
+        b = store.spawn(30, 40, 5, (0, 255, 0))
+
+        store.despawn(a)
+
+        assert len(store) == 1
+        assert store.spawn(50, 60, 5, (0, 0, 255)) == a
+        assert store.active_indices().tolist() == [a, b]
+
+    def test_grows_by_doubling(self):
+        """Test the arrays grow and keep existing entities."""
+        store = EntityStore(800, 600, capacity=2)
+        ids = [store.spawn(i, i, 5, (0, 0, 0)) for i in range(5)]
+
+        assert store.capacity == 8
+        assert store.pos[ids, 0].tolist() == [0, 1, 2, 3, 4]
+
+    def test_move_clamps_to_bounds(self):
+        """Test single and batched moves keep entities inside the world."""
+        store = EntityStore(100, 100)
+        a = store.spawn(50, 50, 10, (0, 0, 0))
+        b = store.spawn(50, 50, 10, (0, 0, 0))
+
+        assert store.move(a, 100, -100) == (90, 10)
+        store.move_many(np.array([b]), np.array([[-100.0, 30.0]]))
+        assert store.pos[b].tolist() == [10, 80]
+
+    def test_handle_exposes_character_api(self):
+        """Test EntityHandle reads and writes through the store."""
+        store = EntityStore(800, 600)
+        handle = EntityHandle(store, store.spawn(100, 200, 7, (1, 2, 3), vision_radius=50))
+
+        handle.move(5, -5)
+
+        assert (handle.x, handle.y) == (105, 195)
+        assert handle.radius == 7
+        assert handle.color == (1, 2, 3)
+        assert handle.vision_radius == 50
+        assert not hasattr(handle, "__dict__")
+
+    def test_100k_entities_memory(self):
+        """Test 100k entities stay within a small memory footprint."""
+        store = EntityStore(800, 600)
+        ids = store.spawn_many(np.random.default_rng(0).uniform(20, 580, (100_000, 2)), 20, (0, 0, 255))
+        handles = [EntityHandle(store, i) for i in ids.tolist()]
+
+        per_entity = (store.nbytes + sys.getsizeof(handles[0]) * len(handles)) / len(handles)
+
+        assert len(store) == 100_000
+        assert per_entity < 128
+
+
+class TestCharacterInStore:
+    """Test Characters attached to an EntityStore."""
+
+    def test_attached_character_uses_store(self):
+        """Test position reads, writes and moves go through the store."""
+        store = EntityStore(800, 600)
+        character = Character(100, 100, (255, 0, 0), LittleWorldConfig())
+
+        index = character.attach_to_store(store)
+        character.move(10, 0)
+        character.y = 150
+
+        assert store.pos[index].tolist() == [110, 150]
+        assert (character.x, character.y) == (110, 150)
+
+    def test_detach_keeps_position(self):
+        """Test detaching copies the position back and frees the entity."""
+        store = EntityStore(800, 600)
+        character = Character(100, 100, (255, 0, 0), LittleWorldConfig())
+        character.attach_to_store(store)
+        character.move(-200, 0)
+
+        character.detach_from_store()
+
+        assert len(store) == 0
+        assert character.entity_id is None
+        assert (character.x, character.y) == (20, 100)
+
+    def test_world_spawns_entities(self):
+        """Test World.spawn_entities adds observable entities to the world."""
+        world = World(LittleWorldConfig(simulation=SimulationConfig(seed=1)), headless=True)
+        try:
+            handles = world.spawn_entities(500)
+
+            assert len(world.entities) == len(world.characters) == 503
+            assert all(20 <= h.x <= 780 and 20 <= h.y <= 580 for h in handles)
+            batch = world.get_world_states_batch([world.big_guy])
+            assert len(batch[0].visible_characters) == len(
+                [c for c in world.characters if c is not world.big_guy
+                 and ((c.x - world.big_guy.x) ** 2 + (c.y - world.big_guy.y) ** 2) ** 0.5
+                 <= world.big_guy.vision_radius]
+            )
+        finally:
+            world.scheduler.stop()
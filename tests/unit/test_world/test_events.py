@@ -0,0 +1,201 @@
+"""
+Unit tests for the world event bus and event-driven decisions.
+"""
+import time
+from character import AICharacter
+from config import LittleWorldConfig, SimulationConfig, WindowConfig
+from decisions import Decision, ActionType
+from world import World
+from world.events import EventBus, EventType, WorldEvent
+
+
+class CountingModel:
+    """Model stand-in that always stays put and counts decision calls."""
+
+    def __init__(self):
+        self.calls = 0
+        self.inputs = []
+
+    def render_world_state(self, world_state):
+        return ""
+
+    async def structured_answering(self, messages, schema):
+        self.calls += 1
+        self.inputs.append(messages["input_messages"])
+        return Decision(type=ActionType.STAY)
+
+
+class TestEventBus:
+    """Test EventBus."""
+
+    def test_type_subscribers_receive_all_subjects(self):
+        """Test subscribe() receives every event of its type."""
+        bus = EventBus()
+        received = []
+        bus.subscribe(EventType.COLLISION, received.append)
+
+        bus.publish(WorldEvent(EventType.COLLISION, "a", 0.0, other="b"))
+        bus.publish(WorldEvent(EventType.BOUNDARY_HIT, "a", 0.0))
+
+        assert [e.type for e in received] == [EventType.COLLISION]
+        assert bus.published[EventType.BOUNDARY_HIT] == 1
+
+    def test_targeted_subscription_filters_subject_and_type(self):
+        """Test subscribe_to() only receives the subject's events of chosen types."""
+        bus = EventBus()
+        received = []
+        bus.subscribe_to("a", received.append, [EventType.MESSAGE_RECEIVED])
+
+        bus.publish(WorldEvent(EventType.MESSAGE_RECEIVED, "a", 0.0, message="hi"))
+        bus.publish(WorldEvent(EventType.MESSAGE_RECEIVED, "b", 0.0, message="hi"))
+        bus.publish(WorldEvent(EventType.COLLISION, "a", 0.0))
+
+        assert len(received) == 1 and received[0].message == "hi"
+        assert bus.wants("a", EventType.MESSAGE_RECEIVED)
+        assert not bus.wants("a", EventType.COLLISION)
+
+    def test_unsubscribe(self):
+        """Test unsubscribe() stops targeted delivery."""
+        bus = EventBus()
+        received = []
+        bus.subscribe_to("a", received.append)
+
+        bus.unsubscribe("a")
+        bus.publish(WorldEvent(EventType.COLLISION, "a", 0.0))
+
+        assert received == [] and "a" not in bus
+
+
+class TestWorldEvents:
+    """Test events published by World."""
+
+    def make_world(self, **simulation):
+        config = LittleWorldConfig(simulation=SimulationConfig(seed=0, **simulation))
+        world = World(config, headless=True)
+        character = AICharacter(400, 100, config, world=world, model=CountingModel(), vision_radius=100)
+        character.name = "Watcher"
+        world.add_character(character)
+        received = []
+        world.events.subscribe_to(character, received.append)
+        return world, character, received
+
+    def test_entered_vision(self):
+        """Test a character coming into view is reported once."""
+        world, watcher, received = self.make_world()
+        try:
+            world.update()
+            world.player.move(watcher.x - world.player.x - 80, watcher.y - world.player.y)
+            world.update()
+            world.update()
+
+            entered = [e.other.name for e in received if e.type == EventType.ENTERED_VISION]
+            assert entered == ["Player A"]
+        finally:
+            world.scheduler.stop()
+
+    def test_boundary_hit(self):
+        """Test reaching the edge is reported once per arrival."""
+        world, watcher, received = self.make_world()
+        try:
+            watcher.move(0, -1000)
+            world.update()
+            world.update()
+
+            assert [e.type for e in received].count(EventType.BOUNDARY_HIT) == 1
+        finally:
+            world.scheduler.stop()
+
+    def test_collision(self):
+        """Test a new contact is reported to the subscriber once."""
+        world, watcher, received = self.make_world()
+        try:
+            world.player.move(watcher.x - world.player.x - 30, watcher.y - world.player.y)
+            world.update()
+            world.update()
+
+            collisions = [e for e in received if e.type == EventType.COLLISION]
+            assert len(collisions) == 1 and collisions[0].other is world.player
+        finally:
+            world.scheduler.stop()
+
+    def test_message_received(self):
+        """Test a spoken message reaches characters in earshot."""
+        world, watcher, received = self.make_world()
+        try:
+            world.player.move(watcher.x - world.player.x - 80, watcher.y - world.player.y)
+
+            world.deliver_message(world.player, "hello")
+
+            messages = [e for e in received if e.type == EventType.MESSAGE_RECEIVED]
+            assert messages[0].message == "hello" and messages[0].other is world.player
+        finally:
+            world.scheduler.stop()
+
+    def test_event_requests_decision(self):
+        """Test an event makes a subscribed AI character due before max_idle_time."""
+        world, watcher, _ = self.make_world(max_idle_time=100.0)
+        try:
+            world._schedule_decisions(0.0)
+            deadline = time.monotonic() + 2.0
+            while world.scheduler.in_flight and time.monotonic() < deadline:
+                world.scheduler.process_completed()
+                time.sleep(0.005)
+            assert world.scheduler.due_characters([watcher], 10.0) == []
+
+            world.deliver_message(world.player, "hey", target="Watcher")
+
+            assert world.scheduler.due_characters([watcher], 10.0) == [watcher]
+        finally:
+            world.scheduler.stop()
+
+    def test_message_reaches_stationary_listener(self):
+        """Test a message to a character whose view did not change is decided on and in the prompt."""
+        world, watcher, _ = self.make_world(max_idle_time=100.0)
+        try:
+            def settle():
+                deadline = time.monotonic() + 2.0
+                while world.scheduler.in_flight and time.monotonic() < deadline:
+                    world.scheduler.process_completed()
+                    time.sleep(0.005)
+
+            world._schedule_decisions(0.0)
+            settle()
+            world.deliver_message(world.player, "hello there", target="Watcher")
+            world._schedule_decisions(10.0)
+            settle()
+
+            assert world.scheduler.skipped == 0
+            assert watcher.model.inputs[-1] == 'Player A said: "hello there"'
+        finally:
+            world.scheduler.stop()
+
+
+class TestDecisionVolume:
+    """Test event-driven decisions cut LLM calls in a sparse world."""
+
+    def count_calls(self, event_driven: bool) -> int:
+        config = LittleWorldConfig(
+            window=WindowConfig(width=4000, height=4000),
+            simulation=SimulationConfig(
+                seed=0, event_driven_decisions=event_driven, skip_unchanged_observations=False,
+            ),
+        )
+        world = World(config, headless=True)
+        models = []
+        for i in range(10):
+            model = CountingModel()
+            models.append(model)
+            world.add_character(AICharacter(
+                500 + 1000 * (i % 4), 500 + 1000 * (i // 4), config,
+                world=world, model=model, vision_radius=200, decision_interval=3.0,
+            ))
+        world.run(max_ticks=int(60 / config.game.timestep))
+        return sum(model.calls for model in models)
+
+    def test_event_driven_cuts_calls(self):
+        """Test a sparse, quiet world makes far fewer calls than 3-second polling."""
+        polling = self.count_calls(event_driven=False)
+        event_driven = self.count_calls(event_driven=True)
+
+        assert polling >= 150
+        assert event_driven * 5 <= polling
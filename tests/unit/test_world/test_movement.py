@@ -0,0 +1,110 @@
+"""
+Unit tests for vectorized batch movement.
+"""
+import numpy as np
+from character import AICharacter
+from config import LittleWorldConfig, SimulationConfig
+from world import World
+from world.entity_store import EntityStore, EntityHandle
+from world.movement import batch_move, sync_spatial_index
+from world.spatial_index import SpatialHashGrid
+
+
+def make_store(count: int, wander: bool = True) -> tuple[EntityStore, np.ndarray]:
+    store = EntityStore(800, 600)
+    ids = store.spawn_many(np.full((count, 2), 400.0), 10, (0, 0, 0), speed=60.0, wander=wander)
+    return store, ids
+
+
+class TestBatchMove:
+    """Test batch_move."""
+
+    def test_direction_changes_on_interval(self):
+        """Test wanderers pick a new direction only when their timer runs out."""
+        store, ids = make_store(100)
+        rng = np.random.default_rng(0)
+
+        batch_move(store, ids, 0.5, rng, direction_change_interval=1.0)
+        assert not store.vel[ids].any()
+
+        batch_move(store, ids, 0.5, rng, direction_change_interval=1.0)
+        speeds = np.linalg.norm(store.vel[ids], axis=1)
+        assert set(np.round(speeds).tolist()) <= {0.0, 60.0}
+        assert (speeds > 0).any()
+        assert np.allclose(store.walk_timer[ids], 0.0)
+
+    def test_moves_by_velocity_and_clamps(self):
+        """Test positions advance by velocity * dt and stay inside the world."""
+        store, ids = make_store(2, wander=False)
+        store.vel[ids] = [(100.0, 0.0), (-10_000.0, 10_000.0)]
+
+        batch_move(store, ids, 0.5, np.random.default_rng(0))
+
+        assert store.pos[ids].tolist() == [[450.0, 400.0], [10.0, 590.0]]
+
+    def test_seeded_runs_match(self):
+        """Test the same seed gives the same trajectories."""
+        results = []
+        for _ in range(2):
+            store, ids = make_store(50)
+            rng = np.random.default_rng(42)
+            for _ in range(120):
+                batch_move(store, ids, 1 / 60, rng)
+            results.append(store.pos[ids].copy())
+
+        assert np.array_equal(results[0], results[1])
+
+    def test_sync_spatial_index_only_touches_changed_cells(self):
+        """Test only objects that crossed a cell boundary are re-indexed."""
+        store = EntityStore(800, 600)
+        grid = SpatialHashGrid(100)
+        handles = [EntityHandle(store, store.spawn(x, 50, 5, (0, 0, 0))) for x in (50, 95)]
+        for handle in handles:
+            grid.insert(handle)
+        ids = np.array([h.index for h in handles])
+        old = store.pos[ids]
+
+        store.move_many(ids, np.array([[2.0, 0.0], [10.0, 0.0]]))
+        changed = sync_spatial_index(grid, handles, old, store.pos[ids])
+
+        assert changed == 1
+        assert grid.query_radius(105, 50, 1) == [handles[1]]
+
+
+class TestWorldBatchMovement:
+    """Test World switching to batch movement."""
+
+    def test_many_ai_characters_use_batch_movement(self):
+        """Test AI characters above the threshold move in the batch pass and stay indexed."""
+        config = LittleWorldConfig(simulation=SimulationConfig(seed=3, batch_movement_threshold=10))
+        world = World(config, headless=True)
+        try:
+            for i in range(20):
+                world.add_character(AICharacter(100 + 30 * i, 300, config))
+
+            world.run(max_ticks=180)
+
+            ai_characters, movers, _, _ = world._get_movement_groups()
+            assert set(ai_characters) <= set(movers)
+            for character in world.characters:
+                assert character.radius <= character.x <= config.window.width - character.radius
+                assert character.radius <= character.y <= config.window.height - character.radius
+                assert world.spatial_index.cell_of(character.x, character.y) == \
+                    world.spatial_index._object_cells[character]
+            wanderers = [c for c in ai_characters if c.model is None]
+            assert any(c.current_dx or c.current_dy for c in wanderers)
+        finally:
+            world.scheduler.stop()
+
+    def test_entities_move_below_threshold(self):
+        """Test spawned entities are batch-moved even when AI characters update per object."""
+        world = World(LittleWorldConfig(simulation=SimulationConfig(seed=5)), headless=True)
+        try:
+            handles = world.spawn_entities(200)
+            start = world.entities.pos[[h.index for h in handles]].copy()
+
+            world.run(max_ticks=120)
+
+            assert not np.array_equal(start, world.entities.pos[[h.index for h in handles]])
+        finally:
+            world.scheduler.stop()
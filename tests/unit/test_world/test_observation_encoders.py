@@ -0,0 +1,197 @@
+"""
+Unit tests for observation encoders.
+"""
+import asyncio
+import json
+import pytest
+from config import LLMConfig, MemoryConfig, MockLLMConfig, ResponseCacheConfig
+from decisions import Decision
+from language_model.llm_base_engine import BaseAIModelEngine
+from language_model.providers.mock_llm import MockLLMError
+from world.observation_encoders import (
+    DeltaEncoder,
+    ObservationEncoder,
+    TableEncoder,
+    create_observation_encoder,
+    register_observation_encoder,
+)
+from world.world_state import VisibleCharacter, WorldBounds, WorldState, format_world_state_text
+
+
+def visible(name, dx, dy, kind="ai"):
+    return VisibleCharacter(
+        name=name,
+        character_type=kind,
+        relative_x=dx,
+        relative_y=dy,
+        distance=(dx * dx + dy * dy) ** 0.5,
+        direction="unused",
+    )
+
+
+def make_state(x=403.7, y=296.2, characters=()):
+    return WorldState(
+        observer_position=(x, y),
+        vision_radius=200.0,
+        visible_characters=list(characters),
+        world_bounds=WorldBounds(
+            distance_to_north=y,
+            distance_to_south=600 - y,
+            distance_to_east=800 - x,
+            distance_to_west=x,
+            world_width=800,
+            world_height=600,
+        ),
+    )
+
+
+class TestEncoders:
+    """Test the built-in formats."""
+
+    def test_table(self):
+        state = make_state(characters=[visible("Ann", 98.6, -101.3), visible("Bob", 0.0, 57.0, "player")])
+
+        assert TableEncoder(round_to=10).encode(state) == (
+            "me 400,300 edges N300 S300 E400 W400\n"
+            "seen name|type|dist|dir\n"
+            "Ann|ai|140|NE\n"
+            "Bob|pl|60|S"
+        )
+        assert TableEncoder(round_to=0).encode(state).splitlines()[2] == "Ann|ai|141|NE"
+        assert TableEncoder().encode(make_state()).endswith("seen nobody")
+
+    def test_characters_sharing_a_name_are_all_listed(self):
+        twins = [visible("AI Character", 100.0, 0.0), visible("AI Character", -50.0, 0.0)]
+        encoder = DeltaEncoder(round_to=10)
+
+        assert TableEncoder(round_to=10).encode(make_state(characters=twins)).splitlines()[2:] == [
+            "AI Character|ai|100|E",
+            "AI Character#2|ai|50|W",
+        ]
+        encoder.encode(make_state(characters=twins[:1]))
+        encoder.commit()
+        assert encoder.encode(make_state(characters=twins)) == "+AI Character#2|ai|50|W"
+
+    def test_verbose_and_json_match_existing_dumps(self):
+        state = make_state(characters=[visible("Ann", 30.0, 40.0)])
+
+        assert create_observation_encoder("verbose").encode(state) == format_world_state_text(state)
+        assert json.loads(create_observation_encoder("json").encode(state)) == json.loads(
+            json.dumps(state.to_structured_dict())
+        )
+
+    def test_delta_sends_only_changes(self):
+        encoder = DeltaEncoder(round_to=10)
+        ann, bob = visible("Ann", 100.0, 0.0), visible("Bob", 0.0, -50.0)
+
+        def seen(state):
+            text = encoder.encode(state)
+            encoder.commit()
+            return text
+
+        first = seen(make_state(characters=[ann, bob]))
+        same = seen(make_state(x=401.0, characters=[ann, visible("Bob", 0.0, -52.0)]))
+        changed = seen(make_state(x=450.0, characters=[visible("Ann", 40.0, 0.0), visible("Cid", -30.0, 0.0)]))
+
+        assert first == TableEncoder(round_to=10).encode(make_state(characters=[ann, bob]))
+        assert same == "no change"
+        assert changed.splitlines() == [
+            "me 450,300 edges N300 S300 E350 W450",
+            "~Ann|ai|40|E",
+            "+Cid|ai|30|W",
+            "-Bob",
+        ]
+        # When everyone left, "seen nobody" is shorter than the list of departures
+        crowd = [visible(f"Walker {i}", 10.0 * i, 0.0) for i in range(1, 6)]
+        seen(make_state(characters=crowd))
+        empty = make_state(x=300.0)
+        assert encoder.encode(empty) == TableEncoder(round_to=10).encode(empty)
+        encoder.reset()
+        assert encoder.encode(make_state()).startswith("me 400,300")
+
+    def test_delta_baseline_advances_only_on_commit(self):
+        encoder = DeltaEncoder(round_to=10)
+        ann = visible("Ann", 100.0, 0.0)
+        encoder.encode(make_state(characters=[ann]))
+
+        # The first observation was never answered, so the next one is a full table again
+        assert encoder.encode(make_state(characters=[ann])).startswith("me 400,300")
+        encoder.commit()
+        encoder.encode(make_state(characters=[ann, visible("Bob", 0.0, -50.0)]))
+        assert encoder.encode(make_state(characters=[ann, visible("Bob", 0.0, -50.0)])) == "+Bob|ai|50|N"
+
+    def test_table_is_smaller_than_dumps(self):
+        state = make_state(characters=[visible(f"Character {i}", 10.0 * i, -7.3 * i) for i in range(1, 10)])
+        sizes = {name: len(create_observation_encoder(name).encode(state)) for name in ("verbose", "json", "table")}
+
+        assert sizes["table"] < sizes["verbose"] < sizes["json"]
+
+    def test_unknown_and_registered_formats(self):
+        class Names(ObservationEncoder):
+            def encode(self, world_state):
+                return ",".join(c.name for c in world_state.visible_characters)
+
+        with pytest.raises(ValueError, match="Unknown observation format 'names'"):
+            create_observation_encoder("names")
+        register_observation_encoder("names", lambda round_to: Names())
+        assert create_observation_encoder("names").encode(make_state(characters=[visible("Ann", 1, 1)])) == "Ann"
+
+
+class TestEngineObservationFormat:
+    """Test BaseAIModelEngine renders observations with the configured encoder."""
+
+    def test_config_selects_encoder(self):
+        config = LLMConfig(type="vllm", version="test-model", api_key="k", observation_format="table")
+        engine = BaseAIModelEngine(config=config, personality_prompt="You are a test.")
+        state = make_state(characters=[visible("Ann", 98.6, -101.3)])
+
+        assert engine.render_world_state(state) == TableEncoder().encode(state)
+        default = BaseAIModelEngine(config=config.model_copy(update={"observation_format": "verbose"}), personality_prompt="")
+        assert default.render_world_state(state) == format_world_state_text(state)
+
+    def test_delta_needs_memory(self):
+        config = LLMConfig(type="mock", version="mock", api_key="", observation_format="delta")
+
+        with pytest.raises(ValueError, match="needs conversation memory"):
+            BaseAIModelEngine(config=config, personality_prompt="You are a test.")
+
+    def test_delta_skips_cache_and_advances_after_answered_calls(self):
+        config = LLMConfig(
+            type="mock", version="mock", api_key="", observation_format="delta",
+            memory=MemoryConfig(), cache=ResponseCacheConfig(), mock=MockLLMConfig(latency_ms=0),
+        )
+        engine = BaseAIModelEngine(config=config, personality_prompt="You are a test.")
+        ann = visible("Ann", 100.0, 0.0)
+
+        def ask(state):
+            messages = {"world_state": engine.render_world_state(state), "input_messages": ""}
+            asyncio.run(engine.structured_answering(messages, Decision))
+            return messages["world_state"]
+
+        assert engine.response_cache is None
+        engine.llm.client.config = MockLLMConfig(latency_ms=0, error_rate=1.0)
+        with pytest.raises(MockLLMError):
+            ask(make_state(characters=[ann]))
+        engine.llm.client.config = MockLLMConfig(latency_ms=0)
+        assert ask(make_state(characters=[ann])).startswith("me 400,300")
+        assert ask(make_state(characters=[ann])) == "no change"
+
+    def test_delta_resends_table_before_it_leaves_memory(self):
+        config = LLMConfig(
+            type="mock", version="mock", api_key="", observation_format="delta",
+            memory=MemoryConfig(max_turns=3), mock=MockLLMConfig(latency_ms=0),
+        )
+        engine = BaseAIModelEngine(config=config, personality_prompt="You are a test.")
+        state = make_state(characters=[visible("Ann", 100.0, 0.0)])
+        sent = []
+
+        for i in range(10):
+            messages = {"world_state": engine.render_world_state(state), "input_messages": ""}
+            prompt = engine.build_prompt(messages).to_string()
+            asyncio.run(engine.structured_answering(messages, Decision))
+            engine.memory.add_turn(messages["world_state"], "stay", float(i))
+            sent.append(messages["world_state"])
+            # The prompt always holds a full table to apply the deltas to
+            assert TableEncoder.header in prompt
+
+        assert [text == "no change" for text in sent] == [False, True, True] * 3 + [False]
@@ -0,0 +1,173 @@
+"""
+Unit tests for incremental observations (ObservationTracker / WorldStateDelta).
+"""
+import time
+from character import AICharacter
+from config import LittleWorldConfig, SimulationConfig
+from decisions import Decision, ActionType
+from world import World
+from world.observation_tracker import ObservationTracker, WorldStateDelta
+from world.world_state import WorldState, WorldBounds, VisibleCharacter
+
+
+class Target:
+    def __init__(self, name, x, y):
+        self.name, self.x, self.y = name, x, y
+
+
+def snapshot(targets, observer=(0.0, 0.0)):
+    """Build a WorldState whose visible_characters are aligned with ``targets``."""
+    return WorldState(
+        observer_position=observer,
+        vision_radius=200.0,
+        visible_characters=[
+            VisibleCharacter(
+                name=t.name, character_type="ai", relative_x=t.x, relative_y=t.y,
+                distance=(t.x ** 2 + t.y ** 2) ** 0.5, direction="east",
+            )
+            for t in targets
+        ],
+        world_bounds=WorldBounds(
+            distance_to_north=0, distance_to_south=0, distance_to_east=0,
+            distance_to_west=0, world_width=800, world_height=600,
+        ),
+    )
+
+
+def observe(tracker, observer, targets, position=(0.0, 0.0)):
+    return tracker.diff(
+        observer, position, targets, [(t.x, t.y) for t in targets],
+        lambda: snapshot(targets, position),
+    )
+
+
+class TestObservationTracker:
+    """Test ObservationTracker."""
+
+    def test_first_observation_is_initial(self):
+        """Test the first observation reports everything as entered."""
+        a, b = Target("a", 10, 0), Target("b", 50, 0)
+
+        _, delta = observe(ObservationTracker(), "me", [a, b])
+
+        assert delta.initial
+        assert [c.name for c in delta.entered] == ["a", "b"]
+        assert not delta.is_empty
+
+    def test_unchanged_view_reuses_snapshot(self):
+        """Test an unchanged view returns the previous snapshot and an empty delta."""
+        tracker = ObservationTracker(move_threshold=10.0)
+        a = Target("a", 10, 0)
+        first, _ = observe(tracker, "me", [a])
+
+        a.x += 5  # Below the threshold
+        second, delta = observe(tracker, "me", [a], position=(3.0, 0.0))
+
+        assert second is first
+        assert delta.is_empty
+        assert delta.describe() == "No changes."
+        assert (tracker.snapshots_built, tracker.snapshots_reused) == (1, 1)
+
+    def test_entered_left_and_moved(self):
+        """Test entering, leaving and moving characters are reported separately."""
+        tracker = ObservationTracker(move_threshold=10.0)
+        a, b, c = Target("a", 10, 0), Target("b", 50, 0), Target("c", 90, 0)
+        observe(tracker, "me", [a, b])
+
+        b.x += 20
+        state, delta = observe(tracker, "me", [b, c])
+
+        assert [ch.name for ch in delta.entered] == ["c"]
+        assert [ch.name for ch in delta.moved] == ["b"]
+        assert delta.left == ["a"]
+        assert not delta.observer_moved
+        assert [ch.name for ch in state.visible_characters] == ["b", "c"]
+        assert "a is out of sight." in delta.describe()
+
+    def test_small_moves_accumulate(self):
+        """Test drift is measured from the last snapshot, not the last call."""
+        tracker = ObservationTracker(move_threshold=10.0)
+        a = Target("a", 10, 0)
+        observe(tracker, "me", [a])
+
+        deltas = []
+        for _ in range(3):
+            a.x += 4
+            deltas.append(observe(tracker, "me", [a])[1])
+
+        assert [d.is_empty for d in deltas] == [True, True, False]
+
+    def test_observer_moved(self):
+        """Test the observer's own move beyond the threshold counts as a change."""
+        tracker = ObservationTracker(move_threshold=10.0)
+        observe(tracker, "me", [])
+
+        _, delta = observe(tracker, "me", [], position=(0.0, 15.0))
+
+        assert delta.observer_moved
+        assert delta.describe() == "I moved to (0, 15)."
+
+    def test_forget(self):
+        """Test a forgotten observer starts over with an initial observation."""
+        tracker = ObservationTracker()
+        observe(tracker, "me", [])
+
+        tracker.forget("me")
+
+        assert observe(tracker, "me", [])[1].initial
+
+
+class CountingModel:
+    """Model stand-in counting decision calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def render_world_state(self, world_state):
+        return ""
+
+    async def structured_answering(self, messages, schema):
+        self.calls += 1
+        return Decision(type=ActionType.STAY)
+
+
+class TestWorldIncrementalObservations:
+    """Test incremental observations in World."""
+
+    def test_observe_incremental(self):
+        """Test World.observe_incremental reports characters entering vision."""
+        world = World(LittleWorldConfig(), headless=True)
+        try:
+            observer = world.big_guy
+            first_state, first = world.observe_incremental(observer)
+            state, unchanged = world.observe_incremental(observer)
+
+            world.player.move(observer.x - world.player.x - 50, observer.y - world.player.y)
+            _, changed = world.observe_incremental(observer)
+
+            assert first.initial
+            assert unchanged.is_empty and state is first_state
+            assert "Player A" in [c.name for c in changed.entered + changed.moved]
+        finally:
+            world.scheduler.stop()
+
+    def test_unchanged_view_skips_decision(self):
+        """Test no LLM call is made when nothing in view changed (interval polling)."""
+        config = LittleWorldConfig(simulation=SimulationConfig(seed=0, event_driven_decisions=False))
+        world = World(config, headless=True)
+        try:
+            model = CountingModel()
+            character = AICharacter(400, 100, config, world=world, model=model, decision_interval=1.0)
+            world.add_character(character)
+
+            for now in (0.0, 1.0, 2.0):
+                world._schedule_decisions(now)
+                deadline = time.monotonic() + 2.0
+                while world.scheduler.in_flight and time.monotonic() < deadline:
+                    world.scheduler.process_completed()
+                    time.sleep(0.005)
+
+            assert model.calls == 1
+            assert world.scheduler.skipped == 2
+        finally:
+            world.scheduler.stop()
@@ -0,0 +1,187 @@
+"""
+Unit tests for the layered dirty-rect renderer.
+"""
+import numpy as np
+import pygame
+import pytest
+from character import Character
+from config import LittleWorldConfig
+from world.entity_store import EntityStore
+from world.renderer import LayeredRenderer
+from world.dialogue import render_dialogue_bubble
+
+GROUND = (34, 139, 34)
+
+
+@pytest.fixture
+def screen():
+    pygame.init()
+    surface = pygame.display.set_mode((400, 300))
+    yield surface
+    pygame.quit()
+
+
+@pytest.fixture
+def characters():
+    config = LittleWorldConfig()
+    return [
+        Character(100, 100, (255, 0, 0), config),
+        Character(200, 150, (0, 0, 255), config),
+        Character(300, 200, (255, 255, 0), config),
+    ]
+
+
+@pytest.fixture
+def store():
+    store = EntityStore(400, 300)
+    positions = np.random.default_rng(0).uniform(20, 280, size=(200, 2))
+    store.spawn_many(positions, 5, (200, 200, 200))
+    return store
+
+
+def reference_frame(screen, characters, dialogue=None, store=None) -> pygame.Surface:
+    """Render a frame from scratch, the way World.render used to."""
+    frame = pygame.Surface(screen.get_size()).convert()
+    frame.fill(GROUND)
+    if store is not None:
+        store.render(frame)
+    for character in characters:
+        character.render(frame)
+    if dialogue is not None:
+        render_dialogue_bubble(frame, *dialogue)
+    return frame
+
+
+def assert_same_pixels(a: pygame.Surface, b: pygame.Surface):
+    assert pygame.image.tobytes(a, "RGB") == pygame.image.tobytes(b, "RGB")
+
+
+class TestLayeredRenderer:
+    """Test LayeredRenderer."""
+
+    def test_first_frame_is_full_redraw(self, screen, characters):
+        """Test the first frame draws everything."""
+        renderer = LayeredRenderer(screen, GROUND)
+
+        rects = renderer.render(characters)
+
+        assert rects == [screen.get_rect()]
+        assert_same_pixels(screen, reference_frame(screen, characters))
+
+    def test_idle_frame_updates_nothing(self, screen, characters):
+        """Test an unchanged frame pushes no rects to the display."""
+        renderer = LayeredRenderer(screen, GROUND)
+        renderer.render(characters)
+
+        assert renderer.render(characters) == []
+
+    def test_only_moved_character_is_dirty(self, screen, characters):
+        """Test a move dirties only the area around the moving character."""
+        renderer = LayeredRenderer(screen, GROUND)
+        renderer.render(characters)
+        old_rect = characters[0].get_rect()
+
+        characters[0].move(3, 0)
+        rects = renderer.render(characters)
+
+        assert rects == [old_rect.union(characters[0].get_rect())]
+        assert_same_pixels(screen, reference_frame(screen, characters))
+
+    def test_overlapping_characters_are_restored(self, screen, characters):
+        """Test a character moving off another one leaves the other intact."""
+        renderer = LayeredRenderer(screen, GROUND)
+        characters[1].move(-90, -45)  # on top of characters[0]
+        renderer.render(characters)
+
+        for _ in range(10):
+            characters[1].move(4, 2)
+            renderer.render(characters)
+
+        assert_same_pixels(screen, reference_frame(screen, characters))
+
+    def test_dialogue_layer(self, screen, characters):
+        """Test the bubble appears, follows its speaker, and is erased."""
+        renderer = LayeredRenderer(screen, GROUND)
+        renderer.render(characters)
+        speaker = characters[1]
+
+        renderer.render(characters, ("Hello there", speaker.x, speaker.y))
+        assert_same_pixels(screen, reference_frame(screen, characters, ("Hello there", speaker.x, speaker.y)))
+
+        speaker.move(5, 5)
+        characters[0].move(100, 0)  # passes under the bubble
+        renderer.render(characters, ("Hello there", speaker.x, speaker.y))
+        assert_same_pixels(screen, reference_frame(screen, characters, ("Hello there", speaker.x, speaker.y)))
+
+        renderer.render(characters)
+        assert_same_pixels(screen, reference_frame(screen, characters))
+
+    def test_invalidate_forces_full_redraw(self, screen, characters):
+        """Test invalidate() makes the next frame a full redraw."""
+        renderer = LayeredRenderer(screen, GROUND)
+        renderer.render(characters)
+
+        renderer.invalidate()
+
+        assert renderer.render(characters) == [screen.get_rect()]
+
+    def test_store_entities_are_diffed_from_arrays(self, screen, characters, store):
+        """Test store-backed entities are redrawn only where they moved, beneath characters."""
+        renderer = LayeredRenderer(screen, GROUND)
+        ids = store.active_indices()
+        renderer.render(characters, store=store, entity_ids=ids)
+        assert_same_pixels(screen, reference_frame(screen, characters, store=store))
+
+        assert renderer.render(characters, store=store, entity_ids=ids) == []
+        # Sub-pixel moves do not change the drawn circle
+        store.pos[ids[:50]] = np.floor(store.pos[ids[:50]]) + 0.25
+        assert renderer.render(characters, store=store, entity_ids=ids) == []
+
+        old_rect = store.rect(ids[3])
+        store.move(ids[3], 4, 0)
+        rects = renderer.render(characters, store=store, entity_ids=ids)
+        assert rects == [old_rect.union(store.rect(ids[3]))]
+        store.move(ids[7], -60, 30)
+        characters[2].move(-5, 0)
+        renderer.render(characters, store=store, entity_ids=ids)
+        assert_same_pixels(screen, reference_frame(screen, characters, store=store))
+
+    def test_population_change_redraws(self, screen, characters, store):
+        """Test spawning or despawning entities triggers a full redraw."""
+        renderer = LayeredRenderer(screen, GROUND)
+        renderer.render(characters, store=store, entity_ids=store.active_indices())
+
+        store.despawn(5)
+
+        assert renderer.render(characters, store=store, entity_ids=store.active_indices()) == [screen.get_rect()]
+        assert_same_pixels(screen, reference_frame(screen, characters, store=store))
+
+
+class TestWorldRender:
+    """Test World.render draws entity handles from the store arrays."""
+
+    def test_world_frame_matches_reference(self, monkeypatch):
+        from config import SimulationConfig
+        from world import World
+
+        world = World(LittleWorldConfig(simulation=SimulationConfig(seed=0)))
+        try:
+            world.spawn_entities(300)
+            calls = []
+            original = world.entities.render
+            monkeypatch.setattr(world.entities, "render", lambda screen, ids=None: calls.append(ids) or original(screen, ids))
+
+            world.render()
+            world.update()
+            world.render()
+
+            # One array draw for the whole population on the full redraw
+            assert len(calls[0]) == 300
+            frame = pygame.Surface(world.screen.get_size()).convert()
+            frame.fill(world.config.colors.ground)
+            world.entities.render(frame, calls[0])
+            for character in world.characters[:3]:
+                character.render(frame)
+            assert_same_pixels(world.screen, frame)
+        finally:
+            world.scheduler.stop()
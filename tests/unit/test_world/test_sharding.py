@@ -0,0 +1,101 @@
+"""
+Unit tests for the multi-process sharded simulation.
+"""
+from multiprocessing import shared_memory
+import numpy as np
+import pytest
+from config import LittleWorldConfig, SimulationConfig
+from world.collision import resolve_collisions
+from world.entity_store import EntityStore
+from world.sharding import ShardedWorld, SharedEntityStore, strip_owners
+
+
+def make_config(**simulation):
+    return LittleWorldConfig(simulation=SimulationConfig(seed=3, **simulation))
+
+
+class TestSharedEntityStore:
+    """Test the shared-memory backed entity store."""
+
+    def test_attached_store_sees_writes(self):
+        store = SharedEntityStore(800, 600, capacity=8)
+        other = SharedEntityStore(800, 600, capacity=8, name=store.name)
+        try:
+            index = store.spawn(100, 200, 5, (1, 2, 3))
+
+            assert other.pos[index].tolist() == [100.0, 200.0]
+            assert other.alive[index]
+        finally:
+            other.close()
+            store.close()
+
+    def test_capacity_is_fixed(self):
+        store = SharedEntityStore(800, 600, capacity=2)
+        try:
+            store.spawn_many(np.zeros((2, 2)), 5, (0, 0, 0))
+            with pytest.raises(RuntimeError):
+                store.spawn(0, 0, 5, (0, 0, 0))
+        finally:
+            store.close()
+
+    def test_close_frees_memory(self):
+        store = SharedEntityStore(800, 600, capacity=4)
+        name = store.name
+        store.close()
+
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
+
+
+class TestShardedWorld:
+    """Test the sharded simulation against the single-process one."""
+
+    def test_strip_owners(self):
+        owners = strip_owners(np.array([0.0, 199.9, 200.0, 799.0, 800.0]), 800, 4)
+
+        assert owners.tolist() == [0, 0, 1, 3, 3]
+
+    def test_border_collisions_match_single_process(self):
+        """Test a crowd straddling the strip border is separated exactly like in one process."""
+        rng = np.random.default_rng(0)
+        positions = rng.uniform((350, 250), (450, 350), (60, 2))
+        reference = EntityStore(800, 600, capacity=64)
+        ids = reference.spawn_many(positions, 10, (0, 0, 0))
+        resolve_collisions(reference, ids)
+
+        with ShardedWorld(make_config(), capacity=64, num_shards=2) as world:
+            world.spawn_entities(positions, 10, (0, 0, 0), speed=0.0, wander=False)
+            world.step()
+
+            np.testing.assert_allclose(world.positions(), reference.pos[ids], atol=1e-9)
+            stats = world.stats()
+            assert sum(s.entities for s in stats) == 60
+            assert all(s.halo > 0 for s in stats)
+
+    def test_entities_migrate_between_shards(self):
+        with ShardedWorld(make_config(collisions=False), capacity=4, num_shards=2) as world:
+            ids = world.spawn_entities(np.array([[380.0, 300.0]]), 5, (0, 0, 0), wander=False)
+            world.store.vel[ids] = (600.0, 0.0)
+
+            world.step(0.05)
+            before = [s.entities for s in world.stats()]
+            world.step(0.05)
+            after = [s.entities for s in world.stats()]
+
+            assert before == [1, 0]
+            assert after == [0, 1]
+            assert world.positions()[0, 0] == pytest.approx(440.0)
+
+    def test_seeded_runs_are_reproducible(self):
+        rng = np.random.default_rng(1)
+        positions = rng.uniform(10, (790, 590), (200, 2))
+        results = []
+        for _ in range(2):
+            with ShardedWorld(make_config(), capacity=256, num_shards=3) as world:
+                world.spawn_entities(positions, 6, (0, 0, 0))
+                for _ in range(20):
+                    world.step()
+                results.append(world.positions())
+
+        np.testing.assert_array_equal(results[0], results[1])
+        assert (results[0] != positions).any()
@@ -0,0 +1,55 @@
+"""
+Unit tests for the fixed-timestep simulation clock.
+"""
+import pytest
+from world.sim_clock import SimulationClock
+
+
+class TestSimulationClock:
+    """Test SimulationClock."""
+
+    def test_steps_independent_of_frame_rate(self):
+        """Test the same real time yields the same number of steps at any FPS."""
+        fast = SimulationClock(timestep=0.01)
+        slow = SimulationClock(timestep=0.01)
+
+        fast_steps = sum(fast.advance(0.005) for _ in range(200))
+        slow_steps = sum(slow.advance(0.05) for _ in range(20))
+
+        assert fast_steps == slow_steps == 100
+
+    def test_accumulator_carries_remainder(self):
+        """Test partial steps are kept for the next frame."""
+        clock = SimulationClock(timestep=0.1)
+
+        assert clock.advance(0.15) == 1
+        assert clock.alpha == pytest.approx(0.5)
+        assert clock.advance(0.05) == 1
+
+    def test_time_scale(self):
+        """Test time_scale multiplies simulated time per real second."""
+        clock = SimulationClock(timestep=0.01, time_scale=10.0, max_frame_time=1.0)
+
+        assert clock.advance(0.1) == 100
+
+    def test_max_frame_time_clamps_catch_up(self):
+        """Test a long stall does not produce an unbounded burst of steps."""
+        clock = SimulationClock(timestep=0.01, max_frame_time=0.25)
+
+        assert clock.advance(5.0) == 25
+
+    def test_step_updates_sim_time(self):
+        """Test step() advances simulation time by one timestep."""
+        clock = SimulationClock(timestep=0.5)
+
+        clock.step()
+        clock.step()
+
+        assert clock.step_count == 2
+        assert clock.sim_time == 1.0
+
+    @pytest.mark.parametrize("time_scale", [0.1, 0.0, 250.0])
+    def test_rejects_out_of_range_time_scale(self, time_scale):
+        """Test time_scale outside 0.5x-100x is rejected."""
+        with pytest.raises(ValueError):
+            SimulationClock(time_scale=time_scale)
@@ -0,0 +1,122 @@
+"""
+Unit tests for binary world snapshots.
+"""
+import numpy as np
+import pytest
+from config import LittleWorldConfig, SimulationConfig, WindowConfig
+from world import World
+from world.snapshot import SnapshotError, load_snapshot, save_snapshot
+
+
+def make_world(**window):
+    config = LittleWorldConfig(simulation=SimulationConfig(seed=5), window=WindowConfig(**window))
+    return World(config, headless=True)
+
+
+class TestSnapshotFormat:
+    """Test the snapshot file format."""
+
+    def test_round_trip(self, tmp_path):
+        path = tmp_path / "state.lws"
+        arrays = {
+            "pos": np.arange(12, dtype=np.float64).reshape(6, 2),
+            "alive": np.array([True, False, True]),
+            "empty": np.zeros((0, 3), dtype=np.uint8),
+        }
+
+        save_snapshot(path, arrays, {"answer": 42})
+        loaded, metadata = load_snapshot(path)
+
+        assert metadata == {"answer": 42}
+        for name, array in arrays.items():
+            np.testing.assert_array_equal(loaded[name], array)
+            assert loaded[name].dtype == array.dtype
+        assert not loaded["pos"].flags.owndata  # A view of the mapped file
+
+    def test_loaded_arrays_are_copy_on_write(self, tmp_path):
+        path = tmp_path / "state.lws"
+        save_snapshot(path, {"pos": np.zeros(4)}, {})
+
+        loaded, _ = load_snapshot(path)
+        loaded["pos"][:] = 7.0
+
+        assert load_snapshot(path)[0]["pos"].tolist() == [0.0] * 4
+
+    def test_rejects_other_files(self, tmp_path):
+        path = tmp_path / "not_a_snapshot"
+        path.write_bytes(b"hello world" * 10)
+
+        with pytest.raises(SnapshotError, match="not a LittleWorld snapshot"):
+            load_snapshot(path)
+
+    def test_rejects_unknown_version(self, tmp_path):
+        path = tmp_path / "state.lws"
+        save_snapshot(path, {}, {})
+        data = bytearray(path.read_bytes())
+        data[8] = 99
+        path.write_bytes(bytes(data))
+
+        with pytest.raises(SnapshotError, match="format 99"):
+            load_snapshot(path)
+
+
+class TestWorldSnapshot:
+    """Test World.snapshot / World.restore."""
+
+    def test_restored_world_continues_identically(self, tmp_path):
+        """Test a restored world replays the original's future exactly (positions and RNGs)."""
+        path = tmp_path / "world.lws"
+        original = make_world()
+        original.spawn_entities(200)
+        for _ in range(30):
+            original.update()
+        original.snapshot(path)
+        for _ in range(30):
+            original.update()
+
+        restored = make_world()
+        restored.restore(path)
+        assert len(restored.characters) == len(original.characters)
+        for _ in range(30):
+            restored.update()
+
+        np.testing.assert_array_equal(
+            restored.entities.pos[restored.entities.active_indices()],
+            original.entities.pos[original.entities.active_indices()],
+        )
+        assert restored.tick_count == original.tick_count == 60
+        assert restored.sim_clock.sim_time == original.sim_clock.sim_time
+
+    def test_restores_dialogue_and_free_ids(self, tmp_path):
+        path = tmp_path / "world.lws"
+        original = make_world()
+        handles = original.spawn_entities(3)
+        original.remove_character(handles[1])
+        original.show_dialogue(original.big_guy, "Hello")
+        original.snapshot(path)
+
+        restored = make_world()
+        restored.restore(path)
+
+        assert restored.dialogue_text == "Hello"
+        assert restored.dialogue_character is restored.big_guy
+        assert len(restored.entities) == len(original.entities)
+        assert restored.entities.spawn(0, 0, 5, (0, 0, 0)) == handles[1].index
+        # Restored entities are indexed for vision queries
+        assert restored.visible_characters_for(restored.player, 10_000)
+
+    def test_rejects_mismatched_world(self, tmp_path):
+        path = tmp_path / "world.lws"
+        make_world().snapshot(path)
+
+        with pytest.raises(SnapshotError, match="1024x768"):
+            make_world(width=1024, height=768).restore(path)
+
+    def test_rejects_missing_characters(self, tmp_path):
+        path = tmp_path / "world.lws"
+        original = make_world()
+        original.player.name = "Someone Else"
+        original.snapshot(path)
+
+        with pytest.raises(SnapshotError, match="Someone Else"):
+            make_world().restore(path)
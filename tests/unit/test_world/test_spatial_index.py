@@ -0,0 +1,101 @@
+"""
+Tests for world.spatial_index module.
+"""
+import random
+import pytest
+from config import LittleWorldConfig
+from character import Character
+from world.spatial_index import SpatialHashGrid
+from world.world_state import calculate_distance
+
+
+class Point:
+    """Minimal hashable object with a position."""
+
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+def make_point(x, y):
+    return Point(x, y)
+
+
+class TestSpatialHashGrid:
+    """Test SpatialHashGrid index."""
+
+    def test_invalid_cell_size(self):
+        """Test that a non-positive cell size is rejected."""
+        with pytest.raises(ValueError):
+            SpatialHashGrid(cell_size=0)
+
+    def test_query_radius_matches_linear_scan(self):
+        """Test radius queries return exactly what a linear scan returns."""
+        # Arrange
+        rng = random.Random(42)
+        points = [make_point(rng.uniform(0, 2000), rng.uniform(0, 1500)) for _ in range(500)]
+        grid = SpatialHashGrid(cell_size=150)
+        for point in points:
+            grid.insert(point)
+
+        # Act / Assert
+        for _ in range(50):
+            qx, qy, radius = rng.uniform(0, 2000), rng.uniform(0, 1500), rng.uniform(10, 400)
+            expected = {id(p) for p in points if calculate_distance(qx, qy, p.x, p.y) <= radius}
+            assert {id(p) for p in grid.query_radius(qx, qy, radius)} == expected
+
+    def test_update_moves_object_between_cells(self):
+        """Test that update() re-buckets an object that moved."""
+        # Arrange
+        grid = SpatialHashGrid(cell_size=100)
+        point = make_point(50, 50)
+        grid.insert(point)
+
+        # Act
+        point.x, point.y = 950, 950
+        grid.update(point)
+
+        # Assert
+        assert grid.query_radius(50, 50, 10) == []
+        assert grid.query_radius(950, 950, 10) == [point]
+
+    def test_remove(self):
+        """Test that removed objects are no longer returned."""
+        grid = SpatialHashGrid(cell_size=100)
+        point = make_point(10, 10)
+        grid.insert(point)
+
+        grid.remove(point)
+        grid.remove(point)  # Removing twice is a no-op
+
+        assert len(grid) == 0
+        assert point not in grid
+        assert grid.query_radius(10, 10, 50) == []
+
+    def test_negative_coordinates(self):
+        """Test that points left/above the origin are indexed correctly."""
+        grid = SpatialHashGrid(cell_size=100)
+        point = make_point(-5, -5)
+        grid.insert(point)
+
+        assert grid.query_radius(5, 5, 20) == [point]
+
+
+class TestCharacterIndexSync:
+    """Test that Character.move keeps the spatial index up to date."""
+
+    def test_move_updates_index(self):
+        """Test a registered character is found at its new position after moving."""
+        # Arrange
+        config = LittleWorldConfig()
+        character = Character(100, 100, (0, 0, 0), config=config)
+        grid = SpatialHashGrid(cell_size=50)
+        grid.insert(character)
+        character.spatial_index = grid
+
+        # Act
+        character.move(300, 200)
+
+        # Assert
+        assert grid.query_radius(100, 100, 30) == []
+        assert grid.query_radius(400, 300, 30) == [character]